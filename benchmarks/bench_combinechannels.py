@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -----------------------------------------------------------------------------
+# Buli Commander
+# Copyright (C) 2019-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin designed to manage documents
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# Micro-benchmark for pktk.modules.imgutils.combineChannels()
+#
+# Compare previous per-pixel implementation with current vectorised one
+# (NumPy if available, otherwise strided slice assignment)
+#
+# Usage (PyQt5 must be available):
+#   python3 benchmarks/bench_combinechannels.py [--pixels N] [--repeat N]
+# -----------------------------------------------------------------------------
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'bulicommander', 'bulicommander'))
+
+from pktk.modules import imgutils
+
+
+def combineChannelsLegacy(bytesPerChannel, *channels):
+    """Previous combineChannels() implementation (per-pixel loop)"""
+    channelSize = None
+    for channel in channels:
+        if channelSize is None:
+            channelSize = len(channel)
+        elif channelSize != len(channel):
+            raise ValueError("All `channels` must have the same size")
+
+    channelCount = len(channels)
+    offsetTargetInc = channelCount*bytesPerChannel
+    targetSize = channelSize*offsetTargetInc
+    target = bytearray(targetSize)
+
+    channelNumber = 0
+    for channel in channels:
+        offsetTarget = channelNumber*bytesPerChannel
+        offsetSource = 0
+        for index in range(channelSize//bytesPerChannel):
+            target[offsetTarget] = channel[offsetSource]
+            offsetTarget += offsetTargetInc
+            offsetSource += bytesPerChannel
+        channelNumber += 1
+
+    return target
+
+
+def timeIt(repeat, function, *args, **kwargs):
+    """Return best execution time (in seconds) of `function` over `repeat` calls"""
+    returned = None
+    for index in range(repeat):
+        startTime = time.perf_counter()
+        function(*args, **kwargs)
+        duration = time.perf_counter() - startTime
+        if returned is None or duration < returned:
+            returned = duration
+    return returned
+
+
+def main():
+    parser = argparse.ArgumentParser(description="combineChannels() micro-benchmark")
+    parser.add_argument('--pixels', type=int, default=1024*1024, help="number of pixels per channel")
+    parser.add_argument('--repeat', type=int, default=3, help="number of runs per case (best time is kept)")
+    parser.add_argument('--no-legacy', action='store_true', help="don't run previous implementation")
+    args = parser.parse_args()
+
+    print(f"NumPy: {'available' if imgutils.numpy is not None else 'not available (slice assignment)'}")
+    print(f"Pixels per channel: {args.pixels}")
+    print(f"{'bytes/ch':>8} {'channels':>8} {'premul':>6} {'legacy (s)':>12} {'current (s)':>12} {'ratio':>8}")
+
+    for bytesPerChannel in (1, 2, 4):
+        for channelCount in (3, 4):
+            channels = [os.urandom(args.pixels*bytesPerChannel) for index in range(channelCount)]
+            target = bytearray(args.pixels*bytesPerChannel*channelCount)
+
+            for premultiplied in (False, True):
+                if premultiplied and channelCount != 4:
+                    continue
+
+                legacy = None
+                if not args.no_legacy and not premultiplied:
+                    legacy = timeIt(args.repeat, combineChannelsLegacy, bytesPerChannel, *channels)
+                current = timeIt(args.repeat, imgutils.combineChannels, bytesPerChannel, *channels, premultiplied=premultiplied, target=target)
+
+                legacyStr = f"{legacy:12.4f}" if legacy is not None else f"{'-':>12}"
+                ratioStr = f"{legacy/current:7.1f}x" if legacy is not None and current > 0 else f"{'-':>8}"
+                print(f"{bytesPerChannel:>8} {channelCount:>8} {str(premultiplied):>6} {legacyStr} {current:12.4f} {ratioStr}")
+
+
+if __name__ == '__main__':
+    main()
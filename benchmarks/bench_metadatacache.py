@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -----------------------------------------------------------------------------
+# Buli Commander
+# Copyright (C) 2019-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin designed to manage documents
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# Benchmark for metadata cache database (bcfile.BCFileCache)
+#
+# Synthetic metadata rows are written and read in a database using the same
+# schema and queries than BCFileCache/BCFileCacheWriter:
+# - insert:         batches of rows (one transaction per batch)
+# - lookup:         one query per hash (BCFileCache.getMetadata())
+# - bulk lookup:    WHERE hash IN (...) queries (BCFileCache.getMetadataList())
+#
+# Each operation is measured with 1, 4 and 16 threads (one connection per
+# thread, read only for lookups) and for different database settings (pragmas)
+# Throughput, latency percentiles and database size are reported
+#
+# Only python standard library is used (sqlite3), no Krita/PyQt5 needed
+#
+# Usage:
+#   python3 benchmarks/bench_metadatacache.py [--rows N] [--threads 1,4,16]
+#                                             [--pragmas wal,wal-normal,delete]
+#                                             [--output results.json]
+#                                             [--baseline baseline.json]
+#
+# Results written with --output can be given as --baseline for a next run, to
+# compare throughput after cache changes
+# -----------------------------------------------------------------------------
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+
+BATCH_SIZE = 500        # BCFileCacheWriter.BATCH_SIZE
+BULK_SIZE = 500         # BCFileCache.__BULK_SIZE
+BUSY_TIMEOUT = 5.0      # in seconds
+
+INDEXED_COLUMNS = ('width', 'height', 'bitDepth', 'colorType', 'frameCount', 'dpi')
+
+# database settings to compare
+PRAGMAS = {
+        'wal': ["PRAGMA journal_mode=WAL"],
+        'wal-normal': ["PRAGMA journal_mode=WAL", "PRAGMA synchronous=NORMAL"],
+        'delete': ["PRAGMA journal_mode=DELETE"]
+    }
+
+SQL_INSERT = f"""
+    INSERT INTO `metadata` (hash, metadata, fileFormat, parserVersion, lastAccess, {', '.join(INDEXED_COLUMNS)}, indexed)
+                VALUES(?, ?, ?, ?, ?, {', '.join(['?'] * len(INDEXED_COLUMNS))}, 1)
+    ON CONFLICT(hash)
+                DO UPDATE SET metadata=excluded.metadata,
+                              fileFormat=excluded.fileFormat,
+                              parserVersion=excluded.parserVersion,
+                              lastAccess=excluded.lastAccess,
+                              {', '.join([f'{column}=excluded.{column}' for column in INDEXED_COLUMNS])},
+                              indexed=1
+    """
+
+
+def createDatabase(fileName, pragmas):
+    """Create database with BCFileCache schema (version 1.04)"""
+    connection = sqlite3.connect(fileName, isolation_level=None)
+    connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    connection.execute(f"""
+        CREATE TABLE `metadata` (
+            `hash` TEXT NOT NULL UNIQUE,
+            `metadata` TEXT,
+            `fileFormat` TEXT,
+            `lastAccess` REAL,
+            {', '.join([f'`{column}` {sqlType}' for column, sqlType in zip(INDEXED_COLUMNS, ('NUMERIC', 'NUMERIC', 'INTEGER', 'TEXT', 'INTEGER', 'REAL'))])},
+            `indexed` INTEGER NOT NULL DEFAULT 0,
+            `parserVersion` INTEGER NOT NULL DEFAULT 1,
+            PRIMARY KEY(`hash`)
+        )
+        """)
+    for column in ('lastAccess', 'fileFormat', 'width', 'height'):
+        connection.execute(f"CREATE INDEX `metadata_{column}` ON `metadata` ({column})")
+    connection.execute("PRAGMA user_version=104")
+    for pragma in pragmas:
+        connection.execute(pragma)
+    connection.close()
+
+
+def connect(fileName, pragmas, readOnly=False):
+    """Return a connection to database"""
+    if readOnly:
+        connection = sqlite3.connect(f'file:{fileName}?mode=ro', uri=True, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+    else:
+        connection = sqlite3.connect(fileName, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+    for pragma in pragmas:
+        if 'journal_mode' not in pragma:
+            # journal mode is persistent, other settings are defined per connection
+            connection.execute(pragma)
+    return connection
+
+
+def syntheticRow(hash):
+    """Return a metadata row for `hash`, similar to metadata of a PNG/Krita file"""
+    width = random.randint(64, 8000)
+    height = random.randint(64, 8000)
+    fileFormat = random.choice(('png', 'jpeg', 'kra', 'psd', 'webp'))
+    metadata = {
+            'format': fileFormat,
+            'width': width,
+            'height': height,
+            'resolutionX': (300.0, '300.00ppi'),
+            'resolutionY': (300.0, '300.00ppi'),
+            'resolution': '300.00ppi',
+            'colorType': ('RGBA', 'RGB with Alpha channel'),
+            'bitDepth': (8, '8-bit integer/channel'),
+            'iccProfileName': {'en-US': 'sRGB-elle-V2-srgbtrc.icc'},
+            'iccProfile': '',
+            'imageCount': 1,
+            'paletteSize': 0,
+            'document.title': f'Document {hash[:8]}',
+            'document.description': 'x' * random.randint(0, 800),
+            'document.keywords': ['synthetic', 'benchmark', fileFormat],
+            'document.layerCount': random.randint(1, 150)
+        }
+    return (hash, json.dumps(metadata), fileFormat, 1, time.time(), width, height, 8, 'RGBA', 1, 300.0)
+
+
+def percentile(values, value):
+    """Return percentile `value` of sorted list `values`"""
+    if len(values) == 0:
+        return 0
+    return values[min(len(values) - 1, int(len(values) * value / 100))]
+
+
+def runThreads(nbThreads, function, items):
+    """Split `items` between `nbThreads` threads executing `function(items, latencies)`
+
+    Return a tuple (duration in seconds, sorted list of latencies in seconds)
+    """
+    latencies = []
+    chunks = [items[index::nbThreads] for index in range(nbThreads)]
+    threads = [threading.Thread(target=function, args=(chunk, latencies)) for chunk in chunks]
+
+    startTime = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return (time.perf_counter() - startTime, sorted(latencies))
+
+
+def benchInsert(fileName, pragmas, nbThreads, rows):
+    """Insert `rows` by batches"""
+    batches = [rows[index:index + BATCH_SIZE] for index in range(0, len(rows), BATCH_SIZE)]
+
+    def insert(batches, latencies):
+        connection = connect(fileName, pragmas)
+        for batch in batches:
+            startTime = time.perf_counter()
+            connection.execute("BEGIN IMMEDIATE TRANSACTION")
+            connection.executemany(SQL_INSERT, batch)
+            connection.execute("COMMIT TRANSACTION")
+            latencies.append(time.perf_counter() - startTime)
+        connection.close()
+
+    return runThreads(nbThreads, insert, batches)
+
+
+def benchLookup(fileName, pragmas, nbThreads, hashes):
+    """Read metadata, one query per hash"""
+    def lookup(hashes, latencies):
+        connection = connect(fileName, pragmas, True)
+        for hash in hashes:
+            startTime = time.perf_counter()
+            connection.execute("SELECT metadata, fileFormat, parserVersion FROM metadata WHERE hash=?", (hash, )).fetchone()
+            latencies.append(time.perf_counter() - startTime)
+        connection.close()
+
+    return runThreads(nbThreads, lookup, hashes)
+
+
+def benchBulkLookup(fileName, pragmas, nbThreads, hashes):
+    """Read metadata by chunks of hashes"""
+    chunks = [hashes[index:index + BULK_SIZE] for index in range(0, len(hashes), BULK_SIZE)]
+
+    def bulkLookup(chunks, latencies):
+        connection = connect(fileName, pragmas, True)
+        for chunk in chunks:
+            startTime = time.perf_counter()
+            connection.execute(f"SELECT hash, metadata, fileFormat, parserVersion FROM metadata WHERE hash IN ({', '.join(['?'] * len(chunk))})", chunk).fetchall()
+            latencies.append(time.perf_counter() - startTime)
+        connection.close()
+
+    return runThreads(nbThreads, bulkLookup, chunks)
+
+
+def databaseSize(fileName):
+    """Return size of database files (database + WAL), in bytes"""
+    returned = 0
+    for suffix in ('', '-wal'):
+        if os.path.isfile(f'{fileName}{suffix}'):
+            returned += os.path.getsize(f'{fileName}{suffix}')
+    return returned
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Metadata cache database benchmark")
+    parser.add_argument('--rows', type=int, default=50000, help="number of metadata rows")
+    parser.add_argument('--threads', default='1,4,16', help="comma separated list of number of threads")
+    parser.add_argument('--pragmas', default=','.join(PRAGMAS.keys()), help=f"comma separated list of database settings ({', '.join(PRAGMAS.keys())})")
+    parser.add_argument('--output', help="write results to given JSON file")
+    parser.add_argument('--baseline', help="compare throughput with results from given JSON file")
+    args = parser.parse_args()
+
+    random.seed(0)
+    threadsList = [int(value) for value in args.threads.split(',')]
+    hashes = [hashlib.sha256(f'{index}'.encode()).hexdigest() for index in range(args.rows)]
+    rows = [syntheticRow(hash) for hash in hashes]
+    # lookups are made in random order, including 10% of hashes not in cache
+    lookupHashes = random.sample(hashes, len(hashes)) + [hashlib.sha256(f'missing{index}'.encode()).hexdigest() for index in range(args.rows // 10)]
+    random.shuffle(lookupHashes)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            for result in json.load(file)['results']:
+                baseline[(result['pragmas'], result['operation'], result['threads'])] = result
+
+    results = []
+    print(f"Rows: {args.rows}, metadata average size: {sum(len(row[1]) for row in rows) // len(rows)} bytes")
+    print(f"{'pragmas':>10} {'operation':>12} {'threads':>7} {'items/s':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'db size':>10} {'baseline':>9}")
+
+    workPath = tempfile.mkdtemp(prefix='bc-bench-')
+    try:
+        for pragmasName in args.pragmas.split(','):
+            pragmas = PRAGMAS[pragmasName]
+            for nbThreads in threadsList:
+                fileName = os.path.join(workPath, f'{pragmasName}-{nbThreads}.sqlite')
+                createDatabase(fileName, pragmas)
+
+                for operation, function, items, nbItems in (('insert', benchInsert, rows, len(rows)),
+                                                             ('lookup', benchLookup, lookupHashes, len(lookupHashes)),
+                                                             ('bulk lookup', benchBulkLookup, lookupHashes, len(lookupHashes))):
+                    duration, latencies = function(fileName, pragmas, nbThreads, items)
+                    result = {
+                            'pragmas': pragmasName,
+                            'operation': operation,
+                            'threads': nbThreads,
+                            'items': nbItems,
+                            'duration': duration,
+                            'itemsPerSecond': nbItems / duration if duration > 0 else 0,
+                            'p50': percentile(latencies, 50) * 1000,
+                            'p95': percentile(latencies, 95) * 1000,
+                            'p99': percentile(latencies, 99) * 1000,
+                            'dbSize': databaseSize(fileName)
+                        }
+                    results.append(result)
+
+                    reference = baseline.get((pragmasName, operation, nbThreads))
+                    if reference is not None and reference['itemsPerSecond'] > 0:
+                        ratio = f"{result['itemsPerSecond'] / reference['itemsPerSecond']:8.2f}x"
+                    else:
+                        ratio = f"{'-':>9}"
+                    print(f"{pragmasName:>10} {operation:>12} {nbThreads:>7} {result['itemsPerSecond']:10.0f} "
+                          f"{result['p50']:9.3f} {result['p95']:9.3f} {result['p99']:9.3f} {result['dbSize'] / 1000000:8.1f}MB {ratio}")
+    finally:
+        shutil.rmtree(workPath, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({
+                    'created': time.time(),
+                    'sqlite': sqlite3.sqlite_version,
+                    'rows': args.rows,
+                    'results': results
+                }, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -----------------------------------------------------------------------------
+# Buli Commander
+# Copyright (C) 2019-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin designed to manage documents
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# Benchmark for multi-workers metadata reading (bcfile.BCFileList)
+#
+# Synthetic image files are created, then BCFile are built with 1 to N workers
+# through plugin classes, as BCFileList does:
+# - pktk WorkerPool.mapNoNone() with BCFileList.getBcFile() callback
+# - bcfile.BCWorkerCache workers, each one with its BCFileCache connection
+#
+# For each format, metadata are read:
+# - files:      cache database is cleared before each run, metadata are read
+#               from files (png: chunks read, kra: zip archive and xml parsed)
+#               and written in cache by BCFileCacheWriter
+# - cache:      metadata are prefetched from cache with bulk queries
+#               (BCFileList.prefetchMetadata()) and BCFile are built from
+#               prefetched data
+# - process:    comparison only, not used by plugin; BCFile are built from
+#               files in a process pool, each process with its own cache
+#
+# Results are checked to be returned in the same order than given file list,
+# with the same properties than files built sequentially
+#
+# Note: files are read from system cache after the first run; to measure cold
+# reads, caches must be dropped between runs (not done by benchmark)
+#
+# Plugin modules are imported from source tree without registering extension,
+# but they need PyQt5 (with QtSql) and Krita python module; use python from
+# Krita installation, or add Krita python libraries to PYTHONPATH
+# (for example /usr/lib/krita-python-libs on Linux)
+#
+# Usage:
+#   python3 benchmarks/bench_metadataworkers.py [--files N] [--workers 1,2,4,8]
+#                                               [--formats png,kra]
+#                                               [--modes files,cache,process]
+# -----------------------------------------------------------------------------
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import types
+import zipfile
+import zlib
+
+from concurrent.futures import ProcessPoolExecutor
+
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# default number of workers for automatic mode (BCFileWalker.MAX_THREADS)
+MAX_THREADS = min(32, (os.cpu_count() or 1) + 4)
+
+PLUGIN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'bulicommander', 'bulicommander')
+
+
+def pngChunk(chunkType, data):
+    """Return a PNG chunk as bytes"""
+    return struct.pack('>I', len(data)) + chunkType + data + struct.pack('>I', zlib.crc32(chunkType + data) & 0xffffffff)
+
+
+def buildPng(fileName, index):
+    """Create a PNG file with some metadata chunks"""
+    width = 64 + index % 512
+    height = 64 + (index * 7) % 512
+    rows = b''.join(b'\x00' + bytes([(row + index) % 256]) * (width * 3) for row in range(height))
+    with open(fileName, 'wb') as file:
+        file.write(PNG_SIGNATURE)
+        file.write(pngChunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        file.write(pngChunk(b'pHYs', struct.pack('>IIB', 11811, 11811, 1)))
+        file.write(pngChunk(b'tEXt', b'Software\x00Buli Commander benchmark'))
+        file.write(pngChunk(b'IDAT', zlib.compress(rows, 1)))
+        file.write(pngChunk(b'IEND', b''))
+
+
+def buildKra(fileName, index):
+    """Create a Krita like file (zip archive) with document description"""
+    layers = ''.join(f'<layer name="Layer {layer}" nodetype="paintlayer" x="0" y="0" opacity="255" visible="1" filename="layer{layer}"/>' for layer in range(50 + index % 50))
+    mainDoc = (f'<?xml version="1.0" encoding="UTF-8"?><DOC><IMAGE width="{1000 + index}" height="{800 + index}" '
+               f'colorspacename="RGBA" x-res="300" y-res="300"><layers>{layers}</layers></IMAGE></DOC>')
+    documentInfo = (f'<?xml version="1.0" encoding="UTF-8"?><document-info><about><title>Image {index}</title>'
+                    f'<description>{"Benchmark document. " * 100}</description></about></document-info>')
+    with zipfile.ZipFile(fileName, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('mimetype', 'application/x-krita')
+        archive.writestr('maindoc.xml', mainDoc)
+        archive.writestr('documentinfo.xml', documentInfo)
+        archive.writestr('mergedimage.png', os.urandom(256 * 1024))
+
+
+BUILDERS = {
+        'png': buildPng,
+        'kra': buildKra
+    }
+
+
+def importPlugin():
+    """Make plugin package importable from source tree and return a Qt application
+
+    Package __init__ is not executed, as it registers extension in Krita
+    Plugin modules create pixmaps when they're imported: application must be
+    created before
+    """
+    if 'bulicommander' not in sys.modules:
+        package = types.ModuleType('bulicommander')
+        package.__path__ = [PLUGIN_PATH]
+        sys.modules['bulicommander'] = package
+
+    from PyQt5.QtWidgets import QApplication
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    return QApplication.instance() or QApplication([])
+
+
+def initialiseCache(cachePath):
+    """Initialise metadata cache in given directory"""
+    from bulicommander.bc.bcfile import (
+            BCFile,
+            BCFileCache,
+            BCFileThumbnailSize
+        )
+    BCFile.initialiseCache(cachePath, BCFileThumbnailSize.LARGE)
+    BCFileCache.initialise(cachePath)
+
+
+def fileProperties(file):
+    """Return properties of a BCFile, to check results"""
+    return (file.fullPathName(), file.format(), file.imageSize().width(), file.imageSize().height())
+
+
+def processInitialise(cachePath):
+    """Initialise a process of process pool, with its own cache"""
+    global application
+    application = importPlugin()
+    initialiseCache(cachePath)
+
+
+def processReadFile(fileName):
+    """Build BCFile in a process of process pool; return file properties"""
+    from bulicommander.bc.bcfile import BCFileList
+
+    file = BCFileList.getBcFile(0, fileName)
+    return None if file is None else fileProperties(file)
+
+
+def runThreads(fileNames, nbWorkers, prefetched):
+    """Build BCFile with a WorkerPool, as BCFileList does; return (duration, results)
+
+    If `prefetched` is True, metadata are prefetched from cache before files are
+    built, otherwise cache is cleared and metadata are read from files
+    """
+    from bulicommander.pktk.modules.workers import WorkerPool
+    from bulicommander.bc.bcfile import (
+            BCFileCache,
+            BCFileCachePrefetch,
+            BCFileList,
+            BCWorkerCache
+        )
+
+    if not prefetched:
+        BCFileCache.globalInstance().clearDbContent()
+
+    pool = WorkerPool(nbWorkers)
+    startTime = time.perf_counter()
+    prefetch = BCFileCachePrefetch()
+    if prefetched:
+        BCFileList.prefetchMetadata(fileNames, prefetch, pool)
+    pool.setWorkerClass(BCWorkerCache.withPrefetch(prefetch))
+    results = [fileProperties(file) for file in pool.mapNoNone(fileNames, BCFileList.getBcFile)]
+    duration = time.perf_counter() - startTime
+
+    # metadata read from files are written in cache: wait before next run
+    BCFileCache.flush()
+    return (duration, results)
+
+
+def runProcesses(fileNames, nbWorkers, cachePath):
+    """Build BCFile with a process pool; return (duration, results)"""
+    # Qt can't be used in forked processes
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=nbWorkers, mp_context=context, initializer=processInitialise, initargs=(cachePath, )) as executor:
+        # start processes before measure
+        list(executor.map(abs, range(nbWorkers)))
+
+        startTime = time.perf_counter()
+        # executor.map() returns results in given order, as WorkerPool.mapNoNone()
+        results = [result for result in executor.map(processReadFile, fileNames, chunksize=64) if result is not None]
+        duration = time.perf_counter() - startTime
+    return (duration, results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-workers metadata reading benchmark")
+    parser.add_argument('--files', type=int, default=2000, help="number of files per format")
+    parser.add_argument('--workers', default=f'1,2,4,8,{MAX_THREADS}', help="comma separated list of workers count")
+    parser.add_argument('--formats', default='png,kra', help="comma separated list of formats")
+    parser.add_argument('--modes', default='files,cache,process', help="comma separated list of modes (files, cache, process)")
+    args = parser.parse_args()
+
+    workers = sorted({int(value) for value in args.workers.split(',')})
+    formats = args.formats.split(',')
+    modes = args.modes.split(',')
+
+    application = importPlugin()
+    from bulicommander.bc.bcfile import (
+            BCFileCache,
+            BCFileList
+        )
+
+    path = tempfile.mkdtemp(prefix='bc-bench-workers-')
+    filesPath = os.path.join(path, 'files')
+    os.makedirs(filesPath)
+    initialiseCache(os.path.join(path, 'cache'))
+    returned = 0
+    try:
+        print(f"CPU: {os.cpu_count()}, files: {args.files} per format, workers: {workers}")
+        for fileFormat in formats:
+            fileNames = []
+            for index in range(args.files):
+                fileName = os.path.join(filesPath, f'image-{index:06d}.{fileFormat}')
+                BUILDERS[fileFormat](fileName, index)
+                fileNames.append(fileName)
+
+            # reference results, built sequentially (and warm system cache)
+            BCFileCache.globalInstance().clearDbContent()
+            reference = [fileProperties(BCFileList.getBcFile(0, fileName)) for fileName in fileNames]
+            BCFileCache.flush()
+
+            print()
+            print(f"{'format':<8}{'mode':<10}{'workers':>8}{'files/s':>12}{'speedup':>10}  ordered")
+            for mode in modes:
+                baseline = None
+                for nbWorkers in workers:
+                    if mode == 'process':
+                        duration, results = runProcesses(fileNames, nbWorkers, os.path.join(path, f'cache-{fileFormat}-{nbWorkers}'))
+                    else:
+                        duration, results = runThreads(fileNames, nbWorkers, mode == 'cache')
+                    ordered = (results == reference)
+                    if not ordered:
+                        returned = 1
+                    if baseline is None:
+                        baseline = duration
+                    print(f"{fileFormat:<8}{mode:<10}{nbWorkers:>8}{len(fileNames) / duration:>12.0f}{baseline / duration:>10.2f}  {'yes' if ordered else 'NO'}")
+        if 'process' in modes:
+            print()
+            print("process: comparison only, files are built by WorkerPool threads in plugin")
+    finally:
+        BCFileCache.finalize()
+        shutil.rmtree(path, ignore_errors=True)
+
+    return returned
+
+
+if __name__ == '__main__':
+    exit(main())
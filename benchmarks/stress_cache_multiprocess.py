@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -----------------------------------------------------------------------------
+# Buli Commander
+# Copyright (C) 2019-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin designed to manage documents
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# Stress test for cache shared by many processes (many Krita instances)
+#
+# Several processes use the same metadata database and thumbnail directory
+# through plugin classes, each one in a QCoreApplication:
+# - bcfile.BCFileCache global instance (schema created/checked in an immediate
+#   transaction) and its BCFileCacheWriter thread: metadata are written with
+#   setMetadata() then flush()
+# - bcfile.BCFileCache read only connection: metadata are read with bulk
+#   queries (getMetadataList())
+# - bcfile.BCFile.saveThumbnailFile(): thumbnails written in a temporary file
+#   then renamed
+#
+# All processes write and read the same small set of hashes to maximise
+# conflicts; read thumbnails are checked (PNG and JPEG end markers), and once
+# all processes are finished, every written hash must be found in database
+#
+# Plugin modules are imported from source tree without registering extension,
+# but they need PyQt5 (with QtSql) and Krita python module; use python from
+# Krita installation, or add Krita python libraries to PYTHONPATH
+# (for example /usr/lib/krita-python-libs on Linux)
+#
+# Usage:
+#   python3 benchmarks/stress_cache_multiprocess.py [--processes N] [--duration S]
+#                                                   [--hashes N] [--unsafe]
+#
+# With --unsafe, thumbnails are directly written in final file with QImage.save()
+# (previous behaviour): truncated thumbnails are then expected to be read
+# Exit code is 1 if a write has been lost, a truncated thumbnail has been read
+# or database integrity check failed
+# -----------------------------------------------------------------------------
+
+import argparse
+import hashlib
+import multiprocessing
+import os
+import queue
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import types
+
+
+BATCH_SIZE = 500        # BCFileCacheWriter.BATCH_SIZE
+BULK_SIZE = 500         # BCFileCache.__BULK_SIZE
+THUMBNAILS = 20         # number of distinct thumbnails written/read
+
+PLUGIN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'bulicommander', 'bulicommander')
+
+PNG_IEND = b'\x00\x00\x00\x00IEND\xaeB`\x82'
+JPEG_SOI = b'\xff\xd8'
+JPEG_EOI = b'\xff\xd9'
+
+
+def importPlugin():
+    """Make plugin package importable from source tree
+
+    Package __init__ is not executed, as it registers extension in Krita
+    """
+    if 'bulicommander' not in sys.modules:
+        package = types.ModuleType('bulicommander')
+        package.__path__ = [PLUGIN_PATH]
+        sys.modules['bulicommander'] = package
+
+
+def isValidThumbnail(data):
+    """Return True if `data` is a complete PNG or JPEG file"""
+    if data.startswith(b'\x89PNG'):
+        return data.endswith(PNG_IEND)
+    return data.startswith(JPEG_SOI) and data.endswith(JPEG_EOI)
+
+
+def worker(processIndex, cachePath, hashes, duration, unsafe, results):
+    """Hammer cache during `duration` seconds"""
+    importPlugin()
+
+    from PyQt5.QtCore import QCoreApplication
+    from PyQt5.QtGui import QImage
+    from bulicommander.bc.bcfile import (
+            BCFile,
+            BCFileCache,
+            BCFileThumbnailFormat,
+            BCFileThumbnailSize
+        )
+
+    random.seed(processIndex)
+    counters = {
+            'written': 0,
+            'read': 0,
+            'thumbnailsWritten': 0,
+            'thumbnailsFailed': 0,
+            'thumbnailsRead': 0,
+            'thumbnailsTruncated': 0
+        }
+    written = set()
+
+    app = QCoreApplication([])
+
+    thumbnailSize = BCFileThumbnailSize.LARGE
+    BCFile.initialiseCache(cachePath, thumbnailSize)
+    BCFileCache.initialise(cachePath)
+    cache = BCFileCache.globalInstance()
+    reader = BCFileCache(f'StressReader{processIndex}')
+    thumbnailPath = BCFile.thumbnailCacheDirectory(thumbnailSize)
+
+    # noise images (not compressible): with alpha channel saved as PNG, otherwise as JPEG
+    images = []
+    for imageFormat in (QImage.Format_ARGB32, QImage.Format_RGB32):
+        for size in (64, 128, 256):
+            images.append(QImage(os.urandom(size * size * 4), size, size, imageFormat).copy())
+
+    timeLimit = time.monotonic() + duration
+    while time.monotonic() < timeLimit:
+        action = random.random()
+        if action < 0.3:
+            for hash in random.sample(hashes, min(BATCH_SIZE, len(hashes))):
+                width = random.randint(1, 8000)
+                height = random.randint(1, 8000)
+                if cache.setMetadata(hash, {'format': 'png', 'width': width, 'height': height, 'bitDepth': 8, 'writtenBy': processIndex}):
+                    written.add(hash)
+                    counters['written'] += 1
+            # wait until batch is committed, to write under contention
+            BCFileCache.flush()
+        elif action < 0.6:
+            counters['read'] += len(reader.getMetadataList(random.sample(hashes, min(BULK_SIZE * 2, len(hashes)))))
+        elif action < 0.8:
+            for hash in random.sample(hashes[:THUMBNAILS], THUMBNAILS // 2):
+                image = random.choice(images)
+                thumbnailFile = os.path.join(thumbnailPath, hash)
+                if unsafe:
+                    thumbnailFormat = BCFileThumbnailFormat.PNG if image.hasAlphaChannel() else BCFileThumbnailFormat.JPEG
+                    saved = image.save(thumbnailFile, thumbnailFormat.value, BCFile.thumbnailCacheCompression(thumbnailFormat, thumbnailSize))
+                else:
+                    saved = BCFile.saveThumbnailFile(image, thumbnailFile, thumbnailSize)
+
+                if saved:
+                    counters['thumbnailsWritten'] += 1
+                else:
+                    counters['thumbnailsFailed'] += 1
+        else:
+            for hash in random.sample(hashes[:THUMBNAILS], THUMBNAILS // 2):
+                try:
+                    with open(os.path.join(thumbnailPath, hash), 'rb') as file:
+                        data = file.read()
+                except FileNotFoundError:
+                    continue
+                counters['thumbnailsRead'] += 1
+                if not isValidThumbnail(data):
+                    counters['thumbnailsTruncated'] += 1
+
+    reader.close()
+    BCFileCache.finalize()
+    app.quit()
+
+    results.put((counters, written, thumbnailPath))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-process cache stress test")
+    parser.add_argument('--processes', type=int, default=8, help="number of processes")
+    parser.add_argument('--duration', type=float, default=10, help="duration, in seconds")
+    parser.add_argument('--hashes', type=int, default=2000, help="number of distinct hashes")
+    parser.add_argument('--unsafe', action='store_true', help="write thumbnails without temporary file")
+    parser.add_argument('--keep', action='store_true', help="don't remove cache directory")
+    args = parser.parse_args()
+
+    cachePath = tempfile.mkdtemp(prefix='bc-stress-')
+    hashes = [hashlib.sha256(f'{index}'.encode()).hexdigest() for index in range(args.hashes)]
+
+    print(f"Cache: {cachePath}")
+    print(f"Processes: {args.processes}, duration: {args.duration}s, hashes: {args.hashes}, thumbnails: {'unsafe' if args.unsafe else 'atomic'}")
+
+    # Qt can't be used in forked processes
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    processes = [context.Process(target=worker, args=(index, cachePath, hashes, args.duration, args.unsafe, results)) for index in range(args.processes)]
+    startTime = time.perf_counter()
+    for process in processes:
+        process.start()
+    processResults = []
+    while len(processResults) < len(processes):
+        try:
+            processResults.append(results.get(timeout=1))
+        except queue.Empty:
+            if any(process.exitcode not in (None, 0) for process in processes):
+                # a worker failed (plugin modules can't be imported?)
+                print("A process has failed, stress test aborted")
+                for process in processes:
+                    process.terminate()
+                shutil.rmtree(cachePath, ignore_errors=True)
+                return 1
+    for process in processes:
+        process.join()
+    duration = time.perf_counter() - startTime
+
+    counters = [processResult[0] for processResult in processResults]
+    written = set().union(*[processResult[1] for processResult in processResults])
+    thumbnailPath = processResults[0][2]
+
+    total = {key: sum(counter[key] for counter in counters) for key in counters[0]}
+    for key, value in total.items():
+        print(f"{key:>20}: {value}")
+    print(f"{'metadata writes/s':>20}: {total['written'] / duration:.0f}")
+    print(f"{'metadata reads/s':>20}: {total['read'] / duration:.0f}")
+
+    connection = sqlite3.connect(os.path.join(cachePath, 'metaDataCache.sqlite'))
+    integrity = connection.execute("PRAGMA integrity_check").fetchone()[0]
+    stored = {row[0] for row in connection.execute("SELECT hash FROM metadata")}
+    connection.close()
+    lost = written - stored
+    print(f"{'integrity check':>20}: {integrity}")
+    print(f"{'metadata rows':>20}: {len(stored)}")
+    print(f"{'lost writes':>20}: {len(lost)}")
+
+    truncated = 0
+    for fileName in os.listdir(thumbnailPath):
+        with open(os.path.join(thumbnailPath, fileName), 'rb') as file:
+            if fileName.endswith('.tmp') or not isValidThumbnail(file.read()):
+                truncated += 1
+    print(f"{'invalid thumbnails':>20}: {truncated}")
+
+    if not args.keep:
+        shutil.rmtree(cachePath, ignore_errors=True)
+
+    if len(lost) > 0 or total['thumbnailsTruncated'] > 0 or truncated > 0 or integrity != 'ok':
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -47,6 +47,7 @@ from PyQt5.QtCore import (
 
 from .bcfile import (
         BCBaseFile,
+        BCCacheStats,
         BCFile,
         BCFileThumbnailSize
     )
@@ -1324,6 +1325,14 @@ class BCClipboard(QObject):
         self.__stats['persistent'] = self.__totalCacheItemP
         self.__stats['session'] = self.__totalCacheItemS
 
+    def __recordStats(self, item, hit, startTime):
+        """Record cache statistics for given clipboard `item`
+
+        A hit is a content already in pool; otherwise item content has been saved
+        in cache (size in cache is recorded)
+        """
+        BCCacheStats.record(BCCacheStats.LAYER_CLIPBOARD, item.type(), hit, time.perf_counter() - startTime, 0 if hit else item.cacheSize())
+
     def __addPool(self, item):
         """Add BCClipboardItem to pool"""
         if isinstance(item, BCClipboardItem):
@@ -1347,10 +1356,14 @@ class BCClipboard(QObject):
         returned = False
         if isinstance(urls, list):
             for url in urls:
+                startTime = time.perf_counter()
                 hashValue = self.__getHash(url.url().encode())
                 if self.__inPool(hashValue):
+                    self.__recordStats(self.__pool[hashValue], True, startTime)
                     returned |= self.__updateTimeStamp(hashValue, origin)
-                elif url.scheme() == 'file':
+                    continue
+
+                if url.scheme() == 'file':
                     if sys.platform == 'win32':
                         # in windows, QUrl() likes "file:///C:/Temp/filetest/20190728_200521-01.jpeg"
                         # and returned .path() likes "/C:/Temp/filetest/20190728_200521-01.jpeg"
@@ -1358,8 +1371,6 @@ class BCClipboard(QObject):
                         clipboardItem = BCClipboardItemFile(hashValue, re.sub(r"^/([A-Z]):", r"\1:", url.path()), origin)
                     else:
                         clipboardItem = BCClipboardItemFile(hashValue, url.path(), origin)
-
-                    returned |= self.__addPool(clipboardItem)
                 else:
                     clipboardItem = BCClipboardItemUrl(hashValue, url, origin)
 
@@ -1369,7 +1380,8 @@ class BCClipboard(QObject):
                     if BCClipboard.optionUrlAutoload() and not clipboardItem.urlIsLoaded():
                         clipboardItem.download()
 
-                    returned |= self.__addPool(clipboardItem)
+                returned |= self.__addPool(clipboardItem)
+                self.__recordStats(clipboardItem, False, startTime)
         return returned
 
     def __addPoolSvg(self, svgData, image=None, origin=None):
@@ -1377,13 +1389,18 @@ class BCClipboard(QObject):
 
         Given image is a svg
         """
+        startTime = time.perf_counter()
         hashValue = self.__getHash(svgData)
 
         if self.__inPool(hashValue):
+            self.__recordStats(self.__pool[hashValue], True, startTime)
             return self.__updateTimeStamp(hashValue, origin)
 
         if svgData is not None:
-            return self.__addPool(BCClipboardItemSvg(hashValue, svgData, image, origin))
+            item = BCClipboardItemSvg(hashValue, svgData, image, origin)
+            returned = self.__addPool(item)
+            self.__recordStats(item, False, startTime)
+            return returned
         return False
 
     def __addPoolKraImage(self, rawData, image=None, origin=None):
@@ -1391,13 +1408,18 @@ class BCClipboard(QObject):
 
         Given image is a QImage
         """
+        startTime = time.perf_counter()
         hashValue = self.__getHash(rawData)
 
         if self.__inPool(hashValue):
+            self.__recordStats(self.__pool[hashValue], True, startTime)
             return self.__updateTimeStamp(hashValue, origin)
 
         if image is not None:
-            return self.__addPool(BCClipboardItemKra(hashValue, rawData, image, origin))
+            item = BCClipboardItemKra(hashValue, rawData, image, origin)
+            returned = self.__addPool(item)
+            self.__recordStats(item, False, startTime)
+            return returned
         return False
 
     def __addPoolImage(self, hashValue, image, urlOrigin=None, origin=None):
@@ -1405,12 +1427,16 @@ class BCClipboard(QObject):
 
         Given image is a QImage
         """
+        startTime = time.perf_counter()
         if self.__inPool(hashValue):
+            self.__recordStats(self.__pool[hashValue], True, startTime)
             return self.__updateTimeStamp(hashValue, origin, urlOrigin)
 
         if image is not None:
             item = BCClipboardItemImg(hashValue, image, urlOrigin, origin)
-            return self.__addPool(item)
+            returned = self.__addPool(item)
+            self.__recordStats(item, False, startTime)
+            return returned
         return False
 
     def __parseHtmlForUrl(self, htmlContent):
@@ -29,16 +29,22 @@
 # -----------------------------------------------------------------------------
 
 from enum import Enum
-from functools import cmp_to_key
+from concurrent.futures import ThreadPoolExecutor
 from multiprocessing import Pool
 
+import bisect
+import functools
 import gzip
 import hashlib
+import heapq
 import io
 import json
 import os
+import queue
+import random
 import re
 import struct
+import stat
 import sys
 import textwrap
 import time
@@ -79,6 +85,10 @@ from bulicommander.pktk.modules.workers import (
     )
 from bulicommander.pktk.modules.uitheme import UITheme
 from bulicommander.pktk.modules.imgutils import (buildIcon, convertSize)
+from bulicommander.pktk.modules.imgdecoders import (
+        PsdDecoder,
+        XcfDecoder
+    )
 from bulicommander.pktk.modules.utils import (
         Debug,
         JsonQObjectEncoder,
@@ -439,8 +449,12 @@ class BCBaseFile(object):
     THUMBTYPE_IMAGE = 'qimage'
     THUMBTYPE_FILENAME = 'filename'     # in this case, return thumbnail file name instead of icon/image
 
-    def __init__(self, fileName):
-        """Initialise BCFile"""
+    def __init__(self, fileName, mdatetime=None):
+        """Initialise BCFile
+
+        If `mdatetime` is provided, file last modification time is not read
+        from file system
+        """
         self._fullPathName = os.path.expanduser(fileName)
         self._name = os.path.basename(self._fullPathName)
 
@@ -449,7 +463,9 @@ class BCBaseFile(object):
             self._fullPathName = os.path.normpath(self._fullPathName)
 
         self._path = os.path.dirname(self._fullPathName)
-        if os.path.isdir(self._fullPathName) or os.path.isfile(self._fullPathName):
+        if mdatetime is not None:
+            self._mdatetime = mdatetime
+        elif os.path.isdir(self._fullPathName) or os.path.isfile(self._fullPathName):
             self._mdatetime = os.path.getmtime(self._fullPathName)
         else:
             self._mdatetime = None
@@ -567,10 +583,7 @@ class BCBaseFile(object):
 
             if not os.path.isfile(thumbnailFile):
                 # generate thumbnail file
-                try:
-                    thumbnailImg.save(thumbnailFile, quality=BCFile.thumbnailCacheCompression())
-                except Exception as e:
-                    Debug.print('[BCBaseFile.thumbnail] Unable to save thumbnail in cache {0}: {1}', thumbnailFile, f"{e}")
+                BCFile.saveThumbnailFile(thumbnailImg, thumbnailFile, size)
 
             return thumbnailFile
 
@@ -634,8 +647,8 @@ class BCDirectory(BCBaseFile):
           consider that this kind of controls must be made before
     """
 
-    def __init__(self, fileName):
-        super(BCDirectory, self).__init__(fileName)
+    def __init__(self, fileName, mdatetime=None):
+        super(BCDirectory, self).__init__(fileName, mdatetime)
         self._format = BCFileManagedFormat.DIRECTORY
 
     def __repr__(self):
@@ -733,6 +746,36 @@ class BCFile(BCBaseFile):
 
     __INITIALISED = False
 
+    # metadata parser version, by file format
+    # when a parser is improved, version for file format must be increased:
+    # version is stored with metadata in cache, metadata read with another
+    # version of parser are ignored (read again from file), not exported in a
+    # cache bundle and not imported from a cache bundle (see BCCacheBundle)
+    __METADATA_PARSER_VERSION = {
+            BCFileManagedFormat.KRA: 1,
+            BCFileManagedFormat.KRZ: 1,
+            BCFileManagedFormat.PNG: 1,
+            BCFileManagedFormat.JPEG: 1,
+            BCFileManagedFormat.ORA: 1,
+            BCFileManagedFormat.SVG: 1,
+            BCFileManagedFormat.GIF: 1,
+            BCFileManagedFormat.PSD: 2,
+            BCFileManagedFormat.XCF: 2,
+            BCFileManagedFormat.BMP: 1,
+            BCFileManagedFormat.WEBP: 1,
+            BCFileManagedFormat.CBZ: 1,
+            BCFileManagedFormat.CBT: 1,
+            BCFileManagedFormat.CBR: 1,
+            BCFileManagedFormat.CB7: 1,
+            BCFileManagedFormat.TIFF: 1,
+            BCFileManagedFormat.TGA: 1
+        }
+
+    @staticmethod
+    def metadataParserVersion(fileFormat):
+        """Return version of metadata parser for given `fileFormat`"""
+        return BCFile.__METADATA_PARSER_VERSION.get(fileFormat, 1)
+
     @staticmethod
     def initialiseCache(bcCachePath=None, thumbnailCacheDefaultSize=None):
         """Initialise thumbnails cache properties
@@ -749,13 +792,17 @@ class BCFile(BCBaseFile):
 
         BCFile.__INITIALISED = True
 
-    def __init__(self, fileName, strict=False, bcFileCache=None):
+    def __init__(self, fileName, strict=False, bcFileCache=None, snapshot=None):
         """Initialise BCFile
 
         If strict is True, check only files for which extension is known
         If strict is False, try to determinate file format even if there's no extension
+
+        If `snapshot` is provided, it's a tuple (file size, modification time, qHash, metadata)
+        read from a directory snapshot; file is initialised from given values without
+        any access to file system
         """
-        super(BCFile, self).__init__(fileName)
+        super(BCFile, self).__init__(fileName, None if snapshot is None else snapshot[1])
         self._format = BCFileManagedFormat.UNKNOWN
         self.__size = 0
         self.__imgSize = QSize(-1, -1)
@@ -781,7 +828,10 @@ class BCFile(BCBaseFile):
         if not BCFile.__INITIALISED:
             raise EInvalidStatus('BCFile class is not initialised')
 
-        self.__initFromFileName(fileName, strict)
+        if snapshot is None:
+            self.__initFromFileName(fileName, strict)
+        else:
+            self.__initFromSnapshot(fileName, snapshot[0], snapshot[2], snapshot[3])
 
     # region: miscellaneous ----------------------------------------------------
 
@@ -806,15 +856,7 @@ class BCFile(BCBaseFile):
         # if os.path.isfile(fileName):
         self.__readable = os.access(fileName, os.R_OK)
 
-        self.__baseName, self.__extension = os.path.splitext(fileName)
-
-        if reResult := re.match(r'^\.\d+'+Krita.instance().readSetting('', 'backupfilesuffix', '~').replace('.', r'\.'), self.__extension):
-            # seems to be an extension for a backup file with number
-            baseName, originalExtension = os.path.splitext(self.__baseName)
-            self.__extension = f'{originalExtension}{self.__extension}'
-
-        self.__baseName = os.path.basename(self.__baseName)
-        self.__extension = self.__extension.lower()
+        self.__initNames(fileName)
         self.__size = os.path.getsize(self._fullPathName)
 
         if not self.__readable:
@@ -828,8 +870,10 @@ class BCFile(BCBaseFile):
             # update qHash for file
             self.__calculateQuickHash()
 
+            startTime = time.perf_counter()
             if self.__readMetaCacheFile():
                 # data has been read from cache file; exit
+                BCCacheStats.record(BCCacheStats.LAYER_METADATA, self._format, True, time.perf_counter() - startTime)
                 return
 
             if self.__extension in ('.cbz', '.cbt', '.cbr', '.cb7'):
@@ -995,13 +1039,63 @@ class BCFile(BCBaseFile):
             else:
                 cacheData[BCFileProperty.IMAGE_RATIO.value] = 0
             self.__writeMetaCacheFile(cacheData)
+            BCCacheStats.record(BCCacheStats.LAYER_METADATA, self._format, False, time.perf_counter() - startTime, self.__size)
         else:
             self.__readable = False
 
+    def __initNames(self, fileName):
+        """Initialise base name and extension from given full file name"""
+        self.__baseName, self.__extension = os.path.splitext(fileName)
+
+        if reResult := re.match(r'^\.\d+'+Krita.instance().readSetting('', 'backupfilesuffix', '~').replace('.', r'\.'), self.__extension):
+            # seems to be an extension for a backup file with number
+            baseName, originalExtension = os.path.splitext(self.__baseName)
+            self.__extension = f'{originalExtension}{self.__extension}'
+
+        self.__baseName = os.path.basename(self.__baseName)
+        self.__extension = self.__extension.lower()
+
+    def __initFromSnapshot(self, fileName, size, qHash, metadata):
+        """Initialize file information from directory snapshot values
+
+        Given `metadata` are those stored in cache for `qHash`
+        If metadata are not valid, file is initialised from file name
+        """
+        self.__initNames(fileName)
+        self.__size = size
+        self.__qHash = qHash
+        self.__readable = True
+
+        if not self.__applyMetadata(metadata):
+            self.__initFromFileName(fileName, False)
+
     # endregion: initialisation ------------------------------------------------
 
     # region: utils ------------------------------------------------------------
 
+    def __applyMetadata(self, contentAsDict):
+        """Initialise image size, format and metadata from given metadata dictionary
+
+        Return True if metadata are valid, otherwise False
+        """
+        if not contentAsDict:
+            return False
+
+        if not ('format' in contentAsDict and
+                'width' in contentAsDict and
+                'height' in contentAsDict):
+            # invalid content?
+            return False
+
+        if isinstance(contentAsDict['width'], float) or isinstance(contentAsDict['height'], float):
+            self.__imgSize = QSizeF(contentAsDict['width'], contentAsDict['height'])
+        else:
+            self.__imgSize = QSize(contentAsDict['width'], contentAsDict['height'])
+        self._format = contentAsDict["format"]
+        self.__metadata = contentAsDict
+
+        return True
+
     def __readMetaCacheFile(self):
         """Calculate meta cache file name
 
@@ -1009,24 +1103,8 @@ class BCFile(BCBaseFile):
         Otherwise return False
         """
         if self.__bcFileCache and self.__qHash != '':
-            contentAsDict = self.__bcFileCache.getMetadata(self.__qHash)
-            if contentAsDict:
-                # meta cache file loaded
-                # get values
-                if not ('format' in contentAsDict and
-                        'width' in contentAsDict and
-                        'height' in contentAsDict):
-                    # invalid content?
-                    return False
-
-                if isinstance(contentAsDict['width'], float) or isinstance(contentAsDict['height'], float):
-                    self.__imgSize = QSizeF(contentAsDict['width'], contentAsDict['height'])
-                else:
-                    self.__imgSize = QSize(contentAsDict['width'], contentAsDict['height'])
-                self._format = contentAsDict["format"]
-                self.__metadata = contentAsDict
-
-                return True
+            # meta cache file loaded
+            return self.__applyMetadata(self.__bcFileCache.getMetadata(self.__qHash))
 
         return False
 
@@ -1265,30 +1343,52 @@ class BCFile(BCBaseFile):
           Risk for collision is not null, but tested on ~12000 different images from 16KB to 160MB, nothing bad happened
           Hash calculation for 12000 files (~114.00GB) take ~2.70s, that's seems good enough (hope nobody have so much image
           files in the same directory ^_^')
+
+        If qHash has been prefetched by BCFileCache, use it
         """
         if self.__readable:
-            try:
-                with open(self._fullPathName, "rb") as fileHandle:
-                    # digest = 256bits (32Bytes)
-                    fileHash = hashlib.sha256()
+            self.__qHash = None
+            if self.__bcFileCache:
+                self.__qHash = self.__bcFileCache.prefetchedQuickHash(self._fullPathName, self.__size)
+            if self.__qHash is None:
+                startTime = time.perf_counter()
+                try:
+                    self.__qHash = BCFile.quickHash(self._fullPathName, self.__size)
+                except Exception as e:
+                    Debug.print('[BCFile.__calculateQuickHash] Unable to calculate hash file {0}: {1}', self._fullPathName, f"{e}")
+                    self.__qHash = ''
+                BCCacheStats.record(BCCacheStats.LAYER_QHASH, self.__extension[1:], False, time.perf_counter() - startTime, min(self.__size, 2 * BCFile.__CHUNK_SIZE))
+            else:
+                BCCacheStats.record(BCCacheStats.LAYER_QHASH, self.__extension[1:], True)
+        else:
+            self.__qHash = ''
 
-                    # file size is the first part of hash (ie: file size changed then ensure that hash is not the same event if 1st/last 8KB of file are the same)
-                    fileHash.update(f"{self.__size}".encode())
+    @staticmethod
+    def quickHash(fileName, fileSize=None):
+        """Return 'quick' hash for given `fileName`
 
-                    # read 1st 8.00KB and update hash
-                    fileHash.update(fileHandle.read(BCFile.__CHUNK_SIZE))
+        If `fileSize` is not provided, it's read from file system
+        See BCFile.__calculateQuickHash() for details about 'quick' hash
+        """
+        if fileSize is None:
+            fileSize = os.path.getsize(fileName)
 
-                    if self.__size > BCFile.__CHUNK_SIZE:
-                        # file size is greater than 8.00KB, read last 8.00KB and update hash
-                        fileHandle.seek(self.__size - BCFile.__CHUNK_SIZE)
-                        fileHash.update(fileHandle.read(BCFile.__CHUNK_SIZE))
+        with open(fileName, "rb") as fileHandle:
+            # digest = 256bits (32Bytes)
+            fileHash = hashlib.sha256()
 
-                    self.__qHash = fileHash.hexdigest()
-            except Exception as e:
-                Debug.print('[BCFile.__calculateQuickHash] Unable to calculate hash file {0}: {1}', self._fullPathName, f"{e}")
-                self.__qHash = ''
-        else:
-            self.__qHash = ''
+            # file size is the first part of hash (ie: file size changed then ensure that hash is not the same event if 1st/last 8KB of file are the same)
+            fileHash.update(f"{fileSize}".encode())
+
+            # read 1st 8.00KB and update hash
+            fileHash.update(fileHandle.read(BCFile.__CHUNK_SIZE))
+
+            if fileSize > BCFile.__CHUNK_SIZE:
+                # file size is greater than 8.00KB, read last 8.00KB and update hash
+                fileHandle.seek(fileSize - BCFile.__CHUNK_SIZE)
+                fileHash.update(fileHandle.read(BCFile.__CHUNK_SIZE))
+
+            return fileHash.hexdigest()
 
     def __readKraImage(self):
         """Return Krita file image
@@ -1496,6 +1596,51 @@ class BCFile(BCBaseFile):
 
         return None
 
+    def __readPsdImage(self, minSize=None):
+        """Return PSD file merged image
+
+        Qt doesn't provide a PSD image plugin by default; when available, it's used
+        to read full image, otherwise merged image is decoded natively
+
+        If `minSize` is provided (<int>), merged image is natively decoded to a
+        reduced size (biggest dimension greater or equal to `minSize`), reading only
+        needed rows from file
+
+        return None if not able to read PSD file
+        return a QImage() otherwise
+        """
+        if not self.__readable:
+            # file must exist
+            return None
+
+        decoder = PsdDecoder(self._fullPathName)
+
+        if minSize is None or not decoder.isValid():
+            imageReader = QImageReader(self._fullPathName)
+            if imageReader.canRead():
+                returned = imageReader.read()
+                if not returned.isNull():
+                    return returned
+
+        return decoder.image(minSize)
+
+    def __readXcfImage(self, minSize=None):
+        """Return GIMP file flattened image
+
+        Qt can't read XCF files; visible layers are natively decoded and composited
+
+        If `minSize` is provided (<int>), layers are decoded to a reduced size (biggest
+        dimension greater or equal to `minSize`)
+
+        return None if not able to read XCF file
+        return a QImage() otherwise
+        """
+        if not self.__readable:
+            # file must exist
+            return None
+
+        return XcfDecoder(self._fullPathName).image(minSize)
+
     def __readMetaDataJpeg(self, fromCache=True, getExtraData=False):
         """
         Read metadata from JPEG file
@@ -3114,7 +3259,15 @@ class BCFile(BCBaseFile):
 
         returned['document.usedFonts'].sort()
 
-        for filename in getPaletteList():
+        if fromCache and isinstance(self.__metadata.get('document.embeddedPalettes'), dict):
+            # palettes properties are already known from metadata cache, no need to
+            # decompress palettes again
+            paletteList = []
+            returned['document.embeddedPalettes'] = self.__metadata['document.embeddedPalettes']
+        else:
+            paletteList = getPaletteList()
+
+        for filename in paletteList:
             kplFile = self.__readArchiveDataFile(filename)
 
             if kplFile is not None:
@@ -3143,18 +3296,16 @@ class BCFile(BCBaseFile):
         # load reference image details
         returned['document.referenceImages.count'] = len(tmpRefImgList)
         if getExtraData:
+            # do not decompress reference images here, just provide handles on them
+            # images will be read on demand
             for refImg in tmpRefImgList:
                 if not re.match(r'file://', refImg):
                     # embedded file
-                    imageData = self.__readArchiveDataFile(refImg)
-                    if imageData:
-                        image = QImage()
-                        if image.loadFromData(imageData):
-                            returned['document.referenceImages.data'].append(image)
+                    returned['document.referenceImages.data'].append(BCFileEmbeddedImage(self._fullPathName, refImg, self.__qHash))
                 else:
-                    image = QImage()
-                    if image.load(refImg.replace('file://', '')):
-                        returned['document.referenceImages.data'].append(image)
+                    fileName = refImg.replace('file://', '')
+                    if os.path.isfile(fileName):
+                        returned['document.referenceImages.data'].append(BCFileEmbeddedImage(fileName))
 
         # References images are stored in a layer
         # Do not consider it as a layer because reference image layer is not visible in layer tree
@@ -4154,6 +4305,42 @@ class BCFile(BCBaseFile):
             # PNG compression
             return 80
 
+    @staticmethod
+    def saveThumbnailFile(thumbnailImg, thumbnailFile, size):
+        """Save `thumbnailImg` (QImage) in cache as `thumbnailFile`, for given
+        thumbnail `size`
+
+        Thumbnail is saved as PNG if image has an alpha channel, otherwise as JPEG
+
+        Thumbnail cache can be shared by many processes (Krita instances): image
+        is written in a temporary file then renamed, so a thumbnail file is never
+        read while being written, and concurrent writes of the same thumbnail
+        can't produce a truncated file
+
+        Return True if thumbnail has been saved
+        """
+        if thumbnailImg.hasAlphaChannel():
+            thumbnailFormat = BCFileThumbnailFormat.PNG
+        else:
+            thumbnailFormat = BCFileThumbnailFormat.JPEG
+
+        tmpFileName = None
+        try:
+            fileHandle, tmpFileName = tempfile.mkstemp(prefix=f'.{os.path.basename(thumbnailFile)}.', suffix='.tmp', dir=os.path.dirname(thumbnailFile))
+            os.close(fileHandle)
+            if thumbnailImg.save(tmpFileName, thumbnailFormat.value, BCFile.thumbnailCacheCompression(thumbnailFormat, size)):
+                os.replace(tmpFileName, thumbnailFile)
+                return True
+        except Exception as e:
+            Debug.print('[BCFile.saveThumbnailFile] Unable to save thumbnail in cache {0}: {1}', thumbnailFile, f"{e}")
+
+        if tmpFileName is not None and os.path.isfile(tmpFileName):
+            try:
+                os.remove(tmpFileName)
+            except Exception:
+                pass
+        return False
+
     @staticmethod
     def thumbnailCacheDefaultSize():
         """Return current thumbnail cdefault cache size"""
@@ -4202,6 +4389,7 @@ class BCFile(BCBaseFile):
         Note:
         - for OpenRaster, return thumbnail
         - for Krita, return merged preview
+        - for GIMP, return flattened visible layers
 
         If not possible to return image, return None
         Otherwise, return a QImage
@@ -4215,12 +4403,85 @@ class BCFile(BCBaseFile):
             return self.__readOraImage()
         elif self._format in (BCFileManagedFormat.CBZ, BCFileManagedFormat.CBT, BCFileManagedFormat.CBR, BCFileManagedFormat.CB7):
             return self.__readCbxImage()
+        elif self._format == BCFileManagedFormat.PSD:
+            return self.__readPsdImage()
+        elif self._format == BCFileManagedFormat.XCF:
+            return self.__readXcfImage()
         else:
             try:
                 return QImage(self._fullPathName)
             except Exception:
                 return None
 
+    def previewImage(self, size):
+        """Return file image to display in a preview area of given `size` (<QSize>)
+
+        Full resolution image is decoded only if there's no faster way:
+        - for Krita, OpenRaster and comic books, return image() (merged preview)
+        - for PSD and GIMP, decode image natively to reduced size
+        - for multi-resolution TIFF (pyramid), use the smallest page bigger than `size`
+        - for other formats, let Qt decode to scaled size (JPEG decoder apply
+          scaling during decoding)
+
+        Returned image can be smaller than file image size; use image() to get
+        full resolution image
+
+        If not possible to return image, return None
+        Otherwise, return a QImage
+        """
+        if not isinstance(size, QSize):
+            raise EInvalidType("Given `size` must be a <QSize>")
+
+        if not self.__readable:
+            return None
+
+        if self._format in (BCFileManagedFormat.KRA,
+                            BCFileManagedFormat.KRZ,
+                            BCFileManagedFormat.ORA,
+                            BCFileManagedFormat.CBZ,
+                            BCFileManagedFormat.CBT,
+                            BCFileManagedFormat.CBR,
+                            BCFileManagedFormat.CB7):
+            return self.image()
+        elif self._format == BCFileManagedFormat.PSD:
+            return self.__readPsdImage(max(size.width(), size.height()))
+        elif self._format == BCFileManagedFormat.XCF:
+            return self.__readXcfImage(max(size.width(), size.height()))
+
+        try:
+            imageReader = QImageReader(self._fullPathName)
+            imageSize = imageReader.size()
+
+            if self._format in (BCFileManagedFormat.TIF, BCFileManagedFormat.TIFF) and imageReader.imageCount() > 1 and imageSize.isValid():
+                # pages with the same ratio than first page and smaller size are
+                # considered as reduced resolution of first page
+                ratio = imageSize.width()/imageSize.height()
+                pageNumber = 0
+                for index in range(1, imageReader.imageCount()):
+                    if not imageReader.jumpToImage(index):
+                        break
+                    pageSize = imageReader.size()
+                    if (pageSize.isValid() and
+                       pageSize.width() < imageSize.width() and
+                       (pageSize.width() >= size.width() or pageSize.height() >= size.height()) and
+                       abs(pageSize.width()/pageSize.height() - ratio) < 0.01):
+                        pageNumber = index
+                        imageSize = pageSize
+
+                imageReader = QImageReader(self._fullPathName)
+                imageReader.jumpToImage(pageNumber)
+
+            if imageSize.isValid() and (imageSize.width() > size.width() or imageSize.height() > size.height()):
+                imageReader.setScaledSize(imageSize.scaled(size, Qt.KeepAspectRatio))
+
+            returned = imageReader.read()
+            if returned.isNull():
+                return None
+            return returned
+        except Exception as e:
+            Debug.print('[BCFile.previewImage] Unable to read file {0}: {1}', self._fullPathName, f"{e}")
+            return None
+
     def thumbnail(self, size=None, thumbType=BCBaseFile.THUMBTYPE_IMAGE, cache=True):
         """Return file thumbnail according to current BCFile default cache size
 
@@ -4248,6 +4509,7 @@ class BCFile(BCBaseFile):
         if size is None or not isinstance(size, BCFileThumbnailSize):
             size = BCFile.__THUMBNAIL_CACHE_DEFAULTSIZE
 
+        startTime = time.perf_counter()
         if cache:
             # check if thumbnail is cached
             sourceSize = size
@@ -4258,6 +4520,9 @@ class BCFile(BCBaseFile):
                 if os.path.isfile(thumbnailFile):
                     # thumbnail found!
                     imageSrc = QImage(thumbnailFile)
+                    if BCCacheStats.enabled():
+                        # a larger thumbnail is also a hit: image file doesn't need to be read
+                        BCCacheStats.record(BCCacheStats.LAYER_THUMBNAIL, self._format, True, time.perf_counter() - startTime, os.path.getsize(thumbnailFile))
 
                     if sourceSize == size:
                         # the found thumbnail is already to expected size, return it
@@ -4277,7 +4542,13 @@ class BCFile(BCBaseFile):
         if not cache or imageSrc is None:
             # no image cache found
             # load full image size from file
-            imageSrc = self.image()
+            if self._format == BCFileManagedFormat.PSD and self.__readable:
+                # no need to decode full image, only what is needed for biggest thumbnail
+                imageSrc = self.__readPsdImage(BCFileThumbnailSize.HUGE.value if cache else size.value)
+            elif self._format == BCFileManagedFormat.XCF and self.__readable:
+                imageSrc = self.__readXcfImage(BCFileThumbnailSize.HUGE.value if cache else size.value)
+            else:
+                imageSrc = self.image()
             if imageSrc is None or imageSrc.isNull():
                 return None
 
@@ -4293,20 +4564,15 @@ class BCFile(BCBaseFile):
                     else:
                         imageSrc = QImage(imageSrc.scaled(QSize(buildSize.value, buildSize.value), Qt.KeepAspectRatio, Qt.SmoothTransformation))
 
-                    thumbnailFile = os.path.join(BCFile.thumbnailCacheDirectory(buildSize), f'{self.__qHash}')
-                    try:
-                        if imageSrc.hasAlphaChannel():
-                            imageSrc.save(thumbnailFile, BCFileThumbnailFormat.PNG.value, BCFile.thumbnailCacheCompression(BCFileThumbnailFormat.PNG, buildSize))
-                        else:
-                            imageSrc.save(thumbnailFile, BCFileThumbnailFormat.JPEG.value, BCFile.thumbnailCacheCompression(BCFileThumbnailFormat.JPEG, buildSize))
-                    except Exception as e:
-                        Debug.print('[BCFile.thumbnail] Unable to save thumbnail in cache {0}: {1}', thumbnailFile, f"{e}")
+                    BCFile.saveThumbnailFile(imageSrc, os.path.join(BCFile.thumbnailCacheDirectory(buildSize), f'{self.__qHash}'), buildSize)
 
                     if size == buildSize:
                         thumbnailImg = QImage(imageSrc)
 
                     buildSize = buildSize.prev()
 
+                BCCacheStats.record(BCCacheStats.LAYER_THUMBNAIL, self._format, False, time.perf_counter() - startTime, self.__size)
+
                 if thumbnailImg is not None:
                     if thumbType == BCBaseFile.THUMBTYPE_IMAGE:
                         return thumbnailImg
@@ -4335,13 +4601,7 @@ class BCFile(BCBaseFile):
                 return None
 
         thumbnailFile = os.path.join(BCFile.thumbnailCacheDirectory(size), f'{self.__qHash}')
-        try:
-            if thumbnailImg.hasAlphaChannel():
-                thumbnailImg.save(thumbnailFile, BCFileThumbnailFormat.PNG.value, BCFile.thumbnailCacheCompression(BCFileThumbnailFormat.PNG, size))
-            else:
-                thumbnailImg.save(thumbnailFile, BCFileThumbnailFormat.JPEG.value, BCFile.thumbnailCacheCompression(BCFileThumbnailFormat.JPEG, size))
-        except Exception as e:
-            Debug.print('[BCFile.thumbnail] Unable to save thumbnail in cache {0}: {1}', thumbnailFile, f"{e}")
+        BCFile.saveThumbnailFile(thumbnailImg, thumbnailFile, size)
 
         # finally, return thumbnail
         if thumbType == BCBaseFile.THUMBTYPE_IMAGE:
@@ -4376,6 +4636,15 @@ class BCFile(BCBaseFile):
 
     def getMetaInformation(self, getExtraData=False):
         """Return metadata informations"""
+        startTime = time.perf_counter()
+        returned = self.__getMetaInformation(getExtraData)
+        if self._format != BCFileManagedFormat.UNKNOWN:
+            # metadata are always read from file
+            BCCacheStats.record(BCCacheStats.LAYER_METAINFORMATION, self._format, False, time.perf_counter() - startTime, self.__size)
+        return returned
+
+    def __getMetaInformation(self, getExtraData):
+        """Return metadata informations, read from file according to file format"""
         if self._format in (BCFileManagedFormat.KRA, BCFileManagedFormat.KRZ):
             return self.__readMetaDataKra(True, getExtraData)
         elif self._format == BCFileManagedFormat.ORA:
@@ -4442,167 +4711,1348 @@ class BCFile(BCBaseFile):
 # ------------------------------------------------------------------------------
 
 
-class BCWorkerCache(Worker):
-    """A worker class that allows to work with BCFile and BCFileCache in a WorkerPool"""
-
-    def __init__(self, pool, callback, *callbackArgv):
-        self.__dbFileCache = BCFileCache(QUuid.createUuid().toString().strip('{}').replace('-', ''))
-        super(BCWorkerCache, self).__init__(pool, callback, self.__dbFileCache, *callbackArgv)
+class BCFileEmbeddedImage(object):
+    """A lightweight handle to an image embedded in a document archive (reference
+    image in a Krita file for example) or referenced from it as an external file
 
-    def startEvent(self):
-        """Worker will start execution; begin transaction mode for BCFileCache database"""
-        self.__dbFileCache.beginTransaction()
+    Nothing is read from archive when handle is built:
+    - image size is read from the first bytes of image only
+    - full image is decompressed and decoded only when image() is called
+    - thumbnails are built once, then read from thumbnail cache
+    """
+    # number of bytes to read from image to get image size from header
+    __HEADER_SIZE = 65536
 
-    def cleanupEvent(self):
-        """Worker have finished and is about to stop; close transaction mode and commit chnage for BCFileCache database"""
-        # close database connexion
-        self.__dbFileCache.commitTransaction()
-        self.__dbFileCache.close()
+    def __init__(self, source, member=None, cacheKey=None):
+        """Initialise handle
 
+        Given `source` is the archive file name (if `member` is provided) or the
+        image file name (if `member` is None)
 
-class BCFileCache(QObject):
-    """Manage BCFile cache in a SQLite database"""
+        Given `member` is the image file name in `source` archive
 
-    # Cache is stored in a SQLite file to improve performances
-    # - use less space on disk than unitary file
-    # - avoid to open/close files (faster to read content from sqlite file than on many small files)
-    #   => https://www.sqlite.org/fasterthanfs.html
-    #
-    # Problem:
-    #   => Cache is (in most case) read/updated through workers
-    #   As it seems SQlite support multithreaded connection, different test made with QSqlDatabase connections
-    #   return some problems:
-    #   - Outside transaction: slow
-    #   - Within transaction:
-    #       . the first worker who start a transactoin lock the database
-    #       . then, all other worker waits for database is unlocked to be able to work
-    #       . the, only the first worker process data files... (so useless multithreading...)
-    #
-    # Solution:
-    #   *Not the most elegant solution found*
-    #
-    #   When reading metadata from database file, if not found, BCFile (instancied from worker)
-    #   needs to read metadata from file and write it to database file
-    #
-    #   The solution is to write in an attached database
-    #   Attached database is in memory, for performances
-    #   When worker is terminated, data from memory database is flushed to database file
-    #
-    #
-    #                       ╔═══════════════════════════════════════╗
-    #                       ║ ┌───┬───┬───┬───┬───┬───┬───┬───┬───┐ ║
-    # Pool of data          ║ │ 1 │ 2 │ 3 │ 4 │ 5 │ 6 │ ..... │ N │ ║           Pool contains a list of files to process
-    #                       ║ └───┴───┴───┴───┴───┴───┴───┴───┴───┘ ║
-    #                       ╚═╤══════╤══════╤══════╤══════╤══════╤══╝
-    #                         ┊      ┊      ┊      ┊      ┊      ┊
-    #                         ▽      ▽      ▽      ▽      ▽      ▽
-    #                         ┊      ┊      ┊      ┊      ┊      ┊
-    #                       ┌─┴─┐  ┌─┴─┐  ┌─┴─┐  ┌─┴─┐  ┌─┴─┐  ┌─┴─┐            Each worker is connected to pool of data to process,
-    #  Workers              │ 1 │  │ 2 │  │ 3 │  │...│  │...│  │ n │            picking next available data in pool
-    #                       └─┬─┘  └─┬─┘  └─┬─┘  └─┬─┘  └─┬─┘  └─┬─┘
-    #                         ┊      ┊      ┊      ┊      ┊      ┊
-    #                         △      △      △      △      △      △
-    #                         ▽      ▽      ▽      ▽      ▽      ▽
-    #                         ┊      ┊      ┊      ┊      ┊      ┊
-    #                       ┌─┴─┐  ┌─┴─┐  ┌─┴─┐  ┌─┴─┐  ┌─┴─┐  ┌─┴─┐            Need one database connection per thread
-    #  DB Connection        │ 1 │  │ 2 │  │ 3 │  │...│  │...│  │ n │            (Different thread can't use the same database connection)
-    #                       └─┬─┘  └─┬─┘  └─┬─┘  └─┬─┘  └─┬─┘  └─┬─┘
-    #                         ┊      ┊      ┊      ┊      ┊      ┊
-    #                         △      △      △      △      △      △
-    #                         ▽      ▽      ▽      ▽      ▽      ▽
-    #                         ┊      ┊      ┊      ┊      ┊      ┊
-    #                      ╭╌╌┤   ╭╌╌┤   ╭╌╌┤   ╭╌╌┤   ╭╌╌┤   ╭╌╌┤
-    #                    ┌─┴─┐┊ ┌─┴─┐┊ ┌─┴─┐┊ ┌─┴─┐┊ ┌─┴─┐┊ ┌─┴─┐┊
-    #  Memory database   │ 1 │┊ │ 2 │┊ │ 3 │┊ │...│┊ │...│┊ │ n │┊              ATTACH a :memory: database on each connection
-    #                    └───┘┊ └───┘┊ └───┘┊ └───┘┊ └───┘┊ └───┘┊              Allows to write
-    #                         ┊      ┊      ┊      ┊      ┊      ┊
-    #                       ╔═╧══════╧══════╧══════╧══════╧══════╧══╗           Workers:
-    #                       ║                                       ║           . read from database file
-    #  Database file        ║                                       ║           . write to attached memory database
-    #                       ║                                       ║           . flush content of memory database to file when terminated
-    #                       ╚═══════════════════════════════════════╝
-    #
-    #  This solution allows to get good performances and maintain a metadata cache
-    #  up to date
-    #
-    #  But there's exception
-    #  In case of files with differents names but same content (same hash), if database is not yet up to date
-    #  with metadata, then each worker will read file and update attached memory database
-    #
-    #  This case is not considered as a problem; first time workers will encounter it, metadata will be processed X times
-    #  but execution time is insignificant
-    #
+        Given `cacheKey` is used to build thumbnail cache file name; if None, thumbnails
+        are not stored in thumbnail cache
+        """
+        self.__source = source
+        self.__member = member
+        self.__size = None
+        self.__thumbnails = {}
 
-    __BC_CACHE_PATH = ''
-    __BC_CACHE_FILE = None
-    __DB_EXPECTED_VERSION = 100   # 1.00
+        if isinstance(cacheKey, str) and cacheKey != '':
+            self.__cacheKey = hashlib.sha1(f"{cacheKey}:{source if member is None else member}".encode()).hexdigest()
+        else:
+            self.__cacheKey = None
 
-    __GLOBAL_INSTANCE = None
+    def __repr__(self):
+        """Format internal representation"""
+        return f'<BCFileEmbeddedImage({self.__source}, {self.__member})>'
 
-    @staticmethod
-    def __setCacheDirectory(bcCachePath=None):
-        """Set current cache directory
+    def __readData(self, maxSize=-1):
+        """Return image data as bytes
 
-        If no value provided, reset to default value
+        If `maxSize` is greater than 0, return only the first `maxSize` bytes of image
+        Return None if not able to read data
         """
-        if bcCachePath is None or bcCachePath == '':
-            bcCachePath = os.path.join(QStandardPaths.writableLocation(QStandardPaths.CacheLocation), "bulicommander")
-        else:
-            bcCachePath = os.path.expanduser(bcCachePath)
-
-        if not isinstance(bcCachePath, str):
-            raise EInvalidType("Given `bcCachePath` must be a valid <str> ")
-
         try:
-            BCFileCache.__BC_CACHE_PATH = bcCachePath
-
-            os.makedirs(bcCachePath, exist_ok=True)
+            if self.__member is None:
+                with open(self.__source, 'rb') as fileHandle:
+                    return fileHandle.read(maxSize)
+            else:
+                with zipfile.ZipFile(self.__source, 'r') as archive:
+                    with archive.open(self.__member) as fileHandle:
+                        return fileHandle.read(maxSize)
         except Exception as e:
-            Debug.print('[BCFile.setCacheDirectory] Unable to create directory: {0} / {1}', bcCachePath, f"{e}")
-
-    @staticmethod
-    def initialise(bcCachePath=None):
-        """Initialise cache
+            Debug.print('[BCFileEmbeddedImage.__readData] Unable to read "{0}" from {1}: {2}', self.__member, self.__source, f"{e}")
+            return None
 
-        If no database cache exists, create it
-        """
-        BCFileCache.__setCacheDirectory(bcCachePath)
-        if BCFileCache.__GLOBAL_INSTANCE is None:
-            BCFileCache.__GLOBAL_INSTANCE = BCFileCache()
+    def __imageReader(self, data):
+        """Return a QImageReader for given data, or None"""
+        if not data:
+            return None
 
-    @staticmethod
-    def finalize():
-        if BCFileCache.__GLOBAL_INSTANCE is not None:
-            BCFileCache.__GLOBAL_INSTANCE.close()
-            BCFileCache.__GLOBAL_INSTANCE = None
+        buffer = QBuffer()
+        buffer.setData(QByteArray(data))
+        buffer.open(QIODevice.ReadOnly)
+        reader = QImageReader(buffer)
+        # keep a reference to buffer, otherwise it's garbage collected before reader is used
+        reader.buffer = buffer
+        return reader
 
-    @staticmethod
-    def cacheDirectory():
-        """Return current cache directory"""
-        return BCFileCache.__BC_CACHE_PATH
+    def isEmbedded(self):
+        """Return True if image is embedded in archive, False if it's an external file"""
+        return self.__member is not None
 
-    @staticmethod
-    def cacheFile():
-        """Return SQlite databse cache file"""
-        if BCFileCache.__BC_CACHE_FILE is None:
-            BCFileCache.__BC_CACHE_FILE = os.path.join(BCFileCache.__BC_CACHE_PATH, f'metaDataCache.sqlite')
-        return BCFileCache.__BC_CACHE_FILE
+    def name(self):
+        """Return image name"""
+        if self.__member is None:
+            return self.__source
+        return self.__member
 
-    @staticmethod
-    def globalInstance():
-        """Return a global instance of cache database"""
-        if BCFileCache.__GLOBAL_INSTANCE is None:
-            BCFileCache.initialise()
-        return BCFileCache.__GLOBAL_INSTANCE
+    def data(self):
+        """Return image content as bytes (decompressed from archive if needed)"""
+        return self.__readData()
 
-    def __init__(self, id=None):
-        """Given `id` is used when database is accessed through Workers; each thread need its own database reference
+    def size(self):
+        """Return image size as QSize
 
-        Also when `id` is provided, setMeta will write into attached memory database
+        Only image header is read to determinate size
         """
-        super(BCFileCache, self).__init__()
+        if self.__size is None:
+            self.__size = QSize(-1, -1)
+            reader = self.__imageReader(self.__readData(BCFileEmbeddedImage.__HEADER_SIZE))
+            if reader is not None:
+                size = reader.size()
+                if size.isValid():
+                    self.__size = size
+                else:
+                    # header not readable from partial data, need to read image
+                    image = self.image()
+                    if image is not None:
+                        self.__size = image.size()
+        return self.__size
 
-        self.__id = id
+    def width(self):
+        """Return image width"""
+        return self.size().width()
+
+    def height(self):
+        """Return image height"""
+        return self.size().height()
+
+    def image(self):
+        """Return image as QImage
+
+        Image is decompressed and decoded on each call (image is not kept in memory)
+        Return None if not able to read image
+        """
+        image = QImage()
+        if self.__member is None:
+            if image.load(self.__source):
+                return image
+        else:
+            data = self.__readData()
+            if data and image.loadFromData(data):
+                return image
+        return None
+
+    def thumbnail(self, size=BCFileThumbnailSize.MEDIUM):
+        """Return thumbnail image as QImage
+
+        Thumbnail is read from thumbnail cache if available, otherwise it is built
+        from image (decoded to a reduced size when image format allows it) and
+        stored in cache
+
+        Return None if not able to read image
+        """
+        if not isinstance(size, BCFileThumbnailSize):
+            size = BCFileThumbnailSize.fromValue(size)
+
+        if size in self.__thumbnails:
+            return self.__thumbnails[size]
+
+        thumbnailFile = None
+        if self.__cacheKey is not None:
+            thumbnailFile = os.path.join(BCFile.thumbnailCacheDirectory(size), self.__cacheKey)
+            if os.path.isfile(thumbnailFile):
+                thumbnailImg = QImage(thumbnailFile)
+                if not thumbnailImg.isNull():
+                    self.__thumbnails[size] = thumbnailImg
+                    return thumbnailImg
+
+        reader = self.__imageReader(self.data())
+        if reader is None:
+            return None
+
+        imageSize = reader.size()
+        if imageSize.isValid():
+            self.__size = imageSize
+            if imageSize.width() > size.value or imageSize.height() > size.value:
+                # let decoder reduce image (supported by some formats like JPEG) to
+                # avoid to decode full image size
+                reader.setScaledSize(imageSize.scaled(size.size(QSize), Qt.KeepAspectRatio))
+
+        thumbnailImg = reader.read()
+        if thumbnailImg.isNull():
+            return None
+
+        if thumbnailImg.width() > size.value or thumbnailImg.height() > size.value:
+            thumbnailImg = thumbnailImg.scaled(size.size(QSize), Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+        if thumbnailFile is not None:
+            BCFile.saveThumbnailFile(thumbnailImg, thumbnailFile, size)
+
+        self.__thumbnails[size] = thumbnailImg
+        return thumbnailImg
+
+
+class BCCacheStats(object):
+    """Collect statistics about caches usage
+
+    For each cache layer and each file format, following counters are collected:
+    - number of hits (data read from cache) and misses (data built from source file)
+    - number of bytes read, from cache file for hits and from source file for misses
+      (when known)
+    - cumulated latency, and latency histogram
+
+    Counters are updated from any thread
+    """
+    LAYER_METADATA = 'metadata'                 # image properties, from BCFileCache database
+    LAYER_QHASH = 'qHash'                       # qHash, prefetched or calculated from file
+    LAYER_THUMBNAIL = 'thumbnail'               # thumbnails, from thumbnail cache directory
+    LAYER_METAINFORMATION = 'metaInformation'   # full metadata, always read from file
+    LAYER_CLIPBOARD = 'clipboard'               # clipboard content, from clipboard pool
+
+    # upper bounds of latency histogram buckets, in milliseconds
+    # last bucket contains all latencies greater than last bound
+    HISTOGRAM_BOUNDS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+    __ENABLED = True
+    __MUTEX = QMutex()
+    __COUNTERS = {}
+    __STARTED = time.time()
+
+    @staticmethod
+    def enabled():
+        """Return if statistics are collected"""
+        return BCCacheStats.__ENABLED
+
+    @staticmethod
+    def setEnabled(value):
+        """Set if statistics are collected"""
+        if not isinstance(value, bool):
+            raise EInvalidType("Given `value` must be <bool>")
+        BCCacheStats.__ENABLED = value
+
+    @staticmethod
+    def record(layer, fileFormat, hit, duration=None, nbBytes=0):
+        """Record an access to cache `layer`, for given `fileFormat`
+
+        Given `hit` is True if data has been read from cache
+        Given `duration` is access latency, in seconds (if None, latency is not recorded)
+        Given `nbBytes` is number of bytes read
+        """
+        if not BCCacheStats.__ENABLED:
+            return
+
+        if not fileFormat:
+            fileFormat = BCFileManagedFormat.UNKNOWN
+
+        BCCacheStats.__MUTEX.lock()
+        counters = BCCacheStats.__COUNTERS.get((layer, fileFormat))
+        if counters is None:
+            counters = {'hits': 0,
+                        'misses': 0,
+                        'bytes': 0,
+                        'duration': 0,
+                        'histogram': [0] * (len(BCCacheStats.HISTOGRAM_BOUNDS) + 1)
+                        }
+            BCCacheStats.__COUNTERS[(layer, fileFormat)] = counters
+
+        if hit:
+            counters['hits'] += 1
+        else:
+            counters['misses'] += 1
+        counters['bytes'] += nbBytes
+
+        if duration is not None:
+            counters['duration'] += duration
+            counters['histogram'][bisect.bisect_left(BCCacheStats.HISTOGRAM_BOUNDS, duration * 1000)] += 1
+        BCCacheStats.__MUTEX.unlock()
+
+    @staticmethod
+    def reset():
+        """Reset all counters"""
+        BCCacheStats.__MUTEX.lock()
+        BCCacheStats.__COUNTERS = {}
+        BCCacheStats.__STARTED = time.time()
+        BCCacheStats.__MUTEX.unlock()
+
+    @staticmethod
+    def percentile(histogram, value):
+        """Return latency (in milliseconds) for given percentile `value` (0-100)
+        from given `histogram`
+
+        Returned value is upper bound of histogram bucket in which percentile is
+        (None if percentile is in last bucket, or if histogram is empty)
+        """
+        total = sum(histogram)
+        if total == 0:
+            return None
+
+        threshold = total * value / 100
+        cumulated = 0
+        for index, nb in enumerate(histogram):
+            cumulated += nb
+            if cumulated >= threshold:
+                if index < len(BCCacheStats.HISTOGRAM_BOUNDS):
+                    return BCCacheStats.HISTOGRAM_BOUNDS[index]
+                break
+        return None
+
+    @staticmethod
+    def stats():
+        """Return a copy of current counters as a dictionary
+
+            key = layer
+            value = dictionary
+                key = file format
+                value = dictionary {'hits', 'misses', 'bytes', 'duration', 'histogram', 'p50', 'p95', 'p99'}
+
+        Percentiles are in milliseconds (see percentile())
+        """
+        returned = {}
+        BCCacheStats.__MUTEX.lock()
+        for (layer, fileFormat), counters in BCCacheStats.__COUNTERS.items():
+            if layer not in returned:
+                returned[layer] = {}
+            returned[layer][fileFormat] = copy.deepcopy(counters)
+        BCCacheStats.__MUTEX.unlock()
+
+        for layer in returned.values():
+            for counters in layer.values():
+                for value in (50, 95, 99):
+                    counters[f'p{value}'] = BCCacheStats.percentile(counters['histogram'], value)
+
+        return returned
+
+    @staticmethod
+    def toJson():
+        """Return current counters as a json string"""
+        return json.dumps({'started': BCCacheStats.__STARTED,
+                           'exported': time.time(),
+                           'histogramBounds': BCCacheStats.HISTOGRAM_BOUNDS,
+                           'layers': BCCacheStats.stats()
+                           }, indent=2)
+
+    @staticmethod
+    def exportJson(fileName):
+        """Export current counters as a json file
+
+        Return True if file has been written, otherwise False
+        """
+        try:
+            with open(fileName, 'w') as fHandle:
+                fHandle.write(BCCacheStats.toJson())
+        except Exception as e:
+            Debug.print('[BCCacheStats.exportJson] Unable to export statistics {0}: {1}', fileName, f"{e}")
+            return False
+        return True
+
+
+class BCWorkerCache(Worker):
+    """A worker class that allows to work with BCFile and BCFileCache in a WorkerPool"""
+
+    @staticmethod
+    def withPrefetch(prefetch):
+        """Return a worker class to use with WorkerPool.setWorkerClass(), for which
+        BCFileCache get qHash and metadata from given BCFileCachePrefetch
+        """
+        return functools.partial(BCWorkerCache, prefetch=prefetch)
+
+    def __init__(self, pool, callback, *callbackArgv, prefetch=None):
+        self.__dbFileCache = BCFileCache(QUuid.createUuid().toString().strip('{}').replace('-', ''), prefetch)
+        super(BCWorkerCache, self).__init__(pool, callback, self.__dbFileCache, *callbackArgv)
+
+    def cleanupEvent(self):
+        """Worker have finished and is about to stop; close BCFileCache database connection
+
+        Note: writes are made by BCFileCacheWriter, worker connection is read only
+        """
+        self.__dbFileCache.close()
+
+
+class BCFileCacheWriter(QThread):
+    """Single writer for BCFileCache database
+
+    All writes to cache database are queued and processed by one dedicated thread
+    with its own database connection; other connections are only used to read
+    database (in WAL mode, readers are not blocked by writer)
+
+    Queued writes are committed by batches: a transaction is committed when
+    BATCH_SIZE items have been written, or BATCH_DELAY after first item of batch
+    has been received
+    If database is locked (by another process), batch is retried later
+
+    When nothing has been written during IDLE_DELAY, database maintenance is
+    processed step by step (purge, indexed columns, size limit, incremental
+    vacuum); a step is processed every MAINTENANCE_DELAY until a new item is queued
+
+    Free pages are released by incremental vacuum only if database is in
+    incremental auto vacuum mode: it's the case for databases created by this
+    version, existing databases stay unconverted until a full vacuum is
+    explicitly asked by user (see BCFileCache.vacuum())
+    """
+    BATCH_SIZE = 500
+    BATCH_DELAY = 0.5           # in seconds
+    BUSY_TIMEOUT = 5000         # in milliseconds
+    BUSY_RETRY = 8
+
+    IDLE_DELAY = 30             # in seconds
+    MAINTENANCE_DELAY = 0.25    # in seconds
+    PURGE_STEP = 1000           # number of metadata removed per step when database is too big
+    VACUUM_STEP = 256           # number of pages released per incremental vacuum step
+    INDEX_STEP = 1000           # number of metadata for which indexed columns are calculated per step
+    FILES_STEP = 500            # number of snapshots files for which existence is checked per step
+
+    __ACTION_METADATA = 0
+    __ACTION_DIRECTORY = 1
+    __ACTION_FLUSH = 2
+    __ACTION_STOP = 3
+    __ACTION_SNAPSHOT = 4
+    __ACTION_ACCESS = 5
+    __ACTION_MAINTENANCE = 6
+    __ACTION_IMPORT = 7
+
+    @staticmethod
+    def isBusyError(error):
+        """Return True if given QSqlError is a SQLITE_BUSY or SQLITE_LOCKED error"""
+        return error.nativeErrorCode() in ('5', '6')
+
+    def __init__(self, fileName, maxAge=0, maxSize=0):
+        """Initialise writer for given database `fileName`
+
+        Given `maxAge` (in days) and `maxSize` (in bytes) are used by database
+        maintenance; 0 means no limit
+        """
+        super(BCFileCacheWriter, self).__init__()
+        self.__fileName = fileName
+        self.__queue = queue.Queue()
+
+        # queued metadata not yet committed in database
+        #   key = hash
+        #   value = tuple (metadata as json string, file format, indexed columns values)
+        self.__pending = {}
+        self.__pendingMutex = QMutex()
+
+        # hashes for which last access time has to be updated, and hashes for
+        # which last access time has already been updated during session
+        # pending hashes are written with next batch; if batch can't be committed
+        # they're kept for the following one
+        self.__accessed = set()
+        self.__accessQueued = False
+        self.__touched = set()
+
+        # maintenance
+        self.__maxAge = maxAge
+        self.__maxSize = maxSize
+        self.__purgeNeeded = True
+        # snapshots files are checked from last processed rowid
+        self.__purgeFilesNeeded = True
+        self.__purgeFilesRowId = 0
+        self.__checkpointNeeded = False
+        # indexed columns of metadata written by previous versions are calculated
+        # from last processed rowid
+        self.__indexNeeded = True
+        self.__indexRowId = 0
+
+    def __execItem(self, queries, item):
+        """Execute queries for given queued `item`
+
+        Return None if item has been written, otherwise QSqlError
+        """
+        if item[0] == BCFileCacheWriter.__ACTION_METADATA:
+            sqlQuery = queries[BCFileCacheWriter.__ACTION_METADATA]
+            sqlQuery.bindValue(":hash", item[1])
+            sqlQuery.bindValue(":metadata", item[2][0])
+            sqlQuery.bindValue(":fileFormat", item[2][1])
+            sqlQuery.bindValue(":parserVersion", item[2][3])
+            sqlQuery.bindValue(":lastAccess", time.time())
+            for column, value in zip(BCFileCache.INDEXED_COLUMNS, item[2][2]):
+                sqlQuery.bindValue(f":{column}", value)
+            if not sqlQuery.exec():
+                return sqlQuery.lastError()
+        elif item[0] == BCFileCacheWriter.__ACTION_ACCESS:
+            sqlQuery = queries[BCFileCacheWriter.__ACTION_ACCESS]
+            sqlQuery.bindValue(":lastAccess", time.time())
+            for hash in item[1]:
+                sqlQuery.bindValue(":hash", hash)
+                if not sqlQuery.exec():
+                    return sqlQuery.lastError()
+        elif item[0] == BCFileCacheWriter.__ACTION_IMPORT:
+            sqlQuery = queries[BCFileCacheWriter.__ACTION_IMPORT]
+            sqlQuery.bindValue(":lastAccess", time.time())
+            for hash, metadata, fileFormat, parserVersion, columns in item[1]:
+                sqlQuery.bindValue(":hash", hash)
+                sqlQuery.bindValue(":metadata", metadata)
+                sqlQuery.bindValue(":fileFormat", fileFormat)
+                sqlQuery.bindValue(":parserVersion", parserVersion)
+                for column, value in zip(BCFileCache.INDEXED_COLUMNS, columns):
+                    sqlQuery.bindValue(f":{column}", value)
+                if not sqlQuery.exec():
+                    return sqlQuery.lastError()
+        elif item[0] == BCFileCacheWriter.__ACTION_DIRECTORY:
+            sqlQuery = queries[BCFileCacheWriter.__ACTION_DIRECTORY]
+            sqlQuery.bindValue(":path", item[1])
+            if not sqlQuery.exec():
+                return sqlQuery.lastError()
+        elif item[0] == BCFileCacheWriter.__ACTION_SNAPSHOT:
+            # snapshot replace all previous entries for path
+            sqlQueryDelete, sqlQuery = queries[BCFileCacheWriter.__ACTION_SNAPSHOT]
+            sqlQueryDelete.bindValue(":path", item[1])
+            if not sqlQueryDelete.exec():
+                return sqlQueryDelete.lastError()
+
+            sqlQuery.bindValue(":path", item[1])
+            for name, size, mtime, inode, qHash, fileFormat in item[2]:
+                sqlQuery.bindValue(":name", name)
+                sqlQuery.bindValue(":size", size)
+                sqlQuery.bindValue(":mtime", mtime)
+                sqlQuery.bindValue(":inode", inode)
+                sqlQuery.bindValue(":qHash", qHash)
+                sqlQuery.bindValue(":format", fileFormat)
+                if not sqlQuery.exec():
+                    return sqlQuery.lastError()
+        return None
+
+    def __writeBatch(self, database, queries, batch):
+        """Write given `batch` of items in one transaction
+
+        Return True if batch has been committed
+        """
+        sqlQuery = QSqlQuery(database)
+        waitTime = 50
+        for retry in range(BCFileCacheWriter.BUSY_RETRY):
+            error = None
+            if sqlQuery.exec("BEGIN IMMEDIATE TRANSACTION"):
+                for item in batch:
+                    error = self.__execItem(queries, item)
+                    if error is not None:
+                        break
+
+                if error is None:
+                    if sqlQuery.exec("COMMIT TRANSACTION"):
+                        return True
+                    error = sqlQuery.lastError()
+                sqlQuery.exec("ROLLBACK TRANSACTION")
+            else:
+                error = sqlQuery.lastError()
+
+            if not BCFileCacheWriter.isBusyError(error):
+                break
+
+            # database is locked by another connection (or another process): wait
+            # and retry; wait time is randomised to avoid processes retrying at
+            # the same time
+            QThread.msleep(int(waitTime * random.uniform(0.5, 1.5)))
+            waitTime = min(2000, waitTime * 2)
+
+        Debug.print('[BCFileCacheWriter.__writeBatch] Unable to write {0} items in cache: {1}', len(batch), error.text())
+        return False
+
+    def __pragma(self, sqlQuery, pragma):
+        """Return value for given `pragma`, None if value can't be read"""
+        if sqlQuery.exec(f"PRAGMA {pragma}") and sqlQuery.next():
+            return sqlQuery.value(0)
+        return None
+
+    def __purge(self, database):
+        """Remove from database:
+        - directories and snapshots of directories that doesn't exist anymore, and
+          metadata only referenced by these snapshots
+          (only if parent directory still exists: a missing parent directory can
+          be an unmounted volume)
+        - metadata not used for more than maxAge days
+
+        Return True if database has been purged
+        """
+        sqlQuery = QSqlQuery(database)
+
+        paths = set()
+        if sqlQuery.exec("SELECT path FROM directories UNION SELECT DISTINCT path FROM snapshots"):
+            while sqlQuery.next():
+                paths.add(sqlQuery.value(0))
+        missingPaths = [path for path in paths if not os.path.isdir(path) and os.path.isdir(os.path.dirname(path))]
+
+        if not sqlQuery.exec("BEGIN IMMEDIATE TRANSACTION"):
+            Debug.print('[BCFileCacheWriter.__purge] Unable to purge database: {0}', sqlQuery.lastError().text())
+            return False
+
+        nbMetadata = 0
+        for path in missingPaths:
+            sqlQuery.prepare("""
+                    DELETE FROM metadata
+                    WHERE hash IN (SELECT qHash FROM snapshots WHERE path=:path)
+                      AND NOT EXISTS (SELECT 1 FROM snapshots WHERE snapshots.qHash=metadata.hash AND snapshots.path<>:path)
+                """)
+            sqlQuery.bindValue(":path", path)
+            if sqlQuery.exec():
+                nbMetadata += sqlQuery.numRowsAffected()
+
+            for table in ('snapshots', 'directories'):
+                sqlQuery.prepare(f"DELETE FROM {table} WHERE path=:path")
+                sqlQuery.bindValue(":path", path)
+                sqlQuery.exec()
+
+        if self.__maxAge > 0:
+            sqlQuery.prepare("DELETE FROM metadata WHERE lastAccess<:lastAccess")
+            sqlQuery.bindValue(":lastAccess", time.time() - self.__maxAge * 86400)
+            if sqlQuery.exec():
+                nbMetadata += sqlQuery.numRowsAffected()
+
+        if not sqlQuery.exec("COMMIT TRANSACTION"):
+            Debug.print('[BCFileCacheWriter.__purge] Unable to purge database: {0}', sqlQuery.lastError().text())
+            sqlQuery.exec("ROLLBACK TRANSACTION")
+            return False
+
+        Debug.print('[BCFileCacheWriter.__purge] Purged: {0} directories, {1} metadata', len(missingPaths), nbMetadata)
+        return True
+
+    def __purgeFiles(self, database):
+        """Check existence of next FILES_STEP files referenced by snapshots of
+        existing directories, and remove from database files that doesn't exist
+        anymore, and metadata only referenced by them
+
+        Metadata not referenced by any snapshot can't be associated to a file,
+        they're removed only when not used for more than maxAge days
+
+        Return True if some files have been checked
+        """
+        sqlQuery = QSqlQuery(database)
+        sqlQuery.setForwardOnly(True)
+        sqlQuery.prepare("""
+                SELECT rowid, path, name, qHash
+                FROM snapshots
+                WHERE rowid>:rowid
+                ORDER BY rowid
+                LIMIT :limit
+            """)
+        sqlQuery.bindValue(":rowid", self.__purgeFilesRowId)
+        sqlQuery.bindValue(":limit", BCFileCacheWriter.FILES_STEP)
+
+        nbChecked = 0
+        existingPaths = {}
+        missingFiles = []
+        if sqlQuery.exec():
+            while sqlQuery.next():
+                nbChecked += 1
+                self.__purgeFilesRowId = sqlQuery.value(0)
+                path = sqlQuery.value(1)
+                if path not in existingPaths:
+                    # files of missing directories are purged by __purge()
+                    existingPaths[path] = os.path.isdir(path)
+                if existingPaths[path] and not os.path.lexists(os.path.join(path, sqlQuery.value(2))):
+                    missingFiles.append((sqlQuery.value(0), sqlQuery.value(3)))
+        sqlQuery.finish()
+
+        if len(missingFiles) == 0:
+            return nbChecked > 0
+
+        if not sqlQuery.exec("BEGIN IMMEDIATE TRANSACTION"):
+            Debug.print('[BCFileCacheWriter.__purgeFiles] Unable to purge database: {0}', sqlQuery.lastError().text())
+            return False
+
+        nbMetadata = 0
+        for rowId, qHash in missingFiles:
+            sqlQuery.prepare("DELETE FROM snapshots WHERE rowid=:rowid")
+            sqlQuery.bindValue(":rowid", rowId)
+            sqlQuery.exec()
+
+            if qHash:
+                sqlQuery.prepare("""
+                        DELETE FROM metadata
+                        WHERE hash=:hash
+                          AND NOT EXISTS (SELECT 1 FROM snapshots WHERE snapshots.qHash=:hash)
+                    """)
+                sqlQuery.bindValue(":hash", qHash)
+                if sqlQuery.exec():
+                    nbMetadata += sqlQuery.numRowsAffected()
+
+        if not sqlQuery.exec("COMMIT TRANSACTION"):
+            Debug.print('[BCFileCacheWriter.__purgeFiles] Unable to purge database: {0}', sqlQuery.lastError().text())
+            sqlQuery.exec("ROLLBACK TRANSACTION")
+            return False
+
+        Debug.print('[BCFileCacheWriter.__purgeFiles] Purged: {0} files, {1} metadata', len(missingFiles), nbMetadata)
+        return True
+
+    def __index(self, database):
+        """Calculate indexed columns for next INDEX_STEP metadata written by a
+        previous version of cache (from json metadata)
+
+        Return True if some metadata have been processed
+        """
+        sqlQuery = QSqlQuery(database)
+        sqlQuery.setForwardOnly(True)
+        sqlQuery.prepare("""
+                SELECT rowid, hash, metadata
+                FROM metadata
+                WHERE rowid>:rowid
+                  AND indexed=0
+                ORDER BY rowid
+                LIMIT :limit
+            """)
+        sqlQuery.bindValue(":rowid", self.__indexRowId)
+        sqlQuery.bindValue(":limit", BCFileCacheWriter.INDEX_STEP)
+
+        items = []
+        if sqlQuery.exec():
+            while sqlQuery.next():
+                self.__indexRowId = sqlQuery.value(0)
+                try:
+                    metadata = json.loads(sqlQuery.value(2), cls=JsonQObjectDecoder)
+                except Exception as e:
+                    metadata = None
+                items.append((sqlQuery.value(1), BCFileCache.indexedColumnsValues(metadata)))
+        sqlQuery.finish()
+
+        if len(items) == 0:
+            return False
+
+        if not sqlQuery.exec("BEGIN IMMEDIATE TRANSACTION"):
+            Debug.print('[BCFileCacheWriter.__index] Unable to index metadata: {0}', sqlQuery.lastError().text())
+            return False
+
+        sqlQuery.prepare(f"""
+                UPDATE metadata
+                SET {', '.join([f'{column}=:{column}' for column in BCFileCache.INDEXED_COLUMNS])},
+                    indexed=1
+                WHERE hash=:hash
+            """)
+        for hash, values in items:
+            sqlQuery.bindValue(":hash", hash)
+            for column, value in zip(BCFileCache.INDEXED_COLUMNS, values):
+                sqlQuery.bindValue(f":{column}", value)
+            sqlQuery.exec()
+
+        if not sqlQuery.exec("COMMIT TRANSACTION"):
+            Debug.print('[BCFileCacheWriter.__index] Unable to index metadata: {0}', sqlQuery.lastError().text())
+            sqlQuery.exec("ROLLBACK TRANSACTION")
+            return False
+        return True
+
+    def __maintenance(self, database, queries):
+        """Process one maintenance step on database
+
+        Steps are processed in this order, one per call:
+        - write last access times not written yet (batch rolled back); until
+          they're written, no other step is processed
+        - purge database (once per session, and when options are modified)
+        - purge files of snapshots that doesn't exist anymore, checked by steps
+          (once per session)
+        - calculate indexed columns of metadata written by previous versions
+        - if database used size exceeds maxSize, remove least recently used metadata
+        - release free pages with incremental vacuum (if database is in incremental
+          auto vacuum mode), then checkpoint WAL file
+
+        Return True if there's still something to do
+        """
+        accessed = self.__takeAccessed()
+        if len(accessed) > 0:
+            # metadata must not be purged according to an outdated last access time
+            if self.__writeBatch(database, queries, [(BCFileCacheWriter.__ACTION_ACCESS, accessed)]):
+                return True
+            self.__restoreAccessed(accessed)
+            return False
+
+        if self.__purgeNeeded:
+            self.__purgeNeeded = False
+            self.__purge(database)
+            return True
+
+        if self.__purgeFilesNeeded:
+            if self.__purgeFiles(database):
+                return True
+            self.__purgeFilesNeeded = False
+
+        if self.__indexNeeded:
+            if self.__index(database):
+                return True
+            self.__indexNeeded = False
+
+        sqlQuery = QSqlQuery(database)
+        try:
+            if self.__maxSize > 0:
+                pageSize = self.__pragma(sqlQuery, "page_size") or 0
+                pageCount = self.__pragma(sqlQuery, "page_count") or 0
+                freePages = self.__pragma(sqlQuery, "freelist_count") or 0
+
+                if (pageCount - freePages) * pageSize > self.__maxSize:
+                    if sqlQuery.exec(f"""
+                            DELETE FROM metadata
+                            WHERE hash IN (SELECT hash FROM metadata ORDER BY lastAccess LIMIT {BCFileCacheWriter.PURGE_STEP})
+                        """) and sqlQuery.numRowsAffected() > 0:
+                        return True
+
+            # 2 = INCREMENTAL; otherwise free pages can't be released step by step
+            if self.__pragma(sqlQuery, "auto_vacuum") == 2 and (self.__pragma(sqlQuery, "freelist_count") or 0) > 0:
+                if sqlQuery.exec(f"PRAGMA incremental_vacuum({BCFileCacheWriter.VACUUM_STEP})"):
+                    # each step of statement release a page
+                    while sqlQuery.next():
+                        pass
+                    self.__checkpointNeeded = True
+                    return True
+
+            if self.__checkpointNeeded:
+                # released pages are removed from database file once WAL file is checkpointed
+                self.__checkpointNeeded = False
+                sqlQuery.exec("PRAGMA wal_checkpoint(PASSIVE)")
+        finally:
+            sqlQuery.finish()
+
+        return False
+
+    def __takeAccessed(self):
+        """Return hashes for which last access time has to be updated, and clear
+        pending list"""
+        self.__pendingMutex.lock()
+        returned = self.__accessed
+        self.__accessed = set()
+        self.__accessQueued = False
+        self.__pendingMutex.unlock()
+        return returned
+
+    def __restoreAccessed(self, hashes):
+        """Put back given `hashes` (not written) in pending list of hashes for
+        which last access time has to be updated"""
+        if len(hashes) > 0:
+            self.__pendingMutex.lock()
+            self.__accessed.update(hashes)
+            self.__pendingMutex.unlock()
+
+    def __removePending(self, batch):
+        """Remove written metadata from pending list"""
+        self.__pendingMutex.lock()
+        for item in batch:
+            # if metadata has been updated again in the meantime, keep it
+            if item[0] == BCFileCacheWriter.__ACTION_METADATA and self.__pending.get(item[1]) is item[2]:
+                self.__pending.pop(item[1])
+        self.__pendingMutex.unlock()
+
+    def run(self):
+        """Process queued items until stop() is called"""
+        database = QSqlDatabase.addDatabase("QSQLITE", "dbBCFileCacheWriter")
+        database.setDatabaseName(self.__fileName)
+        database.setConnectOptions(f"QSQLITE_BUSY_TIMEOUT={BCFileCacheWriter.BUSY_TIMEOUT}")
+        if not database.open():
+            Debug.print('[BCFileCacheWriter.run] Unable to open database: {0}', self.__fileName)
+
+        querySetMetadata = QSqlQuery(database)
+        querySetMetadata.prepare(f"""
+                INSERT INTO `metadata` (hash, metadata, fileFormat, parserVersion, lastAccess, {BCFileCache.INDEXED_COLUMNS_SQL}, indexed)
+                            VALUES(:hash, :metadata, :fileFormat, :parserVersion, :lastAccess, {BCFileCache.INDEXED_COLUMNS_SQL_BIND}, 1)
+                ON CONFLICT(hash)
+                            DO UPDATE SET metadata=excluded.metadata,
+                                          fileFormat=excluded.fileFormat,
+                                          parserVersion=excluded.parserVersion,
+                                          lastAccess=excluded.lastAccess,
+                                          {BCFileCache.INDEXED_COLUMNS_SQL_UPDATE},
+                                          indexed=1
+            """)
+
+        # imported metadata never replace existing metadata, unless they've been
+        # read with another version of parser
+        queryImportMetadata = QSqlQuery(database)
+        queryImportMetadata.prepare(f"""
+                INSERT INTO `metadata` (hash, metadata, fileFormat, parserVersion, lastAccess, {BCFileCache.INDEXED_COLUMNS_SQL}, indexed)
+                            VALUES(:hash, :metadata, :fileFormat, :parserVersion, :lastAccess, {BCFileCache.INDEXED_COLUMNS_SQL_BIND}, 1)
+                ON CONFLICT(hash)
+                            DO UPDATE SET metadata=excluded.metadata,
+                                          fileFormat=excluded.fileFormat,
+                                          parserVersion=excluded.parserVersion,
+                                          lastAccess=excluded.lastAccess,
+                                          {BCFileCache.INDEXED_COLUMNS_SQL_UPDATE},
+                                          indexed=1
+                            WHERE metadata.parserVersion<>excluded.parserVersion
+            """)
+
+        querySetAccess = QSqlQuery(database)
+        querySetAccess.prepare("""
+                UPDATE metadata
+                SET lastAccess=:lastAccess
+                WHERE hash=:hash
+            """)
+
+        querySetDirectory = QSqlQuery(database)
+        querySetDirectory.prepare("""
+                INSERT INTO directories (path, timestamp)
+                            VALUES(:path, strftime('%s', 'now', 'localtime'))
+                ON CONFLICT(path)
+                            DO UPDATE SET timestamp=excluded.timestamp
+            """)
+
+        queryDeleteSnapshot = QSqlQuery(database)
+        queryDeleteSnapshot.prepare("""
+                DELETE FROM snapshots
+                WHERE path=:path
+            """)
+
+        querySetSnapshot = QSqlQuery(database)
+        querySetSnapshot.prepare("""
+                INSERT INTO snapshots (path, name, size, mtime, inode, qHash, format)
+                            VALUES(:path, :name, :size, :mtime, :inode, :qHash, :format)
+            """)
+
+        queries = {
+                BCFileCacheWriter.__ACTION_METADATA: querySetMetadata,
+                BCFileCacheWriter.__ACTION_IMPORT: queryImportMetadata,
+                BCFileCacheWriter.__ACTION_ACCESS: querySetAccess,
+                BCFileCacheWriter.__ACTION_DIRECTORY: querySetDirectory,
+                BCFileCacheWriter.__ACTION_SNAPSHOT: (queryDeleteSnapshot, querySetSnapshot)
+            }
+
+        running = True
+        maintenanceDelay = BCFileCacheWriter.IDLE_DELAY
+        while running:
+            batch = []
+            semaphores = []
+
+            # wait for first item; if nothing has been queued during delay,
+            # process a maintenance step
+            try:
+                item = self.__queue.get(timeout=maintenanceDelay)
+            except queue.Empty:
+                if database.isOpen() and self.__maintenance(database, queries):
+                    maintenanceDelay = BCFileCacheWriter.MAINTENANCE_DELAY
+                else:
+                    # nothing more to do, wait for next item
+                    maintenanceDelay = None
+                continue
+            maintenanceDelay = BCFileCacheWriter.IDLE_DELAY
+
+            # get items until batch is full or delay is elapsed
+            timeLimit = time.monotonic() + BCFileCacheWriter.BATCH_DELAY
+            while True:
+                if item[0] == BCFileCacheWriter.__ACTION_STOP:
+                    running = False
+                    break
+                elif item[0] == BCFileCacheWriter.__ACTION_FLUSH:
+                    semaphores.append(item[1])
+                    break
+                elif item[0] == BCFileCacheWriter.__ACTION_MAINTENANCE:
+                    break
+
+                if item[0] != BCFileCacheWriter.__ACTION_ACCESS:
+                    # queued access only wake up writer: pending hashes are
+                    # added to batch once collected
+                    batch.append(item)
+                if len(batch) >= BCFileCacheWriter.BATCH_SIZE:
+                    break
+
+                timeout = timeLimit - time.monotonic()
+                if timeout <= 0:
+                    break
+
+                try:
+                    item = self.__queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+            accessed = self.__takeAccessed()
+            if len(accessed) > 0:
+                batch.append((BCFileCacheWriter.__ACTION_ACCESS, accessed))
+
+            if len(batch) > 0 and database.isOpen() and not self.__writeBatch(database, queries, batch):
+                # batch has been rolled back: last access times are written with next batch
+                self.__restoreAccessed(accessed)
+            self.__removePending(batch)
+
+            for semaphore in semaphores:
+                semaphore.release()
+
+        for sqlQuery in (querySetMetadata, queryImportMetadata, querySetAccess, querySetDirectory, queryDeleteSnapshot, querySetSnapshot):
+            sqlQuery.finish()
+        queries = None
+        querySetMetadata = None
+        queryImportMetadata = None
+        querySetAccess = None
+        querySetDirectory = None
+        queryDeleteSnapshot = None
+        querySetSnapshot = None
+        database.close()
+        database = None
+        QSqlDatabase.removeDatabase("dbBCFileCacheWriter")
+
+    def setMetadata(self, hash, metadata, fileFormat, columns, parserVersion):
+        """Queue `metadata` (json string) for `hash`
+
+        Given `columns` are values for indexed columns, as returned by
+        BCFileCache.indexedColumnsValues()
+        Given `parserVersion` is version of parser used to read metadata
+        """
+        value = (metadata, fileFormat, columns, parserVersion)
+        self.__pendingMutex.lock()
+        self.__pending[hash] = value
+        self.__pendingMutex.unlock()
+        self.__queue.put((BCFileCacheWriter.__ACTION_METADATA, hash, value))
+
+    def pendingMetadata(self, hash):
+        """Return queued metadata (json string) for `hash` not yet written in
+        database, or None if there's no queued metadata for `hash`"""
+        self.__pendingMutex.lock()
+        returned = self.__pending.get(hash)
+        self.__pendingMutex.unlock()
+        if returned is None:
+            return None
+        return returned[0]
+
+    def pendingMetadataList(self, hashes):
+        """Return queued metadata (json string) for given `hashes` not yet written
+        in database, as a dictionary (key=hash, value=json string)"""
+        returned = {}
+        self.__pendingMutex.lock()
+        if len(self.__pending) > 0:
+            for hash in hashes:
+                if hash in self.__pending:
+                    returned[hash] = self.__pending[hash][0]
+        self.__pendingMutex.unlock()
+        return returned
+
+    def touchMetadata(self, hashes):
+        """Queue update of last access time for given `hashes`
+
+        Last access time is updated once per session for a hash
+        """
+        wakeUp = False
+        self.__pendingMutex.lock()
+        hashes = set(hashes).difference(self.__touched)
+        if len(hashes) > 0:
+            self.__touched.update(hashes)
+            self.__accessed.update(hashes)
+            # if an item is already queued, hashes will be written with its batch
+            wakeUp = not self.__accessQueued
+            self.__accessQueued = True
+        self.__pendingMutex.unlock()
+
+        if wakeUp:
+            self.__queue.put((BCFileCacheWriter.__ACTION_ACCESS, ))
+
+    def setOptions(self, maxAge, maxSize):
+        """Set maximum age (in days) and maximum size (in bytes) of database, used
+        by maintenance; 0 means no limit
+
+        Database will be purged on next idle time
+        """
+        self.__maxAge = maxAge
+        self.__maxSize = maxSize
+        self.__purgeNeeded = True
+        self.__queue.put((BCFileCacheWriter.__ACTION_MAINTENANCE, ))
+
+    def importMetadata(self, rows):
+        """Queue metadata `rows` to import
+
+        Given `rows` is a list of tuple (hash, metadata as json string, file format,
+        parser version, indexed columns values); metadata already in database are
+        not replaced, unless they've been read with another version of parser
+        """
+        for index in range(0, len(rows), BCFileCacheWriter.BATCH_SIZE):
+            self.__queue.put((BCFileCacheWriter.__ACTION_IMPORT, rows[index:index + BCFileCacheWriter.BATCH_SIZE]))
+
+    def setDirectory(self, path):
+        """Queue directory `path`"""
+        self.__queue.put((BCFileCacheWriter.__ACTION_DIRECTORY, path))
+
+    def setSnapshot(self, path, entries):
+        """Queue snapshot `entries` for directory `path`
+
+        Given `entries` is a list of tuple (name, size, mtime, inode, qHash, format)
+        """
+        self.__queue.put((BCFileCacheWriter.__ACTION_SNAPSHOT, path, entries))
+
+    def flush(self):
+        """Wait until all queued items are written in database"""
+        if not self.isRunning():
+            return
+        semaphore = QSemaphore(0)
+        self.__queue.put((BCFileCacheWriter.__ACTION_FLUSH, semaphore))
+        semaphore.acquire()
+
+    def stop(self):
+        """Write queued items and stop thread"""
+        if not self.isRunning():
+            return
+        self.__queue.put((BCFileCacheWriter.__ACTION_STOP, ))
+        self.wait()
+
+
+class BCFileCachePrefetch(object):
+    """qHash and metadata read from cache with bulk queries for a listing
+
+    An instance is created for each listing/search and given to BCFileCache
+    instances used to build files, then concurrent listings don't share (nor
+    clear) prefetched data of each other
+
+    Data are written before workers are started, and only read by them
+    """
+
+    def __init__(self):
+        # key=full path file name, value=tuple(file size, qHash)
+        self.__qHash = {}
+        # key=qHash, value=metadata json string (None if not in cache)
+        self.__metadata = {}
+
+    def update(self, files, metadata):
+        """Add prefetched data
+
+        Given `files` is a dictionary
+            key = full path file name
+            value = tuple (file size, qHash)
+        Given `metadata` is a dictionary
+            key = qHash
+            value = metadata json string, or None if not in cache
+        """
+        self.__qHash.update(files)
+        self.__metadata.update(metadata)
+
+    def quickHash(self, fileName, fileSize):
+        """Return prefetched qHash for given `fileName`
+
+        If there's no prefetched qHash or if file size has changed since qHash has
+        been prefetched, return None
+        """
+        prefetched = self.__qHash.get(fileName)
+        if prefetched is not None and prefetched[0] == fileSize:
+            return prefetched[1]
+        return None
+
+    def hasMetadata(self, hash):
+        """Return True if metadata for given `hash` have been prefetched (even if
+        not found in cache)
+        """
+        return hash in self.__metadata
+
+    def metadata(self, hash):
+        """Return prefetched metadata json string for given `hash`, or None"""
+        return self.__metadata.get(hash)
+
+
+class BCFileCache(QObject):
+    """Manage BCFile cache in a SQLite database"""
+
+    # Cache is stored in a SQLite file to improve performances
+    # - use less space on disk than unitary file
+    # - avoid to open/close files (faster to read content from sqlite file than on many small files)
+    #   => https://www.sqlite.org/fasterthanfs.html
+    #
+    # Problem:
+    #   => Cache is (in most case) read/updated through workers
+    #   Each thread needs its own database connection, and when many connections
+    #   try to write in database, they compete for the SQLite write lock:
+    #   - Outside transaction: slow
+    #   - Within transaction: the first worker who start a transaction lock the
+    #     database, all other workers wait for database is unlocked
+    #
+    # Solution:
+    #   Use only one writer
+    #
+    #                       ╔═══════════════════════════════════════╗
+    #                       ║ ┌───┬───┬───┬───┬───┬───┬───┬───┬───┐ ║
+    # Pool of data          ║ │ 1 │ 2 │ 3 │ 4 │ 5 │ 6 │ ..... │ N │ ║           Pool contains a list of files to process
+    #                       ║ └───┴───┴───┴───┴───┴───┴───┴───┴───┘ ║
+    #                       ╚═╤══════╤══════╤══════╤══════╤══════╤══╝
+    #                         ┊      ┊      ┊      ┊      ┊      ┊
+    #                         ▽      ▽      ▽      ▽      ▽      ▽
+    #                         ┊      ┊      ┊      ┊      ┊      ┊
+    #                       ┌─┴─┐  ┌─┴─┐  ┌─┴─┐  ┌─┴─┐  ┌─┴─┐  ┌─┴─┐            Each worker is connected to pool of data to process,
+    #  Workers              │ 1 │  │ 2 │  │ 3 │  │...│  │...│  │ n │            picking next available data in pool
+    #                       └─┬─┘  └─┬─┘  └─┬─┘  └─┬─┘  └─┬─┘  └─┬─┘
+    #                         ┊      ┊      ┊      ┊      ┊      ┊
+    #                       ┌─┴─┐  ┌─┴─┐  ┌─┴─┐  ┌─┴─┐  ┌─┴─┐  ┌─┴─┐            One read only database connection per thread
+    #  DB Connection (read) │ 1 │  │ 2 │  │ 3 │  │...│  │...│  │ n │            (Different thread can't use the same database connection)
+    #                       └─┬─┘  └─┬─┘  └─┬─┘  └─┬─┘  └─┬─┘  └─┬─┘
+    #                         ┊ ╲    ┊ ╲    ┊ ╲    ┊ ╲    ┊ ╲    ┊ ╲
+    #                         ┊  ╲╌╌╌┊╌╌╲╌╌╌┊╌╌╲╌╌╌┊╌╌╲╌╌╌┊╌╌╲╌╌╌┊╌╌╲╌╌╌╌╌╌╮
+    #                         ┊      ┊      ┊      ┊      ┊      ┊        ┊
+    #                         ┊      ┊      ┊      ┊      ┊      ┊      ┌─┴─┐     Metadata to write are put in a queue
+    #  Writer                 ┊      ┊      ┊      ┊      ┊      ┊      │ W │     and written by one thread, committed
+    #                         ┊      ┊      ┊      ┊      ┊      ┊      └─┬─┘     by batches
+    #                       ╔═╧══════╧══════╧══════╧══════╧══════╧════════╧═╗
+    #  Database file (WAL)  ║                                               ║    Readers are not blocked by writer
+    #                       ╚═══════════════════════════════════════════════╝
+    #
+    #  Queued metadata not yet written are also returned to readers, then a file
+    #  is not parsed twice because its metadata are waiting to be committed
+    #
+    #  But there's exception
+    #  In case of files with differents names but same content (same hash), read at
+    #  the same time by different workers, metadata will be processed X times
+    #  This case is not considered as a problem; execution time is insignificant
+    #
+    #  When a whole directory is listed, metadata can be prefetched:
+    #  - qHash of files are calculated by workers
+    #  - metadata for all qHash are read by global instance with a few bulk queries
+    #    (WHERE hash IN (...), by chunks of __BULK_SIZE hashes)
+    #  - workers creating BCFile get prefetched qHash and metadata from memory,
+    #    without any query on database
+    #  Prefetched data are stored in a BCFileCachePrefetch, one per listing, and
+    #  are given to BCFileCache instances used by its workers
+    #
+    #  Most used image properties (size, format, ...) are stored in dedicated
+    #  indexed columns, then search rules on image properties can be applied by
+    #  SQL queries: when metadata are prefetched, files for which metadata don't
+    #  match rules are excluded without reading their json metadata
+    #
+
+    __BC_CACHE_PATH = ''
+    __BC_CACHE_FILE = None
+    __DB_EXPECTED_VERSION = 104   # 1.04
+
+    __GLOBAL_INSTANCE = None
+    __WRITER = None
+
+    # SQLite default maximum number of host parameters is 999
+    __BULK_SIZE = 500
+
+    # maintenance options; 0 means no limit
+    __OPTION_MAX_AGE = 0      # in days
+    __OPTION_MAX_SIZE = 0     # in bytes
+
+    # metadata properties stored in dedicated columns
+    #   key = column name
+    #   value = tuple (metadata key, SQL type)
+    __INDEXED_COLUMNS = {
+            'width': ('width', 'NUMERIC'),
+            'height': ('height', 'NUMERIC'),
+            'bitDepth': ('bitDepth', 'INTEGER'),
+            'colorType': ('colorType', 'TEXT'),
+            'frameCount': ('imageCount', 'INTEGER'),
+            'dpi': ('resolutionX', 'REAL')
+        }
+    INDEXED_COLUMNS = tuple(__INDEXED_COLUMNS.keys())
+    INDEXED_COLUMNS_SQL = ', '.join(INDEXED_COLUMNS)
+    INDEXED_COLUMNS_SQL_BIND = ', '.join([f':{column}' for column in INDEXED_COLUMNS])
+    INDEXED_COLUMNS_SQL_UPDATE = ', '.join([f'{column}=excluded.{column}' for column in INDEXED_COLUMNS])
+
+    @staticmethod
+    def indexedColumnsValues(metadata):
+        """Return a tuple of values for indexed columns (in INDEXED_COLUMNS order)
+        from given `metadata` dictionary
+
+        Value is None when property is not available in metadata
+        """
+        if not isinstance(metadata, dict):
+            return tuple([None] * len(BCFileCache.INDEXED_COLUMNS))
+
+        returned = []
+        for column, (key, sqlType) in BCFileCache.__INDEXED_COLUMNS.items():
+            value = metadata.get(key)
+            if value is None and column == 'frameCount':
+                # Krita files animation
+                value = metadata.get('imageNbKeyFrames')
+
+            if isinstance(value, (list, tuple)):
+                # some properties are stored as tuple (value, displayed value)
+                value = value[0] if len(value) > 0 else None
+
+            if value is None:
+                returned.append(None)
+            elif sqlType == 'TEXT':
+                returned.append(f"{value}")
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                returned.append(value)
+            else:
+                returned.append(None)
+        return tuple(returned)
+
+    @staticmethod
+    def __setCacheDirectory(bcCachePath=None):
+        """Set current cache directory
+
+        If no value provided, reset to default value
+        """
+        if bcCachePath is None or bcCachePath == '':
+            bcCachePath = os.path.join(QStandardPaths.writableLocation(QStandardPaths.CacheLocation), "bulicommander")
+        else:
+            bcCachePath = os.path.expanduser(bcCachePath)
+
+        if not isinstance(bcCachePath, str):
+            raise EInvalidType("Given `bcCachePath` must be a valid <str> ")
+
+        try:
+            BCFileCache.__BC_CACHE_PATH = bcCachePath
+
+            os.makedirs(bcCachePath, exist_ok=True)
+        except Exception as e:
+            Debug.print('[BCFile.setCacheDirectory] Unable to create directory: {0} / {1}', bcCachePath, f"{e}")
+
+    @staticmethod
+    def initialise(bcCachePath=None):
+        """Initialise cache
+
+        If no database cache exists, create it
+        """
+        BCFileCache.__setCacheDirectory(bcCachePath)
+        if BCFileCache.__GLOBAL_INSTANCE is None:
+            BCFileCache.__GLOBAL_INSTANCE = BCFileCache()
+
+        if BCFileCache.__WRITER is None:
+            # global instance create database schema if needed; writer can be started
+            BCFileCache.__WRITER = BCFileCacheWriter(BCFileCache.cacheFile(), BCFileCache.__OPTION_MAX_AGE, BCFileCache.__OPTION_MAX_SIZE)
+            BCFileCache.__WRITER.start()
+
+    @staticmethod
+    def finalize():
+        if BCFileCache.__WRITER is not None:
+            BCFileCache.__WRITER.stop()
+            BCFileCache.__WRITER = None
+
+        if BCFileCache.__GLOBAL_INSTANCE is not None:
+            BCFileCache.__GLOBAL_INSTANCE.close()
+            BCFileCache.__GLOBAL_INSTANCE = None
+
+    @staticmethod
+    def flush():
+        """Wait until all queued metadata are written in database"""
+        if BCFileCache.__WRITER is not None:
+            BCFileCache.__WRITER.flush()
+
+    @staticmethod
+    def setOptionMaxAge(value):
+        """Set maximum number of days metadata are kept in cache when not used
+
+        0 means metadata are never purged
+        """
+        if not isinstance(value, int):
+            raise EInvalidType("Given `value` must be <int>")
+        BCFileCache.__OPTION_MAX_AGE = max(0, value)
+        if BCFileCache.__WRITER is not None:
+            BCFileCache.__WRITER.setOptions(BCFileCache.__OPTION_MAX_AGE, BCFileCache.__OPTION_MAX_SIZE)
+
+    @staticmethod
+    def setOptionMaxSize(value):
+        """Set maximum size (in bytes) of cache database
+
+        When database is bigger, least recently used metadata are removed
+        0 means no limit
+        """
+        if not isinstance(value, int):
+            raise EInvalidType("Given `value` must be <int>")
+        BCFileCache.__OPTION_MAX_SIZE = max(0, value)
+        if BCFileCache.__WRITER is not None:
+            BCFileCache.__WRITER.setOptions(BCFileCache.__OPTION_MAX_AGE, BCFileCache.__OPTION_MAX_SIZE)
+
+    @staticmethod
+    def cacheDirectory():
+        """Return current cache directory"""
+        return BCFileCache.__BC_CACHE_PATH
+
+    @staticmethod
+    def cacheFile():
+        """Return SQlite databse cache file"""
+        if BCFileCache.__BC_CACHE_FILE is None:
+            BCFileCache.__BC_CACHE_FILE = os.path.join(BCFileCache.__BC_CACHE_PATH, f'metaDataCache.sqlite')
+        return BCFileCache.__BC_CACHE_FILE
+
+    @staticmethod
+    def globalInstance():
+        """Return a global instance of cache database"""
+        if BCFileCache.__GLOBAL_INSTANCE is None:
+            BCFileCache.initialise()
+        return BCFileCache.__GLOBAL_INSTANCE
+
+    def __init__(self, id=None, prefetch=None):
+        """Given `id` is used when database is accessed through Workers; each thread need its own database reference
+
+        When `id` is provided, database connection is read only (writes are made
+        through BCFileCacheWriter)
+
+        Given `prefetch` is a BCFileCachePrefetch from which qHash and metadata
+        are read before querying database
+        """
+        super(BCFileCache, self).__init__()
+
+        self.__id = id
+        self.__prefetch = prefetch if isinstance(prefetch, BCFileCachePrefetch) else None
 
         if isinstance(id, str):
             self.__databaseInstance = QSqlDatabase.addDatabase("QSQLITE", f"dbBCFileCache{self.__id}")
@@ -4616,13 +6066,11 @@ class BCFileCache(QObject):
         self.__databaseQueryGetMetadata = None
         self.__databaseQuerySetDirectory = None
         self.__databaseQueryGetDirectory = None
+        self.__databaseQueryGetSnapshot = None
 
         # database filename
         self.__fileName = BCFileCache.cacheFile()
 
-        # flag to determinate if there's data to flush
-        self.__dataToFlush = False
-
         self.__open()
 
     def __initializeQueries(self):
@@ -4630,23 +6078,26 @@ class BCFileCache(QObject):
         if self.__databaseInstance is None:
             return
 
-        # prepare query that will be used to set metadata in cache
         if self.__id is None:
-            dbSchema = ''
-        else:
-            dbSchema = '`tmpDb`.'
-        self.__databaseQuerySetMetadata = QSqlQuery(self.__databaseInstance)
-        self.__databaseQuerySetMetadata.prepare(f"""
-                INSERT INTO {dbSchema}`metadata` (hash, metadata, fileFormat)
-                            VALUES(:hash, :metadata, :fileFormat)
-                ON CONFLICT(hash)
-                            DO UPDATE SET metadata=:metadata
-            """)
+            # prepare query that will be used to set metadata in cache when
+            # writer is not available
+            self.__databaseQuerySetMetadata = QSqlQuery(self.__databaseInstance)
+            self.__databaseQuerySetMetadata.prepare(f"""
+                    INSERT INTO `metadata` (hash, metadata, fileFormat, parserVersion, lastAccess, {BCFileCache.INDEXED_COLUMNS_SQL}, indexed)
+                                VALUES(:hash, :metadata, :fileFormat, :parserVersion, :lastAccess, {BCFileCache.INDEXED_COLUMNS_SQL_BIND}, 1)
+                    ON CONFLICT(hash)
+                                DO UPDATE SET metadata=excluded.metadata,
+                                              fileFormat=excluded.fileFormat,
+                                              parserVersion=excluded.parserVersion,
+                                              lastAccess=excluded.lastAccess,
+                                              {BCFileCache.INDEXED_COLUMNS_SQL_UPDATE},
+                                              indexed=1
+                """)
 
         # prepare query that will be used to get metadata in cache
         self.__databaseQueryGetMetadata = QSqlQuery(self.__databaseInstance)
         self.__databaseQueryGetMetadata.prepare("""
-                SELECT metadata
+                SELECT metadata, fileFormat, parserVersion
                 FROM metadata
                 WHERE hash=:hash
             """)
@@ -4667,14 +6118,24 @@ class BCFileCache(QObject):
                 FROM directories
             """)
 
+        # prepare query that will be used to get directory snapshot
+        self.__databaseQueryGetSnapshot = QSqlQuery(self.__databaseInstance)
+        self.__databaseQueryGetSnapshot.setForwardOnly(True)
+        self.__databaseQueryGetSnapshot.prepare("""
+                SELECT name, size, mtime, inode, qHash, format
+                FROM snapshots
+                WHERE path=:path
+            """)
+
     def __updateDatabaseVersion(self):
         """Update database version"""
         sqlQuery = QSqlQuery(self.__databaseInstance)
         upToDate = True
-        version = 0
+        updatedVersion = self.__db_version
 
-        if self.__db_version == 0:
+        if updatedVersion == 0:
             # need to create database schema
+            # (auto_vacuum mode is defined in __open(), before tables are created)
             updatedVersion = 100
 
             # Create the main metadata table
@@ -4707,22 +6168,84 @@ class BCFileCache(QObject):
                     """):
                 upToDate = False
 
-        if upToDate and self.__id is not None:
-            # create temporary metadata table in an "memory" database if
-            # an id has been provided
-            if not sqlQuery.exec("""
-                CREATE TABLE `tmpDb`.`metadata` (
-                    `hash` TEXT NOT NULL UNIQUE,
-                    `metadata` TEXT,
-                    `fileFormat` TEXT,
-                    PRIMARY KEY(`hash`)
+        if upToDate and updatedVersion == 100:
+            updatedVersion = 101
+
+            # Create the snapshots table
+            #   Last known content of directories, used to display directory
+            #   content without scanning it
+            #       path=       directory location
+            #       name=       file/directory name
+            #       size=       file size
+            #       mtime=      file last modification time
+            #       inode=      file inode
+            #       qHash=      file qHash (empty for directories)
+            #       format=     file format (BCFileManagedFormat value)
+            if upToDate and not sqlQuery.exec("""
+                CREATE TABLE `snapshots` (
+                    `path` TEXT NOT NULL,
+                    `name` TEXT NOT NULL,
+                    `size` INTEGER,
+                    `mtime` REAL,
+                    `inode` INTEGER,
+                    `qHash` TEXT,
+                    `format` TEXT,
+                    PRIMARY KEY(`path`, `name`)
                 )
                     """):
                 upToDate = False
 
+        if upToDate and updatedVersion == 101:
+            updatedVersion = 102
+
+            # Add last access time to metadata
+            #   lastAccess= last time metadata has been read or written, used to
+            #               purge metadata not used anymore
+            if upToDate and not sqlQuery.exec("ALTER TABLE `metadata` ADD COLUMN `lastAccess` REAL"):
+                upToDate = False
+
+            if upToDate and not sqlQuery.exec(f"UPDATE `metadata` SET `lastAccess`={time.time()}"):
+                upToDate = False
+
+            if upToDate and not sqlQuery.exec("CREATE INDEX `metadata_lastAccess` ON `metadata` (`lastAccess`)"):
+                upToDate = False
+
+            if upToDate and not sqlQuery.exec("CREATE INDEX `snapshots_qHash` ON `snapshots` (`qHash`)"):
+                upToDate = False
+
+        if upToDate and updatedVersion == 102:
+            updatedVersion = 103
+
+            # Add indexed columns to metadata
+            #   width, height, bitDepth, colorType, frameCount, dpi=
+            #               image properties copied from json metadata, used to
+            #               apply search rules from SQL queries
+            #   indexed=    1 if columns have been calculated from metadata
+            #               (existing metadata are indexed by writer during idle time)
+            for column, (key, sqlType) in BCFileCache.__INDEXED_COLUMNS.items():
+                if upToDate and not sqlQuery.exec(f"ALTER TABLE `metadata` ADD COLUMN `{column}` {sqlType}"):
+                    upToDate = False
+
+            if upToDate and not sqlQuery.exec("ALTER TABLE `metadata` ADD COLUMN `indexed` INTEGER NOT NULL DEFAULT 0"):
+                upToDate = False
+
+            for columns in (('fileFormat', ), ('width', ), ('height', )):
+                if upToDate and not sqlQuery.exec(f"CREATE INDEX `metadata_{'_'.join(columns)}` ON `metadata` ({', '.join(columns)})"):
+                    upToDate = False
+
+        if upToDate and updatedVersion == 103:
+            updatedVersion = 104
+
+            # Add metadata parser version to metadata
+            #   parserVersion=  version of parser used to read metadata (see
+            #                   BCFile.metadataParserVersion()); metadata written
+            #                   by previous versions have been read by version 1
+            if upToDate and not sqlQuery.exec("ALTER TABLE `metadata` ADD COLUMN `parserVersion` INTEGER NOT NULL DEFAULT 1"):
+                upToDate = False
+
         if upToDate:
             # all tables has been created!
-            if self.__db_version != BCFileCache.__DB_EXPECTED_VERSION:
+            if self.__db_version != updatedVersion:
                 # update version if needed
                 if sqlQuery.exec(f"PRAGMA user_version={updatedVersion}"):
                     self.__db_version = updatedVersion
@@ -4731,38 +6254,12 @@ class BCFileCache(QObject):
 
         if not upToDate:
             # unable to create/update database schema
-            Debug.print(f"[BCFileCache.__updateDatabaseVersion] Unable to create/update cache database schema: 0.00 ==> {updatedVersion/100:.2f}", )
+            Debug.print(f"[BCFileCache.__updateDatabaseVersion] Unable to create/update cache database schema: {self.__db_version/100:.2f} ==> {updatedVersion/100:.2f}", )
 
         sqlQuery.finish()
 
         return upToDate
 
-    def __flushMemoryDatabase(self):
-        """Flush data from memory database"""
-        if self.__databaseInstance is None or self.__id is None or not self.__dataToFlush:
-            return False
-
-        sqlQuery = QSqlQuery(self.__databaseInstance)
-        # WHERE clause is mandatory to let parser being able to understand the ON CONFLICT statement
-        #  https://www.sqlite.org/lang_upsert.html
-        #  chapter 2.2 Parsing Ambiguity
-        # sqlQuery.exec("BEGIN IMMEDIATE TRANSACTION")
-        if sqlQuery.exec("""
-            INSERT INTO metadata (hash, metadata, fileFormat)
-                SELECT hash, metadata, fileFormat FROM tmpDb.metadata
-                WHERE true
-            ON CONFLICT(hash)
-                DO UPDATE SET metadata=excluded.metadata,
-                             fileFormat=excluded.fileFormat
-                """):
-            self.__dataToFlush = False
-            # sqlQuery.exec("COMMIT TRANSACTION")
-            sqlQuery.finish()
-            return True
-        # sqlQuery.exec("ROLLBACK TRANSACTION")
-        sqlQuery.finish()
-        return False
-
     def __open(self):
         """Open database"""
         if self.__databaseInstance is None:
@@ -4772,19 +6269,24 @@ class BCFileCache(QObject):
                 self.__databaseInstance = QSqlDatabase.addDatabase("QSQLITE",  "dbBCFileCache")
 
         self.__databaseInstance.setDatabaseName(self.__fileName)
+        if self.__id is None:
+            self.__databaseInstance.setConnectOptions(f"QSQLITE_BUSY_TIMEOUT={BCFileCacheWriter.BUSY_TIMEOUT}")
+        else:
+            # workers connections are only used to read database
+            self.__databaseInstance.setConnectOptions(f"QSQLITE_OPEN_READONLY;QSQLITE_BUSY_TIMEOUT={BCFileCacheWriter.BUSY_TIMEOUT}")
 
         if self.__databaseInstance.open():
             # database is opened, prepare database
             sqlQuery = QSqlQuery(self.__databaseInstance)
 
-            # create a temporary database in memory
-            # will be used to insert/update cache data in multithread mode
-            if not sqlQuery.exec(f"ATTACH DATABASE ':memory:' AS tmpDb"):
-                # can't attach memory database??
-                # do not continue
-                self.__databaseInstance.close()
-                self.__databaseInstance = None
-                return False
+            # database can be shared by many processes (Krita instances): when
+            # schema has to be created/updated, database is locked while version
+            # is checked, then schema is updated only once
+            if self.__id is None:
+                # auto_vacuum mode must be defined before tables are created, and
+                # outside a transaction (no effect on an existing database)
+                sqlQuery.exec("PRAGMA auto_vacuum=INCREMENTAL")
+            locked = self.__id is None and sqlQuery.exec("BEGIN IMMEDIATE TRANSACTION")
 
             # need to check version
             if sqlQuery.exec("PRAGMA user_version"):
@@ -4792,18 +6294,29 @@ class BCFileCache(QObject):
                     self.__db_version = sqlQuery.value('user_version')
                     break
 
-                if not self.__updateDatabaseVersion():
+                if self.__id is not None and self.__db_version != BCFileCache.__DB_EXPECTED_VERSION:
+                    # read only connection can't create/update database schema
+                    self.__databaseInstance.close()
+                    self.__databaseInstance = None
+                    return False
+                elif not self.__updateDatabaseVersion():
                     # database schema is not correct and/or unable to create/update database schema
+                    if locked:
+                        sqlQuery.exec("ROLLBACK TRANSACTION")
                     self.__databaseInstance.close()
                     self.__databaseInstance = None
                     return False
 
+            if locked:
+                sqlQuery.exec("COMMIT TRANSACTION")
+
             self.__initializeQueries()
 
             # db settings
-            for pragma in ["PRAGMA journal_mode=WAL"]:
-                if not sqlQuery.exec(pragma):
-                    Debug.print(f"Can't set: {pragma}")
+            if self.__id is None:
+                for pragma in ["PRAGMA journal_mode=WAL"]:
+                    if not sqlQuery.exec(pragma):
+                        Debug.print(f"Can't set: {pragma}")
 
             return True
         else:
@@ -4813,12 +6326,22 @@ class BCFileCache(QObject):
         """Return current database file name"""
         return self.__fileName
 
+    def prefetch(self):
+        """Return BCFileCachePrefetch used by instance, or None"""
+        return self.__prefetch
+
+    def prefetchedQuickHash(self, fileName, fileSize):
+        """Return prefetched qHash for given `fileName`, or None if not prefetched
+
+        See BCFileCachePrefetch.quickHash()
+        """
+        if self.__prefetch is None:
+            return None
+        return self.__prefetch.quickHash(fileName, fileSize)
+
     def close(self):
         """Close cache database if open"""
         if self.__databaseInstance:
-            self.__flushMemoryDatabase()
-            if self.__id is not None:
-                self.__databaseInstance.exec(f"DETACH DATABASE tmpDb")
             self.__databaseInstance.close()
             self.__databaseInstance = None
 
@@ -4831,6 +6354,8 @@ class BCFileCache(QObject):
         """Set `metadata` for `hash`
 
         If exist, update otherwise insert
+        Metadata are queued to BCFileCacheWriter; if writer is not started, metadata
+        are directly written from global instance
         If database is not opened, do nothing
 
         Return True if metadata are set, otherwise false
@@ -4838,6 +6363,7 @@ class BCFileCache(QObject):
         if self.__databaseInstance is None:
             return False
 
+        columns = BCFileCache.indexedColumnsValues(metadata)
         if isinstance(metadata, dict) and 'format' in metadata:
             fileFormat = metadata['format']
             # convert it to string
@@ -4848,15 +6374,24 @@ class BCFileCache(QObject):
         else:
             fileFormat = BCFileManagedFormat.UNKNOWN
             metadata = '{}'
+        parserVersion = BCFile.metadataParserVersion(fileFormat)
+
+        if BCFileCache.__WRITER is not None:
+            BCFileCache.__WRITER.setMetadata(hash, metadata, fileFormat, columns, parserVersion)
+            return True
+        elif self.__id is not None:
+            # read only connection
+            return False
 
         self.__databaseQuerySetMetadata.bindValue(":hash", hash)
         self.__databaseQuerySetMetadata.bindValue(":metadata", metadata)
         self.__databaseQuerySetMetadata.bindValue(":fileFormat", fileFormat)
+        self.__databaseQuerySetMetadata.bindValue(":parserVersion", parserVersion)
+        self.__databaseQuerySetMetadata.bindValue(":lastAccess", time.time())
+        for column, value in zip(BCFileCache.INDEXED_COLUMNS, columns):
+            self.__databaseQuerySetMetadata.bindValue(f":{column}", value)
 
-        if self.__databaseQuerySetMetadata.exec():
-            self.__dataToFlush = (self.__id is not None)
-            return True
-        return False
+        return self.__databaseQuerySetMetadata.exec()
 
     def getMetadata(self, hash):
         """Return `metadata` for `hash`
@@ -4868,9 +6403,34 @@ class BCFileCache(QObject):
         if self.__databaseInstance is None:
             return None
 
+        if BCFileCache.__WRITER is not None:
+            metadata = BCFileCache.__WRITER.pendingMetadata(hash)
+            if metadata is not None:
+                try:
+                    return json.loads(metadata, cls=JsonQObjectDecoder)
+                except Exception as e:
+                    Debug.print('Unable to load meta cache data ({2}) {0}: {1}', metadata, f"{e}", hash)
+                    return None
+
+        if self.__prefetch is not None and self.__prefetch.hasMetadata(hash):
+            metadata = self.__prefetch.metadata(hash)
+            if metadata is None:
+                # prefetched, but not in cache
+                return None
+            try:
+                return json.loads(metadata, cls=JsonQObjectDecoder)
+            except Exception as e:
+                Debug.print('Unable to load meta cache data ({2}) {0}: {1}', metadata, f"{e}", hash)
+                return None
+
         self.__databaseQueryGetMetadata.bindValue(":hash", hash)
         if self.__databaseQueryGetMetadata.exec():
             while self.__databaseQueryGetMetadata.next():
+                if self.__databaseQueryGetMetadata.value('parserVersion') != BCFile.metadataParserVersion(self.__databaseQueryGetMetadata.value('fileFormat')):
+                    # read with another version of parser: need to be read again
+                    return None
+                if BCFileCache.__WRITER is not None:
+                    BCFileCache.__WRITER.touchMetadata((hash, ))
                 try:
                     return json.loads(self.__databaseQueryGetMetadata.value('metadata'), cls=JsonQObjectDecoder)
                 except Exception as e:
@@ -4878,6 +6438,205 @@ class BCFileCache(QObject):
                     return None
         return None
 
+    def __getMetadataJsonList(self, hashes, sqlFilter=None):
+        """Return a tuple (metadata, excluded hashes) for given `hashes`
+        - metadata: json string as a dictionary
+            key = hash
+            value = metadata as json string
+        - excluded hashes: set of hashes for which metadata don't match `sqlFilter`
+
+        Hashes for which there's no metadata in cache, or metadata read with
+        another version of parser, are not returned
+
+        If provided, `sqlFilter` is a tuple (SQL condition, list of values) as
+        returned by BCFileList.sqlFilter(), applied on indexed columns; metadata
+        that don't match filter are not read
+        Metadata not yet indexed, and metadata queued in writer, are considered to
+        match filter
+        """
+        returned = {}
+        excluded = set()
+        if self.__databaseInstance is None:
+            return (returned, excluded)
+
+        if sqlFilter is None:
+            sqlSelect = "metadata"
+            sqlValues = []
+        else:
+            # metadata that can't be indexed (no width) always match
+            sqlSelect = f"CASE WHEN indexed=0 OR width IS NULL OR ({sqlFilter[0]}) THEN metadata END"
+            sqlValues = sqlFilter[1]
+
+        # remove duplicates and empty hashes
+        hashes = {hash for hash in hashes if hash}
+
+        if BCFileCache.__WRITER is not None and len(hashes) > 0:
+            returned = BCFileCache.__WRITER.pendingMetadataList(hashes)
+            hashes.difference_update(returned.keys())
+
+        hashes = list(hashes)
+        sqlQuery = None
+        sqlQuerySize = 0
+        for index in range(0, len(hashes), BCFileCache.__BULK_SIZE):
+            chunk = hashes[index:index + BCFileCache.__BULK_SIZE]
+
+            if len(chunk) != sqlQuerySize:
+                # need to prepare query for a different number of hashes (last chunk)
+                if sqlQuery is not None:
+                    sqlQuery.finish()
+                sqlQuerySize = len(chunk)
+                sqlQuery = QSqlQuery(self.__databaseInstance)
+                sqlQuery.setForwardOnly(True)
+                sqlQuery.prepare(f"""
+                        SELECT hash, {sqlSelect}, fileFormat, parserVersion
+                        FROM metadata
+                        WHERE hash IN ({', '.join(['?'] * sqlQuerySize)})
+                    """)
+
+            for position, value in enumerate(sqlValues):
+                sqlQuery.bindValue(position, value)
+            for position, hash in enumerate(chunk, len(sqlValues)):
+                sqlQuery.bindValue(position, hash)
+
+            if sqlQuery.exec():
+                while sqlQuery.next():
+                    if sqlQuery.value(3) != BCFile.metadataParserVersion(sqlQuery.value(2)):
+                        # read with another version of parser: need to be read again
+                        continue
+
+                    metadata = sqlQuery.value(1)
+                    if metadata is None or metadata == '':
+                        # NULL: doesn't match filter
+                        excluded.add(sqlQuery.value(0))
+                    else:
+                        returned[sqlQuery.value(0)] = metadata
+            else:
+                Debug.print('[BCFileCache.__getMetadataJsonList] Unable to read metadata: {0}', sqlQuery.lastError().text())
+
+        if sqlQuery is not None:
+            sqlQuery.finish()
+
+        if BCFileCache.__WRITER is not None and len(returned) > 0:
+            BCFileCache.__WRITER.touchMetadata(returned.keys())
+
+        return (returned, excluded)
+
+    def getMetadataRows(self, hashes):
+        """Return metadata for given list of `hashes`, as stored in database
+
+        Metadata are read with bulk queries and returned as a dictionary
+            key = hash
+            value = tuple (metadata as json string, file format, parser version)
+
+        Hashes for which there's no metadata in cache are not returned
+        """
+        returned = {}
+        if self.__databaseInstance is None:
+            return returned
+
+        hashes = list({hash for hash in hashes if hash})
+        sqlQuery = QSqlQuery(self.__databaseInstance)
+        sqlQuery.setForwardOnly(True)
+        for index in range(0, len(hashes), BCFileCache.__BULK_SIZE):
+            chunk = hashes[index:index + BCFileCache.__BULK_SIZE]
+            sqlQuery.prepare(f"""
+                    SELECT hash, metadata, fileFormat, parserVersion
+                    FROM metadata
+                    WHERE hash IN ({', '.join(['?'] * len(chunk))})
+                """)
+            for position, hash in enumerate(chunk):
+                sqlQuery.bindValue(position, hash)
+
+            if sqlQuery.exec():
+                while sqlQuery.next():
+                    returned[sqlQuery.value(0)] = (sqlQuery.value(1), sqlQuery.value(2), sqlQuery.value(3))
+            else:
+                Debug.print('[BCFileCache.getMetadataRows] Unable to read metadata: {0}', sqlQuery.lastError().text())
+        sqlQuery.finish()
+
+        return returned
+
+    def importMetadata(self, rows):
+        """Import metadata `rows` in cache
+
+        Given `rows` is a list of tuple (hash, metadata as json string, file format)
+        read with current version of parser
+        Metadata already in cache are not replaced: for the same hash and parser
+        version, metadata in cache are the same or more recent than imported ones;
+        metadata in cache read with another version of parser are replaced
+
+        Metadata are queued to BCFileCacheWriter
+        Return number of queued metadata
+        """
+        if self.__databaseInstance is None or BCFileCache.__WRITER is None:
+            return 0
+
+        queued = []
+        for hash, metadata, fileFormat in rows:
+            try:
+                columns = BCFileCache.indexedColumnsValues(json.loads(metadata, cls=JsonQObjectDecoder))
+            except Exception as e:
+                Debug.print('[BCFileCache.importMetadata] Invalid metadata ({2}) {0}: {1}', metadata, f"{e}", hash)
+                continue
+            queued.append((hash, metadata, fileFormat, BCFile.metadataParserVersion(fileFormat), columns))
+
+        BCFileCache.__WRITER.importMetadata(queued)
+        return len(queued)
+
+    def getMetadataList(self, hashes):
+        """Return metadata for given list of `hashes`
+
+        Metadata are read with bulk queries and returned as a dictionary
+            key = hash
+            value = metadata as a dictionary
+
+        Hashes for which there's no metadata in cache, or metadata read with
+        another version of parser, are not returned
+        If database is not opened, return an empty dictionary
+        """
+        returned = {}
+        for hash, metadata in self.__getMetadataJsonList(hashes)[0].items():
+            try:
+                returned[hash] = json.loads(metadata, cls=JsonQObjectDecoder)
+            except Exception as e:
+                Debug.print('Unable to load meta cache data ({2}) {0}: {1}', metadata, f"{e}", hash)
+        return returned
+
+    def prefetchMetadata(self, files, sqlFilter=None, prefetch=None):
+        """Prefetch metadata for given `files`
+
+        Given `files` is a dictionary
+            key = full path file name
+            value = tuple (file size, qHash)
+
+        Metadata are read with bulk queries and stored in given `prefetch`
+        (BCFileCachePrefetch); if not provided, they're stored in the instance's
+        one (created if needed)
+        BCFile created with a BCFileCache using this BCFileCachePrefetch get their
+        qHash and metadata without any calculation nor query on database
+
+        If `sqlFilter` is provided (see __getMetadataJsonList()), files for which
+        metadata in cache don't match filter are removed from given `files`
+        dictionary, and their metadata are not prefetched
+
+        Return number of files for which metadata have been found in cache
+        """
+        hashes = {prefetched[1] for prefetched in files.values() if prefetched[1]}
+        metadata, excluded = self.__getMetadataJsonList(hashes, sqlFilter)
+
+        if len(excluded) > 0:
+            for fileName in [fileName for fileName, prefetched in files.items() if prefetched[1] in excluded]:
+                files.pop(fileName)
+            hashes.difference_update(excluded)
+
+        if not isinstance(prefetch, BCFileCachePrefetch):
+            if self.__prefetch is None:
+                self.__prefetch = BCFileCachePrefetch()
+            prefetch = self.__prefetch
+        prefetch.update(files, {hash: metadata.get(hash) for hash in hashes})
+
+        return len([prefetched for prefetched in files.values() if prefetched[1] in metadata])
+
     def setDirectory(self, directory):
         """Set given directory in list"""
         if self.__databaseInstance is None:
@@ -4892,6 +6651,13 @@ class BCFileCache(QObject):
             if inTransaction:
                 return self.commitTransaction() and (nbKo == 0)
         elif isinstance(directory, str):
+            if BCFileCache.__WRITER is not None:
+                BCFileCache.__WRITER.setDirectory(directory)
+                return True
+            elif self.__id is not None:
+                # read only connection
+                return False
+
             self.__databaseQuerySetDirectories.bindValue(":path", directory)
             if self.__databaseQuerySetDirectories.exec():
                 return True
@@ -4914,10 +6680,78 @@ class BCFileCache(QObject):
 
         return returned
 
+    def setSnapshot(self, path, entries):
+        """Set snapshot for directory `path`
+
+        Given `entries` is a list of tuple (name, size, mtime, inode, qHash, format)
+        Previous snapshot for directory is replaced
+
+        Snapshot is queued to BCFileCacheWriter; if writer is not started, snapshot
+        is directly written from global instance
+        """
+        if self.__databaseInstance is None:
+            return False
+
+        if BCFileCache.__WRITER is not None:
+            BCFileCache.__WRITER.setSnapshot(path, entries)
+            return True
+        elif self.__id is not None:
+            # read only connection
+            return False
+
+        sqlQuery = QSqlQuery(self.__databaseInstance)
+        self.beginTransaction()
+        sqlQuery.prepare("DELETE FROM snapshots WHERE path=:path")
+        sqlQuery.bindValue(":path", path)
+        if sqlQuery.exec():
+            sqlQuery.prepare("""
+                    INSERT INTO snapshots (path, name, size, mtime, inode, qHash, format)
+                                VALUES(:path, :name, :size, :mtime, :inode, :qHash, :format)
+                """)
+            sqlQuery.bindValue(":path", path)
+            for name, size, mtime, inode, qHash, fileFormat in entries:
+                sqlQuery.bindValue(":name", name)
+                sqlQuery.bindValue(":size", size)
+                sqlQuery.bindValue(":mtime", mtime)
+                sqlQuery.bindValue(":inode", inode)
+                sqlQuery.bindValue(":qHash", qHash)
+                sqlQuery.bindValue(":format", fileFormat)
+                if not sqlQuery.exec():
+                    break
+            else:
+                return self.commitTransaction()
+        self.rollbackTransaction()
+        return False
+
+    def getSnapshot(self, path):
+        """Return snapshot for directory `path` as a dictionary
+            key = name
+            value = tuple (size, mtime, inode, qHash, format)
+
+        If there's no snapshot for directory, return None
+        """
+        if self.__databaseInstance is None:
+            return None
+
+        returned = {}
+        self.__databaseQueryGetSnapshot.bindValue(":path", path)
+        if self.__databaseQueryGetSnapshot.exec():
+            while self.__databaseQueryGetSnapshot.next():
+                returned[self.__databaseQueryGetSnapshot.value(0)] = (self.__databaseQueryGetSnapshot.value(1),
+                                                                      self.__databaseQueryGetSnapshot.value(2),
+                                                                      self.__databaseQueryGetSnapshot.value(3),
+                                                                      self.__databaseQueryGetSnapshot.value(4),
+                                                                      self.__databaseQueryGetSnapshot.value(5))
+            self.__databaseQueryGetSnapshot.finish()
+
+        if len(returned) == 0:
+            return None
+        return returned
+
     def beginTransaction(self):
         """Begin a transaction if possible, otherwise is ignored
 
-        If an Id is provided, means we're working on memory database, and then ignore transaction action
+        If an Id is provided, means we're working on a read only connection, and then ignore transaction action
         """
         if self.__databaseInstance is None or not self.__databaseInstance.driver().hasFeature(QSqlDriver.Transactions) or self.__id is not None:
             return False
@@ -4926,7 +6760,7 @@ class BCFileCache(QObject):
     def commitTransaction(self):
         """Commit a transaction if possible, otherwise is ignored
 
-        If an Id is provided, means we're working on memory database, and then ignore transaction action
+        If an Id is provided, means we're working on a read only connection, and then ignore transaction action
         """
         if self.__databaseInstance is None or not self.__databaseInstance.driver().hasFeature(QSqlDriver.Transactions) or self.__id is not None:
             return False
@@ -4935,7 +6769,7 @@ class BCFileCache(QObject):
     def rollbackTransaction(self):
         """Rollback a transaction if possible, otherwise is ignored
 
-        If an Id is provided, means we're working on memory database, and then ignore transaction action
+        If an Id is provided, means we're working on a read only connection, and then ignore transaction action
         """
         if self.__databaseInstance is None or not self.__databaseInstance.driver().hasFeature(QSqlDriver.Transactions):
             return False
@@ -4946,8 +6780,14 @@ class BCFileCache(QObject):
         returned = {
                 'dbFile': self.__fileName,
                 'dbSize': 0,
+                'dbFreeSize': 0,
                 'nbHash': 0,
                 'nbDir': 0,
+                'nbSnapshot': 0,
+                'oldestAccess': None,
+                'incrementalVacuum': False,
+                'maxAge': BCFileCache.__OPTION_MAX_AGE,
+                'maxSize': BCFileCache.__OPTION_MAX_SIZE
             }
         # print('getStats')
 
@@ -4968,12 +6808,34 @@ class BCFileCache(QObject):
         if query.exec("SELECT count(*) AS nbHash FROM metadata"):
             # print('getStats: metadata')
             while query.next():
-                # print('getStats: metadata - '+f"{query.value('nbHash'}"))
-                returned['nbHash'] = int(query.value('nbHash'))
+                # print('getStats: metadata - '+f"{query.value('nbHash'}"))
+                returned['nbHash'] = int(query.value('nbHash'))
+
+        if query.exec("SELECT count(*) AS nbDir FROM directories"):
+            while query.next():
+                returned['nbDir'] = int(query.value('nbDir'))
+
+        if query.exec("SELECT count(DISTINCT path) AS nbSnapshot FROM snapshots"):
+            while query.next():
+                returned['nbSnapshot'] = int(query.value('nbSnapshot'))
+
+        if query.exec("SELECT min(lastAccess) AS oldestAccess FROM metadata"):
+            while query.next():
+                if query.value('oldestAccess'):
+                    returned['oldestAccess'] = float(query.value('oldestAccess'))
 
-        if query.exec("SELECT count(*) AS nbDir FROM directories"):
+        # size of free pages, that will be released by incremental vacuum
+        pageSize = 0
+        if query.exec("PRAGMA page_size"):
             while query.next():
-                returned['nbDir'] = int(query.value('nbDir'))
+                pageSize = int(query.value(0))
+        if query.exec("PRAGMA freelist_count"):
+            while query.next():
+                returned['dbFreeSize'] = pageSize * int(query.value(0))
+        # 2 = INCREMENTAL
+        if query.exec("PRAGMA auto_vacuum"):
+            while query.next():
+                returned['incrementalVacuum'] = (int(query.value(0)) == 2)
 
         query.finish()
 
@@ -4986,23 +6848,34 @@ class BCFileCache(QObject):
         if self.__databaseInstance is None:
             return False
 
+        # ensure there's no pending metadata
+        BCFileCache.flush()
+
         query = QSqlQuery(self.__databaseInstance)
 
         self.beginTransaction()
-        query.prepare("DELETE FROM metadata")
-        if query.exec():
-            query.prepare("DELETE FROM directories")
-            self.commitTransaction()
-            if query.exec():
-                return self.vacuum()
-        self.rollbackTransaction()
-        return False
+        for table in ('metadata', 'directories', 'snapshots'):
+            if not query.exec(f"DELETE FROM {table}"):
+                self.rollbackTransaction()
+                return False
+        self.commitTransaction()
+        return self.vacuum()
 
     def vacuum(self):
-        """Rebuild database content"""
+        """Rebuild database content
+
+        Database is switched to incremental auto vacuum mode if needed (free pages
+        are then released by writer during idle time)
+
+        Database is locked during the whole operation; this is a full VACUUM that
+        must be executed on user request only
+        """
         if self.__databaseInstance is None:
             return
 
+        # ensure there's no pending metadata
+        BCFileCache.flush()
+
         # to avoid SQL error: "cannot VACUUM - SQL statements in progress Unable to fetch row"
         # need to be seure that all SQL statement are processed
 
@@ -5017,7 +6890,11 @@ class BCFileCache(QObject):
 
         tmpDbVacuum = QSqlDatabase.addDatabase("QSQLITE",  "tmpDbVacuum")
         tmpDbVacuum.setDatabaseName(self.__fileName)
+        # database can be used by another process
+        tmpDbVacuum.setConnectOptions(f"QSQLITE_BUSY_TIMEOUT={BCFileCacheWriter.BUSY_TIMEOUT}")
         tmpDbVacuum.open()
+        # auto_vacuum mode is applied on existing database only after a VACUUM
+        tmpDbVacuum.exec("PRAGMA auto_vacuum=INCREMENTAL")
         tmpDbVacuum.exec("VACUUM")
         tmpDbVacuum.exec("PRAGMA wal_checkpoint(TRUNCATE)")
         tmpDbVacuum.close()
@@ -5026,6 +6903,475 @@ class BCFileCache(QObject):
         self.__open()
 
 
+class BCCacheWarmer(QThread):
+    """Warm cache in background for a list of directories and files
+
+    Metadata and thumbnails (of default thumbnail cache size) of images are
+    calculated and stored in cache, then the first time a directory is listed
+    everything is read from cache
+
+    Warming is processed in a low priority thread:
+    - it's paused while user is working: warming starts when no keyboard, mouse
+      or tablet event has been received during IDLE_DELAY
+      user events are filtered only while there's targets to warm; once everything
+      is warm, application events are not filtered anymore
+    - CPU usage is limited to a percentage of time: after a file has been processed,
+      thread sleeps according to processing duration
+    - disk read is limited to a volume of data per second
+
+    Progress is not stored by warmer: a file is warm when its thumbnail exists
+    in cache, then warming is resumed where it has been stopped on next session
+    """
+    activityTrackingChanged = Signal(bool)
+
+    IDLE_DELAY = 5              # in seconds
+
+    __USER_EVENTS = (QEvent.KeyPress,
+                     QEvent.MouseButtonPress,
+                     QEvent.MouseMove,
+                     QEvent.Wheel,
+                     QEvent.TabletPress,
+                     QEvent.TabletMove)
+
+    def __init__(self, cpu=25, io=0):
+        """Initialise warmer
+
+        Given `cpu` is maximum CPU usage, in percent
+        Given `io` is maximum disk read, in MB/s (0=no limit)
+        """
+        super(BCCacheWarmer, self).__init__()
+
+        self.__mutex = QMutex()
+        self.__waitCondition = QWaitCondition()
+        self.__stopRequested = False
+
+        # list of paths (directories and/or files) to warm, and already warmed paths
+        self.__targets = []
+        self.__warmed = set()
+
+        self.setOptionCpu(cpu)
+        self.setOptionIo(io)
+
+        self.__lastActivity = time.monotonic()
+        # application event filter is installed only while there's something to warm
+        self.__activityTracking = False
+        self.activityTrackingChanged.connect(self.__setActivityTracking)
+
+        extensionList = [fr'\.{extension}' for extension in BCFileManagedFormat.list()]
+        self.__managedFiles = re.compile(f"({'|'.join(extensionList)})$", re.I)
+
+    def __sleep(self, delay=None):
+        """Sleep during given `delay` (in milliseconds), or until thread is woken
+        up if no delay is provided
+
+        Return False if thread has to be stopped
+        """
+        self.__mutex.lock()
+        if not self.__stopRequested:
+            if delay is None:
+                self.__waitCondition.wait(self.__mutex)
+            else:
+                self.__waitCondition.wait(self.__mutex, max(1, int(delay)))
+        returned = not self.__stopRequested
+        self.__mutex.unlock()
+        return returned
+
+    def __waitIdle(self):
+        """Wait until user is idle
+
+        Return False if thread has to be stopped
+        """
+        while True:
+            idle = time.monotonic() - self.__lastActivity
+            if idle >= BCCacheWarmer.IDLE_DELAY:
+                return not self.__stopRequested
+            if not self.__sleep(1000 * (BCCacheWarmer.IDLE_DELAY - idle)):
+                return False
+
+    def __throttle(self, duration, nbBytes):
+        """Sleep according to CPU and disk read limits, for a file processed in
+        `duration` seconds for which `nbBytes` have been read
+
+        Return False if thread has to be stopped
+        """
+        delay = duration * (100 - self.__cpu) / self.__cpu
+        if self.__io > 0:
+            delay = max(delay, nbBytes / (self.__io * 1000000) - duration)
+        if delay > 0:
+            return self.__sleep(1000 * delay)
+        return not self.__stopRequested
+
+    def __setActivityTracking(self, enabled):
+        """Install or remove application event filter used to track user activity
+
+        Called in main thread (through activityTrackingChanged signal)
+        """
+        if enabled and self.isRunning() and not self.__stopRequested:
+            QApplication.instance().installEventFilter(self)
+        else:
+            QApplication.instance().removeEventFilter(self)
+
+    def __nextTarget(self):
+        """Return next path to warm
+
+        If all targets are warmed, stop tracking user activity and wait until new
+        targets are provided
+        Return None if thread has to be stopped
+        """
+        self.__mutex.lock()
+        returned = None
+        while not self.__stopRequested:
+            for target in self.__targets:
+                if target not in self.__warmed:
+                    returned = target
+                    break
+            if returned is not None:
+                break
+            if self.__activityTracking:
+                self.__activityTracking = False
+                self.activityTrackingChanged.emit(False)
+            self.__waitCondition.wait(self.__mutex)
+        self.__mutex.unlock()
+
+        if returned is not None and not self.__activityTracking:
+            # user activity was not tracked while waiting for targets: consider
+            # user as active to wait IDLE_DELAY before warming
+            self.__lastActivity = time.monotonic()
+            self.__activityTracking = True
+            self.activityTrackingChanged.emit(True)
+        return returned
+
+    def __warmFile(self, cache, fullPathName, snapshotEntry=None):
+        """Warm metadata and thumbnail for file `fullPathName`
+
+        If file is not modified since given `snapshotEntry` (as returned by
+        BCFileCache.getSnapshot()) and thumbnail exists, file is already warm
+
+        Return False if thread has to be stopped
+        """
+        thumbnailSize = BCFile.thumbnailCacheDefaultSize()
+        try:
+            stat = os.stat(fullPathName)
+        except Exception:
+            return not self.__stopRequested
+
+        if (snapshotEntry is not None and
+           snapshotEntry[0] == stat.st_size and
+           snapshotEntry[1] == stat.st_mtime and
+           snapshotEntry[3] != '' and
+           os.path.isfile(os.path.join(BCFile.thumbnailCacheDirectory(thumbnailSize), snapshotEntry[3]))):
+            return not self.__stopRequested
+
+        startTime = time.monotonic()
+        # quick hash read first and last 8KB of file
+        nbBytes = min(stat.st_size, 16384)
+        try:
+            file = BCFile(fullPathName, bcFileCache=cache)
+            if file.readable() and file.qHash() != '' and not os.path.isfile(os.path.join(BCFile.thumbnailCacheDirectory(thumbnailSize), file.qHash())):
+                file.thumbnail(thumbnailSize)
+                nbBytes = stat.st_size
+        except Exception as e:
+            Debug.print('[BCCacheWarmer.__warmFile] Unable to warm file {0}: {1}', fullPathName, f"{e}")
+
+        return self.__throttle(time.monotonic() - startTime, nbBytes)
+
+    def __warmDirectory(self, cache, path):
+        """Warm metadata and thumbnails for managed files of directory `path`
+        (hidden and backup files are ignored)
+
+        Return False if thread has to be stopped
+        """
+        snapshot = cache.getSnapshot(path)
+        if snapshot is None:
+            snapshot = {}
+
+        try:
+            with os.scandir(path) as files:
+                fileNames = [foundFile.name for foundFile in files if foundFile.is_file() and self.__managedFiles.search(foundFile.name)]
+        except Exception as e:
+            Debug.print('[BCCacheWarmer.__warmDirectory] Unable to scan directory {0}: {1}', path, f"{e}")
+            return not self.__stopRequested
+
+        for fileName in sorted(fileNames):
+            if not self.__waitIdle():
+                return False
+
+            fullPathName = os.path.join(path, fileName)
+            if not QFileInfo(fullPathName).isHidden() and not self.__warmFile(cache, fullPathName, snapshot.get(fileName)):
+                return False
+        return True
+
+    def run(self):
+        """Warm targets until thread is stopped"""
+        # read only connection; metadata are written through BCFileCacheWriter
+        cache = BCFileCache('CacheWarmer')
+
+        while True:
+            target = self.__nextTarget()
+            if target is None or not self.__waitIdle():
+                break
+
+            if os.path.isdir(target):
+                warmed = self.__warmDirectory(cache, target)
+            elif os.path.isfile(target) and self.__managedFiles.search(target):
+                warmed = self.__warmFile(cache, target)
+            else:
+                # not a directory or not a managed file (or doesn't exist anymore)
+                warmed = True
+
+            if warmed:
+                self.__mutex.lock()
+                self.__warmed.add(target)
+                self.__mutex.unlock()
+
+        cache.close()
+
+    def eventFilter(self, object, event):
+        """Keep time of last user activity"""
+        if event.type() in BCCacheWarmer.__USER_EVENTS:
+            self.__lastActivity = time.monotonic()
+        return False
+
+    def setOptionCpu(self, value):
+        """Set maximum CPU usage, in percent"""
+        if not isinstance(value, int):
+            raise EInvalidType("Given `value` must be <int>")
+        self.__cpu = min(100, max(1, value))
+
+    def setOptionIo(self, value):
+        """Set maximum disk read, in MB/s
+
+        0 means no limit
+        """
+        if not isinstance(value, int):
+            raise EInvalidType("Given `value` must be <int>")
+        self.__io = max(0, value)
+
+    def setTargets(self, paths):
+        """Set `paths` (directories and/or files) to warm
+
+        Targets are warmed in given order
+        Targets already warmed during session are not warmed again
+        """
+        self.__mutex.lock()
+        self.__targets = [path for path in dict.fromkeys(paths) if isinstance(path, str)]
+        self.__waitCondition.wakeAll()
+        self.__mutex.unlock()
+
+    def start(self):
+        """Start warming in a low priority thread"""
+        if self.isRunning():
+            return
+        self.__stopRequested = False
+        self.__lastActivity = time.monotonic()
+        self.__activityTracking = True
+        QApplication.instance().installEventFilter(self)
+        super(BCCacheWarmer, self).start(QThread.IdlePriority)
+
+    def stop(self):
+        """Stop warming; wait until current file is processed"""
+        if not self.isRunning():
+            return
+        QApplication.instance().removeEventFilter(self)
+        self.__mutex.lock()
+        self.__stopRequested = True
+        self.__waitCondition.wakeAll()
+        self.__mutex.unlock()
+        self.wait()
+
+
+class BCCacheBundle(object):
+    """Export/import cache content as a portable bundle file
+
+    A bundle contains metadata and thumbnails of images from a directory tree,
+    keyed by qHash; imported on another workstation, images from the same (shared)
+    directory tree are listed from cache without being read again
+
+    Bundle is a zip file:
+        manifest.json               bundle properties (format, version, exported
+                                    directory, metadata parsers versions, ...)
+        metadata.json               list of [qHash, file format, metadata as json string,
+                                    parser version]
+        thumbnails/<size>/<qHash>   thumbnail files
+
+    Only metadata read with current version of parser are exported; when imported,
+    metadata read with another version of parser than importer one are ignored
+    Bundles of format version 1 don't provide parser version of metadata: their
+    metadata are ignored, only thumbnails are imported
+    """
+    FORMAT_ID = 'bulicommander.cacheBundle'
+    FORMAT_VERSION = 2
+
+    __HASH_RE = re.compile(r'^[0-9a-f]{64}$')
+
+    @staticmethod
+    def __treeHashes(path, recursive):
+        """Return a set of qHash for managed files of directory `path`
+
+        When a file is not modified since directory snapshot, qHash is read from
+        snapshot, otherwise it's calculated
+        """
+        bcFileCache = BCFileCache.globalInstance()
+        returned = set()
+        for dirPath, dirNames, fileNames in os.walk(path):
+            if not recursive:
+                dirNames.clear()
+
+            snapshot = bcFileCache.getSnapshot(dirPath)
+            if snapshot is None:
+                snapshot = {}
+
+            for fileName in fileNames:
+                if not BCFileManagedFormat.inExtensions(os.path.splitext(fileName)[1]):
+                    continue
+
+                fullPathName = os.path.join(dirPath, fileName)
+                try:
+                    stat = os.stat(fullPathName)
+                    snapshotEntry = snapshot.get(fileName)
+                    if (snapshotEntry is not None and
+                       snapshotEntry[0] == stat.st_size and
+                       snapshotEntry[1] == stat.st_mtime and
+                       snapshotEntry[3] != ''):
+                        returned.add(snapshotEntry[3])
+                    else:
+                        returned.add(BCFile.quickHash(fullPathName, stat.st_size))
+                except Exception as e:
+                    Debug.print('[BCCacheBundle.__treeHashes] Unable to calculate hash file {0}: {1}', fullPathName, f"{e}")
+        return returned
+
+    @staticmethod
+    def exportBundle(fileName, path, recursive=True):
+        """Export metadata and thumbnails in cache for images of directory `path`
+        (and sub-directories if `recursive` is True) to bundle `fileName`
+
+        Metadata read with another version of parser than current one are not
+        exported
+
+        Return a tuple (number of metadata, number of thumbnails) exported, or None
+        if bundle can't be exported
+        """
+        hashes = BCCacheBundle.__treeHashes(path, recursive)
+
+        metadataList = []
+        parsers = {}
+        for hash, (metadata, fileFormat, parserVersion) in BCFileCache.globalInstance().getMetadataRows(hashes).items():
+            if parserVersion != BCFile.metadataParserVersion(fileFormat):
+                continue
+            metadataList.append([hash, fileFormat, metadata, parserVersion])
+            parsers[fileFormat] = parserVersion
+
+        try:
+            nbThumbnails = 0
+            with zipfile.ZipFile(fileName, 'w', zipfile.ZIP_DEFLATED) as archive:
+                for size in BCFileThumbnailSize:
+                    thumbnailPath = BCFile.thumbnailCacheDirectory(size)
+                    for hash in hashes:
+                        thumbnailFile = os.path.join(thumbnailPath, hash)
+                        if os.path.isfile(thumbnailFile):
+                            # thumbnails are already compressed images
+                            archive.write(thumbnailFile, f'thumbnails/{size.value}/{hash}', zipfile.ZIP_STORED)
+                            nbThumbnails += 1
+
+                archive.writestr('metadata.json', json.dumps(metadataList))
+
+                manifest = {
+                        'format': BCCacheBundle.FORMAT_ID,
+                        'version': BCCacheBundle.FORMAT_VERSION,
+                        'created': time.time(),
+                        'path': path,
+                        'recursive': recursive,
+                        'parsers': parsers,
+                        'nbMetadata': len(metadataList),
+                        'nbThumbnails': nbThumbnails
+                    }
+                archive.writestr('manifest.json', json.dumps(manifest, indent=2))
+        except Exception as e:
+            Debug.print('[BCCacheBundle.exportBundle] Unable to export bundle {0}: {1}', fileName, f"{e}")
+            return None
+
+        return (len(metadataList), nbThumbnails)
+
+    @staticmethod
+    def manifest(fileName):
+        """Return manifest of bundle `fileName` as a dictionary
+
+        Return None if file is not a valid bundle, or if bundle has been exported
+        from a more recent version
+        """
+        try:
+            with zipfile.ZipFile(fileName, 'r') as archive:
+                returned = json.loads(archive.read('manifest.json'))
+        except Exception as e:
+            Debug.print('[BCCacheBundle.manifest] Unable to read bundle {0}: {1}', fileName, f"{e}")
+            return None
+
+        if (not isinstance(returned, dict) or
+           returned.get('format') != BCCacheBundle.FORMAT_ID or
+           not isinstance(returned.get('version'), int) or
+           returned['version'] > BCCacheBundle.FORMAT_VERSION or
+           not isinstance(returned.get('parsers'), dict)):
+            Debug.print('[BCCacheBundle.manifest] Invalid bundle {0}', fileName)
+            return None
+
+        return returned
+
+    @staticmethod
+    def importBundle(fileName):
+        """Import metadata and thumbnails from bundle `fileName` in cache
+
+        Bundle content is merged with cache content:
+        - metadata and thumbnails already in cache are kept
+        - metadata read with another version of parser than current one are ignored
+
+        Return a tuple (number of metadata, number of ignored metadata, number of
+        thumbnails) imported, or None if bundle can't be imported
+        """
+        manifest = BCCacheBundle.manifest(fileName)
+        if manifest is None:
+            return None
+
+        sizes = {f'{size.value}': size for size in BCFileThumbnailSize}
+        try:
+            with zipfile.ZipFile(fileName, 'r') as archive:
+                rows = []
+                nbIgnored = 0
+                for row in json.loads(archive.read('metadata.json')):
+                    # [hash, fileFormat, metadata, parserVersion]
+                    # (no parser version for bundle format version 1)
+                    if (len(row) == 4 and
+                       isinstance(row[0], str) and BCCacheBundle.__HASH_RE.match(row[0]) and
+                       row[3] == BCFile.metadataParserVersion(row[1])):
+                        rows.append((row[0], row[2], row[1]))
+                    else:
+                        nbIgnored += 1
+
+                nbThumbnails = 0
+                for zipInfo in archive.infolist():
+                    # thumbnails/<size>/<qHash>
+                    names = zipInfo.filename.split('/')
+                    if len(names) != 3 or names[0] != 'thumbnails' or names[1] not in sizes or not BCCacheBundle.__HASH_RE.match(names[2]):
+                        continue
+
+                    thumbnailFile = os.path.join(BCFile.thumbnailCacheDirectory(sizes[names[1]]), names[2])
+                    if os.path.exists(thumbnailFile):
+                        continue
+
+                    # write in a temporary file first, then a partially written
+                    # thumbnail is never read
+                    fileHandle, tmpFileName = tempfile.mkstemp(prefix=f'.{names[2]}.', suffix='.tmp', dir=os.path.dirname(thumbnailFile))
+                    with os.fdopen(fileHandle, 'wb') as file:
+                        file.write(archive.read(zipInfo))
+                    os.replace(tmpFileName, thumbnailFile)
+                    nbThumbnails += 1
+        except Exception as e:
+            Debug.print('[BCCacheBundle.importBundle] Unable to import bundle {0}: {1}', fileName, f"{e}")
+            return None
+
+        nbImported = BCFileCache.globalInstance().importMetadata(rows)
+        return (nbImported, nbIgnored + len(rows) - nbImported, nbThumbnails)
+
+
 # ------------------------------------------------------------------------------
 
 
@@ -5063,6 +7409,7 @@ class BCFileListRuleOperator(object):
         self.__operator = None
         self.__value = None
         self.__displayValue = None
+        self.__compiled = None
 
         if isinstance(value, BCFileListRuleOperator):
             self.__type = value.type()
@@ -5142,6 +7489,20 @@ class BCFileListRuleOperator(object):
         else:
             return f"{self.__operator} {value}"
 
+    def __eq__(self, other):
+        """Return if other BCFileListRuleOperator is the same than current one"""
+        if isinstance(other, BCFileListRuleOperator):
+            return hash(self) == hash(other)
+        return False
+
+    def __hash__(self):
+        """Return hash for BCFileListRuleOperator, calculated from its type,
+        operator and value"""
+        value = self.__value
+        if isinstance(value, list):
+            value = tuple(value)
+        return hash((self.__type, self.__operator, value))
+
     def __enumToStr(self, value):
         """return printable value for enum"""
         if self.__type == BCFileListRuleOperatorType.ENUM:
@@ -5212,6 +7573,7 @@ class BCFileListRuleOperator(object):
             self.__displayValue = displayValue
 
         self.__checkValueType()
+        self.__compiled = self.__compile()
 
     def operator(self):
         """Return current set operator"""
@@ -5287,41 +7649,175 @@ class BCFileListRuleOperator(object):
 
         return returned
 
-    def compare(self, value):
-        """Compare value according to current rule, and return True or False"""
+    def sqlFilter(self, expression):
+        """Return a tuple (SQL condition, list of values) to apply rule on given
+        SQL `expression`
+
+        Values are bound in SQL condition with positional placeholders (?)
+        Return None if rule can't be applied from SQL query (regular expression)
+        """
         if self.__type == BCFileListRuleOperatorType.REGEX:
-            if not isinstance(value, str):
-                raise EInvalidType("Given value type must be <str>")
-        elif self.__type not in [BCFileListRuleOperatorType.LIST]:
-            self.__checkValueType(value)
+            return None
+
+        value = self.__enumToStr(self.__value)
+
+        if self.__operator in ('in', 'not in'):
+            if not isinstance(value, (list, tuple)):
+                value = [value]
+            else:
+                value = list(value)
+
+            if len(value) == 0:
+                # nothing is in an empty list
+                return ('0' if self.__operator == 'in' else '1', [])
+            return (f"{expression} {self.__operator.upper()} ({', '.join(['?'] * len(value))})", value)
+        elif self.__operator in ('between', 'not between'):
+            return (f"{expression} {self.__operator.upper()} ? AND ?", [value[0], value[1]])
+        else:
+            return (f"{expression} {self.__operator} ?", [value])
+
+    def __compile(self):
+        """Return a function that compare a value according to current rule
+
+        Operator is resolved once: returned function only do the comparison
+        - 'in', 'not in': list of values is converted to a frozenset
+        - 'between', 'not between': bounds are bound to function
+        - 'match', 'not match': regular expression is already compiled
+        """
+        value = self.__value
 
         if self.__operator == '=':
-            return (value == self.__value)
+            return lambda compared: compared == value
         elif self.__operator == '<>':
-            return (value != self.__value)
+            return lambda compared: compared != value
         elif self.__operator == '<':
-            return (value < self.__value)
+            return lambda compared: compared < value
         elif self.__operator == '>':
-            return (value > self.__value)
+            return lambda compared: compared > value
         elif self.__operator == '<=':
-            return (value <= self.__value)
+            return lambda compared: compared <= value
         elif self.__operator == '>=':
-            return (value >= self.__value)
-        elif self.__operator == 'in':
-            return (value in self.__value)
-        elif self.__operator == 'between':
-            return (self.__value[0] <= value and value <= self.__value[1])
-        elif self.__operator == 'not in':
-            return not(value in self.__value)
-        elif self.__operator == 'not between':
-            return not(self.__value[0] <= value and value <= self.__value[1])
+            return lambda compared: compared >= value
+        elif self.__operator in ('in', 'not in'):
+            if not isinstance(value, (list, tuple)):
+                value = [value]
+
+            try:
+                values = frozenset(value)
+            except TypeError:
+                # not hashable values, keep list
+                values = value
+
+            if self.__operator == 'in':
+                return lambda compared: compared in values
+            return lambda compared: compared not in values
+        elif self.__operator in ('between', 'not between'):
+            if isinstance(value, (list, tuple)):
+                minValue, maxValue = value[0], value[1]
+            else:
+                minValue = maxValue = value
+
+            if self.__operator == 'between':
+                return lambda compared: minValue <= compared <= maxValue
+            return lambda compared: not (minValue <= compared <= maxValue)
         elif self.__operator == 'match':
-            return not(self.__value.search(value) is None)
+            search = value.search
+            return lambda compared: search(compared) is not None
         elif self.__operator == 'not match':
-            return (self.__value.search(value) is None)
+            search = value.search
+            return lambda compared: search(compared) is None
         else:
             # should not occurs
-            return False
+            return lambda compared: False
+
+    def compiled(self):
+        """Return a function that compare a value according to current rule, and
+        return True or False
+
+        Unlike compare(), type of compared value is not checked: use it when
+        evaluating rule on many values for which type is known
+        """
+        return self.__compiled
+
+    def compare(self, value):
+        """Compare value according to current rule, and return True or False"""
+        if self.__type == BCFileListRuleOperatorType.REGEX:
+            if not isinstance(value, str):
+                raise EInvalidType("Given value type must be <str>")
+        elif self.__type not in [BCFileListRuleOperatorType.LIST]:
+            self.__checkValueType(value)
+
+        return self.__compiled(value)
+
+
+class BCFileListRulePredicates(object):
+    """A list of predicates evaluated with short-circuit: value match if all
+    predicates return True
+
+    Predicates are ordered by rank (cost / rejection rate), then cheap predicates
+    that reject many values are evaluated first
+    - cost is measured (in microseconds) on a sample of calls, starting from an
+      estimated cost
+    - rejection rate is counted on all calls
+    Order is updated every REORDER_INTERVAL calls
+    """
+    REORDER_INTERVAL = 1024
+    SAMPLE_INTERVAL = 64
+
+    # estimated costs, in microseconds
+    COST_ATTRIBUTE = 0.1
+    COST_PROPERTY = 0.5
+    COST_REGEX = 1.0
+    COST_STAT = 5.0
+
+    def __init__(self):
+        # list of [predicate, cost, number of calls, number of rejects]
+        self.__predicates = []
+        self.__nbCalls = 0
+
+    def __len__(self):
+        return len(self.__predicates)
+
+    def __reorder(self):
+        """Sort predicates by rank"""
+        def rank(item):
+            # predicates not yet evaluated are considered to reject half of values
+            return item[1] * (item[2] + 2) / (item[3] + 1)
+
+        # list is replaced and not sorted in place: predicates can be evaluated
+        # at the same time in other threads
+        self.__predicates = sorted(self.__predicates, key=rank)
+
+    def add(self, predicate, cost):
+        """Add a `predicate` (function that return True or False) with an estimated `cost`"""
+        self.__predicates.append([predicate, cost, 0, 0])
+        self.__reorder()
+
+    def match(self, *values):
+        """Return True if given `values` match all predicates
+
+        Values are provided as arguments to predicates
+        """
+        self.__nbCalls += 1
+        if self.__nbCalls % BCFileListRulePredicates.REORDER_INTERVAL == 0:
+            self.__reorder()
+
+        if self.__nbCalls % BCFileListRulePredicates.SAMPLE_INTERVAL == 0:
+            for item in self.__predicates:
+                item[2] += 1
+                startTime = time.perf_counter()
+                returned = item[0](*values)
+                item[1] = 0.8 * item[1] + 0.2 * (time.perf_counter() - startTime) * 1000000
+                if not returned:
+                    item[3] += 1
+                    return False
+        else:
+            for item in self.__predicates:
+                item[2] += 1
+                if not item[0](*values):
+                    item[3] += 1
+                    return False
+        return True
 
 
 class BCFileListRuleFile(object):
@@ -5381,6 +7877,50 @@ class BCFileListRuleFile(object):
                             self.__path,
                             self.__size,
                             self.__mdatetime))
+        self.__compile()
+
+    def __compile(self):
+        """Build predicates from rule
+
+        Two lists of predicates are built:
+        - one to evaluate rule from a file name and its stat
+        - one to evaluate rule from a BCFile
+        """
+        self.__statPredicates = BCFileListRulePredicates()
+        self.__filePredicates = BCFileListRulePredicates()
+
+        if self.__name is not None:
+            compareName = self.__name.compiled()
+            self.__statPredicates.add(lambda fileName, fileStat: compareName(os.path.basename(fileName)), BCFileListRulePredicates.COST_REGEX)
+            self.__filePredicates.add(lambda file: compareName(file.name()), BCFileListRulePredicates.COST_REGEX)
+
+        if self.__path is not None:
+            comparePath = self.__path.compiled()
+            self.__statPredicates.add(lambda fileName, fileStat: comparePath(os.path.dirname(fileName)), BCFileListRulePredicates.COST_REGEX)
+            self.__filePredicates.add(lambda file: comparePath(file.path()), BCFileListRulePredicates.COST_REGEX)
+
+        if self.__size is not None:
+            compareSize = self.__size.compiled()
+            self.__statPredicates.add(lambda fileName, fileStat: compareSize(fileStat().st_size), BCFileListRulePredicates.COST_STAT)
+            self.__filePredicates.add(lambda file: compareSize(file.size()), BCFileListRulePredicates.COST_ATTRIBUTE)
+
+        if self.__mdatetime is not None:
+            compareDateTime = self.__mdatetime.compiled()
+            if self.__mdatetime.type() == BCFileListRuleOperatorType.DATE:
+                # only date, no date/time
+                self.__statPredicates.add(lambda fileName, fileStat: compareDateTime(BCFileListRuleFile.dateFromTs(fileStat().st_mtime)), BCFileListRulePredicates.COST_STAT)
+                self.__filePredicates.add(lambda file: compareDateTime(BCFileListRuleFile.dateFromTs(file.lastModificationDateTime())), BCFileListRulePredicates.COST_PROPERTY)
+            else:
+                self.__statPredicates.add(lambda fileName, fileStat: compareDateTime(fileStat().st_mtime), BCFileListRulePredicates.COST_STAT)
+                self.__filePredicates.add(lambda file: compareDateTime(file.lastModificationDateTime()), BCFileListRulePredicates.COST_ATTRIBUTE)
+
+    @staticmethod
+    def dateFromTs(value):
+        """Return timestamp of date (local time, 00:00:00) for given timestamp
+
+        Same result than strToTs(tsToStr(value, 'd')), without string conversion
+        """
+        return time.mktime(time.localtime(value)[0:3] + (0, 0, 0, 0, 0, -1))
 
     def translate(self, short=False):
         """Return rule as a human readable string"""
@@ -5564,6 +8104,23 @@ class BCFileListRuleFile(object):
             raise EInvalidRuleParameter("Given `date` must be a valid value")
         self.__updateHash()
 
+    def sqlFilter(self):
+        """Return None: file properties are not stored in cache database, rule
+        can't be applied from SQL query"""
+        return None
+
+    def statMatch(self, fileName, fileStat):
+        """Check if file properties match current rule, without reading file
+        content
+
+        Given `fileName` is a full path file name (expanded, normalized)
+        Given `fileStat` is a callable that return os.stat_result for file; it's
+        called only if rule need file size or date
+
+        Return True if file match rule, otherwise False
+        """
+        return self.__statPredicates.match(fileName, fileStat)
+
     def fileMatch(self, file, bcFileCache=None, strict=False):
         """Check if file properties match current rule
 
@@ -5579,42 +8136,12 @@ class BCFileListRuleFile(object):
             return (True, file)
         elif isinstance(file, BCFile):
             # If given `file` is already a BCFile, then use data already available
-            if self.__name is not None:
-                if not self.__name.compare(file.name()):
-                    return (False, file)
-
-            if self.__path is not None:
-                if not self.__path.compare(file.path()):
-                    return (False, file)
-
-            if self.__size is not None:
-                if not self.__size.compare(file.size()):
-                    return (False, file)
-
-            if self.__mdatetime is not None:
-                if not self.__mdatetime.compare(file.lastModificationDateTime(self.__mdatetime.type() == BCFileListRuleOperatorType.DATE)):
-                    return (False, file)
+            if not self.__filePredicates.match(file):
+                return (False, file)
         elif isinstance(file, str):
             # assume it's a valid file name (expanded, normalized)
-            if self.__name is not None:
-                if not self.__name.compare(os.path.basename(file)):
-                    return (False, file)
-
-            if self.__path is not None:
-                if not self.__path.compare(os.path.dirname(file)):
-                    return (False, file)
-
-            if self.__size is not None:
-                if not self.__size.compare(os.path.getsize(file)):
-                    return (False, file)
-
-            if self.__mdatetime is not None:
-                dateTime = os.path.getmtime(file)
-                if self.__mdatetime.type() == BCFileListRuleOperatorType.DATE:
-                    # only date, no date/time
-                    dateTime = strToTs(tsToStr(dateTime, 'd'))
-                if not self.__mdatetime.compare(dateTime):
-                    return (False, file)
+            if not self.statMatch(file, lambda: os.stat(file)):
+                return (False, file)
 
             # From here, file properties are matching rule
             # return a BCFile
@@ -5689,6 +8216,39 @@ class BCFileListRuleImage(object):
                             self.__imageHeight,
                             self.__imageRatio,
                             self.__imagePixels))
+        self.__compile()
+
+    def __compile(self):
+        """Build predicates to evaluate rule from a BCFile"""
+        self.__filePredicates = BCFileListRulePredicates()
+
+        if self.__format is not None:
+            compareFormat = self.__format.compiled()
+            self.__filePredicates.add(lambda file: compareFormat(file.format()), BCFileListRulePredicates.COST_ATTRIBUTE)
+
+        if self.__imageWidth is not None:
+            compareWidth = self.__imageWidth.compiled()
+            self.__filePredicates.add(lambda file: compareWidth(file.imageSize().width()), BCFileListRulePredicates.COST_PROPERTY)
+
+        if self.__imageHeight is not None:
+            compareHeight = self.__imageHeight.compiled()
+            self.__filePredicates.add(lambda file: compareHeight(file.imageSize().height()), BCFileListRulePredicates.COST_PROPERTY)
+
+        if self.__imageRatio is not None:
+            compareRatio = self.__imageRatio.compiled()
+            self.__filePredicates.add(lambda file: BCFileListRuleImage.comparePropertyValue(compareRatio, file.getProperty(BCFileProperty.IMAGE_RATIO)),
+                                      BCFileListRulePredicates.COST_PROPERTY)
+
+        if self.__imagePixels is not None:
+            comparePixels = self.__imagePixels.compiled()
+            self.__filePredicates.add(lambda file: BCFileListRuleImage.comparePropertyValue(comparePixels, file.getProperty(BCFileProperty.IMAGE_PIXELS)),
+                                      BCFileListRulePredicates.COST_PROPERTY)
+
+    @staticmethod
+    def comparePropertyValue(compare, value):
+        """Return result of `compare` function for given property value, or
+        False if property value is not defined"""
+        return value is not None and compare(value)
 
     def translate(self, short=False):
         """Return rule as a human readable string"""
@@ -5766,7 +8326,7 @@ class BCFileListRuleImage(object):
         self.__updateHash()
 
     def imageHeight(self):
-        """Return current image width rule"""
+        """Return current image height rule"""
         return self.__imageHeight
 
     def setImageHeight(self, value):
@@ -5840,6 +8400,40 @@ class BCFileListRuleImage(object):
             raise EInvalidRuleParameter("Given `image pixels` must be a valid value")
         self.__updateHash()
 
+    def sqlFilter(self):
+        """Return a tuple (SQL condition, list of values, exact) to apply rule on
+        indexed columns of cache database metadata
+
+        Condition is exact when a file match rule if and only if its metadata match
+        SQL condition
+        Return None if rule can't be applied from SQL query
+        """
+        conditions = []
+        values = []
+        for ruleOperator, expression in ((self.__format, 'fileFormat'),
+                                         (self.__imageWidth, 'width'),
+                                         (self.__imageHeight, 'height'),
+                                         (self.__imageRatio, 'CASE WHEN height<>0 THEN CAST(width AS REAL)/height ELSE 0 END'),
+                                         (self.__imagePixels, f"CASE WHEN fileFormat IN ('{BCFileManagedFormat.SVG}', '{BCFileManagedFormat.SVGZ}') THEN NULL ELSE width*height END")):
+            if ruleOperator is not None:
+                sqlFilter = ruleOperator.sqlFilter(expression)
+                if sqlFilter is None:
+                    return None
+                # NULL value never match rule
+                conditions.append(f"COALESCE(({sqlFilter[0]}), 0)")
+                values += sqlFilter[1]
+
+        if len(conditions) == 0:
+            # no property: any file match rule
+            return ('1', [], True)
+
+        return (' AND '.join(conditions), values, True)
+
+    def statMatch(self, fileName, fileStat):
+        """Return None: image properties can't be checked without reading file
+        content (or its metadata from cache)"""
+        return None
+
     def fileMatch(self, file, bcFileCache=None, strict=False):
         """Check if image properties match current rule
 
@@ -5855,27 +8449,8 @@ class BCFileListRuleImage(object):
             return (True, file)
         elif isinstance(file, BCFile):
             # If given `file` is already a BCFile, then use data already available
-            if self.__format is not None:
-                if not self.__format.compare(file.format()):
-                    return (False, file)
-
-            if self.__imageWidth is not None:
-                if not self.__imageWidth.compare(file.imageSize().width()):
-                    return (False, file)
-
-            if self.__imageHeight is not None:
-                if not self.__imageHeight.compare(file.imageSize().width()):
-                    return (False, file)
-
-            if self.__imageRatio is not None:
-                property = file.getProperty(BCFileProperty.IMAGE_RATIO)
-                if property is None or not self.__imageRatio.compare(property):
-                    return (False, file)
-
-            if self.__imagePixels is not None:
-                property = file.getProperty(BCFileProperty.IMAGE_PIXELS)
-                if property is None or not self.__imagePixels.compare(property):
-                    return (False, file)
+            if not self.__filePredicates.match(file):
+                return (False, file)
         elif isinstance(file, str):
             # assume it's a valid file name (expanded, normalized)
             # need to generate BCFile to be able to continue to check properties
@@ -6025,6 +8600,80 @@ class BCFileListRuleCombination(object):
                     return (True, file)
             return (False, file)
 
+    def sqlFilter(self):
+        """Return a tuple (SQL condition, list of values, exact) to apply rule on
+        indexed columns of cache database metadata
+
+        For AND operator, items that can't be applied from SQL query are ignored
+        (condition is not exact but files that match rule still match condition)
+        Return None if rule can't be applied from SQL query
+        """
+        if len(self.__itemsSorted) == 0:
+            # if empty combination, then always return False
+            return ('0', [], True)
+
+        if self.__type == BCFileListRuleCombination.OPERATOR_NOT:
+            sqlFilter = self.__items[0].sqlFilter()
+            if sqlFilter is None or not sqlFilter[2]:
+                # negation of a non exact condition could exclude matching files
+                return None
+            return (f"NOT ({sqlFilter[0]})", sqlFilter[1], True)
+
+        sqlFilters = [item.sqlFilter() for item in self.__itemsSorted]
+        exact = (None not in sqlFilters)
+        if self.__type == BCFileListRuleCombination.OPERATOR_AND:
+            sqlFilters = [sqlFilter for sqlFilter in sqlFilters if sqlFilter is not None]
+            if len(sqlFilters) == 0:
+                return None
+        elif not exact:
+            # OR: if an item can't be applied, any file can match
+            return None
+
+        values = []
+        for sqlFilter in sqlFilters:
+            values += sqlFilter[1]
+            exact = exact and sqlFilter[2]
+
+        sqlOperator = ' AND ' if self.__type == BCFileListRuleCombination.OPERATOR_AND else ' OR '
+        return (sqlOperator.join([f"({sqlFilter[0]})" for sqlFilter in sqlFilters]), values, exact)
+
+    def statMatch(self, fileName, fileStat):
+        """Check if file properties match current rule, without reading file
+        content
+
+        Return True if file match rule, False if file doesn't match rule, and
+        None if rule need image properties to be evaluated
+        """
+        if len(self.__itemsSorted) == 0:
+            # if empty combination, then always return False
+            return False
+
+        if self.__type == BCFileListRuleCombination.OPERATOR_NOT:
+            isMatchingRule = self.__items[0].statMatch(fileName, fileStat)
+            if isMatchingRule is None:
+                return None
+            return not isMatchingRule
+        elif self.__type == BCFileListRuleCombination.OPERATOR_AND:
+            # AND => False as soon as an item is False, True only if all items are True
+            returned = True
+            for item in self.__itemsSorted:
+                isMatchingRule = item.statMatch(fileName, fileStat)
+                if isMatchingRule is False:
+                    return False
+                elif isMatchingRule is None:
+                    returned = None
+            return returned
+        elif self.__type == BCFileListRuleCombination.OPERATOR_OR:
+            # OR => True as soon as an item is True, False only if all items are False
+            returned = False
+            for item in self.__itemsSorted:
+                isMatchingRule = item.statMatch(fileName, fileStat)
+                if isMatchingRule is True:
+                    return True
+                elif isMatchingRule is None:
+                    returned = None
+            return returned
+
     def rules(self):
         """Return current defined filter rules to combine"""
         return self.__items
@@ -6067,6 +8716,349 @@ class BCFileListRuleCombination(object):
         return self.__type
 
 
+class BCFileWalker(object):
+    """Walk directories with a pool of threads
+
+    Each directory is read by a os.scandir() task executed in a thread pool;
+    os.scandir() release the GIL while waiting for kernel, then sub-trees are
+    read in parallel and walk duration is limited by file system, not by python
+
+    Directory content is streamed to consumer as soon as directory has been
+    read, through entries() generator
+
+    Directories are identified by their (device, inode): a directory visited
+    more than once (overlapping search paths, symbolic links loops, bind mounts)
+    is read only once for a given group
+
+    Last modification time of directories read is available from
+    directoryModificationTime()
+    """
+    # number of threads used to read directories
+    MAX_THREADS = min(32, (os.cpu_count() or 1) + 4)
+
+    # on Linux, hidden files are files for which name start with a dot: no need
+    # to use a QFileInfo() to determinate it
+    if sys.platform == 'linux':
+        @staticmethod
+        def isHidden(entry):
+            """Return if given os.DirEntry is a hidden file/directory"""
+            return entry.name[0] == '.'
+    elif sys.platform == 'win32':
+        @staticmethod
+        def isHidden(entry):
+            """Return if given os.DirEntry is a hidden file/directory"""
+            # on Windows, stat result returned by scandir() is already available
+            return bool(entry.stat(follow_symlinks=False).st_file_attributes & stat.FILE_ATTRIBUTE_HIDDEN)
+    else:
+        @staticmethod
+        def isHidden(entry):
+            """Return if given os.DirEntry is a hidden file/directory"""
+            return QFileInfo(entry.path).isHidden()
+
+    def __init__(self, maxThreads=None, followSymlinks=False):
+        """Initialise walker
+
+        If `followSymlinks` is True, symbolic links to directories are walked
+        (as os.walk() default behaviour, not followed by default)
+        """
+        if maxThreads is None:
+            maxThreads = BCFileWalker.MAX_THREADS
+        elif not isinstance(maxThreads, int):
+            raise EInvalidType("Given `maxThreads` must be an <int>")
+
+        self.__maxThreads = max(1, maxThreads)
+        self.__followSymlinks = followSymlinks
+        self.__paths = []
+        self.__visited = {}
+        self.__mutex = QMutex()
+        self.__results = queue.SimpleQueue()
+        self.__cancelled = False
+        self.__nbDirectories = 0
+        self.__mtimes = {}
+
+    def __scanDirectory(self, tag, group, pathName, recursive, includeHidden):
+        """Read content of directory `pathName`
+
+        Executed in a thread of pool, result is put in queue as a tuple
+            (tag, group, pathName, recursive, includeHidden, entries, subDirectories, mtime)
+        """
+        entries = []
+        subDirectories = []
+        mtime = None
+        try:
+            if self.__cancelled:
+                return
+
+            # identify directory with (device, inode), symbolic links are resolved
+            fileStat = os.stat(pathName)
+            key = (group, fileStat.st_dev, fileStat.st_ino)
+
+            self.__mutex.lock()
+            try:
+                visitedRecursive = self.__visited.get(key)
+                if visitedRecursive is True or (visitedRecursive is False and not recursive):
+                    # already read with same (or more) content
+                    return
+                self.__visited[key] = recursive
+            finally:
+                self.__mutex.unlock()
+
+            # read before directory content: if directory is modified while it's read,
+            # modification time will be different for next walk
+            mtime = fileStat.st_mtime
+
+            with os.scandir(pathName) as directoryEntries:
+                for entry in directoryEntries:
+                    if not includeHidden and BCFileWalker.isHidden(entry):
+                        continue
+
+                    entries.append(entry)
+                    if recursive and entry.is_dir() and (self.__followSymlinks or not entry.is_symlink()):
+                        subDirectories.append(entry.path)
+        except OSError:
+            # not readable directory (permissions, removed since parent has been read, ...) is ignored
+            # like os.walk() does
+            pass
+        finally:
+            self.__results.put((tag, group, pathName, recursive, includeHidden, entries, subDirectories, mtime))
+
+    def addPath(self, pathName, recursive=False, includeHidden=False, tag=None, group=None):
+        """Add a path to walk
+
+        Given `tag` is returned with entries of path (and sub-directories)
+        Directories are read once per `group`: paths for which entries are not
+        processed in the same way must use different groups
+        """
+        if not isinstance(pathName, str):
+            raise EInvalidType("Given `pathName` must be a <str>")
+        self.__paths.append((tag, group, pathName, recursive, includeHidden))
+
+    def cancel(self):
+        """Stop walk, pending directories are not read"""
+        self.__cancelled = True
+
+    def nbDirectories(self):
+        """Return number of directories read by current walk"""
+        return self.__nbDirectories
+
+    def directoryModificationTime(self, pathName):
+        """Return last modification time of directory `pathName`, as read before
+        its content has been read by current walk
+
+        Return None if directory has not been read
+        """
+        return self.__mtimes.get(pathName)
+
+    def entries(self):
+        """Walk paths and yield, for each directory read, a tuple:
+            (tag, directory path, list of os.DirEntry)
+
+        Directories are returned in the order they've been read
+        """
+        self.__cancelled = False
+        self.__visited = {}
+        self.__nbDirectories = 0
+        self.__mtimes = {}
+
+        executor = ThreadPoolExecutor(max_workers=self.__maxThreads, thread_name_prefix='BCFileWalker')
+        try:
+            nbPending = 0
+            for tag, group, pathName, recursive, includeHidden in self.__paths:
+                executor.submit(self.__scanDirectory, tag, group, pathName, recursive, includeHidden)
+                nbPending += 1
+
+            while nbPending > 0:
+                tag, group, pathName, recursive, includeHidden, entries, subDirectories, mtime = self.__results.get()
+                nbPending -= 1
+                self.__nbDirectories += 1
+                if mtime is not None:
+                    self.__mtimes[pathName] = mtime
+
+                if self.__cancelled:
+                    continue
+
+                for subDirectory in subDirectories:
+                    executor.submit(self.__scanDirectory, tag, group, subDirectory, recursive, includeHidden)
+                nbPending += len(subDirectories)
+
+                if len(entries):
+                    yield (tag, pathName, entries)
+        finally:
+            # generator closed before the end, or cancelled: pending tasks
+            # return immediately
+            self.__cancelled = True
+            executor.shutdown(wait=True)
+            # drop results of tasks finished after walk has been stopped
+            while not self.__results.empty():
+                self.__results.get()
+
+
+class BCFileListFuture(QThread):
+    """List content of a directory in a background thread
+
+    Directory is read, files are filtered (hidden, managed files), built (by
+    BCFileList.optionMaxWorkers() workers, with dedicated cache connections)
+    and sorted without any access to user interface; once done, resultsReady()
+    signal is emitted with future as argument, and list of files is available
+    from results()
+
+    Built files are memoised (see BCFileListQueryCache): when directory is listed
+    again, files are not built again if directory and files are not modified
+
+    A cancelled future never emit resultsReady()
+    """
+    resultsReady = Signal(object)
+
+    @staticmethod
+    def getBcFile(itemIndex, fileName, bcFileCache, future):
+        """Return a BCFile from given fileName, or None if `future` has been cancelled
+
+        > Used for multiprocessing tasks
+        """
+        if future.isCancelled():
+            return None
+        return BCFileList.getBcFile(itemIndex, fileName, bcFileCache)
+
+    def __init__(self, path, includeHidden=False, managedFilesOnly=None, sortRules=None, caseInsensitive=False, parentDirectory=False):
+        """Initialise future
+
+        Given `managedFilesOnly` is a regular expression to filter file names, or None
+        Given `sortRules` is a list of BCFileListSortRule
+        If `parentDirectory` is True, parent directory ('..') is added to results
+        """
+        super(BCFileListFuture, self).__init__(None)
+        self.__path = path
+        self.__includeHidden = includeHidden
+        self.__managedFilesOnly = managedFilesOnly
+        self.__sortRules = sortRules if isinstance(sortRules, list) else []
+        self.__caseInsensitive = caseInsensitive
+        self.__parentDirectory = parentDirectory
+        self.__cancelled = False
+        self.__walker = None
+        self.__results = []
+        self.__sortKeys = {}
+
+    def path(self):
+        """Return listed path"""
+        return self.__path
+
+    def sortRules(self):
+        """Return sort rules applied to results"""
+        return self.__sortRules
+
+    def results(self):
+        """Return list of files (BCFile and BCDirectory)"""
+        return self.__results
+
+    def sortKeys(self):
+        """Return sort keys calculated to sort results (see BCFileList.sortFiles())"""
+        return self.__sortKeys
+
+    def isCancelled(self):
+        """Return True if future has been cancelled"""
+        return self.__cancelled
+
+    def cancel(self):
+        """Cancel listing; resultsReady() won't be emitted"""
+        self.__cancelled = True
+        walker = self.__walker
+        if walker is not None:
+            walker.cancel()
+
+    def run(self):
+        """List directory content"""
+        fileNames = []
+        directories = []
+        # key=full path file name, value=tuple (path, name)
+        names = {}
+
+        self.__walker = BCFileWalker()
+        self.__walker.addPath(self.__path, False, self.__includeHidden)
+        for tag, path, entries in self.__walker.entries():
+            for entry in entries:
+                if entry.is_dir():
+                    directories.append(entry.path)
+                elif entry.is_file() and (self.__managedFilesOnly is None or self.__managedFilesOnly.search(entry.name)):
+                    fileNames.append(entry.path)
+                    names[entry.path] = (path, entry.name)
+
+            if self.__cancelled:
+                break
+
+        if self.__cancelled:
+            return
+
+        # files built for previous listing of directory, per directory
+        querySignature = None
+        if BCFileListQueryCache.enabled():
+            querySignature = ('BCFileListFuture',
+                              os.path.normpath(os.path.expanduser(self.__path)),
+                              self.__includeHidden,
+                              None if self.__managedFilesOnly is None else self.__managedFilesOnly.pattern)
+            cachedDirectories = BCFileListQueryCache.get(querySignature)
+            queryDirectories = {path: (self.__walker.directoryModificationTime(path), {}) for path, name in names.values()}
+
+        bcFileCache = BCFileCache(f'BCFileListFuture{id(self)}', BCFileCachePrefetch())
+        try:
+            cachedFiles = {}
+            examinedFiles = {}
+            with ThreadPoolExecutor(max_workers=BCFileWalker.MAX_THREADS) as executor:
+                if querySignature is not None:
+                    for fileStat in executor.map(lambda fileName: BCFileList.getFileStat(None, fileName), fileNames):
+                        if fileStat is None:
+                            continue
+                        fileName, fileStat = fileStat
+                        path, name = names[fileName]
+                        cachedFile = BCFileListQueryCache.cachedFile(cachedDirectories, path, name, fileStat, queryDirectories[path][0])
+                        if cachedFile is not None:
+                            queryDirectories[path][1][name] = cachedFile
+                            cachedFiles[fileName] = cachedFile[2]
+                        else:
+                            examinedFiles[fileName] = fileStat
+                builtFileNames = [fileName for fileName in fileNames if fileName not in cachedFiles]
+
+                # calculate qHash in parallel (I/O bound) and read metadata from cache with bulk queries
+                hashes = dict([fileHash for fileHash in executor.map(lambda fileName: BCFileList.getQuickHash(None, fileName), builtFileNames) if fileHash is not None])
+            bcFileCache.prefetchMetadata(hashes)
+
+            # each worker use its own database connection
+            pool = WorkerPool(BCFileList.optionMaxWorkers())
+            pool.setWorkerClass(BCWorkerCache.withPrefetch(bcFileCache.prefetch()))
+            builtFiles = dict(zip(builtFileNames, pool.map(builtFileNames, BCFileListFuture.getBcFile, self)))
+            if self.__cancelled:
+                return
+
+            if querySignature is not None:
+                for fileName, fileStat in examinedFiles.items():
+                    path, name = names[fileName]
+                    queryDirectories[path][1][name] = (fileStat[0], fileStat[1], builtFiles.get(fileName))
+                BCFileListQueryCache.set(querySignature, queryDirectories)
+
+            # files are kept in directory order
+            results = []
+            for fileName in fileNames:
+                file = cachedFiles.get(fileName) if fileName in cachedFiles else builtFiles.get(fileName)
+                if file is not None:
+                    results.append(file)
+
+            for directory in directories:
+                file = BCFileList.getBcDirectory(None, directory)
+                if file is not None:
+                    results.append(file)
+        finally:
+            bcFileCache.close()
+
+        if self.__parentDirectory:
+            results.append(BCDirectory(os.path.join(self.__path, '..')))
+
+        if len(self.__sortRules) > 0:
+            results = BCFileList.sortFiles(results, self.__sortRules, self.__caseInsensitive, self.__sortKeys)
+
+        if not self.__cancelled:
+            self.__results = results
+            self.resultsReady.emit(self)
+
+
 class BCFileListPath(object):
     """A search path definition"""
 
@@ -6142,6 +9134,27 @@ class BCFileListPath(object):
             raise EInvalidRuleParameter("Given `managedFilesBackup` must be a valid boolean")
 
 
+class BCFileListReversedSortKey(object):
+    """A sort key for which comparison is reversed
+
+    Allows to build one sort key from properties sorted in ascending and
+    descending order
+    """
+    __slots__ = ('__value', )
+
+    def __init__(self, value):
+        self.__value = value
+
+    def __eq__(self, other):
+        return self.__value == other.__value
+
+    def __lt__(self, other):
+        return other.__value < self.__value
+
+    def __repr__(self):
+        return f'<BCFileListReversedSortKey({self.__value})>'
+
+
 class BCFileListSortRule(object):
     """Define sort rule for file"""
 
@@ -6206,6 +9219,110 @@ class BCFileListSortRule(object):
         return self.__ascending
 
 
+class BCFileListQueryCache(object):
+    """Memoise search results by query signature (see BCFileList.querySignature())
+
+    For each query, results are stored per directory:
+        key = directory path
+        value = tuple (directory last modification time, files)
+
+    For which files is a dictionary:
+        key = file name
+        value = tuple (size, last modification time, BCFile or None if file doesn't match query)
+
+    When a query is executed again, a directory for which last modification time
+    has changed is examined again; otherwise, only files for which size or last
+    modification time have changed are examined again
+
+    Only the last MAX_QUERIES queries are kept in memory, and least recently used
+    queries are removed when more than MAX_FILES files are memoised; a query with
+    more than MAX_FILES files is not memoised
+    """
+    MAX_QUERIES = 8
+    MAX_FILES = 200000
+
+    __ENABLED = True
+    __MUTEX = QMutex()
+    # dictionary order is used to remove least recently used queries
+    #   key = query signature
+    #   value = tuple (number of files, directories)
+    __QUERIES = {}
+    __NB_FILES = 0
+
+    @staticmethod
+    def enabled():
+        """Return if search results are memoised"""
+        return BCFileListQueryCache.__ENABLED
+
+    @staticmethod
+    def setEnabled(value):
+        """Set if search results are memoised"""
+        if not isinstance(value, bool):
+            raise EInvalidType("Given `value` must be <bool>")
+        BCFileListQueryCache.__ENABLED = value
+        if not value:
+            BCFileListQueryCache.clear()
+
+    @staticmethod
+    def get(signature):
+        """Return directories memoised for query `signature`, or an empty dictionary"""
+        BCFileListQueryCache.__MUTEX.lock()
+        returned = BCFileListQueryCache.__QUERIES.pop(signature, None)
+        if returned is not None:
+            BCFileListQueryCache.__QUERIES[signature] = returned
+        BCFileListQueryCache.__MUTEX.unlock()
+        return {} if returned is None else returned[1]
+
+    @staticmethod
+    def set(signature, directories):
+        """Memoise `directories` for query `signature`"""
+        if not BCFileListQueryCache.__ENABLED:
+            return
+
+        nbFiles = sum(len(files) for modificationTime, files in directories.values())
+
+        BCFileListQueryCache.__MUTEX.lock()
+        removed = BCFileListQueryCache.__QUERIES.pop(signature, None)
+        if removed is not None:
+            BCFileListQueryCache.__NB_FILES -= removed[0]
+        if nbFiles <= BCFileListQueryCache.MAX_FILES:
+            BCFileListQueryCache.__QUERIES[signature] = (nbFiles, directories)
+            BCFileListQueryCache.__NB_FILES += nbFiles
+            while len(BCFileListQueryCache.__QUERIES) > BCFileListQueryCache.MAX_QUERIES or BCFileListQueryCache.__NB_FILES > BCFileListQueryCache.MAX_FILES:
+                removed = BCFileListQueryCache.__QUERIES.pop(next(iter(BCFileListQueryCache.__QUERIES)))
+                BCFileListQueryCache.__NB_FILES -= removed[0]
+        BCFileListQueryCache.__MUTEX.unlock()
+
+    @staticmethod
+    def clear():
+        """Clear all memoised queries"""
+        BCFileListQueryCache.__MUTEX.lock()
+        BCFileListQueryCache.__QUERIES = {}
+        BCFileListQueryCache.__NB_FILES = 0
+        BCFileListQueryCache.__MUTEX.unlock()
+
+    @staticmethod
+    def cachedFile(directories, path, name, fileStat, directoryModificationTime):
+        """Return memoised tuple (size, last modification time, BCFile or None) for
+        file `name` of directory `path`, from given `directories` (as returned by
+        get())
+
+        Given `fileStat` is a tuple (size, last modification time) of file, and
+        `directoryModificationTime` the current last modification time of directory
+
+        Return None if file is not memoised, or if file or directory has been
+        modified since memoised
+        """
+        directory = directories.get(path)
+        if directory is None or directory[0] is None or directory[0] != directoryModificationTime:
+            return None
+
+        cachedFile = directory[1].get(name)
+        if cachedFile is not None and (cachedFile[0], cachedFile[1]) == fileStat:
+            return cachedFile
+        return None
+
+
 class BCFileList(QObject):
     """A file list wrapper
 
@@ -6216,6 +9333,7 @@ class BCFileList(QObject):
     stepCancel = Signal()               # search execution is cancelled
     resultsUpdatedReset = Signal()
     resultsUpdatedSort = Signal()
+    resultsAboutToBeAdded = Signal(int, int)    # results are about to be updated: position and number of added items
     resultsUpdatedAdd = Signal(list)        # results are updated: list of added items (BCBaseFile)
     resultsUpdatedRemove = Signal(list)     # results are updated: list of removed items (BCBaseFile)
     resultsUpdatedUpdate = Signal(list)     # results are updated: list of updates items (BCBaseFile)
@@ -6229,6 +9347,7 @@ class BCFileList(QObject):
 
     # not activated by default
     STEPEXECUTED_SEARCH_FROM_PATH =  0b0000000000000101      # during path scan, a path has been scanned (scan next directory will start)
+    STEPEXECUTED_PROGRESS_SEARCH =   0b0000000000000110      # during path scan, emitted regularly; allows to track number of directories read, files found and files per second
     STEPEXECUTED_PROGRESS_FILTER =   0b0000000000010001      # each file filtered will emit a signal; allows to track analysis progress and update a progress bar for exwample
     STEPEXECUTED_PROGRESS_SORT =     0b0000000001000001      # each file sorted will emit a signal; allows to track analysis progress and update a progress bar for exwample
     STEPEXECUTED_PROGRESS_OUTPUT =   0b0000000010000001
@@ -6241,8 +9360,44 @@ class BCFileList(QObject):
 
     CANCELLED_SEARCH = -1
 
+    # searchExecuteStream(): maximum number of files per batch, number of files
+    # for the first batch, and maximum delay (in seconds) between two batches
+    STREAM_BATCH_SIZE = 5000
+    STREAM_BATCH_SIZE_FIRST = 100
+    STREAM_BATCH_DELAY = 0.25
+
     __MTASKS_RULES = []
 
+    __SORT_NATURAL_SPLIT = re.compile(r'(\d+)').split
+
+    # properties for which sort key can be calculated from file stat only
+    __SORT_STAT_PROPERTIES = (BCFileProperty.PATH,
+                              BCFileProperty.FULL_PATHNAME,
+                              BCFileProperty.FILE_NAME,
+                              BCFileProperty.FILE_SIZE,
+                              BCFileProperty.FILE_DATE)
+
+    # maximum number of workers used to build BCFile and read metadata; 0 for automatic
+    __OPTION_MAX_WORKERS = 0
+
+    @staticmethod
+    def setOptionMaxWorkers(value):
+        """Set maximum number of workers used to build files and read metadata
+
+        0 means automatic: as metadata reading is mostly I/O bound (file reads
+        release the GIL), more workers than CPU cores are used
+        """
+        if not isinstance(value, int):
+            raise EInvalidType("Given `value` must be <int>")
+        BCFileList.__OPTION_MAX_WORKERS = max(0, value)
+
+    @staticmethod
+    def optionMaxWorkers():
+        """Return maximum number of workers used to build files and read metadata"""
+        if BCFileList.__OPTION_MAX_WORKERS > 0:
+            return BCFileList.__OPTION_MAX_WORKERS
+        return BCFileWalker.MAX_THREADS
+
     @staticmethod
     def getBcFile(itemIndex, fileName, bcFileCache=None, strict=False):
         """Return a BCFile from given fileName
@@ -6261,6 +9416,79 @@ class BCFileList(QObject):
             Debug.print('[BCFileList.getBcFile] Unable to analyse file {0}: {1}', fileName, e)
             return None
 
+    @staticmethod
+    def getQuickHash(itemIndex, fileName):
+        """Return a tuple (fileName, (file size, qHash)) for given fileName
+
+        Return None if file is not a managed file, or if qHash can't be calculated
+
+        > Used for multiprocessing tasks
+        """
+        if not isinstance(fileName, str) or not BCFileManagedFormat.inExtensions(os.path.splitext(fileName)[1].lower(), True, True):
+            return None
+
+        try:
+            fileSize = os.path.getsize(fileName)
+            return (fileName, (fileSize, BCFile.quickHash(fileName, fileSize)))
+        except Exception as e:
+            Debug.print('[BCFileList.getQuickHash] Unable to calculate hash file {0}: {1}', fileName, e)
+            return None
+
+    @staticmethod
+    def prefetchMetadata(fileNames, prefetch, pool=None, sqlFilter=None):
+        """Calculate qHash for given `fileNames` and prefetch their metadata from
+        cache with bulk queries
+
+        Prefetched data are stored in given `prefetch` (BCFileCachePrefetch), to
+        provide to BCFileCache used to build files (see BCWorkerCache.withPrefetch())
+
+        If `sqlFilter` is provided (as returned by sqlFilter()), given `fileNames`
+        must be a <set>: files for which metadata in cache don't match filter are
+        removed from it
+
+        Return number of files for which metadata have been found in cache
+        """
+        if len(fileNames) == 0:
+            return 0
+
+        if pool is None:
+            pool = WorkerPool()
+
+        files = dict(pool.mapNoNone(fileNames, BCFileList.getQuickHash))
+        if sqlFilter is None:
+            return BCFileCache.globalInstance().prefetchMetadata(files, None, prefetch)
+
+        excluded = set(files.keys())
+        returned = BCFileCache.globalInstance().prefetchMetadata(files, sqlFilter, prefetch)
+        excluded.difference_update(files.keys())
+        fileNames.difference_update(excluded)
+        return returned
+
+    @staticmethod
+    def getSnapshotFiles(path, snapshot):
+        """Return list of BCFile and BCDirectory from `snapshot` of directory `path`
+        (as returned by BCFileCache.getSnapshot())
+
+        Files are built from snapshot and metadata stored in cache only, without
+        any access to file system; files for which metadata are not available in
+        cache are ignored
+        """
+        bcFileCache = BCFileCache.globalInstance()
+        metadataList = bcFileCache.getMetadataList([entry[3] for entry in snapshot.values() if entry[3]])
+
+        returned = []
+        for name, (size, mtime, inode, qHash, fileFormat) in snapshot.items():
+            fullPathName = os.path.join(path, name)
+            try:
+                if fileFormat == BCFileManagedFormat.DIRECTORY:
+                    returned.append(BCDirectory(fullPathName, mtime))
+                elif qHash in metadataList:
+                    returned.append(BCFile(fullPathName, bcFileCache=bcFileCache, snapshot=(size, mtime, qHash, dict(metadataList[qHash]))))
+            except Exception as e:
+                Debug.print('[BCFileList.getSnapshotFiles] Unable to restore file {0}: {1}', fullPathName, e)
+
+        return returned
+
     @staticmethod
     def getBcDirectory(itemIndex, fileName):
         """Return a BCDirectory from given fileName
@@ -6276,6 +9504,105 @@ class BCFileList(QObject):
             Debug.print('[BCFileList.getBcDirectory] Unable to analyse directory {0}: {1}', fileName, e)
             return None
 
+    @staticmethod
+    def getFileStat(itemIndex, fileName):
+        """Return a tuple (fileName, (size, last modification time)) for given fileName
+
+        Return None if file properties can't be read
+
+        > Used for multiprocessing tasks
+        """
+        try:
+            fileStat = os.stat(fileName)
+        except Exception as e:
+            Debug.print('[BCFileList.getFileStat] Unable to read file properties {0}: {1}', fileName, e)
+            return None
+        return (fileName, (fileStat.st_size, fileStat.st_mtime))
+
+    @staticmethod
+    def getStatSortKey(itemIndex, fileName, sortRules, caseInsensitive=False):
+        """Return a tuple (sortKey, fileName) for given fileName, for which sort
+        key is calculated from file properties (name, path, size, date) only,
+        without reading file content
+
+        Given `sortRules` must be sortable from file properties (see
+        statSortable())
+
+        Return None if file properties can't be read
+
+        > Used for multiprocessing tasks
+        """
+        try:
+            fileStat = os.stat(fileName)
+        except Exception as e:
+            Debug.print('[BCFileList.getStatSortKey] Unable to read file properties {0}: {1}', fileName, e)
+            return None
+
+        # same values than BCFile
+        fullPathName = os.path.expanduser(fileName)
+        name = os.path.basename(fullPathName)
+        fullPathName = os.path.normpath(fullPathName)
+        values = {
+                BCFileProperty.PATH: os.path.dirname(fullPathName),
+                BCFileProperty.FULL_PATHNAME: fullPathName,
+                BCFileProperty.FILE_NAME: name,
+                BCFileProperty.FILE_SIZE: fileStat.st_size,
+                BCFileProperty.FILE_DATE: fileStat.st_mtime
+            }
+
+        returned = []
+        for sortRule in sortRules:
+            key = BCFileList.sortKey(values[sortRule.property()], caseInsensitive)
+            if not sortRule.ascending():
+                key = BCFileListReversedSortKey(key)
+            returned.append(key)
+        return (tuple(returned), fileName)
+
+    @staticmethod
+    def statSortable(sortRules):
+        """Return True if sort keys for given list of BCFileListSortRule can be
+        calculated from file properties (name, path, size, date) only"""
+        for sortRule in sortRules:
+            if sortRule.property() not in BCFileList.__SORT_STAT_PROPERTIES:
+                return False
+        return True
+
+    @staticmethod
+    def statCheckFile(itemIndex, fileName):
+        """Check if file match query rules from file properties only (name,
+        path, size, date), without reading file content
+
+        Return a tuple (fileName, isMatchingRule) for which isMatchingRule is True
+        if file match rules, or None if image properties are needed to check rules
+        Return None if file doesn't match rules
+
+        > Used for multiprocessing tasks
+        """
+        fileStat = []
+
+        def getFileStat():
+            # stat is made only once, and only if a rule need it
+            if len(fileStat) == 0:
+                fileStat.append(os.stat(fileName))
+            return fileStat[0]
+
+        try:
+            returned = False
+            for rule in BCFileList.__MTASKS_RULES:
+                # rules works in OR mode
+                isMatchingRule = rule.statMatch(fileName, getFileStat)
+                if isMatchingRule is True:
+                    return (fileName, True)
+                elif isMatchingRule is None:
+                    returned = None
+        except Exception as e:
+            Debug.print('[BCFileList.statCheckFile] Unable to check file {0}: {1}', fileName, e)
+            return None
+
+        if returned is False:
+            return None
+        return (fileName, None)
+
     @staticmethod
     def checkBcFile(itemIndex, fileName, bcFileCache=None, strict=False):
         """Return BCFile if matching query rules, otherwise return None
@@ -6330,84 +9657,313 @@ class BCFileList(QObject):
         """Initialiser current list query"""
         super(BCFileList, self).__init__(None)
         self.__currentFiles = []
-        self.__currentFilesUuid = set()
+        # uuid -> index of file in current results; indexes are recalculated only
+        # when needed, after current results order has been modified
+        self.__currentFilesIndex = {}
+        self.__currentFilesIndexValid = True
 
         self.__pathList = []
         self.__ruleList = []
         self.__sortList = []
         self.__sortCaseInsensitive = False
+        # sort keys cache, per (property, caseInsensitive), see sortFiles()
+        self.__sortKeys = {}
+
+        # maximum number of results (0 = no limit), and number of files matching
+        # search criteria excluded from results by limit
+        self.__resultsLimit = 0
+        self.__nbFilesExcludedByLimit = 0
+
+        self.__statFiles = None
+
+        self.__includeDirectories = False
+
+        self.__invalidated = True
+
+        self.__cancelProcess = False
+
+        # workers for analysis&filter; results order doesn't depend of number of workers
+        self.__workerPool = WorkerPool(BCFileList.optionMaxWorkers())
+
+        self.__progressFilesPctThreshold = 0
+        self.__progressFilesPctTracker = 0
+        self.__progressFilesPctCurrent = 0
+        self.__progressFilesTracker = 0
+
+        self.__massProcess = False
+
+    def __invalidate(self):
+        self.__invalidated = True
+
+    def __setCurrentFiles(self, files):
+        """Set current results, and index them"""
+        self.__currentFiles = files
+        self.__currentFilesIndex = dict(zip([file.uuid() for file in files], range(len(files))))
+        self.__currentFilesIndexValid = True
+
+    def __indexCurrentFiles(self):
+        """Recalculate index of files in current results, if needed"""
+        if not self.__currentFilesIndexValid:
+            self.__currentFilesIndex = dict(zip([file.uuid() for file in self.__currentFiles], range(len(self.__currentFiles))))
+            self.__currentFilesIndexValid = True
+
+    def __buildLimitedFiles(self, fileNames):
+        """Return a tuple (files, excludedFileNames) for which `files` is the list
+        of BCFile built for the first `fileNames` according to current sort rules,
+        and `excludedFileNames` the list of file names not built due to results
+        limit
+
+        Sort keys are calculated from file properties only, and first files are
+        selected with a bounded heap: metadata are read only for them
+        If a file can't be built, it's replaced by the next one
+        """
+        candidates = self.__workerPool.mapNoNone(fileNames, BCFileList.getStatSortKey, self.__sortList, self.__sortCaseInsensitive)
+        returned = []
+        while len(returned) < self.__resultsLimit and len(candidates) > 0 and not self.__cancelProcess:
+            nbFiles = self.__resultsLimit - len(returned)
+            if nbFiles < len(candidates):
+                selected = [fileName for sortKey, fileName in heapq.nsmallest(nbFiles, candidates)]
+                selectedFiles = set(selected)
+                candidates = [candidate for candidate in candidates if candidate[1] not in selectedFiles]
+            else:
+                selected = [fileName for sortKey, fileName in candidates]
+                selectedFiles = set(selected)
+                candidates = []
+
+            prefetch = BCFileCachePrefetch()
+            BCFileList.prefetchMetadata(selectedFiles, prefetch, self.__workerPool)
+            self.__workerPool.setWorkerClass(BCWorkerCache.withPrefetch(prefetch))
+            returned += self.__workerPool.mapNoNone(selected, BCFileList.getBcFile)
+            self.__workerPool.setWorkerClass()
+
+        return (returned, [fileName for sortKey, fileName in candidates])
+
+    def __restoreSnapshotFiles(self, fileStats):
+        """Return list of BCFile restored from directories snapshots (see
+        BCFileCache.getSnapshot()), for given `fileStats`
+
+        Given `fileStats` is a dictionary
+            key = file name
+            value = tuple (size, last modification time)
+
+        Files are restored from cache only if they're not modified since snapshot
+        has been taken, and if their metadata are available in cache
+        """
+        bcFileCache = BCFileCache.globalInstance()
+
+        directories = {}
+        for fileName in fileStats:
+            path, name = os.path.split(fileName)
+            if path not in directories:
+                directories[path] = []
+            directories[path].append((fileName, name))
+
+        restored = []
+        for path, names in directories.items():
+            snapshot = bcFileCache.getSnapshot(path)
+            if snapshot is None:
+                continue
+            for fileName, name in names:
+                entry = snapshot.get(name)
+                if entry is not None and entry[3] and entry[4] != BCFileManagedFormat.DIRECTORY and (entry[0], entry[1]) == fileStats[fileName]:
+                    restored.append((fileName, entry))
+
+        if len(restored) == 0:
+            return []
 
-        self.__statFiles = None
+        returned = []
+        metadataList = bcFileCache.getMetadataList([entry[3] for fileName, entry in restored])
+        for fileName, (size, mtime, inode, qHash, fileFormat) in restored:
+            if qHash in metadataList:
+                try:
+                    returned.append(BCFile(fileName, bcFileCache=bcFileCache, snapshot=(size, mtime, qHash, dict(metadataList[qHash]))))
+                except Exception as e:
+                    Debug.print('[BCFileList.__restoreSnapshotFiles] Unable to restore file {0}: {1}', fileName, e)
+        return returned
 
-        self.__includeDirectories = False
+    def __updateWorkerPool(self):
+        """Rebuild worker pool if maximum number of workers has been modified"""
+        if self.__workerPool.maxWorkerCount() != BCFileList.optionMaxWorkers():
+            self.__workerPool = WorkerPool(BCFileList.optionMaxWorkers())
 
-        self.__invalidated = True
+    @staticmethod
+    def sortKey(value, caseInsensitive=False):
+        """Return sort key for given property `value`, as a tuple
 
-        self.__cancelProcess = False
+        Strings are sorted in natural order ('image2' < 'image10'): numbers are
+        prefixed with their length (without leading zeros); original string is
+        kept to sort strings for which numbers are equal ('a01', 'a1')
+        None values are before all other values
+        """
+        if value is None:
+            return (0, )
+        elif isinstance(value, str):
+            if caseInsensitive:
+                value = value.casefold()
+            parts = BCFileList.__SORT_NATURAL_SPLIT(value)
+            if len(parts) == 1:
+                return (1, value, value)
+            for index in range(1, len(parts), 2):
+                number = parts[index].lstrip('0') or '0'
+                parts[index] = f'{len(number):03d}{number}'
+            return (1, ''.join(parts), value)
+        return (1, value)
 
-        # use at maximum, 1 workers for analysis&filter
-        self.__workerPool = WorkerPool(1)
+    @staticmethod
+    def sortGroup(file):
+        """Return sort group for file: parent directory '..', then directories, then files"""
+        if file.format() == BCFileManagedFormat.DIRECTORY:
+            if file.name() == '..':
+                return 0
+            return 1
+        return 2
 
-        self.__progressFilesPctThreshold = 0
-        self.__progressFilesPctTracker = 0
-        self.__progressFilesPctCurrent = 0
-        self.__progressFilesTracker = 0
+    @staticmethod
+    def sortFiles(files, sortRules, caseInsensitive=False, sortKeys=None, progress=None, limit=0):
+        """Return given `files` sorted according to given list of BCFileListSortRule
 
-        self.__massProcess = False
+        Directories are always before files, whatever the sort order is
 
-    def __invalidate(self):
-        self.__invalidated = True
+        One sort key is calculated per file and sort rule; consecutive rules with
+        the same sort order are sorted in one pass with a composite key, from the
+        last rules to the first ones (sort is stable)
 
-    def __sort(self, fileA, fileB):
-        # if A < B : -1
-        #    A > B : 1
-        #    A = B : 0
-        if self.__progressFilesPctThreshold > 0:
-            self.__progressSorting()
-
-        # very long: need to check all sort criteria
-        for sortKey in self.__sortList:
-            pA = fileA.getProperty(sortKey.property())
-            pB = fileB.getProperty(sortKey.property())
-
-            if self.__sortCaseInsensitive:
-                if isinstance(pA, str):
-                    pA = pA.lower()
-                if isinstance(pB, str):
-                    pB = pB.lower()
-
-            # note: directories are always before files
-            #       if directories and "..", always first...
-            if fileA.format() == BCFileManagedFormat.DIRECTORY and (fileB.format() != BCFileManagedFormat.DIRECTORY or fileA.name() == '..'):
-                return -1
-            elif fileB.format() == BCFileManagedFormat.DIRECTORY and (fileA.format() != BCFileManagedFormat.DIRECTORY or fileB.name() == '..'):
-                return 1
+        Given `sortKeys` is a dictionary in which calculated keys are cached, to
+        be reused by next sorts (for example, when results are sorted on another
+        column)
 
-            # both are directories OR both are not directories
+        Given `progress` callable, if any, is called once per file
 
-            if pA == pB:
-                # same value, need to compare on next sort key
-                continue
-            elif sortKey.ascending():
-                if pA is None:
-                    return -1
-                elif pB is None:
-                    return 1
-                elif pA < pB:
-                    return -1
+        If a `limit` is given, only the `limit` first files are sorted: they're
+        selected with a bounded heap, other files are returned after them in
+        their current order
+        """
+        if len(sortRules) == 0 or len(files) == 0:
+            return list(files)
+
+        if sortKeys is None:
+            sortKeys = {}
+
+        # cached keys are stored in lists aligned with 'files' list; 'order' is the
+        # list of indexes of 'files' for last returned list ('sorted')
+        if sortKeys.get('sorted') == files:
+            baseFiles = sortKeys.pop('files')
+            order = sortKeys.pop('order')
+            realigned = False
+        else:
+            # files are not the last sorted ones (added, removed, ...): realign
+            # cached keys with files, keys of new files have to be calculated
+            cachedFiles = sortKeys.pop('files', [])
+            positions = dict(zip(cachedFiles, range(len(cachedFiles))))
+            indexes = [positions.get(file) for file in files]
+            sortKeys.pop('order', None)
+            for cacheKey, keys in sortKeys.items():
+                if cacheKey != 'sorted':
+                    sortKeys[cacheKey] = [None if index is None else keys[index] for index in indexes]
+
+            baseFiles = list(files)
+            order = list(range(len(baseFiles)))
+            realigned = True
+        sortKeys.pop('sorted', None)
+
+        # sort groups (directories first) are cached with None key, as sort keys
+        groups = sortKeys.get(None)
+        if groups is None:
+            groups = [(BCFileList.sortGroup(file), ) for file in baseFiles]
+        elif realigned and None in groups:
+            groups = [(BCFileList.sortGroup(file), ) if group is None else group for file, group in zip(baseFiles, groups)]
+        sortKeys[None] = groups
+
+        columns = []
+        for index, sortRule in enumerate(sortRules):
+            property = sortRule.property()
+            column = sortKeys.get((property, caseInsensitive))
+            if column is None:
+                column = [None] * len(baseFiles)
+                realigned = True
+
+            if progress is not None and index == 0:
+                for file in baseFiles:
+                    progress()
+
+            if realigned and None in column:
+                column = [BCFileList.sortKey(file.getProperty(property), caseInsensitive) if key is None else key for file, key in zip(baseFiles, column)]
+            sortKeys[(property, caseInsensitive)] = column
+            columns.append(column)
+
+        # consecutive rules with same sort order: [ascending, [column index, ...]]
+        passes = []
+        for index, sortRule in enumerate(sortRules):
+            if len(passes) > 0 and passes[-1][0] == sortRule.ascending():
+                passes[-1][1].append(index)
+            else:
+                passes.append([sortRule.ascending(), [index]])
+
+        def passKeys(columnIndexes, keys=None):
+            # keys of rules are concatenated: a flat tuple is faster to compare than
+            # nested tuples; it's safe as keys with the same first item have the same
+            # length
+            for columnIndex in columnIndexes:
+                if keys is None:
+                    keys = columns[columnIndex]
                 else:
-                    return 1
+                    keys = list(map(tuple.__add__, keys, columns[columnIndex]))
+            return keys
+
+        # sort indexes of files rather than files, keys are looked up by index
+        order = list(order)
+        if 0 < limit < len(order):
+            # only first files are needed: they're selected group by group with a
+            # bounded heap (nsmallest() and nlargest() are stable, like sort())
+            if len(passes) == 1:
+                ascending = passes[0][0]
+                keys = passKeys(passes[0][1]).__getitem__
             else:
-                if pA is None:
-                    return 1
-                elif pB is None:
-                    return -1
-                elif pA > pB:
-                    return -1
+                # rules are not all sorted in the same order: keys of rules sorted in
+                # descending order are reversed
+                ascending = True
+                reversedColumns = [not sortRule.ascending() for sortRule in sortRules]
+
+                def keys(index):
+                    return tuple(BCFileListReversedSortKey(column[index]) if isReversed else column[index]
+                                 for column, isReversed in zip(columns, reversedColumns))
+
+            groupOrders = ([], [], [])
+            for index in order:
+                groupOrders[groups[index][0]].append(index)
+
+            selected = []
+            for groupOrder in groupOrders:
+                nbFiles = limit - len(selected)
+                if nbFiles <= 0:
+                    break
+                elif nbFiles >= len(groupOrder):
+                    groupOrder.sort(key=keys, reverse=not ascending)
+                    selected += groupOrder
+                elif ascending:
+                    selected += heapq.nsmallest(nbFiles, groupOrder, key=keys)
                 else:
-                    return 1
+                    selected += heapq.nlargest(nbFiles, groupOrder, key=keys)
 
-        return 0
+            selectedIndexes = set(selected)
+            order = selected + [index for index in order if index not in selectedIndexes]
+        else:
+            for index, (ascending, columnIndexes) in reversed(list(enumerate(passes))):
+                if index == 0 and ascending:
+                    # first sort pass is ascending, sort groups can be applied with it
+                    keys = passKeys(columnIndexes, groups)
+                else:
+                    keys = passKeys(columnIndexes)
+                order.sort(key=keys.__getitem__, reverse=not ascending)
+
+            if not passes[0][0]:
+                order.sort(key=groups.__getitem__)
+
+        returned = list(map(baseFiles.__getitem__, order))
+        sortKeys['files'] = baseFiles
+        sortKeys['order'] = order
+        sortKeys['sorted'] = list(returned)
+        return returned
 
     def __progressFiltering(self, value):
         """Emit signal during scanning progress
@@ -6460,8 +10016,9 @@ class BCFileList(QObject):
 
     def clearResults(self, emitSignal=True):
         """Clear current results"""
-        self.__currentFiles = []
-        self.__currentFilesUuid = set()
+        self.__setCurrentFiles([])
+        self.__sortKeys = {}
+        self.__nbFilesExcludedByLimit = 0
         self.__invalidate()
         if emitSignal:
             self.resultsUpdatedReset.emit()
@@ -6546,6 +10103,27 @@ class BCFileList(QObject):
         """Return current defined rules used to filter files"""
         return self.__ruleList
 
+    def sqlFilter(self):
+        """Return a tuple (SQL condition, list of values) to apply current rules on
+        indexed columns of cache database metadata
+
+        Files that match rules always match returned condition; return None if
+        there's no rules, or if rules can't be applied from SQL query
+        """
+        if len(self.__ruleList) == 0:
+            return None
+
+        sqlFilters = [rule.sqlFilter() for rule in self.__ruleList]
+        if None in sqlFilters:
+            # rules works in OR mode
+            return None
+
+        values = []
+        for sqlFilter in sqlFilters:
+            values += sqlFilter[1]
+
+        return (' OR '.join([f"({sqlFilter[0]})" for sqlFilter in sqlFilters]), values)
+
     def inSearchRules(self, value):
         """Return True if a rule is already defined in list"""
         if isinstance(value, (BCFileListRuleCombination, BCFileListRuleFile, BCFileListRuleImage)):
@@ -6585,7 +10163,7 @@ class BCFileList(QObject):
 
     def sortRules(self):
         """Return sort rules"""
-        return self.__sortlist
+        return self.__sortList
 
     def inSortRules(self, value):
         """Return True if sort is already defined in sort list"""
@@ -6700,6 +10278,58 @@ class BCFileList(QObject):
             if self.__workerPool:
                 self.__workerPool.stopProcessing()
 
+    def __searchWalker(self):
+        """Return a tuple (walker, managedFilesOnly) for current search paths
+
+        Returned walker return entries tagged with index of search path
+        Returned managedFilesOnly is a list of regular expressions (or None),
+        to prefilter files names for each search path
+        """
+        # all paths are walked in parallel, directories content is returned as
+        # soon as directory has been read
+        walker = BCFileWalker()
+        managedFilesOnly = []
+        for index, processedPath in enumerate(self.__pathList):
+            pathName = processedPath.path()
+
+            # build regex to prefilter files if needed
+            if processedPath.managedFilesOnly():
+                extensionList = [fr'\.{extension}' for extension in BCFileManagedFormat.list()]
+
+                if processedPath.managedFilesBackup():
+                    bckSufRe = BCFileManagedFormat.backupSuffixRe()
+                    extensionList += [fr'\.{extension}{bckSufRe}' for extension in BCFileManagedFormat.list()]
+
+                managedFilesOnly.append(re.compile(f"({'|'.join(extensionList)})$", re.I))
+            else:
+                managedFilesOnly.append(None)
+
+            BCFileCache.globalInstance().setDirectory(pathName)
+
+            if processedPath.recursive() or os.path.isdir(pathName):
+                # directories are read once for paths with the same filter
+                walker.addPath(pathName,
+                               processedPath.recursive(),
+                               processedPath.hiddenFiles(),
+                               index,
+                               (processedPath.hiddenFiles(), None if managedFilesOnly[index] is None else managedFilesOnly[index].pattern))
+
+        return (walker, managedFilesOnly)
+
+    def querySignature(self):
+        """Return a signature for current query: search paths, search rules, and
+        if directories are included
+
+        Queries with the same signature return the same results for the same files
+        """
+        return (tuple(sorted((os.path.normpath(os.path.expanduser(path.path())),
+                              path.recursive(),
+                              path.hiddenFiles(),
+                              path.managedFilesOnly(),
+                              path.managedFilesBackup()) for path in self.__pathList)),
+                tuple(sorted(hash(rule) for rule in self.__ruleList)),
+                self.__includeDirectories)
+
     def searchExecute(self, clearResults=True, buildStats=False, signals=None):
         """Search for files
 
@@ -6711,9 +10341,16 @@ class BCFileList(QObject):
         If `buildStats` is True, calculate statistics from file query
         => use stats() method to get statistics (nbDir, NbKra files, nb other files, sizes, ...)
 
+        If a limit is defined (see setResultsLimit()), only the first files
+        according to sort rules are kept in selection
+
+        If query has already been executed (see BCFileListQueryCache), only
+        files from modified directories and modified files are examined again
+
         Return number of files matching criteria
         """
         self.__cancelProcess = False
+        self.__updateWorkerPool()
 
         Stopwatch.reset('^BCFileList.execute')
         Stopwatch.start('BCFileList.execute.99-global')
@@ -6745,10 +10382,10 @@ class BCFileList(QObject):
         Debug.print('...........................................')
 
         # stopwatches are just used to measure execution time performances
-        managedFilesOnly = None
 
         # nbTotal=counter used to determinate when to process application events
         nbTotal = 0
+        nbProcessedEvents = 0
 
         # same search rule than in BCMainViewTab.__filesDirectoryContentChanged()
         # if updated here, must be updated in BCMainViewTab too
@@ -6756,107 +10393,71 @@ class BCFileList(QObject):
         # work on a set, faster for searching if a file is already in list
         foundFiles = set()
         foundDirectories = set()
-        for processedPath in self.__pathList:
-            # counter for files (excluding directories) founds in current path
-            nbFilesInPath = 0
-
-            pathName = processedPath.path()
-            includeHidden = processedPath.hiddenFiles()
-
-            # build regex to prefilter files if needed
-            if processedPath.managedFilesOnly():
-                extensionList = [fr'\.{extension}' for extension in BCFileManagedFormat.list()]
-
-                if processedPath.managedFilesBackup():
-                    bckSufRe = BCFileManagedFormat.backupSuffixRe()
-                    extensionList += [fr'\.{extension}{bckSufRe}' for extension in BCFileManagedFormat.list()]
-
-                managedFilesOnly = re.compile(f"({'|'.join(extensionList)})$", re.I)
-            else:
-                managedFilesOnly = None
+        # uuid of found files and directories; results index is not modified
+        # during search, as search can be cancelled
+        foundUuids = set()
+
+        walker, managedFilesOnly = self.__searchWalker()
+        # counter for files (excluding directories) founds per path
+        nbFilesInPath = [0] * len(self.__pathList)
+
+        # results of previous execution of the same query, per directory
+        querySignature = None
+        if BCFileListQueryCache.enabled():
+            querySignature = self.querySignature()
+            cachedDirectories = BCFileListQueryCache.get(querySignature)
+            # results of current execution, per directory
+            queryDirectories = {}
+            # list of tuple (full path name, path, name) for found files
+            queryFiles = []
+
+        entries = walker.entries()
+        for index, path, files in entries:
+            managedFilesOnlyRe = managedFilesOnly[index]
+            if querySignature is not None and path not in queryDirectories:
+                queryDirectories[path] = (walker.directoryModificationTime(path), {})
 
-            BCFileCache.globalInstance().setDirectory(pathName)
-
-            if processedPath.recursive():
-                # recursive search for path, need to use os.walk()
-                for path, subdirs, files in os.walk(pathName):
-                    if not includeHidden:
-                        # do not include hidden files/directories then need to remove hidden items from subdirs/files
-                        # trick from https://stackoverflow.com/a/13454267
-                        # > Note the dirs[:] = slice assignment; os.walk recursively traverses the subdirectories listed in dirs.
-                        # >                    By replacing the elements of dirs with those that satisfy a criteria (e.g., directories whose names don't begin with .),
-                        # >                    os.walk() will not visit directories that fail to meet the criteria.
-                        # >                    This only works if you keep the topdown keyword argument to True
-                        subdirs[:] = [dirName for dirName in subdirs if not QFileInfo(os.path.join(path, dirName)).isHidden()]
+            for file in files:
+                nbTotal += 1
 
+                if file.is_dir():
                     if self.__includeDirectories:
-                        for dir in subdirs:
-                            nbTotal += 1
-                            fullPathName = os.path.join(path, dir)
-
+                        # if directories are asked and file is a directory, add it
+                        fullPathName = file.path
+                        if fullPathName not in foundDirectories:
                             uuid = BCBaseFile.getUuid(fullPathName)
-                            if uuid not in self.__currentFilesUuid and fullPathName not in foundDirectories:
+                            if uuid not in self.__currentFilesIndex and uuid not in foundUuids:
                                 foundDirectories.add(fullPathName)
-                                self.__currentFilesUuid.add(uuid)
-
-                            if nbTotal % 1000 == 0:
-                                if self.__cancelProcess:
-                                    self.stepExecuted.emit((BCFileList.STEPEXECUTED_CANCEL, ))
-                                    self.__invalidated = False
-                                    return BCFileList.CANCELLED_SEARCH
-                                QApplication.processEvents()
-
-                    for name in files:
-                        nbTotal += 1
-                        fullPathName = os.path.join(path, name)
-
-                        if includeHidden or not QFileInfo(name).isHidden():
-                            # check if file name match given pattern (if pattern) and is not already in file list
-                            if (managedFilesOnly is None or managedFilesOnly.search(name)) and fullPathName not in foundFiles:
-                                uuid = BCBaseFile.getUuid(fullPathName)
-                                if uuid not in self.__currentFilesUuid:
-                                    foundFiles.add(fullPathName)
-                                    self.__currentFilesUuid.add(uuid)
-                                    nbFilesInPath += 1
-
-                        if nbTotal % 1000 == 0:
-                            if self.__cancelProcess:
-                                self.stepExecuted.emit((BCFileList.STEPEXECUTED_CANCEL, ))
-                                self.__invalidated = False
-                                return BCFileList.CANCELLED_SEARCH
-                            QApplication.processEvents()
-            elif os.path.isdir(pathName):
-                # return current directory content
-                with os.scandir(pathName) as files:
-                    for file in files:
-                        nbTotal += 1
-
-                        fullPathName = os.path.join(pathName, file.name)
-                        if includeHidden or not QFileInfo(fullPathName).isHidden():
-                            if file.is_file():
-                                # check if file name match given pattern (if pattern) and is not already in file list
-                                if (managedFilesOnly is None or managedFilesOnly.search(file.name)) and fullPathName not in foundFiles:
-                                    uuid = BCBaseFile.getUuid(fullPathName)
-                                    if uuid not in self.__currentFilesUuid:
-                                        foundFiles.add(fullPathName)
-                                        self.__currentFilesUuid.add(uuid)
-                                        nbFilesInPath += 1
-                            elif self.__includeDirectories and file.is_dir():
-                                # if directories are asked and file is a directory, add it
-                                uuid = BCBaseFile.getUuid(fullPathName)
-                                if uuid not in self.__currentFilesUuid and fullPathName not in foundDirectories:
-                                    foundDirectories.add(fullPathName)
-                                    self.__currentFilesUuid.add(uuid)
-
-                        if nbTotal % 1000 == 0:
-                            if self.__cancelProcess:
-                                self.stepExecuted.emit((BCFileList.STEPEXECUTED_CANCEL, ))
-                                self.__invalidated = False
-                                return BCFileList.CANCELLED_SEARCH
-                            QApplication.processEvents()
-
-            if BCFileList.STEPEXECUTED_SEARCH_FROM_PATH in signals:
-                self.stepExecuted.emit((BCFileList.STEPEXECUTED_SEARCH_FROM_PATH, pathName, processedPath.recursive(), nbFilesInPath))
+                                foundUuids.add(uuid)
+                elif file.is_file():
+                    # check if file name match given pattern (if pattern) and is not already in file list
+                    fullPathName = file.path
+                    if (managedFilesOnlyRe is None or managedFilesOnlyRe.search(file.name)) and fullPathName not in foundFiles:
+                        uuid = BCBaseFile.getUuid(fullPathName)
+                        if uuid not in self.__currentFilesIndex and uuid not in foundUuids:
+                            foundFiles.add(fullPathName)
+                            foundUuids.add(uuid)
+                            nbFilesInPath[index] += 1
+                            if querySignature is not None:
+                                queryFiles.append((fullPathName, path, file.name))
+
+            if nbTotal - nbProcessedEvents >= 1000:
+                # directories are read by walker threads, user interface only need to be refreshed
+                # from time to time
+                nbProcessedEvents = nbTotal
+                if self.__cancelProcess:
+                    walker.cancel()
+                    entries.close()
+                    self.stepExecuted.emit((BCFileList.STEPEXECUTED_CANCEL, ))
+                    self.__invalidated = False
+                    return BCFileList.CANCELLED_SEARCH
+                if BCFileList.STEPEXECUTED_PROGRESS_SEARCH in signals:
+                    self.__emitProgressSearch(walker.nbDirectories(), len(foundFiles), nbTotal)
+                QApplication.processEvents()
+
+        if BCFileList.STEPEXECUTED_SEARCH_FROM_PATH in signals:
+            for index, processedPath in enumerate(self.__pathList):
+                self.stepExecuted.emit((BCFileList.STEPEXECUTED_SEARCH_FROM_PATH, processedPath.path(), processedPath.recursive(), nbFilesInPath[index]))
 
         totalMatch = len(foundFiles) + len(foundDirectories)
 
@@ -6884,8 +10485,85 @@ class BCFileList(QObject):
         # - all files that don't match rule are removed from result
         # - all files that match rule are returned as BCFile in result
 
+        # query already executed: files that are not modified since previous
+        # execution are not examined again, and files not modified since
+        # directory snapshot has been taken are examined from cache
+        cachedFiles = []
+        examinedFiles = {}
+        if querySignature is not None:
+            fileStats = dict(self.__workerPool.mapNoNone(foundFiles, BCFileList.getFileStat))
+            for fullPathName, path, name in queryFiles:
+                fileStat = fileStats.get(fullPathName)
+                if fileStat is None:
+                    continue
+
+                cachedFile = BCFileListQueryCache.cachedFile(cachedDirectories, path, name, fileStat, queryDirectories[path][0])
+                if cachedFile is not None:
+                    # directory content and file not modified
+                    queryDirectories[path][1][name] = cachedFile
+                    foundFiles.discard(fullPathName)
+                    if cachedFile[2] is not None:
+                        cachedFiles.append(cachedFile[2])
+                    continue
+                examinedFiles[fullPathName] = fileStat
+
+            restoredFiles = self.__restoreSnapshotFiles(examinedFiles)
+            for file in restoredFiles:
+                foundFiles.discard(file.fullPathName())
+            Debug.print('Query cache: {0} files not modified (matching: {1}), {2} examined (restored from snapshots: {3})',
+                        len(queryFiles) - len(examinedFiles), len(cachedFiles), len(examinedFiles), len(restoredFiles))
+            BCFileList.__MTASKS_RULES = self.__ruleList
+            restoredFiles = self.__workerPool.mapNoNone(restoredFiles, BCFileList.checkBcFile)
+
+        # rules on file properties (name, path, size, date) are applied from file
+        # stat only: files that don't match are excluded before their content is
+        # read, and files for which image properties are not needed to match rules
+        # don't have to be checked anymore
+        matchedFiles = set()
+        if len(self.__ruleList) > 0:
+            nbFoundFiles = len(foundFiles)
+            BCFileList.__MTASKS_RULES = self.__ruleList
+            statCheckedFiles = self.__workerPool.mapNoNone(foundFiles, BCFileList.statCheckFile)
+            foundFiles = {fileName for fileName, isMatchingRule in statCheckedFiles if isMatchingRule is None}
+            matchedFiles = {fileName for fileName, isMatchingRule in statCheckedFiles if isMatchingRule}
+            Debug.print('Checked from file properties: {0} (matching: {1}, excluded: {2})',
+                        nbFoundFiles, len(matchedFiles), nbFoundFiles - len(matchedFiles) - len(foundFiles))
+
+            if self.__cancelProcess:
+                BCFileList.__MTASKS_RULES = []
+                self.stepExecuted.emit((BCFileList.STEPEXECUTED_CANCEL, ))
+                self.__invalidated = False
+                return BCFileList.CANCELLED_SEARCH
+
+        # results are limited and sort keys can be calculated from file properties:
+        # files that don't need image properties to match rules are built later,
+        # only the first ones according to sort rules
+        limitedFiles = None
+        if self.__resultsLimit > 0 and BCFileList.statSortable(self.__sortList):
+            if len(self.__ruleList) > 0:
+                limitedFiles = matchedFiles
+                matchedFiles = set()
+            else:
+                limitedFiles = foundFiles
+                foundFiles = set()
+
+        # calculate qHash of found files and read their metadata from cache with
+        # bulk queries, then workers don't need to query database file by file
+        # rules on image properties are applied by query on indexed columns: files
+        # that don't match are excluded before their metadata are read
+        nbFoundFiles = len(foundFiles)
+        prefetch = BCFileCachePrefetch()
+        nbPrefetched = BCFileList.prefetchMetadata(foundFiles, prefetch, self.__workerPool, self.sqlFilter())
+        # files already matching rules are not filtered
+        nbPrefetched += BCFileList.prefetchMetadata(matchedFiles, prefetch, self.__workerPool)
+        Debug.print('Prefetched metadata: {0} (excluded by cache query: {1})', nbPrefetched, nbFoundFiles - len(foundFiles))
+
         # Need use a dedicated worker class to manage sqlite database cache
-        self.__workerPool.setWorkerClass(BCWorkerCache)
+        self.__workerPool.setWorkerClass(BCWorkerCache.withPrefetch(prefetch))
+
+        # current results are replaced by built files: index is recalculated when
+        # results are built, or on next inResults() call if search is cancelled
+        self.__currentFilesIndexValid = False
 
         if len(self.__ruleList) > 0:
             # As callback called by pool can't be a method of an instancied object, we need to call static method with static data
@@ -6901,11 +10579,13 @@ class BCFileList(QObject):
 
             # use all processors to parallelize files analysis
             self.__currentFiles = self.__workerPool.mapNoNone(foundFiles, BCFileList.checkBcFile)
+            self.__currentFiles += self.__workerPool.mapNoNone(matchedFiles, BCFileList.getBcFile)
 
             if BCFileList.STEPEXECUTED_PROGRESS_FILTER in signals:
                 self.__workerPool.signals.processed.disconnect(self.__progressFiltering)
 
             if self.__cancelProcess:
+                self.__workerPool.setWorkerClass()
                 self.stepExecuted.emit((BCFileList.STEPEXECUTED_CANCEL, ))
                 self.__invalidated = False
                 return BCFileList.CANCELLED_SEARCH
@@ -6916,6 +10596,29 @@ class BCFileList(QObject):
         # restore default worker pool, no need to access anymore to database
         self.__workerPool.setWorkerClass()
 
+        excludedFiles = []
+        if limitedFiles is not None:
+            limitedFiles, excludedFiles = self.__buildLimitedFiles(limitedFiles)
+            self.__currentFiles += limitedFiles
+            self.__nbFilesExcludedByLimit = len(excludedFiles)
+            Debug.print('Limited results: {0} files (not built: {1})', len(limitedFiles), self.__nbFilesExcludedByLimit)
+
+        if querySignature is not None and not self.__cancelProcess:
+            self.__currentFiles += restoredFiles
+
+            # memoise result of examined files, files not built due to results limit
+            # are not memoised
+            builtFiles = {file.fullPathName(): file for file in self.__currentFiles}
+            for fullPathName in excludedFiles:
+                examinedFiles.pop(fullPathName, None)
+            for fullPathName, path, name in queryFiles:
+                fileStat = examinedFiles.get(fullPathName)
+                if fileStat is not None:
+                    queryDirectories[path][1][name] = (fileStat[0], fileStat[1], builtFiles.get(os.path.normpath(fullPathName)))
+            BCFileListQueryCache.set(querySignature, queryDirectories)
+
+            self.__currentFiles += cachedFiles
+
         # directories are not filtered, add list of all directories
         self.__currentFiles += self.__workerPool.mapNoNone(foundDirectories, BCFileList.getBcDirectory)
         BCFileList.__MTASKS_RULES = []
@@ -6935,7 +10638,8 @@ class BCFileList(QObject):
         Stopwatch.start('BCFileList.execute.03-result')
         # build final result
         #   all files that match selection rules are added to current selected images
-        self.__currentFilesUuid = set(self.__workerPool.map(self.__currentFiles, BCFileList.getBcFileUuid))
+        self.__currentFilesIndex = dict(zip(self.__workerPool.map(self.__currentFiles, BCFileList.getBcFileUuid), range(len(self.__currentFiles))))
+        self.__currentFilesIndexValid = True
         nb = len(self.__currentFiles)
 
         # Debug.print('Add {0} files to result in {1}s', nb, Stopwatch.duration("BCFileList.execute.03-result"))
@@ -6964,7 +10668,22 @@ class BCFileList(QObject):
             self.__progressFilesTracker = 0
         else:
             self.__progressFilesPctThreshold = 0
-        self.sortResults(None, (BCFileList.STEPEXECUTED_UPDATESORT in signals))
+        if 0 < self.__resultsLimit < nb:
+            # only first files are kept
+            self.sortResults(None, False, self.__resultsLimit)
+            self.__nbFilesExcludedByLimit += nb - self.__resultsLimit
+            self.__setCurrentFiles(self.__currentFiles[0:self.__resultsLimit])
+            nb = self.__resultsLimit
+
+            if buildStats:
+                self.__statFiles = self.__workerPool.aggregate(self.__currentFiles,
+                                                               {'nbKra': 0, 'nbOther': 0, 'sizeKra': 0, 'sizeOther': 0, 'nbDir': 0},
+                                                               BCFileList.getBcFileStats)
+
+            if BCFileList.STEPEXECUTED_UPDATESORT in signals:
+                self.resultsUpdatedSort.emit()
+        else:
+            self.sortResults(None, (BCFileList.STEPEXECUTED_UPDATESORT in signals))
         Stopwatch.stop('BCFileList.execute.05-sort')
 
         if BCFileList.STEPEXECUTED_SORT_RESULTS in signals:
@@ -6988,15 +10707,232 @@ class BCFileList(QObject):
         if BCFileList.STEPEXECUTED_UPDATERESET in signals:
             self.resultsUpdatedReset.emit()
 
-        return nb
+        return self.nbFilesMatching()
+
+    def __emitProgressSearch(self, nbDirectories, nbFiles, nbTotal):
+        """Emit STEPEXECUTED_PROGRESS_SEARCH step"""
+        duration = Stopwatch.duration('BCFileList.execute.01-search')
+        if duration is None or duration <= 0:
+            filesPerSecond = 0
+        else:
+            filesPerSecond = nbTotal / duration
+        self.stepExecuted.emit((BCFileList.STEPEXECUTED_PROGRESS_SEARCH, nbDirectories, nbFiles, filesPerSecond))
+
+    def __searchExecuteBatch(self, files, directories, query=None):
+        """Return list of BCFile and BCDirectory for given `files` and `directories`
+        names, for which files are filtered according to rules
+
+        If given, `query` is a tuple (memoised directories, current directories,
+        names) for which:
+        - memoised directories are returned by BCFileListQueryCache.get()
+        - current directories are updated with examined files, to be memoised
+        - names is a dictionary: key=full path file name, value=tuple (path, name)
+        Files not modified since query has been memoised are not examined again
+
+        Used by searchExecuteStream() to build each batch of results
+        """
+        cachedFiles = []
+        examinedFiles = {}
+        if query is not None:
+            cachedDirectories, queryDirectories, names = query
+            fileStats = dict(self.__workerPool.mapNoNone(files, BCFileList.getFileStat))
+            for fullPathName, fileStat in fileStats.items():
+                path, name = names[fullPathName]
+                cachedFile = BCFileListQueryCache.cachedFile(cachedDirectories, path, name, fileStat, queryDirectories[path][0])
+                if cachedFile is not None:
+                    queryDirectories[path][1][name] = cachedFile
+                    if cachedFile[2] is not None:
+                        cachedFiles.append(cachedFile[2])
+                else:
+                    examinedFiles[fullPathName] = fileStat
+            files = {fullPathName for fullPathName in files if fullPathName not in fileStats or fullPathName in examinedFiles}
+
+        returned = []
+        matchedFiles = set()
+        if len(self.__ruleList) > 0:
+            # As callback called by pool can't be a method of an instancied object, pass
+            # current object rules to static class
+            BCFileList.__MTASKS_RULES = self.__ruleList
+            statCheckedFiles = self.__workerPool.mapNoNone(files, BCFileList.statCheckFile)
+            files = {fileName for fileName, isMatchingRule in statCheckedFiles if isMatchingRule is None}
+            matchedFiles = {fileName for fileName, isMatchingRule in statCheckedFiles if isMatchingRule}
+
+        prefetch = BCFileCachePrefetch()
+        BCFileList.prefetchMetadata(files, prefetch, self.__workerPool, self.sqlFilter())
+        BCFileList.prefetchMetadata(matchedFiles, prefetch, self.__workerPool)
+
+        self.__workerPool.setWorkerClass(BCWorkerCache.withPrefetch(prefetch))
+        if len(self.__ruleList) > 0:
+            returned = self.__workerPool.mapNoNone(files, BCFileList.checkBcFile)
+            returned += self.__workerPool.mapNoNone(matchedFiles, BCFileList.getBcFile)
+        else:
+            returned = self.__workerPool.mapNoNone(files, BCFileList.getBcFile)
+        self.__workerPool.setWorkerClass()
+        BCFileList.__MTASKS_RULES = []
+
+        if query is not None:
+            builtFiles = {file.fullPathName(): file for file in returned}
+            for fullPathName, fileStat in examinedFiles.items():
+                path, name = names[fullPathName]
+                queryDirectories[path][1][name] = (fileStat[0], fileStat[1], builtFiles.get(os.path.normpath(fullPathName)))
+            returned += cachedFiles
+
+        returned += self.__workerPool.mapNoNone(directories, BCFileList.getBcDirectory)
+        return returned
+
+    def searchExecuteStream(self, clearResults=True, buildStats=False, signals=None):
+        """Search for files, results are streamed
+
+        Unlike searchExecute(), files matching criteria are added to results by
+        batches as soon as they're found: each batch is added with addResults()
+        then resultsUpdatedAdd() signal is emitted (resultsUpdatedReset() for the
+        first batch if results were empty)
+
+        Batches are small at the beginning to provide first results as fast as
+        possible, and grows up to STREAM_BATCH_SIZE files; a batch is also
+        emitted if STREAM_BATCH_DELAY seconds elapsed since the last one
 
-    def sortResults(self, caseInsensitive=False, emitSignal=True):
-        """Sort current result using current sort rules"""
+        Given `signals` are the same than searchExecute(), use
+        STEPEXECUTED_PROGRESS_SEARCH to get progress after each batch
+
+        Search can be cancelled with cancelSearchExecution(), results already
+        added are kept
+
+        If query has already been executed (see BCFileListQueryCache), files from
+        directories and files not modified are not examined again: memoised files
+        are added with batches in which they're found
+
+        Return number of files matching criteria
+        """
+        self.__cancelProcess = False
+        self.__updateWorkerPool()
+
+        Stopwatch.reset('^BCFileList.execute')
+        Stopwatch.start('BCFileList.execute.99-global')
+        Stopwatch.start('BCFileList.execute.01-search')
+
+        if signals is None:
+            signals = [BCFileList.STEPEXECUTED_SEARCH_FROM_PATHS,
+                       BCFileList.STEPEXECUTED_SORT_RESULTS,
+                       BCFileList.STEPEXECUTED_CANCEL
+                       ]
+
+        if clearResults:
+            self.clearResults(True)
+
+        nbTotal = 0
+        nbFiles = 0
+        foundFiles = set()
+        foundDirectories = set()
+        batchFiles = set()
+        batchDirectories = set()
+        batchSize = BCFileList.STREAM_BATCH_SIZE_FIRST
+        batchTime = time.monotonic()
+
+        walker, managedFilesOnly = self.__searchWalker()
+
+        # results of previous execution of the same query, per directory
+        query = None
+        if BCFileListQueryCache.enabled():
+            querySignature = self.querySignature()
+            # tuple (memoised directories, directories of current execution, names of found files)
+            query = (BCFileListQueryCache.get(querySignature), {}, {})
+
+        entries = walker.entries()
+        for index, path, files in entries:
+            managedFilesOnlyRe = managedFilesOnly[index]
+            if query is not None and path not in query[1]:
+                query[1][path] = (walker.directoryModificationTime(path), {})
+
+            for file in files:
+                nbTotal += 1
+                fullPathName = file.path
+
+                if file.is_dir():
+                    if self.__includeDirectories and fullPathName not in foundDirectories and BCBaseFile.getUuid(fullPathName) not in self.__currentFilesIndex:
+                        foundDirectories.add(fullPathName)
+                        batchDirectories.add(fullPathName)
+                elif file.is_file():
+                    if (managedFilesOnlyRe is None or managedFilesOnlyRe.search(file.name)) and fullPathName not in foundFiles and BCBaseFile.getUuid(fullPathName) not in self.__currentFilesIndex:
+                        foundFiles.add(fullPathName)
+                        batchFiles.add(fullPathName)
+                        if query is not None:
+                            query[2][fullPathName] = (path, file.name)
+
+            if len(batchFiles) + len(batchDirectories) >= batchSize or (time.monotonic() - batchTime) >= BCFileList.STREAM_BATCH_DELAY:
+                nbFiles += len(batchFiles)
+                self.addResults(self.__searchExecuteBatch(batchFiles, batchDirectories, query))
+                batchFiles = set()
+                batchDirectories = set()
+                batchSize = min(BCFileList.STREAM_BATCH_SIZE, batchSize * 2)
+                batchTime = time.monotonic()
+
+                if BCFileList.STEPEXECUTED_PROGRESS_SEARCH in signals:
+                    self.__emitProgressSearch(walker.nbDirectories(), nbFiles, nbTotal)
+                QApplication.processEvents()
+
+                if self.__cancelProcess:
+                    walker.cancel()
+                    entries.close()
+                    self.stepExecuted.emit((BCFileList.STEPEXECUTED_CANCEL, ))
+                    self.__invalidated = False
+                    return BCFileList.CANCELLED_SEARCH
+
+        if len(batchFiles) + len(batchDirectories) > 0:
+            nbFiles += len(batchFiles)
+            self.addResults(self.__searchExecuteBatch(batchFiles, batchDirectories, query))
+
+        if query is not None:
+            BCFileListQueryCache.set(querySignature, query[1])
+
+        Stopwatch.stop('BCFileList.execute.01-search')
+        if BCFileList.STEPEXECUTED_PROGRESS_SEARCH in signals:
+            self.__emitProgressSearch(walker.nbDirectories(), nbFiles, nbTotal)
+
+        if BCFileList.STEPEXECUTED_SEARCH_FROM_PATHS in signals:
+            self.stepExecuted.emit((BCFileList.STEPEXECUTED_SEARCH_FROM_PATHS,
+                                    len(foundFiles),
+                                    len(foundDirectories),
+                                    len(foundFiles) + len(foundDirectories),
+                                    Stopwatch.duration("BCFileList.execute.01-search")))
+
+        if buildStats:
+            self.__statFiles = self.__workerPool.aggregate(self.__currentFiles,
+                                                           {'nbKra': 0, 'nbOther': 0, 'sizeKra': 0, 'sizeOther': 0, 'nbDir': 0},
+                                                           BCFileList.getBcFileStats)
+        else:
+            self.__statFiles = None
+
+        # ----
+        Stopwatch.start('BCFileList.execute.05-sort')
+        self.sortResults(None, (BCFileList.STEPEXECUTED_UPDATESORT in signals))
+        Stopwatch.stop('BCFileList.execute.05-sort')
+
+        if BCFileList.STEPEXECUTED_SORT_RESULTS in signals:
+            self.stepExecuted.emit((BCFileList.STEPEXECUTED_SORT_RESULTS, Stopwatch.duration("BCFileList.execute.05-sort")))
+
+        Stopwatch.stop('BCFileList.execute.99-global')
+        Debug.print('Streamed {0} of {1} files in {2}s', len(self.__currentFiles), nbTotal, Stopwatch.duration("BCFileList.execute.99-global"))
+
+        self.__invalidated = False
+        return len(self.__currentFiles)
+
+    def sortResults(self, caseInsensitive=False, emitSignal=True, limit=0):
+        """Sort current result using current sort rules
+
+        If a `limit` is given, only the `limit` first files are sorted, other
+        files are kept after them
+        """
         if isinstance(caseInsensitive, bool):
             self.__sortCaseInsensitive = caseInsensitive
 
         if len(self.__sortList) > 0:
-            self.__currentFiles = sorted(self.__currentFiles, key=cmp_to_key(self.__sort))
+            if self.__progressFilesPctThreshold > 0:
+                progress = self.__progressSorting
+            else:
+                progress = None
+            self.__currentFiles = BCFileList.sortFiles(self.__currentFiles, self.__sortList, self.__sortCaseInsensitive, self.__sortKeys, progress, limit)
+            self.__currentFilesIndexValid = False
 
             if emitSignal is True:
                 self.resultsUpdatedSort.emit()
@@ -7005,6 +10941,32 @@ class BCFileList(QObject):
         """Return number of found image files"""
         return len(self.__currentFiles)
 
+    def nbFilesMatching(self):
+        """Return number of files matching search criteria
+
+        Can be greater than nbFiles() if results have been limited by
+        setResultsLimit()
+        """
+        return len(self.__currentFiles) + self.__nbFilesExcludedByLimit
+
+    def resultsLimit(self):
+        """Return maximum number of results (0 = no limit)"""
+        return self.__resultsLimit
+
+    def setResultsLimit(self, value):
+        """Set maximum number of results kept by searchExecute(), 0 for no limit
+
+        Only the first files according to sort rules are kept; if sort rules are
+        only on file properties (name, path, size, date), files are selected
+        before their content is read
+        """
+        if not isinstance(value, int):
+            raise EInvalidType("Given `value` must be <int>")
+        value = max(0, value)
+        if self.__resultsLimit != value:
+            self.__invalidate()
+        self.__resultsLimit = value
+
     def files(self):
         """Return found image files"""
         return self.__currentFiles
@@ -7016,6 +10978,9 @@ class BCFileList(QObject):
         - current paths are cleared
         - current rules are cleared
         - current results are cleared
+
+        Files already built for the same list of file names (see BCFileListQueryCache),
+        and not modified since, are not built again
         """
         if not isinstance(files, list):
             raise EInvalidType("Given `files` must be a <list> of <str>, <BCFile> or <BCDirectory> items")
@@ -7045,10 +11010,42 @@ class BCFileList(QObject):
 
         # Debug.print('[BCFileList.setResult] FoundFile: {0}', foundFiles)
         pool = WorkerPool()
-        pool.setWorkerClass(BCWorkerCache)
         if len(foundFiles) > 0:
-            filesList = filesList.union(pool.mapNoNone(foundFiles, BCFileList.getBcFile))
-        pool.setWorkerClass()
+            # files built for previous call with the same file names, per directory
+            querySignature = None
+            if BCFileListQueryCache.enabled():
+                fileNames = [fileName for fileName in foundFiles if isinstance(fileName, str)]
+                querySignature = ('setResults', frozenset(fileNames))
+                cachedDirectories = BCFileListQueryCache.get(querySignature)
+                queryDirectories = {}
+                examinedFiles = {}
+                for fileName, fileStat in pool.mapNoNone(fileNames, BCFileList.getFileStat):
+                    path, name = os.path.split(fileName)
+                    if path not in queryDirectories:
+                        directoryStat = BCFileList.getFileStat(None, path)
+                        queryDirectories[path] = (None if directoryStat is None else directoryStat[1][1], {})
+                    cachedFile = BCFileListQueryCache.cachedFile(cachedDirectories, path, name, fileStat, queryDirectories[path][0])
+                    if cachedFile is not None:
+                        queryDirectories[path][1][name] = cachedFile
+                        foundFiles.discard(fileName)
+                        if cachedFile[2] is not None:
+                            filesList.add(cachedFile[2])
+                    else:
+                        examinedFiles[fileName] = fileStat
+
+            prefetch = BCFileCachePrefetch()
+            BCFileList.prefetchMetadata(foundFiles, prefetch, pool)
+            pool.setWorkerClass(BCWorkerCache.withPrefetch(prefetch))
+            builtFiles = pool.mapNoNone(foundFiles, BCFileList.getBcFile)
+            pool.setWorkerClass()
+            filesList = filesList.union(builtFiles)
+
+            if querySignature is not None:
+                builtFiles = {file.fullPathName(): file for file in builtFiles}
+                for fileName, fileStat in examinedFiles.items():
+                    path, name = os.path.split(fileName)
+                    queryDirectories[path][1][name] = (fileStat[0], fileStat[1], builtFiles.get(os.path.normpath(fileName)))
+                BCFileListQueryCache.set(querySignature, queryDirectories)
         if len(foundDirectories) > 0:
             directoriesList = directoriesList.union(pool.mapNoNone(foundDirectories, BCFileList.getBcDirectory))
 
@@ -7058,6 +11055,24 @@ class BCFileList(QObject):
 
         return len(self.__currentFiles)
 
+    def applyResults(self, files, sortKeys=None):
+        """Replace current results with given list of BCFile and/or BCDirectory
+
+        Unlike setResults(), given files are used as is (no file is built nor
+        sorted) and search paths/rules are kept: results are replaced at once
+        and resultsUpdatedReset() signal is emitted
+
+        Given `sortKeys`, if any, are sort keys already calculated for files
+        (see sortFiles())
+        """
+        if not isinstance(files, list):
+            raise EInvalidType("Given `files` must be a <list> of <BCFile> or <BCDirectory> items")
+
+        self.__setCurrentFiles(files)
+        self.__sortKeys = sortKeys if isinstance(sortKeys, dict) else {}
+        self.__invalidated = False
+        self.resultsUpdatedReset.emit()
+
     def addResults(self, files, position=-1):
         """Add files to current results
 
@@ -7070,56 +11085,60 @@ class BCFileList(QObject):
         - If value > 0, inserted to position
 
         A file already in list is not added
+
+        If results weren't empty, resultsAboutToBeAdded() signal is emitted before
+        files are added, then resultsUpdatedAdd(); otherwise resultsUpdatedReset()
+        signal is emitted
         """
-        currentFilesCount = len(self.__currentFiles)
+        if not isinstance(files, (list, tuple, set)):
+            files = [files]
 
-        if isinstance(files, (list, tuple, set)):
-            added = []
-            self.__massProcess = True
-            for file in files:
-                if self.addResults(file):
-                    added.append(file)
-            self.__massProcess = False
-            if len(added) > 0:
-                if currentFilesCount == 0:
-                    # list was empty, then it's a reset
-                    self.resultsUpdatedReset.emit()
+        self.__indexCurrentFiles()
+        added = []
+        addedUuids = set()
+        for file in files:
+            if isinstance(file, str):
+                if os.path.isdir(file):
+                    file = BCDirectory(file)
+                elif os.path.isfile(file):
+                    file = BCFile(file)
                 else:
-                    # list wasn't empty, then it's an addition
-                    self.resultsUpdatedAdd.emit(added)
-                return True
-            return False
+                    file = BCMissingFile(file)
 
-        if isinstance(files, str):
-            if os.path.isdir():
-                files = BCDirectory(files)
-            elif os.path.isfile():
-                files = BCFile(files)
-            else:
-                files = BCMissingFile(files)
+            if not isinstance(file, BCBaseFile):
+                raise EInvalidType("Given `files` must be <BCBaseFile> or <list>")
 
-        if isinstance(files, BCBaseFile):
-            if not files.uuid() in self.__currentFilesUuid:
+            if file.uuid() not in self.__currentFilesIndex and file.uuid() not in addedUuids:
                 # add only if not already in current results
-                if position < 0:
-                    self.__currentFiles.append(files)
-                else:
-                    self.__currentFiles.insert(files, position)
+                addedUuids.add(file.uuid())
+                added.append(file)
 
-                self.__currentFilesUuid.add(files.uuid())
+        if len(added) == 0:
+            return False
 
-                if not self.__massProcess:
-                    if currentFilesCount == 0:
-                        # list was empty, then it's a reset
-                        self.resultsUpdatedReset.emit()
-                    else:
-                        # list wasn't empty, then it's an addition
-                        self.resultsUpdatedAdd.emit([files])
+        currentFilesCount = len(self.__currentFiles)
+        if position < 0 or position > currentFilesCount:
+            position = currentFilesCount
 
-                return True
-            return False
+        if currentFilesCount > 0:
+            self.resultsAboutToBeAdded.emit(position, len(added))
+
+        if position == currentFilesCount:
+            for index, file in enumerate(added, currentFilesCount):
+                self.__currentFilesIndex[file.uuid()] = index
+            self.__currentFiles.extend(added)
         else:
-            raise EInvalidType("Given `files` must be <BCBaseFile> or <list>")
+            # indexes of next files are modified
+            self.__currentFiles[position:position] = added
+            self.__currentFilesIndexValid = False
+
+        if currentFilesCount == 0:
+            # list was empty, then it's a reset
+            self.resultsUpdatedReset.emit()
+        else:
+            # list wasn't empty, then it's an addition
+            self.resultsUpdatedAdd.emit(added)
+        return True
 
     def updateResults(self, files):
         """Update files to current results
@@ -7142,18 +11161,18 @@ class BCFileList(QObject):
             return False
 
         if isinstance(files, str):
-            if os.path.isdir():
+            if os.path.isdir(files):
                 files = BCDirectory(files)
-            elif os.path.isfile():
+            elif os.path.isfile(files):
                 files = BCFile(files)
             else:
                 files = BCMissingFile(files)
 
         if isinstance(files, BCBaseFile):
-            if files.uuid() in self.__currentFilesUuid:
+            index = self.inResults(files.uuid())
+            if index >= 0:
                 # update only if in current results
-
-                self.__currentFiles[self.inResults(files.uuid())] = files
+                self.__currentFiles[index] = files
 
                 if not self.__massProcess:
                     # list wasn't empty, then it's an addition
@@ -7172,64 +11191,44 @@ class BCFileList(QObject):
         - a file uuid
         - <BCFile> and/or <BCDirectory>
         """
-        if isinstance(files, (list, tuple, set)):
-            removed = []
-            self.__massProcess = True
-            # first we need to process values given as row number
-            # need reverse order to avoid index being broken when removed
-            nbFiles = len(self.__currentFiles)
-            intList = sorted([v for v in files if isinstance(v, int) and (v >= 0 and v < nbFiles)], reverse=True)
-
-            for index in intList:
-                removed.append(self.__currentFiles.pop(index))
-
-            notIntList = [v for v in files if not isinstance(v, int)]
+        if not isinstance(files, (list, tuple, set)):
+            files = [files]
 
-            for file in notIntList:
-                if self.removeResults(file):
-                    removed.append(file)
-            self.__massProcess = False
-            if len(removed) > 0:
-                if len(self.__currentFiles) == 0:
-                    # everything was removed, then it's a reset
-                    self.resultsUpdatedReset.emit()
-                else:
-                    # list wasn't empty, then it's an remove
-                    self.resultsUpdatedRemove.emit(removed)
-                return True
-            return False
-
-        if isinstance(files, str):
-            if os.path.isdir():
-                files = BCDirectory(files)
-            elif os.path.isfile():
-                files = BCFile(files)
+        nbFiles = len(self.__currentFiles)
+        removedIndexes = set()
+        for file in files:
+            if isinstance(file, int):
+                # value given as row number
+                if file >= 0 and file < nbFiles:
+                    removedIndexes.add(file)
+                continue
+            elif isinstance(file, str):
+                file = BCBaseFile.getUuid(file)
+            elif isinstance(file, BCBaseFile):
+                file = file.uuid()
+
+            if isinstance(file, bytes):
+                index = self.inResults(file)
+                if index >= 0:
+                    # remove only if found in current results
+                    removedIndexes.add(index)
             else:
-                files = BCMissingFile(files)
-
-        if isinstance(files, BCBaseFile):
-            files = files.uuid()
-
-        if isinstance(files, bytes):
-            index = self.inResults(files)
+                raise EInvalidType("Given `files` must be <BCBaseFile> or <list>")
 
-            if index >= 0:
-                # remove only if found in current results
-                file = self.__currentFiles.pop(index)
-                self.__currentFilesUuid.discard(files)
+        if len(removedIndexes) == 0:
+            return False
 
-                if not self.__massProcess:
-                    if len(self.__currentFiles) == 0:
-                        # everything was removed, then it's a reset
-                        self.resultsUpdatedReset.emit()
-                    else:
-                        # list wasn't empty, then it's an remove
-                        self.resultsUpdatedRemove.emit([file])
+        # files are removed in one pass, then indexes are recalculated once
+        removed = [self.__currentFiles[index] for index in sorted(removedIndexes)]
+        self.__setCurrentFiles([file for index, file in enumerate(self.__currentFiles) if index not in removedIndexes])
 
-                return True
-            return False
+        if len(self.__currentFiles) == 0:
+            # everything was removed, then it's a reset
+            self.resultsUpdatedReset.emit()
         else:
-            raise EInvalidType("Given `files` must be <BCBaseFile> or <list>")
+            # list wasn't empty, then it's an remove
+            self.resultsUpdatedRemove.emit(removed)
+        return True
 
     def inResults(self, bcFileUuid):
         """Return if `bcFileUuid` is in current results
@@ -7265,11 +11264,8 @@ class BCFileList(QObject):
             bcFileUuid = bcFileUuid.uuid()
 
         if isinstance(bcFileUuid, bytes):
-            if bcFileUuid in self.__currentFilesUuid:
-                for index, file in enumerate(self.__currentFiles):
-                    if file.uuid() == bcFileUuid:
-                        return index
-            return -1
+            self.__indexCurrentFiles()
+            return self.__currentFilesIndex.get(bcFileUuid, -1)
         else:
             raise EInvalidType("Given `bcFileUuid` must be <BCBaseFile> of <bytes>")
 
@@ -84,12 +84,17 @@ from .bcfile import (
         BCBaseFile,
         BCDirectory,
         BCFile,
+        BCFileCache,
+        BCFileCachePrefetch,
+        BCFileEmbeddedImage,
         BCFileList,
+        BCFileListFuture,
         BCFileListSortRule,
         BCFileListPath,
         BCFileManagedFormat,
         BCFileProperty,
         BCFileThumbnailSize,
+        BCFileWalker,
         BCMissingFile
     )
 from .bchistory import BCHistory
@@ -357,7 +362,11 @@ class BCMainViewClipboard(QTreeView):
 
 
 class BCWImageLabel(QLabel):
-    """A label with an image"""
+    """A label with an image
+
+    Given `image` can be a QImage or a BCFileEmbeddedImage; in this case, label
+    display the cached thumbnail and full image is decoded only when asked
+    """
     clicked = Signal(QObject)
 
     def __init__(self, image, parent=None):
@@ -365,7 +374,12 @@ class BCWImageLabel(QLabel):
 
         self.__image = image
 
-        self.setPixmap(QPixmap.fromImage(image.scaled(128, 128, Qt.KeepAspectRatio, Qt.SmoothTransformation)))
+        if isinstance(image, BCFileEmbeddedImage):
+            thumbnail = image.thumbnail(BCFileThumbnailSize.MEDIUM)
+            if thumbnail is not None:
+                self.setPixmap(QPixmap.fromImage(thumbnail))
+        else:
+            self.setPixmap(QPixmap.fromImage(image.scaled(128, 128, Qt.KeepAspectRatio, Qt.SmoothTransformation)))
         self.setCursor(Qt.PointingHandCursor)
 
     def mousePressEvent(self, event):
@@ -373,6 +387,9 @@ class BCWImageLabel(QLabel):
         self.clicked.emit(self)
 
     def image(self):
+        """Return image as QImage"""
+        if isinstance(self.__image, BCFileEmbeddedImage):
+            return self.__image.image()
         return self.__image
 
 # -----------------------------------------------------------------------------
@@ -454,6 +471,17 @@ class BCMainViewTab(QFrame):
         self.__filesFsWatcherTimer.setInterval(150)
         self.__filesFsWatcherTimer.timeout.connect(self.__filesFsWatcherTimerRefresh)
 
+        # directory content is restored from snapshot, then scanned in background
+        # to apply differences
+        self.__filesSnapshotInodes = {}
+        self.__filesScanPool = WorkerPool(1)
+        self.__filesScanPool.signals.processed.connect(self.__filesDirectoryScanned)
+
+        # directory content not available from snapshot is listed in background
+        # futures are kept until their thread is finished, even if cancelled
+        self.__filesFuture = None
+        self.__filesFutures = set()
+
         self.__filesImageNfoSizeUnit = 'mm'
 
         self.__filesViewAsThumbnail = False
@@ -771,11 +799,70 @@ class BCMainViewTab(QFrame):
 
     # -- PRIVATE FILES ---------------------------------------------------------
 
-    def __filesDirectoryContentChanged(self, path):
-        """Content of directory has changed (from __filesFsWatcher)
+    @staticmethod
+    def scanDirectory(itemIndex, path, includeHidden, managedFilesOnly, knownFiles):
+        """Return a tuple (path, content, files) for directory `path`
 
-        Do comparison with current directory content and add/remove file from model
+        Returned content is a dictionary
+            key = file/directory name
+            value = tuple (isDirectory, size, mtime, inode)
+
+        If `managedFilesOnly` is a regular expression, only files for which name is
+        matching are returned
+
+        Given `knownFiles` is a dictionary of files currently in view
+            key = file name
+            value = tuple (size, mtime, inode), inode is None if not known
+
+        Returned files is a dictionary of BCFile built for files not in `knownFiles`
+        or for which size, modification time or inode has changed
+            key = file name
+            value = BCFile, or None if file can't be analysed
+
+        > Used for multiprocessing tasks
         """
+        # same search rule than in BCFileListFuture
+        # if updated in BCFileListFuture, must be updated here too
+        content = {}
+        try:
+            walker = BCFileWalker(1)
+            walker.addPath(path, False, includeHidden)
+            for tag, directory, entries in walker.entries():
+                for entry in entries:
+                    if entry.is_file():
+                        # check if file name match given pattern (if pattern)
+                        if (managedFilesOnly is None or managedFilesOnly.search(entry.name)):
+                            stat = entry.stat()
+                            content[entry.name] = (False, stat.st_size, stat.st_mtime, entry.inode())
+                    elif entry.is_dir():
+                        content[entry.name] = (True, 0, entry.stat().st_mtime, entry.inode())
+        except Exception as e:
+            Debug.print('[BCMainViewTab.scanDirectory] Unable to scan directory {0}: {1}', path, f"{e}")
+
+        toBuild = []
+        for name, (isDirectory, size, mtime, inode) in content.items():
+            if not isDirectory:
+                known = knownFiles.get(name)
+                if known is None or known[0] != size or known[1] != mtime or known[2] not in (None, inode):
+                    toBuild.append(os.path.join(path, name))
+
+        files = {}
+        if len(toBuild) > 0:
+            # calculate qHash and read metadata of new/modified files with bulk queries
+            prefetch = BCFileCachePrefetch()
+            BCFileList.prefetchMetadata(toBuild, prefetch)
+            bcFileCache = BCFileCache(f'BCMainViewTab.scanDirectory{id(prefetch)}', prefetch)
+            try:
+                for fullPathName in toBuild:
+                    files[os.path.basename(fullPathName)] = BCFileList.getBcFile(None, fullPathName, bcFileCache)
+            finally:
+                bcFileCache.close()
+
+        return (path, content, files)
+
+    def __filesScanOptions(self):
+        """Return a tuple (includeHidden, managedFilesOnly) according to current
+        view options, to use with BCMainViewTab.scanDirectory()"""
         # build regex to prefilter files if needed
         if self.__uiController.optionViewFileManagedOnly():
             extensionList = [fr'\.{extension}' for extension in BCFileManagedFormat.list()]
@@ -788,64 +875,109 @@ class BCMainViewTab(QFrame):
         else:
             managedFilesOnly = None
 
-        includeHidden = self.__uiController.optionViewFileHidden()
-
-        # same search rule than in BCFileList.searchExecute()
-        # if updated in BCFileList, must be updated here too
-        foundFiles = []
-        foundDirectories = []
-        with os.scandir(path) as files:
-            for foundFile in files:
-                fullPathName = os.path.join(path, foundFile.name)
-                if includeHidden or not QFileInfo(fullPathName).isHidden():
-                    if foundFile.is_file():
-                        # check if file name match given pattern (if pattern) and is not already in file list
-                        if (managedFilesOnly is None or managedFilesOnly.search(foundFile.name)):
-                            foundFiles.append(fullPathName)
-                    elif foundFile.is_dir():
-                        foundDirectories.append(fullPathName)
+        return (self.__uiController.optionViewFileHidden(), managedFilesOnly)
+
+    def __filesDirectoryContentChanged(self, path):
+        """Content of directory has changed (from __filesFsWatcher)
+
+        Do comparison with current directory content and add/remove file from model
+        """
+        self.__filesScanDirectory(path)
+
+    def __filesScanDirectory(self, path):
+        """Scan directory `path` in background (from __filesScanPool)
+
+        Differences with current view are applied and snapshot updated once
+        directory has been scanned
+        """
+        knownFiles = {file.name(): (file.size(), file.lastModificationDateTime(), self.__filesSnapshotInodes.get(file.name()))
+                      for file in self.__filesQuery.files() if isinstance(file, BCFile)}
+        self.__filesScanPool.startProcessing([path], BCMainViewTab.scanDirectory, *self.__filesScanOptions(), knownFiles)
+
+    def __filesDirectoryScanned(self, processedNfo):
+        """Directory content has been scanned in background (from __filesScanPool)"""
+        itemIndex, scanned, nbProcessed = processedNfo
+        if scanned is None:
+            return
+        elif self.__filesModelTv.isThumbnailLoading() or self.__filesModelLv.isThumbnailLoading():
+            # let watcher timer apply directory content once thumbnails are loaded
+            self.__filesFsWatcherTimer.start()
+            return
+
+        self.__filesApplyDirectoryContent(scanned)
+
+    def __filesApplyDirectoryContent(self, scanned):
+        """Apply directory content returned by BCMainViewTab.scanDirectory() to current view
+
+        Only differences between current view and directory content are applied:
+        - new files/directories are added
+        - files/directories that doesn't exist anymore are removed
+        - files for which size, modification time or inode has changed are updated
+
+        Then directory snapshot is updated in cache
+        """
+        path, content, files = scanned
+        if self.framePathBar.mode() != BCWPathBar.MODE_PATH or path != self.filesPath():
+            # view has changed since directory has been scanned
+            return
 
         # now we have a list of files+directories, matching current rules
         toAdd = []
         toRemove = []
         toUpdate = []
-        toCheck = []
-
-        # check if found files&directories are already in current view
-        # if not, they have to be added, otherwise ignore it
-        for fullPathName in foundFiles:
-            uuid = BCBaseFile.getUuid(fullPathName)
-            if self.__filesQuery.inResults(uuid) == -1:
-                toAdd.append(BCFile(fullPathName))
-            else:
-                toCheck.append(uuid)
-
-        for fullPathName in foundDirectories:
-            uuid = BCBaseFile.getUuid(fullPathName)
-            if self.__filesQuery.inResults(uuid) == -1:
-                toAdd.append(BCDirectory(fullPathName))
-            else:
-                toCheck.append(uuid)
-
-        # check if files&directories from current view are already in current view
-        # if not, they have to be added, otherwise ignore it
-        for file in self.__filesQuery.files():
-            if not file.uuid() in toCheck and file.name() != '..':
+        toBuild = []
+
+        currentFiles = {file.name(): file for file in self.__filesQuery.files() if file.name() != '..'}
+
+        for name, (isDirectory, size, mtime, inode) in content.items():
+            file = currentFiles.pop(name, None)
+            fullPathName = os.path.join(path, name)
+
+            if isDirectory:
+                if not isinstance(file, BCDirectory):
+                    if file is not None:
+                        toRemove.append(file)
+                    toAdd.append(BCDirectory(fullPathName, mtime))
+            elif file is None:
+                toBuild.append(name)
+            elif not isinstance(file, BCFile):
                 toRemove.append(file)
-            elif isinstance(file, BCFile):
+                toBuild.append(name)
+            elif (file.size() != size or
+                  file.lastModificationDateTime() != mtime or
+                  self.__filesSnapshotInodes.get(name, inode) != inode):
                 # need to check if file has been modified...
-                newFile = BCFile(file.fullPathName())
-                if newFile.qHash() != file.qHash():
-                    toUpdate.append(newFile)
+                toBuild.append(name)
+
+        # files&directories from current view not found in directory content have to be removed
+        toRemove += list(currentFiles.values())
+
+        # files have been built in background by BCMainViewTab.scanDirectory()
+        rescan = False
+        for name in toBuild:
+            if name not in files:
+                # view has changed since directory scan has been started; file
+                # will be built by next scan
+                rescan = True
+                continue
+
+            newFile = files[name]
+            if newFile is None:
+                # unable to analyse file
+                continue
+            elif self.__filesQuery.inResults(newFile.uuid()) == -1:
+                toAdd.append(newFile)
+            else:
+                toUpdate.append(newFile)
 
         refresh = False
         # now we have list of files to add/remove to current view
-        if len(toAdd) > 0:
-            self.__filesQuery.addResults(toAdd)
-            refresh = True
         if len(toRemove) > 0:
             self.__filesQuery.removeResults(toRemove)
             refresh = True
+        if len(toAdd) > 0:
+            self.__filesQuery.addResults(toAdd)
+            refresh = True
         if len(toUpdate) > 0:
             self.__filesQuery.updateResults(toUpdate)
             refresh = True
@@ -853,90 +985,122 @@ class BCMainViewTab(QFrame):
         if refresh:
             self.__filesSort()
 
-    def __filesSort(self, index=None):
-        """Sort files according to column index"""
-        if self.__filesQuery is None:
-            return
+        # update snapshot of directory
+        self.__filesSnapshotInodes = {name: nfo[3] for name, nfo in content.items()}
+        snapshot = []
+        for file in self.__filesQuery.files():
+            if file.name() in content:
+                if isinstance(file, BCFile):
+                    snapshot.append((file.name(), file.size(), file.lastModificationDateTime(), content[file.name()][3], file.qHash(), file.format()))
+                elif isinstance(file, BCDirectory):
+                    snapshot.append((file.name(), 0, file.lastModificationDateTime(), content[file.name()][3], '', BCFileManagedFormat.DIRECTORY))
+        BCFileCache.globalInstance().setSnapshot(path, snapshot)
+
+        if rescan:
+            self.__filesFsWatcherTimer.start()
 
-        if index is None:
-            index = self.treeViewFiles.header().sortIndicatorSection()
+    def __filesSortRules(self, index=None):
+        """Return list of BCFileListSortRule for given column index
 
+        If no index is provided, use current sort column
+        """
         if index is None:
-            return
-
-        self.__filesQuery.clearSortRules()
+            index = self.treeViewFiles.header().sortIndicatorSection()
 
         ascending = (self.treeViewFiles.header().sortIndicatorOrder() == Qt.AscendingOrder)
 
         if index == BCFileModel.COLNUM_FILE_PATH:
-            self.__filesQuery.addSortRule([
+            return [
                     BCFileListSortRule(BCFileProperty.PATH, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_NAME, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_DATE, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_SIZE, ascending)
-                ])
+                ]
         elif index in (BCFileModel.COLNUM_FILE_NAME, BCFileModel.COLNUM_ICON, BCFileModel.COLNUM_FILE_BASENAME):
-            self.__filesQuery.addSortRule([
+            return [
                     BCFileListSortRule(BCFileProperty.FILE_NAME, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_DATE, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_SIZE, ascending)
-                ])
+                ]
         elif index == BCFileModel.COLNUM_FILE_EXTENSION:
-            self.__filesQuery.addSortRule([
+            return [
                     BCFileListSortRule(BCFileProperty.FILE_EXTENSION, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_NAME, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_DATE, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_SIZE, ascending)
-                ])
+                ]
         elif index in (BCFileModel.COLNUM_FILE_FORMAT_SHORT, BCFileModel.COLNUM_FILE_FORMAT_LONG):
-            self.__filesQuery.addSortRule([
+            return [
                     BCFileListSortRule(BCFileProperty.FILE_FORMAT, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_NAME, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_DATE, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_SIZE, ascending)
-                ])
+                ]
         elif index in (BCFileModel.COLNUM_FILE_DATETIME, BCFileModel.COLNUM_FILE_DATE, BCFileModel.COLNUM_FILE_TIME):
-            self.__filesQuery.addSortRule([
+            return [
                     BCFileListSortRule(BCFileProperty.FILE_DATE, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_NAME, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_SIZE, ascending)
-                ])
+                ]
         elif index == BCFileModel.COLNUM_FILE_SIZE:
-            self.__filesQuery.addSortRule([
+            return [
                     BCFileListSortRule(BCFileProperty.FILE_SIZE, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_NAME, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_DATE, ascending)
-                ])
+                ]
         elif index in (BCFileModel.COLNUM_IMAGE_WIDTH, BCFileModel.COLNUM_IMAGE_SIZE):
-            self.__filesQuery.addSortRule([
+            return [
                     BCFileListSortRule(BCFileProperty.IMAGE_WIDTH, ascending),
                     BCFileListSortRule(BCFileProperty.IMAGE_HEIGHT, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_NAME, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_DATE, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_SIZE, ascending)
-                ])
+                ]
         elif index == BCFileModel.COLNUM_IMAGE_HEIGHT:
-            self.__filesQuery.addSortRule([
+            return [
                     BCFileListSortRule(BCFileProperty.IMAGE_HEIGHT, ascending),
                     BCFileListSortRule(BCFileProperty.IMAGE_WIDTH, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_NAME, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_DATE, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_SIZE, ascending)
-                ])
+                ]
         elif index in (BCFileModel.COLNUM_IMAGE_RATIO, BCFileModel.COLNUM_IMAGE_ORIENTATION):
-            self.__filesQuery.addSortRule([
+            return [
                     BCFileListSortRule(BCFileProperty.IMAGE_RATIO, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_NAME, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_DATE, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_SIZE, ascending)
-                ])
+                ]
         elif index in (BCFileModel.COLNUM_IMAGE_PIXELS, BCFileModel.COLNUM_IMAGE_PIXELSMP):
-            self.__filesQuery.addSortRule([
+            return [
                     BCFileListSortRule(BCFileProperty.IMAGE_PIXELS, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_NAME, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_DATE, ascending),
                     BCFileListSortRule(BCFileProperty.FILE_SIZE, ascending)
-                ])
+                ]
+        return []
+
+    def __filesSort(self, index=None, applySort=True):
+        """Sort files according to column index
+
+        If `applySort` is False, sort rules are updated but files are considered
+        to be already sorted
+        """
+        if self.__filesQuery is None:
+            return
+
+        if index is None:
+            index = self.treeViewFiles.header().sortIndicatorSection()
+
+        if index is None:
+            return
+
+        self.__filesQuery.clearSortRules()
+        self.__filesQuery.addSortRule(self.__filesSortRules(index))
+
+        if not applySort:
+            self.__filesUpdate()
+            return
 
         # when sort is applied, we want to keep current selected items
         if len(self.treeViewFiles.selectionModel().selectedRows()) > 0:
@@ -1030,6 +1194,9 @@ class BCMainViewTab(QFrame):
             self.__filesBlockedRefresh += 1
             return
 
+        # a listing in progress for another directory is not needed anymore
+        self.__filesFutureCancel()
+
         if self.framePathBar.mode() == BCWPathBar.MODE_SAVEDVIEW:
             refType = self.__uiController.quickRefType(self.filesPath())
 
@@ -1070,18 +1237,69 @@ class BCMainViewTab(QFrame):
                                                             self.__uiController.optionViewFileManagedOnly(),
                                                             self.__uiController.optionViewFileBackup()))
 
-            QApplication.setOverrideCursor(Qt.WaitCursor)
             self.__filesQuery.clearSortRules()
-            self.__filesQuery.searchExecute(True,
-                                            True,
-                                            [BCFileList.STEPEXECUTED_SEARCH_FROM_PATHS, BCFileList.STEPEXECUTED_FILTER_FILES, BCFileList.STEPEXECUTED_PROGRESS_FILTER])
-            self.__filesAddParentDirectory()
-            QApplication.restoreOverrideCursor()
+
+            # if directory snapshot is available, display it immediately
+            snapshot = BCFileCache.globalInstance().getSnapshot(path)
+            if snapshot is None:
+                # directory is listed, filtered and sorted in background; results
+                # are applied to view at once when ready
+                self.__filesSnapshotInodes = {}
+                self.__filesQuery.clearResults()
+                self.__filesProgressStart(0, i18n('Reading directory'))
+
+                includeHidden, managedFilesOnly = self.__filesScanOptions()
+                self.__filesFuture = BCFileListFuture(path, includeHidden, managedFilesOnly, self.__filesSortRules(), False, True)
+                self.__filesFuture.resultsReady.connect(self.__filesFutureResultsReady)
+                self.__filesFuture.finished.connect(self.__filesFutureFinished)
+                self.__filesFutures.add(self.__filesFuture)
+                self.__filesFuture.start()
+            else:
+                QApplication.setOverrideCursor(Qt.WaitCursor)
+                self.__filesSnapshotInodes = {name: entry[2] for name, entry in snapshot.items()}
+                self.__filesQuery.setResults(BCFileList.getSnapshotFiles(path, snapshot))
+                self.__filesAddParentDirectory()
+                QApplication.restoreOverrideCursor()
+
+                # scan directory in background; differences with current view will be
+                # applied and snapshot updated
+                self.__filesScanDirectory(path)
 
         # sort files according to columns + add to treeview
         self.__filesSort()
         self.__filesBlockedRefresh = 0
 
+    def __filesFutureCancel(self):
+        """Cancel listing of directory in progress, if any"""
+        if self.__filesFuture is not None:
+            self.__filesFuture.cancel()
+            self.__filesFuture = None
+            self.__filesProgressStop()
+
+    def __filesFutureFinished(self):
+        """Thread of a BCFileListFuture is finished, reference can be released"""
+        for future in [future for future in self.__filesFutures if future.isFinished()]:
+            self.__filesFutures.discard(future)
+
+    def __filesFutureResultsReady(self, future):
+        """Directory content listed in background (from BCFileListFuture) is ready"""
+        if future is not self.__filesFuture:
+            # not the current listing anymore
+            return
+
+        self.__filesFuture = None
+        self.__filesProgressStop()
+        if self.framePathBar.mode() != BCWPathBar.MODE_PATH or future.path() != self.filesPath():
+            # view has changed since directory listing has been started
+            return
+
+        self.__filesQuery.applyResults(future.results(), future.sortKeys())
+        # files are already sorted, unless sort column has been changed meanwhile
+        self.__filesSort(None, future.sortRules() != self.__filesSortRules())
+
+        # scan directory in background; snapshot is updated
+        self.__filesScanDirectory(future.path())
+
     def __filesRefreshTabLayout(self):
         """Refresh layout according to current configuration"""
         if self.__filesTabLayout == BCMainViewTabFilesLayout.FULL:
@@ -1243,7 +1461,10 @@ class BCMainViewTab(QFrame):
 
         def loadReferenceImageAsnewDocument(imgLabel):
             """Load reference image (from index) as a new document"""
-            item = BCClipboardItemImg('00000000000000000000000000000000', imgLabel.image(), saveInCache=True, persistent=False)
+            image = imgLabel.image()
+            if image is None:
+                return
+            item = BCClipboardItemImg('00000000000000000000000000000000', image, saveInCache=True, persistent=False)
             self.__uiController.clipboard().pushBackToClipboard(item)
             Krita.instance().action('paste_new').trigger()
 
@@ -1801,7 +2022,8 @@ class BCMainViewTab(QFrame):
                         self.setStyleSheet("QTabBar::tab::disabled {width: 0; height: 0; margin: 0; padding: 0; border: none;} ")
                 except Exception as e:
                     Debug.print(f"Error: {traceback.format_exc()}")
-                self.wFilesPreview.showPreview(file.image())
+                # avoid full resolution decoding; full image is loaded if user zoom in preview
+                self.wFilesPreview.showPreview(file.previewImage(self.wFilesPreview.size()), file.imageSize(), file.image)
                 if not self.wFilesPreview.hasImage():
                     self.wFilesPreview.hidePreview("Unable to read image")
 
@@ -2033,6 +2255,14 @@ class BCMainViewTab(QFrame):
             # in this case, value[2] give processed index
             if self.__filesPbVisible:
                 self.__filesProgressSetValue(value[2])
+        elif value[0] == BCFileList.STEPEXECUTED_PROGRESS_SEARCH:
+            # in this case, value[1] give number of directories read, value[2]
+            # number of files found and value[3] number of files read per second
+            text = i18n('Reading files: {0} found ({1:.0f} files/s)').format(value[2], value[3])
+            if self.__filesPbVisible:
+                self.pbProgress.setFormat(text)
+            else:
+                self.__filesProgressStart(0, text)
 
     def __filesContextMenuInformations(self, event):
         """Display context menu for informations tabs"""
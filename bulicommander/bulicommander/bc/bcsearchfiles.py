@@ -433,6 +433,96 @@ class BCSearchFilesDialogBox(QDialog):
 
         return True
 
+    @staticmethod
+    def buildBCFileListSortRules(fileList, sortRulesAsDict):
+        """From a given sort rule (provided as dictionnary) define sort rules of
+        given BCFileList
+
+        Return list of checked sort rules (as dictionnary)
+        """
+        if not isinstance(fileList, BCFileList):
+            raise EInvalidType("Given `fileList` must be a <BCFileList>")
+        elif not isinstance(sortRulesAsDict, dict):
+            raise EInvalidType("Given `sortRulesAsDict` must be a <dict>")
+
+        returned = []
+        fileList.clearSortRules()
+        for sortRule in sortRulesAsDict['list']:
+            if sortRule['checked']:
+                # need a conversion from BCWSearchSortRules.MAP_VALUE_LABEL and BCFileProperty
+                # as BCFile is more "generic" and BCWSearchSortRules is more oriented to image...
+                # maybe not a good thing, but currently prefer to keep it as is it
+                value = sortRule['value']
+                if value == 'filePath':
+                    value = BCFileProperty.PATH
+                elif value == 'fileFullPathName':
+                    value = BCFileProperty.FULL_PATHNAME
+                elif value == 'imageFormat':
+                    value = BCFileProperty.FILE_FORMAT
+                fileList.addSortRule(BCFileListSortRule(value, sortRule['ascending']))
+                returned.append(sortRule)
+
+        return returned
+
+    @staticmethod
+    def searchResultsLimit(searchRulesAsDict):
+        """From a given search rule (provided as dictionnary), return a tuple
+        (sortRulesAsDict, limitValue) if search results can be limited before
+        being sorted and exported, otherwise return None
+
+        Results can be limited when search engine output is only linked to a
+        sort filter, itself only linked to a limit filter that truncates results;
+        then only the first files are needed by output engines
+        """
+        nodes = {}
+        nodeSearchEngine = None
+        for node in searchRulesAsDict['nodes']:
+            nodes[node['properties']['id']] = node
+            if node['widget']['type'] == 'BCNodeWSearchEngine':
+                nodeSearchEngine = node
+
+        if nodeSearchEngine is None:
+            return None
+
+        # links from node id --> set of node id
+        linksFrom = {}
+        for link in searchRulesAsDict['links']:
+            linkTo, dummy = link['connect']['to'].split(':')
+            linkFrom, dummy = link['connect']['from'].split(':')
+            if linkFrom not in linksFrom:
+                linksFrom[linkFrom] = set()
+            linksFrom[linkFrom].add(linkTo)
+
+        linksTo = linksFrom.get(nodeSearchEngine['properties']['id'], set())
+        if len(linksTo) != 1:
+            return None
+        nodeSortRule = nodes[next(iter(linksTo))]
+        if nodeSortRule['widget']['type'] != 'BCNodeWSearchSortRule':
+            return None
+
+        linksTo = linksFrom.get(nodeSortRule['properties']['id'], set())
+        if len(linksTo) != 1:
+            return None
+        nodeLimitRule = nodes[next(iter(linksTo))]
+        if (nodeLimitRule['widget']['type'] != 'BCNodeWSearchLimitRule'
+           or nodeLimitRule['widget']['limitProperties']['limitAction'] != 1
+           or nodeLimitRule['widget']['limitProperties']['limitValue'] <= 0):
+            return None
+
+        # all output engines must be linked to limit filter only
+        nbOutputEngines = 0
+        for nodeId, linksTo in linksFrom.items():
+            for linkTo in linksTo:
+                if nodes[linkTo]['widget']['type'] == 'BCNodeWSearchOutputEngine':
+                    if nodeId != nodeLimitRule['properties']['id']:
+                        return None
+                    nbOutputEngines += 1
+
+        if nbOutputEngines == 0:
+            return None
+
+        return (nodeSortRule['widget']['sortProperties'], nodeLimitRule['widget']['limitProperties']['limitValue'])
+
     def __init__(self, title, uicontroller, parent=None):
         super(BCSearchFilesDialogBox, self).__init__(parent)
 
@@ -1199,6 +1289,13 @@ class BCSearchFilesDialogBox(QDialog):
             self.wcExecutionConsole.appendLine("")
             self.wcExecutionConsole.appendLine(f"""**{i18n('Analyze & Filter files:')}** """)
             self.pbProgress.setMaximum(100)
+        elif informations[0] == BCFileList.STEPEXECUTED_PROGRESS_SEARCH:
+            # 0 => step identifier
+            # 1 => number of directories read
+            # 2 => number of files found
+            # 3 => number of files read per second
+            self.pbProgress.setFormat(i18n('Reading files: {0} found ({1:.0f} files/s)').format(informations[2], informations[3]))
+            self.pbProgress.update()
         elif informations[0] == BCFileList.STEPEXECUTED_PROGRESS_FILTER:
             # 0 => step identifier
             # 1 => current pct
@@ -1467,7 +1564,7 @@ class BCSearchFilesDialogBox(QDialog):
                                                     outputEngineRules['documentExportInfo']['exportFormat'],
                                                     limitApplied,
                                                     limitValue,
-                                                    self.__bcFileList.nbFiles()])
+                                                    self.__bcFileList.nbFilesMatching()])
 
             def exportProgress(currentPage):
                 self.__executeSearchProcessSignals([BCFileList.STEPEXECUTED_PROGRESS_OUTPUT, currentPage])
@@ -1477,7 +1574,7 @@ class BCSearchFilesDialogBox(QDialog):
 
             filesToProcess = self.__bcFileList.files()
             if limitRules is not None:
-                if limitRules['limitValue'] > 0 and self.__bcFileList.nbFiles() > limitRules['limitValue']:
+                if limitRules['limitValue'] > 0 and self.__bcFileList.nbFilesMatching() > limitRules['limitValue']:
                     limitApplied = True
                     if limitRules['limitAction'] == 0:
                         # return nothing
@@ -1495,7 +1592,7 @@ class BCSearchFilesDialogBox(QDialog):
                                                             None,
                                                             limitApplied,
                                                             limitRules['limitValue'],
-                                                            self.__bcFileList.nbFiles()])
+                                                            self.__bcFileList.nbFilesMatching()])
                         return
                     elif limitRules['limitAction'] == 1:
                         # return truncated list
@@ -1588,7 +1685,7 @@ class BCSearchFilesDialogBox(QDialog):
                 Stopwatch.stop('executeSortAndExport.export')
                 exportEnd(limitApplied, len(filesToProcess))
 
-        def executeSort(sortRules):
+        def executeSort(sortRules, limit=0):
             # prepare and execute sort for file results
             txtAscending = f"[{i18n('Ascending')}]"
             txtDescending = f"[{i18n('Descending')}]"
@@ -1600,27 +1697,13 @@ class BCSearchFilesDialogBox(QDialog):
             sortNfoList = []
             self.__executeSearchProcessSignals([BCFileList.STEPEXECUTED_PROGRESS_SORT])
             Stopwatch.start('executeSortAndExport.sort')
-            self.__bcFileList.clearSortRules()
-            for sortRule in sortRules['list']:
-                if sortRule['checked']:
-                    # need a conversion from BCWSearchSortRules.MAP_VALUE_LABEL and BCFileProperty
-                    # as BCFile is more "generic" and BCWSearchSortRules is more oriented to image...
-                    # maybe not a good thing, but currently prefer to keep it as is it
-                    value = sortRule['value']
-                    if value == 'filePath':
-                        value = BCFileProperty.PATH
-                    elif value == 'fileFullPathName':
-                        value = BCFileProperty.FULL_PATHNAME
-                    elif value == 'imageFormat':
-                        value = BCFileProperty.FILE_FORMAT
-                    fileListSortRule = BCFileListSortRule(value, sortRule['ascending'])
-                    self.__bcFileList.addSortRule(fileListSortRule)
-
-                    if sortRule['ascending']:
-                        sortNfoList.append(f"{txtAscending}{BCWSearchSortRules.MAP_VALUE_LABEL[sortRule['value']]}")
-                    else:
-                        sortNfoList.append(f"{txtDescending}{BCWSearchSortRules.MAP_VALUE_LABEL[sortRule['value']]}")
-            self.__bcFileList.sortResults(sortRules['caseInsensitive'])
+            for sortRule in BCSearchFilesDialogBox.buildBCFileListSortRules(self.__bcFileList, sortRules):
+                if sortRule['ascending']:
+                    sortNfoList.append(f"{txtAscending}{BCWSearchSortRules.MAP_VALUE_LABEL[sortRule['value']]}")
+                else:
+                    sortNfoList.append(f"{txtDescending}{BCWSearchSortRules.MAP_VALUE_LABEL[sortRule['value']]}")
+            # when results are limited, only the first files need to be sorted
+            self.__bcFileList.sortResults(sortRules['caseInsensitive'], True, limit)
             Stopwatch.stop('executeSortAndExport.sort')
             self.__executeSearchProcessSignals([BCFileList.STEPEXECUTED_SORT_RESULTS, Stopwatch.duration("executeSortAndExport.sort"), sortNfoList])
 
@@ -1759,7 +1842,10 @@ class BCSearchFilesDialogBox(QDialog):
             if self.__searchInProgress == BCSearchFilesDialogBox.__SEARCH_IN_PROGRESS_CANCEL:
                 self.__executeSearchProcessSignals([BCFileList.STEPEXECUTED_CANCEL])
                 return
-            executeSort(sortRule['widget']['sortProperties'])
+            if limitRule is None:
+                executeSort(sortRule['widget']['sortProperties'])
+            else:
+                executeSort(sortRule['widget']['sortProperties'], limitRule['widget']['limitProperties']['limitValue'])
             for outputEngine in sortRule['outputEngines']:
                 if self.__searchInProgress == BCSearchFilesDialogBox.__SEARCH_IN_PROGRESS_CANCEL:
                     self.__executeSearchProcessSignals([BCFileList.STEPEXECUTED_CANCEL])
@@ -1913,13 +1999,43 @@ class BCSearchFilesDialogBox(QDialog):
             self.wcExecutionConsole.appendLine("")
             self.wcExecutionConsole.appendLine(f"""**{i18n('Scan directories:')}** """)
 
-            self.__bcFileList.searchExecute(True, True, [
-                BCFileList.STEPEXECUTED_SEARCH_FROM_PATHS,
-                BCFileList.STEPEXECUTED_SEARCH_FROM_PATH,
-                BCFileList.STEPEXECUTED_FILTER_FILES,
-                BCFileList.STEPEXECUTED_BUILD_RESULTS,
-                BCFileList.STEPEXECUTED_PROGRESS_FILTER
-            ])
+            # if only first files are exported, limit search results
+            resultsLimit = BCSearchFilesDialogBox.searchResultsLimit(dataAsDict)
+            if resultsLimit is None:
+                # results are streamed: files are filtered and added to results by
+                # batches while directories are scanned, then user interface stay
+                # responsive and search can be cancelled at any time
+                self.__bcFileList.setResultsLimit(0)
+
+                # number of files is not known: progress bar only display progress text
+                # (text is not displayed by an infinite progress bar)
+                self.pbProgress.setMaximum(1)
+                self.pbProgress.setFormat(i18n('Reading files...'))
+
+                Stopwatch.start('executeSearch.stream')
+                self.__bcFileList.searchExecuteStream(True, True, [BCFileList.STEPEXECUTED_PROGRESS_SEARCH])
+                Stopwatch.stop('executeSearch.stream')
+                self.pbProgress.resetFormat()
+                self.pbProgress.setMaximum(0)
+
+                if self.__searchInProgress != BCSearchFilesDialogBox.__SEARCH_IN_PROGRESS_CANCEL:
+                    self.wcExecutionConsole.append(f"""#g#{i18n('OK')}#""")
+                    self.wcExecutionConsole.appendLine(f"""&nbsp;{i18n('Total files:')} #c#{self.__bcFileList.nbFiles()}#""")
+                    self.wcExecutionConsole.appendLine(f"""&nbsp;*#lk#({i18n('Scan & filter executed in')}# #w#{Stopwatch.duration("executeSearch.stream"):0.4f}s##lk#)#*""")
+            else:
+                # first files are selected before being built: search is not streamed
+                BCSearchFilesDialogBox.buildBCFileListSortRules(self.__bcFileList, resultsLimit[0])
+                # results are empty: only define case sensitivity used by search
+                self.__bcFileList.sortResults(resultsLimit[0]['caseInsensitive'], False)
+                self.__bcFileList.setResultsLimit(resultsLimit[1])
+
+                self.__bcFileList.searchExecute(True, True, [
+                    BCFileList.STEPEXECUTED_SEARCH_FROM_PATHS,
+                    BCFileList.STEPEXECUTED_SEARCH_FROM_PATH,
+                    BCFileList.STEPEXECUTED_FILTER_FILES,
+                    BCFileList.STEPEXECUTED_BUILD_RESULTS,
+                    BCFileList.STEPEXECUTED_PROGRESS_FILTER
+                ])
 
             # Even if BCFileList.execute can do sort, it's not used because only
             # one sort van be applied
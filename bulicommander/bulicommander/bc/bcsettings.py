@@ -46,6 +46,8 @@ import sys
 import shutil
 
 from .bcfile import (
+        BCCacheBundle,
+        BCCacheStats,
         BCFile,
         BCFileCache
     )
@@ -59,6 +61,7 @@ from bulicommander.pktk.modules.utils import (
     )
 from bulicommander.pktk.modules.imgutils import buildIcon
 from bulicommander.pktk.modules.strutils import bytesSizeToStr
+from bulicommander.pktk.modules.timeutils import tsToStr
 from bulicommander.pktk.modules.ekrita import EKritaResizeMethods
 from bulicommander.pktk.modules.settings import (
                         Settings,
@@ -133,6 +136,13 @@ class BCSettingsKey(SettingsKey):
 
     CONFIG_PANELVIEW_FILES_MARKERS_MOVETONEXT =              'config.panelView.files.markers.moveToNext'
 
+    CONFIG_CACHE_METADATA_MAXAGE =                           'config.cache.metadata.maxAge'
+    CONFIG_CACHE_METADATA_MAXSIZE =                          'config.cache.metadata.maxSize'
+    CONFIG_CACHE_METADATA_WORKERS =                          'config.cache.metadata.workers'
+    CONFIG_CACHE_WARMING_ENABLED =                           'config.cache.warming.enabled'
+    CONFIG_CACHE_WARMING_CPU =                               'config.cache.warming.cpu'
+    CONFIG_CACHE_WARMING_IO =                                'config.cache.warming.io'
+
     CONFIG_CLIPBOARD_CACHE_MODE_GENERAL =                    'config.clipboard.cache.mode.general'
     CONFIG_CLIPBOARD_CACHE_MODE_SYSTRAY =                    'config.clipboard.cache.mode.systray'
     CONFIG_CLIPBOARD_CACHE_MAXISZE =                         'config.clipboard.cache.maxSize'
@@ -768,6 +778,13 @@ class BCSettings(Settings):
             SettingsRule(BCSettingsKey.CONFIG_DSESSION_INFO_TOCLIPBOARD_MINWIDTH_ACTIVE,    True,                       SettingsFmt(bool)),
             SettingsRule(BCSettingsKey.CONFIG_DSESSION_INFO_TOCLIPBOARD_MAXWIDTH_ACTIVE,    False,                      SettingsFmt(bool)),
 
+            SettingsRule(BCSettingsKey.CONFIG_CACHE_METADATA_MAXAGE,                        180,                        SettingsFmt(int)),
+            SettingsRule(BCSettingsKey.CONFIG_CACHE_METADATA_MAXSIZE,                       1024000000,                 SettingsFmt(int)),
+            SettingsRule(BCSettingsKey.CONFIG_CACHE_METADATA_WORKERS,                       0,                          SettingsFmt(int, (0, 64))),
+            SettingsRule(BCSettingsKey.CONFIG_CACHE_WARMING_ENABLED,                        True,                       SettingsFmt(bool)),
+            SettingsRule(BCSettingsKey.CONFIG_CACHE_WARMING_CPU,                            25,                         SettingsFmt(int, (1, 100))),
+            SettingsRule(BCSettingsKey.CONFIG_CACHE_WARMING_IO,                             20,                         SettingsFmt(int)),
+
             SettingsRule(BCSettingsKey.CONFIG_CLIPBOARD_CACHE_MODE_GENERAL,                 BCSettingsValues.CLIPBOARD_MODE_ALWAYS,
                                                                                                                         SettingsFmt(str, [BCSettingsValues.CLIPBOARD_MODE_ALWAYS,
                                                                                                                                           BCSettingsValues.CLIPBOARD_MODE_ACTIVE,
@@ -1027,6 +1044,12 @@ class BCSettingsDialogBox(QDialog):
         self.pbCCIClearCacheCS.clicked.connect(self.__clearCacheCS)
         self.pbCCIClearCacheCP.clicked.connect(self.__clearCacheCP)
         self.pbCCIClearCacheMD.clicked.connect(self.__clearCacheMD)
+        self.pbCCICompactMD.clicked.connect(self.__compactCacheMD)
+        self.pbCCICacheStatsRefresh.clicked.connect(self.__updateCacheStats)
+        self.pbCCICacheStatsReset.clicked.connect(self.__resetCacheStats)
+        self.pbCCICacheStatsExport.clicked.connect(self.__exportCacheStats)
+        self.pbCCIBundleExport.clicked.connect(self.__exportCacheBundle)
+        self.pbCCIBundleImport.clicked.connect(self.__importCacheBundle)
 
         self.bbOkCancel.accepted.connect(self.__applySettings)
 
@@ -1230,6 +1253,19 @@ class BCSettingsDialogBox(QDialog):
         self.cbCCAutomaticUrlDownload.setChecked(BCSettings.get(BCSettingsKey.CONFIG_CLIPBOARD_URL_AUTOLOAD))
         self.cbCCUsePersistent.setChecked(BCSettings.get(BCSettingsKey.CONFIG_CLIPBOARD_CACHE_PERSISTENT))
 
+        # --- Cache Category -----------------------------------------------------
+        self.sbCCIDbCacheMaxAge.setValue(BCSettings.get(BCSettingsKey.CONFIG_CACHE_METADATA_MAXAGE))
+        # setting is stored in bytes, spinbox value in MB
+        self.sbCCIDbCacheMaxSize.setValue(BCSettings.get(BCSettingsKey.CONFIG_CACHE_METADATA_MAXSIZE) // 1000000)
+        self.sbCCIDbCacheWorkers.setValue(BCSettings.get(BCSettingsKey.CONFIG_CACHE_METADATA_WORKERS))
+        self.cbCCIWarmingEnabled.setChecked(BCSettings.get(BCSettingsKey.CONFIG_CACHE_WARMING_ENABLED))
+        self.sbCCIWarmingCpu.setValue(BCSettings.get(BCSettingsKey.CONFIG_CACHE_WARMING_CPU))
+        self.sbCCIWarmingIo.setValue(BCSettings.get(BCSettingsKey.CONFIG_CACHE_WARMING_IO))
+        self.sbCCIWarmingCpu.setEnabled(self.cbCCIWarmingEnabled.isChecked())
+        self.sbCCIWarmingIo.setEnabled(self.cbCCIWarmingEnabled.isChecked())
+        self.cbCCIWarmingEnabled.toggled.connect(self.sbCCIWarmingCpu.setEnabled)
+        self.cbCCIWarmingEnabled.toggled.connect(self.sbCCIWarmingIo.setEnabled)
+
         # --- Panel files Category -----------------------------------------------------
         value = BCSettings.get(BCSettingsKey.CONFIG_PANELVIEW_FILES_GRIDINFO_LAYOUT)
         if value == BCSettingsDialogBox.BCViewFilesLv.OPTION_LAYOUT_GRIDINFO_NONE:
@@ -1364,6 +1400,14 @@ class BCSettingsDialogBox(QDialog):
         self.__uiController.commandSettingsClipboardUrlAutomaticDownload(self.cbCCAutomaticUrlDownload.isChecked())
         self.__uiController.commandSettingsClipboardUrlParseTextHtml(self.cbCCParseTextHtml.isChecked())
 
+        # --- Cache Category -----------------------------------------------------
+        self.__uiController.commandSettingsCacheMetadataMaxAge(self.sbCCIDbCacheMaxAge.value())
+        self.__uiController.commandSettingsCacheMetadataMaxSize(self.sbCCIDbCacheMaxSize.value() * 1000000)
+        self.__uiController.commandSettingsCacheMetadataWorkers(self.sbCCIDbCacheWorkers.value())
+        self.__uiController.commandSettingsCacheWarmingCpu(self.sbCCIWarmingCpu.value())
+        self.__uiController.commandSettingsCacheWarmingIo(self.sbCCIWarmingIo.value())
+        self.__uiController.commandSettingsCacheWarmingEnabled(self.cbCCIWarmingEnabled.isChecked())
+
         # --- Panel files Category -----------------------------------------------------
         if self.rbCFNfoGridNone.isChecked():
             self.__uiController.commandSettingsFilesNfoGridMode(BCSettingsDialogBox.BCViewFilesLv.OPTION_LAYOUT_GRIDINFO_NONE)
@@ -1412,6 +1456,7 @@ class BCSettingsDialogBox(QDialog):
         if self.lvCategory.currentItem().data(Qt.UserRole) == BCSettingsDialogBox.CATEGORY_CACHE:
             # calculate cache nb files+size
             self.__calculateCacheSize()
+            self.__updateCacheStats()
 
     def __setCategory(self, value):
         """Set category setting
@@ -1456,6 +1501,139 @@ class BCSettingsDialogBox(QDialog):
             self.lblCCIDbCache.setText(f"{dbStats['nbHash']} images, {bytesSizeToStr(dbStats['dbSize'], BCSettingsValues.FILE_UNIT_KB)}")
         self.pbCCIClearCacheMD.setEnabled(dbStats['nbHash'] > 0)
 
+        if self.rbCGFileUnitBinary.isChecked():
+            freeSize = bytesSizeToStr(dbStats['dbFreeSize'], BCSettingsValues.FILE_UNIT_KIB)
+        else:
+            freeSize = bytesSizeToStr(dbStats['dbFreeSize'], BCSettingsValues.FILE_UNIT_KB)
+        if dbStats['incrementalVacuum']:
+            freeSize = i18n(f"{freeSize} to release")
+        else:
+            # free space is released only by a full vacuum
+            freeSize = i18n(f"{freeSize} to release by compacting database")
+        self.lblCCIDbCacheStats.setText(i18n(f"{dbStats['nbSnapshot']} directories snapshots, {freeSize}, "
+                                             f"oldest image used on {tsToStr(dbStats['oldestAccess'], 'd', '-')}"))
+
+    def __cacheStatsRow(self, name, counters):
+        """Return list of columns values for cache statistics tree, from given
+        `counters` (as returned by BCCacheStats.stats())"""
+        def latency(value):
+            if value is None:
+                if sum(counters['histogram']) == 0:
+                    return '-'
+                return f'> {BCCacheStats.HISTOGRAM_BOUNDS[-1]}ms'
+            return f'≤ {value}ms'
+
+        nbAccess = counters['hits'] + counters['misses']
+        nbDuration = sum(counters['histogram'])
+
+        if self.rbCGFileUnitBinary.isChecked():
+            size = bytesSizeToStr(counters['bytes'], BCSettingsValues.FILE_UNIT_KIB)
+        else:
+            size = bytesSizeToStr(counters['bytes'], BCSettingsValues.FILE_UNIT_KB)
+
+        return [name,
+                f"{counters['hits']}",
+                f"{counters['misses']}",
+                f"{100 * counters['hits'] / nbAccess:.1f}%" if nbAccess > 0 else '-',
+                size,
+                f"{1000 * counters['duration'] / nbDuration:.2f}ms" if nbDuration > 0 else '-',
+                latency(BCCacheStats.percentile(counters['histogram'], 50)),
+                latency(BCCacheStats.percentile(counters['histogram'], 95)),
+                latency(BCCacheStats.percentile(counters['histogram'], 99))
+                ]
+
+    def __updateCacheStats(self):
+        """Update cache statistics tree"""
+        layerNames = {
+                BCCacheStats.LAYER_METADATA: i18n('Metadata'),
+                BCCacheStats.LAYER_QHASH: i18n('Quick hash'),
+                BCCacheStats.LAYER_THUMBNAIL: i18n('Thumbnails'),
+                BCCacheStats.LAYER_METAINFORMATION: i18n('Metadata (full)'),
+                BCCacheStats.LAYER_CLIPBOARD: i18n('Clipboard')
+            }
+
+        self.twCCICacheStats.clear()
+        for layer, formats in BCCacheStats.stats().items():
+            # layer row is the sum of all formats rows
+            total = {'hits': 0,
+                     'misses': 0,
+                     'bytes': 0,
+                     'duration': 0,
+                     'histogram': [0] * (len(BCCacheStats.HISTOGRAM_BOUNDS) + 1)
+                     }
+            for counters in formats.values():
+                for key in ('hits', 'misses', 'bytes', 'duration'):
+                    total[key] += counters[key]
+                total['histogram'] = [a + b for a, b in zip(total['histogram'], counters['histogram'])]
+
+            layerItem = QTreeWidgetItem(self.twCCICacheStats, self.__cacheStatsRow(layerNames.get(layer, layer), total))
+            for fileFormat in sorted(formats.keys()):
+                QTreeWidgetItem(layerItem, self.__cacheStatsRow(fileFormat, formats[fileFormat]))
+
+        self.twCCICacheStats.sortItems(0, Qt.AscendingOrder)
+        for column in range(self.twCCICacheStats.columnCount()):
+            self.twCCICacheStats.resizeColumnToContents(column)
+
+    def __resetCacheStats(self):
+        """Reset cache statistics"""
+        BCCacheStats.reset()
+        self.__updateCacheStats()
+
+    def __exportCacheStats(self):
+        """Export cache statistics as a JSON file"""
+        fileName, dummy = QFileDialog.getSaveFileName(self,
+                                                      i18n(f"{self.__title}::Export cache statistics"),
+                                                      os.path.join(os.path.expanduser('~'), 'bulicommander-cache-statistics.json'),
+                                                      i18n("JSON file (*.json)"))
+        if fileName != '' and not BCCacheStats.exportJson(fileName):
+            WDialogMessage.display(i18n(f"{self.__title}::Export cache statistics"),
+                                   i18n(f"<h1>Can't export statistics!</h1>Unable to write file <i>{fileName}</i>"))
+
+    def __exportCacheBundle(self):
+        """Export cache content for a directory tree as a bundle file"""
+        title = i18n(f"{self.__title}::Export cache bundle")
+        path = QFileDialog.getExistingDirectory(self, title, os.path.expanduser('~'))
+        if path == '':
+            return
+
+        fileName, dummy = QFileDialog.getSaveFileName(self,
+                                                      title,
+                                                      os.path.join(os.path.expanduser('~'), f'{os.path.basename(path)}.bccache'),
+                                                      i18n("Buli Commander cache bundle (*.bccache)"))
+        if fileName == '':
+            return
+
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        exported = BCCacheBundle.exportBundle(fileName, path)
+        QApplication.restoreOverrideCursor()
+
+        if exported is None:
+            WDialogMessage.display(title, i18n(f"<h1>Can't export cache bundle!</h1>Unable to write file <i>{fileName}</i>"))
+        else:
+            WDialogMessage.display(title, i18n(f"<h1>Cache bundle exported</h1>Metadata for {exported[0]} images and {exported[1]} thumbnails exported"))
+
+    def __importCacheBundle(self):
+        """Import a cache bundle file"""
+        title = i18n(f"{self.__title}::Import cache bundle")
+        fileName, dummy = QFileDialog.getOpenFileName(self,
+                                                      title,
+                                                      os.path.expanduser('~'),
+                                                      i18n("Buli Commander cache bundle (*.bccache)"))
+        if fileName == '':
+            return
+
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        imported = BCCacheBundle.importBundle(fileName)
+        BCFileCache.flush()
+        QApplication.restoreOverrideCursor()
+
+        if imported is None:
+            WDialogMessage.display(title, i18n(f"<h1>Can't import cache bundle!</h1>File <i>{fileName}</i> is not a valid cache bundle, or has been exported from a more recent version of Buli Commander"))
+        else:
+            WDialogMessage.display(title, i18n(f"<h1>Cache bundle imported</h1>Metadata for {imported[0]} images and {imported[2]} thumbnails merged in cache"
+                                               f"{f'<br>Metadata for {imported[1]} images ignored (read with another parser version)' if imported[1] > 0 else ''}"))
+            self.__calculateCacheSize()
+
     def __clearCache(self):
         """Clear cache after user confirmation"""
 
@@ -1498,6 +1676,18 @@ class BCSettingsDialogBox(QDialog):
             BCFileCache.globalInstance().clearDbContent()
             self.__calculateCacheSize()
 
+    def __compactCacheMD(self):
+        """Compact metadata cache database after user confirmation"""
+        if WDialogBooleanInput.display(
+                    i18n(f"{self.__title}::Compact Metadata Cache"),
+                    i18n(f"Metadata cache database ({self.lblCCIDbCache.text()}) will be rebuilt; "
+                         "during operation, database is locked for all Krita instances<br><br>Do you confirm action?")
+                ):
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+            BCFileCache.globalInstance().vacuum()
+            QApplication.restoreOverrideCursor()
+            self.__calculateCacheSize()
+
     @staticmethod
     def open(title, uicontroller):
         """Open dialog box"""
@@ -53,7 +53,9 @@ from .bcfile import (
         BCDirectory,
         BCFile,
         BCFileCache,
-        BCFileManagedFormat
+        BCFileList,
+        BCFileManagedFormat,
+        BCCacheWarmer
     )
 from .bcfilenamemanipulationlanguage import BCFileManipulateName
 from .bcfileoperation import (
@@ -212,6 +214,14 @@ class BCUIController(QObject):
 
         self.__clipboard = BCClipboard(False)
 
+        # warm cache for bookmarks, history and saved views when Krita is idle
+        self.__cacheWarmer = BCCacheWarmer()
+        self.__history.changed.connect(self.__cacheWarmerUpdateTargets)
+        self.__bookmark.changed.connect(self.__cacheWarmerUpdateTargets)
+        self.__savedView.updated.connect(self.__cacheWarmerUpdateTargets)
+        self.__savedView.created.connect(self.__cacheWarmerUpdateTargets)
+        self.__savedView.deleted.connect(self.__cacheWarmerUpdateTargets)
+
         # overrides native Krita Open dialog...
         self.__overrideOpenKrita()
         # add action to file menu
@@ -334,6 +344,13 @@ class BCUIController(QObject):
         self.commandSettingsFilesNfoGridPropertiesFields(BCSettings.get(BCSettingsKey.CONFIG_PANELVIEW_FILES_GRIDINFO_FIELDS))
         self.commandSettingsFilesNfoGridOverMinSize(BCSettings.get(BCSettingsKey.CONFIG_PANELVIEW_FILES_GRIDINFO_OVERMINSIZE))
 
+        self.commandSettingsCacheMetadataMaxAge(BCSettings.get(BCSettingsKey.CONFIG_CACHE_METADATA_MAXAGE))
+        self.commandSettingsCacheMetadataMaxSize(BCSettings.get(BCSettingsKey.CONFIG_CACHE_METADATA_MAXSIZE))
+        self.commandSettingsCacheMetadataWorkers(BCSettings.get(BCSettingsKey.CONFIG_CACHE_METADATA_WORKERS))
+        self.commandSettingsCacheWarmingCpu(BCSettings.get(BCSettingsKey.CONFIG_CACHE_WARMING_CPU))
+        self.commandSettingsCacheWarmingIo(BCSettings.get(BCSettingsKey.CONFIG_CACHE_WARMING_IO))
+        self.commandSettingsCacheWarmingEnabled(BCSettings.get(BCSettingsKey.CONFIG_CACHE_WARMING_ENABLED))
+
         self.commandSettingsClipboardDefaultAction(BCSettings.get(BCSettingsKey.CONFIG_CLIPBOARD_DEFAULT_ACTION))
         self.commandSettingsClipboardCacheMode(BCSettings.get(BCSettingsKey.CONFIG_CLIPBOARD_CACHE_MODE_GENERAL))
         self.commandSettingsClipboardCacheMaxSize(BCSettings.get(BCSettingsKey.CONFIG_CLIPBOARD_CACHE_MAXISZE))
@@ -602,6 +619,17 @@ class BCUIController(QObject):
         else:
             self.__clipboard.setEnabled(False)
 
+    def __cacheWarmerUpdateTargets(self, name=None):
+        """Bookmarks, history or saved views have been modified, update cache warmer targets
+
+        Bookmarks are warmed first, then history (most recent first) and saved views
+        """
+        paths = [value for bookmarkName, value in self.__bookmark.list()]
+        paths += reversed(self.__history.list())
+        for viewName, files in self.__savedView.list():
+            paths += files
+        self.__cacheWarmer.setTargets(paths)
+
     def __checkOpenedDocuments(self, displayMessage=False):
         """Check for all opened documents in Krita
 
@@ -1475,7 +1503,8 @@ class BCUIController(QObject):
         # save current settings
         self.saveSettings()
 
-        # stop all async processes (thumbnail generating)
+        # stop all async processes (thumbnail generating, cache warming)
+        self.__cacheWarmer.stop()
         for panelRef in self.__window.panels:
             self.__window.panels[panelRef].close()
 
@@ -1530,6 +1559,7 @@ class BCUIController(QObject):
 
     def commandQuit(self):
         """Close Buli Commander"""
+        self.__cacheWarmer.stop()
         BCFileCache.finalize()
         self.__window.close()
 
@@ -3238,6 +3268,52 @@ class BCUIController(QObject):
         if BCSettingsDialogBox.open(f'{self.__bcName}::Settings', self):
             self.saveSettings()
 
+    def commandSettingsCacheMetadataMaxAge(self, value=None):
+        """Define number of days metadata are kept in cache when not used (0=never purged)"""
+        if value is not None:
+            BCSettings.set(BCSettingsKey.CONFIG_CACHE_METADATA_MAXAGE, value)
+            BCFileCache.setOptionMaxAge(value)
+        return BCSettings.get(BCSettingsKey.CONFIG_CACHE_METADATA_MAXAGE)
+
+    def commandSettingsCacheMetadataMaxSize(self, value=None):
+        """Define maximum size of metadata cache database, in bytes (0=no limit)"""
+        if value is not None:
+            BCSettings.set(BCSettingsKey.CONFIG_CACHE_METADATA_MAXSIZE, value)
+            BCFileCache.setOptionMaxSize(value)
+        return BCSettings.get(BCSettingsKey.CONFIG_CACHE_METADATA_MAXSIZE)
+
+    def commandSettingsCacheMetadataWorkers(self, value=None):
+        """Define maximum number of workers used to read files metadata (0=automatic)"""
+        if value is not None:
+            BCSettings.set(BCSettingsKey.CONFIG_CACHE_METADATA_WORKERS, value)
+            BCFileList.setOptionMaxWorkers(value)
+        return BCSettings.get(BCSettingsKey.CONFIG_CACHE_METADATA_WORKERS)
+
+    def commandSettingsCacheWarmingEnabled(self, value=None):
+        """Define if cache is warmed in background for bookmarks, history and saved views"""
+        if value is not None:
+            BCSettings.set(BCSettingsKey.CONFIG_CACHE_WARMING_ENABLED, value)
+            if value:
+                self.__cacheWarmerUpdateTargets()
+                self.__cacheWarmer.start()
+            else:
+                self.__cacheWarmer.stop()
+        return BCSettings.get(BCSettingsKey.CONFIG_CACHE_WARMING_ENABLED)
+
+    def commandSettingsCacheWarmingCpu(self, value=None):
+        """Define maximum CPU usage of cache warming, in percent"""
+        if value is not None:
+            BCSettings.set(BCSettingsKey.CONFIG_CACHE_WARMING_CPU, value)
+            self.__cacheWarmer.setOptionCpu(value)
+        return BCSettings.get(BCSettingsKey.CONFIG_CACHE_WARMING_CPU)
+
+    def commandSettingsCacheWarmingIo(self, value=None):
+        """Define maximum disk read of cache warming, in MB/s (0=no limit)"""
+        if value is not None:
+            BCSettings.set(BCSettingsKey.CONFIG_CACHE_WARMING_IO, value)
+            self.__cacheWarmer.setOptionIo(value)
+        return BCSettings.get(BCSettingsKey.CONFIG_CACHE_WARMING_IO)
+
     def commandSettingsClipboardCacheMode(self, value=None):
         """Define default mode for clipboard"""
         if value is not None:
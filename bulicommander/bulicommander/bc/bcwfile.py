@@ -164,7 +164,14 @@ class BCFileModel(QAbstractTableModel):
                ]
 
     @staticmethod
-    def getIcon(itemIndex, file, size=None):
+    def getIcon(itemIndex, file, size=None, loadedIcons=None):
+        """Return icon for file
+
+        If `loadedIcons` is provided, return None for files for which icon is
+        already loaded
+        """
+        if loadedIcons is not None and file.uuid() in loadedIcons:
+            return None
         return file.thumbnail(size=size, thumbType=BCBaseFile.THUMBTYPE_ICON)
 
     def __init__(self, fileList, parent=None):
@@ -183,6 +190,7 @@ class BCFileModel(QAbstractTableModel):
 
         self.__fileList = fileList
         self.__fileList.resultsUpdatedReset.connect(self.__dataUpdateReset)
+        self.__fileList.resultsAboutToBeAdded.connect(self.__dataAboutToBeAdded)
         self.__fileList.resultsUpdatedAdd.connect(self.__dataUpdatedAdd)
         self.__fileList.resultsUpdatedRemove.connect(self.__dataUpdateRemove)
         self.__fileList.resultsUpdatedUpdate.connect(self.__dataUpdateUpdate)
@@ -192,6 +200,7 @@ class BCFileModel(QAbstractTableModel):
         self.__icons = {}
         self.__markers = set()
         self.__items = self.__fileList.files()
+        self.__inserting = False
         self.__headerRightAlign = (BCFileModel.COLNUM_FILE_SIZE,
                                    BCFileModel.COLNUM_IMAGE_SIZE,
                                    BCFileModel.COLNUM_IMAGE_WIDTH,
@@ -242,8 +251,11 @@ class BCFileModel(QAbstractTableModel):
             self.__iconPool.waitProcessed()
             self.__updatingIcons = BCFileModel.__STATUS_ICON_LOADED
 
-    def __updateIcons(self):
-        """Update icons asynchronously"""
+    def __updateIcons(self, onlyMissing=False):
+        """Update icons asynchronously
+
+        If `onlyMissing` is True, icons already loaded are not loaded again
+        """
         if self.__updatingIcons == BCFileModel.__STATUS_ICON_STOPLOADING:
             # currently stop loading icons, so don't need to update them as
             # an update is already waiting
@@ -258,7 +270,10 @@ class BCFileModel(QAbstractTableModel):
 
         self.__updatingIcons = BCFileModel.__STATUS_ICON_LOADING
 
-        self.__iconPool.startProcessing([item for item in self.__items], BCFileModel.getIcon, self.__iconSize)
+        if onlyMissing:
+            self.__iconPool.startProcessing([item for item in self.__items], BCFileModel.getIcon, self.__iconSize, self.__icons)
+        else:
+            self.__iconPool.startProcessing([item for item in self.__items], BCFileModel.getIcon, self.__iconSize)
 
     def __dataUpdateReset(self):
         """Data has entirely been changed (reset/reload)"""
@@ -279,9 +294,26 @@ class BCFileModel(QAbstractTableModel):
         self.endResetModel()
         self.__updateIcons()
 
+    def __dataAboutToBeAdded(self, position, nbItems):
+        """New files are about to be inserted to list of files at given `position`"""
+        if self.__items is not self.__fileList.files():
+            # list of files has been rebuilt; model is reset once files are added
+            return
+
+        self.__stopUpdatingIcons()
+        self.beginInsertRows(QModelIndex(), position, position + nbItems - 1)
+        self.__inserting = True
+
     def __dataUpdatedAdd(self, items):
-        """Add a new file to model"""
-        pass
+        """New files have been inserted to list of files"""
+        if not self.__inserting:
+            # list of files has been rebuilt
+            self.__dataUpdateReset()
+            return
+
+        self.__inserting = False
+        self.endInsertRows()
+        self.__updateIcons(True)
 
     def __dataUpdateRemove(self, items):
         """Remove file from model"""
@@ -114,10 +114,15 @@ class BCWPreview(QWidget):
 
         self.swPreview.setCurrentIndex(1)
 
-    def showPreview(self, img=None):
-        """Hide preview and display message"""
+    def showPreview(self, img=None, fullSize=None, fullImageLoader=None):
+        """Display preview for given image
+
+        If `fullSize` is provided, given `img` is a reduced preview of an image
+        of `fullSize`, and `fullImageLoader` (if provided) is a callable used to
+        get full resolution image when zoom require it
+        """
         self.swPreview.setCurrentIndex(0)
-        self.gvPreview.setImage(img)
+        self.gvPreview.setImage(img, True, fullSize, fullImageLoader)
         self.lblNoPreview.setText("...")
 
     def setText(self, msg):
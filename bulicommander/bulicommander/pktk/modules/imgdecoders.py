@@ -0,0 +1,789 @@
+# -----------------------------------------------------------------------------
+# PyKritaToolKit
+# Copyright (C) 2019-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin framework
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# The imgdecoders module provides native decoders for image file formats that
+# are not (or not always) managed by Qt image plugins
+#
+# Decoders are designed to build previews/thumbnails: they can decode an image
+# directly to a reduced size, reading only the needed data from file
+#
+# Main class from this module
+#
+# - PsdDecoder:
+#       Decode merged (composite) image from PSD/PSB files
+#
+# - XcfDecoder:
+#       Decode flattened image from GIMP XCF files (composite visible layers)
+#
+# -----------------------------------------------------------------------------
+
+import math
+import struct
+import zlib
+
+from itertools import accumulate
+
+from PyQt5.Qt import *
+from PyQt5.QtGui import (
+        QImage,
+        QPainter,
+        qRgb
+    )
+
+from .imgutils import combineChannels
+from .utils import Debug
+from ..pktk import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def unpackBits(data):
+    """Decode given PackBits (RLE) compressed `data` and return decoded bytes
+
+    PackBits specifications: https://en.wikipedia.org/wiki/PackBits
+    """
+    returned = bytearray()
+    index = 0
+    size = len(data)
+    while index < size:
+        header = data[index]
+        index += 1
+        if header < 128:
+            # literal run: (header + 1) bytes to copy
+            returned += data[index:index+header+1]
+            index += header+1
+        elif header > 128:
+            # repeat run: next byte is repeated (257 - header) times
+            returned += data[index:index+1] * (257-header)
+            index += 1
+        # header == 128: no operation
+    return bytes(returned)
+
+
+def unpackXcfRle(data, size, bytesPerPixel):
+    """Decode given XCF RLE compressed tile `data` and return decoded bytes
+
+    Tile is made of `size` pixels of `bytesPerPixel` bytes; RLE data are stored
+    by planes (all first bytes of pixels, then all second bytes, ...) and returned
+    pixels are interleaved
+    """
+    planes = []
+    index = 0
+    dataSize = len(data)
+    for plane in range(bytesPerPixel):
+        decoded = bytearray()
+        while len(decoded) < size and index < dataSize:
+            opcode = data[index]
+            index += 1
+            if opcode <= 126:
+                # short run of identical bytes
+                decoded += data[index:index+1] * (opcode+1)
+                index += 1
+            elif opcode == 127:
+                # long run of identical bytes
+                decoded += data[index+2:index+3] * ((data[index] << 8) | data[index+1])
+                index += 3
+            elif opcode == 128:
+                # long run of different bytes
+                length = (data[index] << 8) | data[index+1]
+                decoded += data[index+2:index+2+length]
+                index += 2+length
+            else:
+                # short run of different bytes
+                decoded += data[index:index+256-opcode]
+                index += 256-opcode
+
+        if len(decoded) < size:
+            decoded += bytes(size - len(decoded))
+        planes.append(decoded[0:size])
+
+    return combineChannels(1, *planes)
+
+
+class PsdDecoder(object):
+    """Decode merged image from a PSD (or PSB) file
+
+    PSD specifications: https://www.adobe.com/devnet-apps/photoshop/fileformatashtml/
+
+    Supported merged image data:
+    - Compression: raw, PackBits (RLE), ZIP without prediction
+    - Depth: 8 and 16-bit integer per channel
+    - Color mode: grayscale, duotone (as grayscale), indexed, RGB, CMYK (naive conversion)
+
+    For ZIP compressed image data, when a reduced size image is requested and file
+    provides a JPEG thumbnail (image resource 1036) big enough, thumbnail is used
+    """
+    COMPRESSION_RAW = 0
+    COMPRESSION_RLE = 1
+    COMPRESSION_ZIP = 2
+    COMPRESSION_ZIP_PREDICTION = 3
+
+    MODE_BITMAP = 0
+    MODE_GRAYSCALE = 1
+    MODE_INDEXED = 2
+    MODE_RGB = 3
+    MODE_CMYK = 4
+    MODE_MULTICHANNEL = 7
+    MODE_DUOTONE = 8
+    MODE_LAB = 9
+
+    RESOURCE_THUMBNAIL = 1036
+
+    # size of compressed data read from file, and maximum size of data
+    # decompressed at once for ZIP compressed image data
+    ZIP_CHUNK_SIZE = 65536
+
+    def __init__(self, fileName):
+        """Initialise decoder for given PSD `fileName`"""
+        self.__fileName = fileName
+
+        self.__version = 0
+        self.__width = 0
+        self.__height = 0
+        self.__channels = 0
+        self.__depth = 0
+        self.__colorMode = None
+        self.__colorTable = b''
+        self.__compression = None
+        # position of image data (after compression method)
+        self.__dataOffset = 0
+        # embedded JPEG thumbnail: tuple (offset, size, width, height), or None
+        self.__thumbnail = None
+        self.__valid = False
+
+        self.__readHeader()
+
+    def __readHeader(self):
+        """Read file header and locate image data section"""
+        try:
+            with open(self.__fileName, 'rb') as fHandle:
+                header = fHandle.read(26)
+                if len(header) != 26 or header[0:4] != b'8BPS':
+                    return
+
+                self.__version, self.__channels, self.__height, self.__width, self.__depth, self.__colorMode = struct.unpack('!H6xHIIHH', header[4:26])
+                if self.__version not in (1, 2):
+                    return
+
+                # color mode data section
+                length = struct.unpack('!I', fHandle.read(4))[0]
+                if length > 0:
+                    self.__colorTable = fHandle.read(length)
+
+                # image resources section
+                length = struct.unpack('!I', fHandle.read(4))[0]
+                resourcesEnd = fHandle.tell() + length
+                self.__readResources(fHandle, resourcesEnd)
+                fHandle.seek(resourcesEnd)
+
+                # layer and mask information section: length is stored on 8 bytes for PSB
+                if self.__version == 1:
+                    length = struct.unpack('!I', fHandle.read(4))[0]
+                else:
+                    length = struct.unpack('!Q', fHandle.read(8))[0]
+                fHandle.seek(length, 1)
+
+                # image data section
+                self.__compression = struct.unpack('!H', fHandle.read(2))[0]
+                self.__dataOffset = fHandle.tell()
+                self.__valid = True
+        except Exception as e:
+            Debug.print('[PsdDecoder.__readHeader] Unable to read file {0}: {1}', self.__fileName, f"{e}")
+            self.__valid = False
+
+    def __readResources(self, fHandle, resourcesEnd):
+        """Read image resources section, up to `resourcesEnd` position
+
+        Only JPEG thumbnail resource is kept
+        """
+        while fHandle.tell() + 12 <= resourcesEnd:
+            signature, resourceId, nameLength = struct.unpack('!4sHB', fHandle.read(7))
+            if signature != b'8BIM':
+                return
+
+            # pascal string name, padded to make size even
+            fHandle.seek(nameLength + (nameLength + 1) % 2, 1)
+            size = struct.unpack('!I', fHandle.read(4))[0]
+            dataOffset = fHandle.tell()
+
+            if resourceId == PsdDecoder.RESOURCE_THUMBNAIL and size > 28:
+                # format, width, height, (widthbytes, total size, compressed size, bpp, planes)
+                thumbFormat, width, height = struct.unpack('!III', fHandle.read(12))
+                if thumbFormat == 1:
+                    # JPEG data
+                    self.__thumbnail = (dataOffset + 28, size - 28, width, height)
+
+            # data are padded to make size even
+            fHandle.seek(dataOffset + size + size % 2)
+
+    def __colorChannels(self):
+        """Return number of channels to decode (color channels + alpha), or 0 if
+        color mode is not supported"""
+        if self.__colorMode in (PsdDecoder.MODE_GRAYSCALE, PsdDecoder.MODE_DUOTONE, PsdDecoder.MODE_INDEXED):
+            colorChannels = 1
+        elif self.__colorMode == PsdDecoder.MODE_RGB:
+            colorChannels = 3
+        elif self.__colorMode == PsdDecoder.MODE_CMYK:
+            colorChannels = 4
+        else:
+            return 0
+
+        if self.__colorMode != PsdDecoder.MODE_INDEXED and self.__channels > colorChannels:
+            # first extra channel is transparency
+            return colorChannels + 1
+        return min(colorChannels, self.__channels)
+
+    def __readPlanes(self, fHandle, nbChannels, step):
+        """Read `nbChannels` planes from image data, keeping one pixel every `step`
+        pixels (for rows and columns)
+
+        Return a list of 8-bit planes (bytes)
+        """
+        bytesPerChannel = self.__depth // 8
+        rowSize = self.__width * bytesPerChannel
+        rows = range(0, self.__height, step)
+        # for 16-bit values (big endian), keep high byte only
+        colSlice = slice(0, rowSize, step * bytesPerChannel)
+
+        planes = []
+        if self.__compression == PsdDecoder.COMPRESSION_RAW:
+            for channel in range(nbChannels):
+                channelOffset = self.__dataOffset + channel * self.__height * rowSize
+                if step == 1:
+                    fHandle.seek(channelOffset)
+                    plane = fHandle.read(self.__height * rowSize)
+                    planes.append(plane[0::bytesPerChannel] if bytesPerChannel > 1 else plane)
+                else:
+                    plane = []
+                    for row in rows:
+                        fHandle.seek(channelOffset + row * rowSize)
+                        plane.append(fHandle.read(rowSize)[colSlice])
+                    planes.append(b''.join(plane))
+        elif self.__compression == PsdDecoder.COMPRESSION_RLE:
+            # byte counts for all rows of all channels (including not decoded channels)
+            nbRows = self.__height * self.__channels
+            if self.__version == 1:
+                byteCounts = struct.unpack(f'!{nbRows}H', fHandle.read(2 * nbRows))
+            else:
+                byteCounts = struct.unpack(f'!{nbRows}I', fHandle.read(4 * nbRows))
+            rowOffsets = list(accumulate(byteCounts, initial=fHandle.tell()))
+
+            for channel in range(nbChannels):
+                plane = []
+                for row in rows:
+                    index = channel * self.__height + row
+                    fHandle.seek(rowOffsets[index])
+                    decoded = unpackBits(fHandle.read(byteCounts[index]))
+                    if len(decoded) < rowSize:
+                        decoded += bytes(rowSize - len(decoded))
+                    plane.append(decoded[colSlice])
+                planes.append(b''.join(plane))
+        elif self.__compression == PsdDecoder.COMPRESSION_ZIP:
+            # all channels are compressed in one stream: data are decompressed
+            # by chunks, only needed rows are kept, and decompression stops after
+            # the last needed row of the last needed channel
+            fHandle.seek(self.__dataOffset)
+            decompressor = zlib.decompressobj()
+            data = bytearray()
+            for channel in range(nbChannels):
+                plane = []
+                nbRows = rows[-1] + 1 if channel == nbChannels - 1 else self.__height
+                for row in range(nbRows):
+                    while len(data) < rowSize:
+                        compressed = decompressor.unconsumed_tail
+                        if compressed == b'':
+                            compressed = fHandle.read(PsdDecoder.ZIP_CHUNK_SIZE)
+                            if compressed == b'':
+                                # truncated data
+                                return None
+                        data += decompressor.decompress(compressed, PsdDecoder.ZIP_CHUNK_SIZE)
+
+                    if row % step == 0:
+                        plane.append(bytes(data[colSlice]))
+                    del data[0:rowSize]
+                planes.append(b''.join(plane))
+        else:
+            return None
+
+        return planes
+
+    def __cmykToRgb(self, planes):
+        """Convert CMYK planes to RGB planes
+
+        In PSD files, CMYK values are stored inverted (0=100% ink, 255=0% ink)
+        Conversion is naive, without color management
+        """
+        c, m, y, k = planes[0:4]
+        if numpy is not None:
+            kArray = numpy.frombuffer(k, dtype=numpy.uint8).astype(numpy.uint16)
+            returned = [(numpy.frombuffer(plane, dtype=numpy.uint8).astype(numpy.uint16) * kArray // 255).astype(numpy.uint8).tobytes() for plane in (c, m, y)]
+        else:
+            returned = [bytes([value * kValue // 255 for value, kValue in zip(plane, k)]) for plane in (c, m, y)]
+        return returned + planes[4:]
+
+    def __thumbnailImage(self):
+        """Return embedded JPEG thumbnail as a QImage, or None if it can't be read"""
+        offset, size, width, height = self.__thumbnail
+        try:
+            with open(self.__fileName, 'rb') as fHandle:
+                fHandle.seek(offset)
+                returned = QImage.fromData(fHandle.read(size), b'JPEG')
+        except Exception as e:
+            Debug.print('[PsdDecoder.__thumbnailImage] Unable to read thumbnail {0}: {1}', self.__fileName, f"{e}")
+            return None
+
+        if returned.isNull():
+            return None
+        return returned
+
+    def isValid(self):
+        """Return True if file is a PSD file for which merged image can be decoded"""
+        return (self.__valid and
+                self.__depth in (8, 16) and
+                self.__compression in (PsdDecoder.COMPRESSION_RAW, PsdDecoder.COMPRESSION_RLE, PsdDecoder.COMPRESSION_ZIP) and
+                self.__colorChannels() > 0)
+
+    def size(self):
+        """Return image size as QSize"""
+        return QSize(self.__width, self.__height)
+
+    def image(self, minSize=None):
+        """Decode merged image and return it as a QImage
+
+        If `minSize` is provided (<int>), image is decoded to a reduced size, skipping
+        rows and columns, keeping the biggest image dimension greater or equal to
+        `minSize` (image still need to be scaled to expected size after decoding);
+        embedded thumbnail can be returned instead (see class description)
+
+        Return None if image can't be decoded
+        """
+        if not self.isValid() or self.__width == 0 or self.__height == 0:
+            return None
+
+        step = 1
+        if isinstance(minSize, int) and minSize > 0:
+            step = max(1, max(self.__width, self.__height) // minSize)
+
+        nbChannels = self.__colorChannels()
+
+        if step > 1 and self.__compression == PsdDecoder.COMPRESSION_ZIP and self.__thumbnail is not None and max(self.__thumbnail[2], self.__thumbnail[3]) >= minSize:
+            # embedded thumbnail is big enough: image data are not decompressed
+            returned = self.__thumbnailImage()
+            if returned is not None:
+                return returned
+
+        try:
+            with open(self.__fileName, 'rb') as fHandle:
+                fHandle.seek(self.__dataOffset)
+                planes = self.__readPlanes(fHandle, nbChannels, step)
+        except Exception as e:
+            Debug.print('[PsdDecoder.image] Unable to decode file {0}: {1}', self.__fileName, f"{e}")
+            return None
+
+        if planes is None:
+            return None
+
+        width = len(range(0, self.__width, step))
+        height = len(range(0, self.__height, step))
+
+        if self.__colorMode == PsdDecoder.MODE_CMYK:
+            planes = self.__cmykToRgb(planes)
+            nbChannels -= 1
+
+        if self.__colorMode == PsdDecoder.MODE_INDEXED:
+            returned = QImage(planes[0], width, height, width, QImage.Format_Indexed8).copy()
+            colorTable = self.__colorTable
+            if len(colorTable) >= 768:
+                returned.setColorTable([qRgb(colorTable[index], colorTable[256+index], colorTable[512+index]) for index in range(256)])
+            return returned
+        elif nbChannels == 1:
+            return QImage(planes[0], width, height, width, QImage.Format_Grayscale8).copy()
+        elif nbChannels == 2:
+            # grayscale with alpha
+            return QImage(bytes(combineChannels(1, planes[0], planes[0], planes[0], planes[1])), width, height, width * 4, QImage.Format_RGBA8888).copy()
+        elif nbChannels == 3:
+            return QImage(bytes(combineChannels(1, *planes)), width, height, width * 3, QImage.Format_RGB888).copy()
+        else:
+            return QImage(bytes(combineChannels(1, *planes[0:4])), width, height, width * 4, QImage.Format_RGBA8888).copy()
+
+
+class XcfDecoder(object):
+    """Decode flattened image from a GIMP XCF file
+
+    XCF specifications: https://gitlab.gnome.org/GNOME/gimp/-/blob/master/devel-docs/xcf.txt
+
+    Visible layers are composited in normal mode, from bottom to top, according
+    to their opacity and offsets; layer modes and masks are ignored
+
+    Supported data:
+    - Compression: none, RLE, zlib
+    - Precision: 8, 16 and 32-bit integer, 16, 32 and 64-bit float (linear or gamma)
+    - Layer type: RGB, grayscale, indexed (with or without alpha)
+    """
+    COMPRESSION_NONE = 0
+    COMPRESSION_RLE = 1
+    COMPRESSION_ZLIB = 2
+
+    PROP_END = 0
+    PROP_COLORMAP = 1
+    PROP_OPACITY = 6
+    PROP_VISIBLE = 8
+    PROP_OFFSETS = 15
+    PROP_COMPRESSION = 17
+    PROP_GROUP_ITEM = 29
+    PROP_ITEM_PATH = 30
+    PROP_FLOAT_OPACITY = 33
+
+    TILE_SIZE = 64
+
+    # precision: (bytes per component, is float, is linear)
+    __PRECISIONS = {
+            0: (1, False, False),
+            1: (2, False, False),
+            2: (4, False, True),
+            3: (2, True, True),
+            4: (4, True, True),
+            100: (1, False, True),
+            150: (1, False, False),
+            200: (2, False, True),
+            250: (2, False, False),
+            300: (4, False, True),
+            350: (4, False, False),
+            500: (2, True, True),
+            550: (2, True, False),
+            600: (4, True, True),
+            650: (4, True, False),
+            700: (8, True, True),
+            750: (8, True, False)
+        }
+
+    # linear (8-bit) to sRGB (8-bit) conversion table
+    __LINEAR_TO_SRGB = bytes([round(255*(12.92*value if value <= 0.0031308 else 1.055*value**(1/2.4)-0.055)) for value in [index/255 for index in range(256)]])
+
+    def __init__(self, fileName):
+        """Initialise decoder for given XCF `fileName`"""
+        self.__fileName = fileName
+
+        self.__version = 0
+        self.__width = 0
+        self.__height = 0
+        self.__baseType = 0
+        self.__bytesPerComponent = 1
+        self.__isFloat = False
+        self.__isLinear = False
+        self.__compression = XcfDecoder.COMPRESSION_RLE
+        self.__colorMap = b''
+        self.__layerOffsets = []
+        self.__valid = False
+
+        self.__readHeader()
+
+    def __readPointer(self, fHandle):
+        """Read a pointer (32-bit before XCF v11, 64-bit after)"""
+        if self.__version < 11:
+            return struct.unpack('!I', fHandle.read(4))[0]
+        return struct.unpack('!Q', fHandle.read(8))[0]
+
+    def __readProperties(self, fHandle):
+        """Read a property list and return a dictionary {id: payload}"""
+        returned = {}
+        while True:
+            propId, length = struct.unpack('!II', fHandle.read(8))
+            if propId == XcfDecoder.PROP_END:
+                break
+            returned[propId] = fHandle.read(length)
+        return returned
+
+    def __readHeader(self):
+        """Read file header, image properties and layers offsets"""
+        try:
+            with open(self.__fileName, 'rb') as fHandle:
+                header = fHandle.read(14)
+                if len(header) != 14 or header[0:9] != b'gimp xcf ':
+                    return
+
+                if header[9:13] == b'file':
+                    self.__version = 0
+                else:
+                    self.__version = int(header[10:13])
+
+                self.__width, self.__height, self.__baseType = struct.unpack('!III', fHandle.read(12))
+
+                if self.__version >= 4:
+                    precision = struct.unpack('!I', fHandle.read(4))[0]
+                    if precision not in XcfDecoder.__PRECISIONS:
+                        return
+                    self.__bytesPerComponent, self.__isFloat, self.__isLinear = XcfDecoder.__PRECISIONS[precision]
+
+                properties = self.__readProperties(fHandle)
+                if XcfDecoder.PROP_COMPRESSION in properties:
+                    self.__compression = properties[XcfDecoder.PROP_COMPRESSION][0]
+                if XcfDecoder.PROP_COLORMAP in properties:
+                    self.__colorMap = properties[XcfDecoder.PROP_COLORMAP][4:]
+
+                while pointer := self.__readPointer(fHandle):
+                    self.__layerOffsets.append(pointer)
+
+                self.__valid = True
+        except Exception as e:
+            Debug.print('[XcfDecoder.__readHeader] Unable to read file {0}: {1}', self.__fileName, f"{e}")
+            self.__valid = False
+
+    def __readLayers(self, fHandle):
+        """Return list of visible layers (from top to bottom) as dictionaries"""
+        returned = []
+        # effective (visible, opacity) for parent groups of current layer, each
+        # entry already includes its own parents
+        groups = []
+        for offset in self.__layerOffsets:
+            fHandle.seek(offset)
+            width, height, layerType, nameLength = struct.unpack('!IIII', fHandle.read(16))
+            fHandle.seek(nameLength, 1)
+
+            properties = self.__readProperties(fHandle)
+            hierarchyOffset = self.__readPointer(fHandle)
+
+            visible = struct.unpack('!I', properties.get(XcfDecoder.PROP_VISIBLE, b'\0\0\0\1'))[0] != 0
+            if XcfDecoder.PROP_FLOAT_OPACITY in properties:
+                opacity = struct.unpack('!f', properties[XcfDecoder.PROP_FLOAT_OPACITY])[0]
+            else:
+                opacity = struct.unpack('!I', properties.get(XcfDecoder.PROP_OPACITY, b'\0\0\0\xff'))[0]/255
+            offsetX, offsetY = struct.unpack('!ii', properties.get(XcfDecoder.PROP_OFFSETS, bytes(8)))
+
+            depth = 0
+            if XcfDecoder.PROP_ITEM_PATH in properties:
+                depth = len(properties[XcfDecoder.PROP_ITEM_PATH])//4 - 1
+            groups = groups[0:depth]
+            if len(groups) > 0:
+                # direct parent already combines all ancestors
+                groupVisible, groupOpacity = groups[-1]
+                visible = visible and groupVisible
+                opacity *= groupOpacity
+
+            if XcfDecoder.PROP_GROUP_ITEM in properties:
+                # group content is provided by children layers
+                groups.append((visible, opacity))
+            elif visible and opacity > 0 and width > 0 and height > 0:
+                returned.append({'width': width,
+                                 'height': height,
+                                 'type': layerType,
+                                 'opacity': min(1.0, opacity),
+                                 'offsetX': offsetX,
+                                 'offsetY': offsetY,
+                                 'hierarchy': hierarchyOffset
+                                 })
+        return returned
+
+    def __readLevel(self, fHandle, step):
+        """Read hierarchy levels at current position and return the level to use
+        to decode layer with given `step`, as a tuple (width, height, factor, tile offsets)
+
+        Only the first level is used by GIMP (other levels are empty), but if file
+        provides smaller levels with tiles, the one matching `step` is used
+        """
+        width, height, bytesPerPixel = struct.unpack('!III', fHandle.read(12))
+        levelOffsets = []
+        while pointer := self.__readPointer(fHandle):
+            levelOffsets.append(pointer)
+
+        returned = None
+        factor = 1
+        for levelOffset in levelOffsets:
+            if factor > step:
+                break
+            fHandle.seek(levelOffset)
+            levelWidth, levelHeight = struct.unpack('!II', fHandle.read(8))
+            tileOffsets = []
+            while pointer := self.__readPointer(fHandle):
+                tileOffsets.append(pointer)
+            if levelWidth == 0 or levelHeight == 0 or len(tileOffsets) == 0:
+                break
+            returned = (levelWidth, levelHeight, factor, tileOffsets)
+            factor *= 2
+
+        return (bytesPerPixel, returned)
+
+    def __floatTo8bit(self, data):
+        """Convert big endian float values from `data` to 8-bit values"""
+        if numpy is not None:
+            values = numpy.frombuffer(data, dtype={2: '>f2', 4: '>f4', 8: '>f8'}[self.__bytesPerComponent])
+            return (numpy.clip(numpy.nan_to_num(values), 0.0, 1.0)*255 + 0.5).astype(numpy.uint8).tobytes()
+
+        valueFormat = {2: 'e', 4: 'f', 8: 'd'}[self.__bytesPerComponent]
+        values = struct.unpack(f'!{len(data)//self.__bytesPerComponent}{valueFormat}', data)
+        return bytes([0 if not value > 0 else 255 if value >= 1 else int(value*255 + 0.5) for value in values])
+
+    def __readLayerPlanes(self, fHandle, layer, step):
+        """Decode given `layer`, keeping one pixel every `step` pixels (for rows and columns)
+
+        Return a tuple (width, height, level factor, planes) with 8-bit planes for
+        each layer component, or None if layer can't be decoded
+        """
+        fHandle.seek(layer['hierarchy'])
+        bytesPerPixel, level = self.__readLevel(fHandle, step)
+        if level is None:
+            return None
+
+        levelWidth, levelHeight, factor, tileOffsets = level
+        step = max(1, step//factor)
+
+        bytesPerComponent = self.__bytesPerComponent
+        nbComponents = bytesPerPixel//bytesPerComponent
+        # for integer values, only high byte (first byte, big endian) is kept
+        storedBytes = bytesPerComponent if self.__isFloat else 1
+
+        width = len(range(0, levelWidth, step))
+        height = len(range(0, levelHeight, step))
+        planes = [bytearray(width*height*storedBytes) for component in range(nbComponents)]
+
+        tileSize = XcfDecoder.TILE_SIZE
+        nbTilesX = math.ceil(levelWidth/tileSize)
+        nbTilesY = math.ceil(levelHeight/tileSize)
+        if len(tileOffsets) < nbTilesX*nbTilesY:
+            return None
+
+        for tileY in range(nbTilesY):
+            y0 = tileY*tileSize
+            tileHeight = min(tileSize, levelHeight - y0)
+            firstRow = -y0 % step
+            if firstRow >= tileHeight:
+                # no row to keep from this line of tiles
+                continue
+
+            for tileX in range(nbTilesX):
+                x0 = tileX*tileSize
+                tileWidth = min(tileSize, levelWidth - x0)
+                firstCol = -x0 % step
+                if firstCol >= tileWidth:
+                    continue
+
+                tileIndex = tileY*nbTilesX + tileX
+                tileBytes = tileWidth*tileHeight*bytesPerPixel
+                fHandle.seek(tileOffsets[tileIndex])
+                if tileIndex + 1 < len(tileOffsets):
+                    data = fHandle.read(tileOffsets[tileIndex + 1] - tileOffsets[tileIndex])
+                else:
+                    data = fHandle.read(2*tileBytes + 1024)
+
+                if self.__compression == XcfDecoder.COMPRESSION_RLE:
+                    data = unpackXcfRle(data, tileWidth*tileHeight, bytesPerPixel)
+                elif self.__compression == XcfDecoder.COMPRESSION_ZLIB:
+                    data = zlib.decompressobj().decompress(data, tileBytes)
+                elif self.__compression != XcfDecoder.COMPRESSION_NONE:
+                    return None
+
+                if len(data) < tileBytes:
+                    data = bytes(data) + bytes(tileBytes - len(data))
+
+                rowSize = tileWidth*bytesPerPixel
+                nbCols = len(range(firstCol, tileWidth, step))
+                targetCol = (x0 + firstCol)//step
+                for row in range(firstRow, tileHeight, step):
+                    rowData = data[row*rowSize:(row + 1)*rowSize]
+                    targetOffset = (((y0 + row)//step)*width + targetCol)*storedBytes
+                    for component in range(nbComponents):
+                        componentOffset = firstCol*bytesPerPixel + component*bytesPerComponent
+                        if storedBytes == 1:
+                            values = rowData[componentOffset::step*bytesPerPixel]
+                        else:
+                            values = combineChannels(1, *[rowData[componentOffset + byteIndex::step*bytesPerPixel] for byteIndex in range(storedBytes)])
+                        planes[component][targetOffset:targetOffset + nbCols*storedBytes] = values
+
+        if self.__isFloat:
+            planes = [self.__floatTo8bit(plane) for plane in planes]
+
+        return (width, height, factor, planes)
+
+    def __layerImage(self, layerType, width, height, planes):
+        """Build a RGBA QImage from layer 8-bit `planes`
+
+        Return a tuple (image, data); data must be kept while image is used
+        """
+        if layerType in (4, 5):
+            # indexed
+            colorMap = self.__colorMap[0:768]
+            colorMap += bytes(768 - len(colorMap))
+            color = [planes[0].translate(colorMap[component::3]) for component in range(3)]
+        elif layerType in (2, 3):
+            # grayscale
+            color = [planes[0], planes[0], planes[0]]
+        else:
+            color = planes[0:3]
+
+        if self.__isLinear and layerType not in (4, 5):
+            color = [plane.translate(XcfDecoder.__LINEAR_TO_SRGB) for plane in color]
+
+        if layerType in (1, 3, 5):
+            alpha = planes[-1]
+        else:
+            alpha = b'\xff' * (width*height)
+
+        data = bytes(combineChannels(1, *color, alpha))
+        return (QImage(data, width, height, width*4, QImage.Format_RGBA8888), data)
+
+    def isValid(self):
+        """Return True if file is a XCF file for which flattened image can be decoded"""
+        return (self.__valid and
+                self.__compression in (XcfDecoder.COMPRESSION_NONE, XcfDecoder.COMPRESSION_RLE, XcfDecoder.COMPRESSION_ZLIB))
+
+    def size(self):
+        """Return image size as QSize"""
+        return QSize(self.__width, self.__height)
+
+    def image(self, minSize=None):
+        """Composite visible layers and return flattened image as a QImage
+
+        If `minSize` is provided (<int>), image is decoded to a reduced size, skipping
+        rows and columns, keeping the biggest image dimension greater or equal to
+        `minSize` (image still need to be scaled to expected size after decoding)
+
+        Return None if image can't be decoded
+        """
+        if not self.isValid() or self.__width == 0 or self.__height == 0:
+            return None
+
+        step = 1
+        if isinstance(minSize, int) and minSize > 0:
+            step = max(1, max(self.__width, self.__height) // minSize)
+
+        returned = QImage(len(range(0, self.__width, step)), len(range(0, self.__height, step)), QImage.Format_ARGB32_Premultiplied)
+        returned.fill(Qt.transparent)
+        nbLayers = 0
+
+        painter = QPainter()
+        painter.begin(returned)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
+        try:
+            with open(self.__fileName, 'rb') as fHandle:
+                # layers are stored from top to bottom
+                for layer in reversed(self.__readLayers(fHandle)):
+                    decoded = self.__readLayerPlanes(fHandle, layer, step)
+                    if decoded is None:
+                        continue
+
+                    width, height, factor, planes = decoded
+                    layerImage, data = self.__layerImage(layer['type'], width, height, planes)
+
+                    painter.setOpacity(layer['opacity'])
+                    painter.drawImage(QRectF(layer['offsetX']/step, layer['offsetY']/step, layer['width']/step, layer['height']/step), layerImage)
+                    nbLayers += 1
+        except Exception as e:
+            Debug.print('[XcfDecoder.image] Unable to decode file {0}: {1}', self.__fileName, f"{e}")
+            nbLayers = 0
+        painter.end()
+
+        if nbLayers == 0:
+            return None
+        return returned
@@ -23,11 +23,17 @@ from PyQt5.QtGui import (
     )
 
 from math import ceil
+import array
 import re
 import pickle
 
 from ..pktk import *
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 def warningAreaBrush(size=32):
     """Return a checker board brush"""
@@ -234,13 +240,49 @@ def imgBoxSize(imageSize, boxSize):
     return QSize(w, h)
 
 
-def combineChannels(bytesPerChannel, *channels):
+def _premultiplyChannel(bytesPerChannel, channel, alpha):
+    """Return given `channel` values multiplied by `alpha` values (pure python)"""
+    maxValue = (1 << (8*bytesPerChannel)) - 1
+    halfValue = maxValue >> 1
+
+    if bytesPerChannel == 1:
+        return bytes([(value*alphaValue + halfValue)//maxValue for value, alphaValue in zip(channel, alpha)])
+
+    itemFormat = 'H' if bytesPerChannel == 2 else 'I'
+    values = memoryview(channel).cast('B').cast(itemFormat)
+    alphaValues = memoryview(alpha).cast('B').cast(itemFormat)
+    return array.array(itemFormat, [(value*alphaValue + halfValue)//maxValue for value, alphaValue in zip(values, alphaValues)]).tobytes()
+
+
+def _premultiplyArrays(bytesPerChannel, arrays):
+    """Return given NumPy `arrays` in which color arrays are multiplied by alpha
+    (last array)"""
+    maxValue = (1 << (8*bytesPerChannel)) - 1
+    dtype = arrays[0].dtype
+    wideType = {1: numpy.uint16, 2: numpy.uint32, 4: numpy.uint64}[bytesPerChannel]
+    alpha = arrays[-1].astype(wideType)
+
+    return [((channelArray.astype(wideType)*alpha + (maxValue >> 1))//maxValue).astype(dtype) for channelArray in arrays[:-1]] + [arrays[-1]]
+
+
+def combineChannels(bytesPerChannel, *channels, premultiplied=False, target=None):
     """Combine given channels
 
-    Given `bytesPerChannel` define how many byte are used for one pixel in channels
+    Given `bytesPerChannel` define how many byte are used for one pixel in channels (1, 2 or 4)
     Given `channels` are bytes or bytesarray (or memory view on bytes/bytearray)
 
-    Return a bytearray
+    If `premultiplied` is True, last channel is alpha channel and values of other
+    channels are multiplied by alpha (for 2 and 4 bytes per channel, values are
+    expected in native byte order)
+
+    If `target` is provided (bytearray or writable memory view), channels are
+    combined into it instead of a new bytearray; size of `target` must be the
+    sum of channels size
+
+    Channels are combined with NumPy if available, otherwise with strided slice
+    assignment
+
+    Return a bytearray (or given `target`)
 
     Example:
         bytes per channel = 1
@@ -253,28 +295,50 @@ def combineChannels(bytesPerChannel, *channels):
          0x01, 0xff, 0x06,
          0x02, 0x06, 0xff)
     """
+    if bytesPerChannel not in (1, 2, 4):
+        raise EInvalidValue("Given `bytesPerChannel` must be 1, 2 or 4")
+    elif len(channels) == 0:
+        raise EInvalidValue("At least one channel must be provided")
+
     # First, need to ensure that all channels have the same size
-    channelSize = None
+    channels = [memoryview(channel).cast('B') for channel in channels]
+    channelSize = len(channels[0])
     for channel in channels:
-        if channelSize is None:
-            channelSize = len(channel)
-        elif channelSize != len(channel):
+        if channelSize != len(channel):
             raise EInvalidValue("All `channels` must have the same size")
 
+    if channelSize % bytesPerChannel != 0:
+        raise EInvalidValue("Size of `channels` must be a multiple of `bytesPerChannel`")
+
     channelCount = len(channels)
     offsetTargetInc = channelCount*bytesPerChannel
-    targetSize = channelSize*offsetTargetInc
-    target = bytearray(targetSize)
-
-    channelNumber = 0
-    for channel in channels:
+    targetSize = channelSize*channelCount
+
+    if target is None:
+        target = bytearray(targetSize)
+    elif not isinstance(target, (bytearray, memoryview)):
+        raise EInvalidType("Given `target` must be a <bytearray> or a <memoryview>")
+    elif len(memoryview(target).cast('B')) != targetSize:
+        raise EInvalidValue(f"Given `target` size must be {targetSize}")
+
+    premultiplied = premultiplied and channelCount > 1
+
+    if numpy is not None:
+        dtype = {1: numpy.uint8, 2: numpy.uint16, 4: numpy.uint32}[bytesPerChannel]
+        arrays = [numpy.frombuffer(channel, dtype=dtype) for channel in channels]
+        if premultiplied:
+            arrays = _premultiplyArrays(bytesPerChannel, arrays)
+        numpy.stack(arrays, axis=-1, out=numpy.frombuffer(target, dtype=dtype).reshape(-1, channelCount))
+        return target
+
+    if premultiplied:
+        channels = [memoryview(_premultiplyChannel(bytesPerChannel, channel, channels[-1])) for channel in channels[:-1]] + [channels[-1]]
+
+    targetView = memoryview(target).cast('B')
+    for channelNumber, channel in enumerate(channels):
         offsetTarget = channelNumber*bytesPerChannel
-        offsetSource = 0
-        for index in range(channelSize//bytesPerChannel):
-            target[offsetTarget] = channel[offsetSource]
-            offsetTarget += offsetTargetInc
-            offsetSource += bytesPerChannel
-        channelNumber += 1
+        for byteNumber in range(bytesPerChannel):
+            targetView[offsetTarget+byteNumber::offsetTargetInc] = channel[byteNumber::bytesPerChannel]
 
     return target
 
@@ -149,6 +149,10 @@ class WorkerPool(QObject):
 
         if isinstance(maxWorkerCount, int) and maxWorkerCount >= 1 and maxWorkerCount <= self.__threadpool.maxThreadCount():
             self.__maxWorkerCount = maxWorkerCount
+        elif isinstance(maxWorkerCount, int) and maxWorkerCount > self.__threadpool.maxThreadCount():
+            # more workers than CPU cores, for I/O bound processing
+            self.__threadpool.setMaxThreadCount(maxWorkerCount)
+            self.__maxWorkerCount = maxWorkerCount
         elif isinstance(maxWorkerCount, float) and maxWorkerCount > 0 and maxWorkerCount <= 1:
             self.__maxWorkerCount = int(self.__threadpool.maxThreadCount() * maxWorkerCount)
         else:
@@ -176,10 +180,10 @@ class WorkerPool(QObject):
         self.__nbProcessed += 1
         if self.__mapResults != WorkerPool.__MAP_MODE_OFF:
             index, item = processedNfo
-            if self.__mapResults == WorkerPool.__MAP_MODE_ALL and index is not None:
+            if self.__mapResults in (WorkerPool.__MAP_MODE_ALL, WorkerPool.__MAP_MODE_NONONE) and index is not None:
+                # results are stored according to items index, to be returned in
+                # same order than given list whatever the number of workers is
                 self.__results[index] = item
-            elif self.__mapResults == WorkerPool.__MAP_MODE_NONONE and item is not None:
-                self.__results.append(item)
             elif self.__mapResults == WorkerPool.__MAP_MODE_AGGREGATE and isinstance(item, dict):
                 for key in item:
                     self.__results[key] += item[key]
@@ -204,6 +208,10 @@ class WorkerPool(QObject):
         else:
             self.__workerClass = workerClass
 
+    def maxWorkerCount(self):
+        """Return maximum number of workers used by pool"""
+        return self.__maxWorkerCount
+
     def stopProcessingAsked(self):
         return self.__stopProcess
 
@@ -241,7 +249,7 @@ class WorkerPool(QObject):
 
         self.__dataList = [v for v in dataList]
 
-        if self.__mapResults == WorkerPool.__MAP_MODE_ALL:
+        if self.__mapResults in (WorkerPool.__MAP_MODE_ALL, WorkerPool.__MAP_MODE_NONONE):
             self.__results = [None] * self.__size
         elif self.__mapResults != WorkerPool.__MAP_MODE_AGGREGATE:
             # already initialised by aggregate() method
@@ -312,6 +320,7 @@ class WorkerPool(QObject):
     def mapNoNone(self, dataList, callback, *callbackArgv):
         """Apply `callback` function to each item `datalist` list and return a list
         If callback return None value, value is not added to result
+        Returned values are in the same order than items in `dataList`
 
         Similar to python map() method, but for Qt threads
             https://docs.python.org/3/library/multiprocessing.html#multiprocessing.pool.Pool.map
@@ -323,7 +332,7 @@ class WorkerPool(QObject):
         self.startProcessing(dataList, callback, *callbackArgv)
         self.waitProcessed()
         self.__mapResults = WorkerPool.__MAP_MODE_OFF
-        return self.__results
+        return [item for item in self.__results if item is not None]
 
     def aggregate(self, dataList, returnedStruct, callback, *callbackArgv):
         """Apply `callback` function to each item `datalist` list and return a dictionary with aggregated
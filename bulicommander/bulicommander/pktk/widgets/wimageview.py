@@ -85,6 +85,10 @@ class WImageGView(QGraphicsView):
 
         self.__imgHandle = None
         self.__imgRectF = None
+        # when image is a reduced preview: scale applied to preview and callable
+        # to get full resolution image
+        self.__imgScale = 1.0
+        self.__fullImageLoader = None
 
         self.__minimumZoomFactor = 0.01
         self.__maximumZoomFactor = 16.0
@@ -136,6 +140,22 @@ class WImageGView(QGraphicsView):
             else:
                 self.__zoomStep = 0.5
 
+    def __refineImage(self):
+        """If current image is a reduced preview, replace it with full resolution
+        image when zoom is over preview 1:1 size"""
+        if self.__fullImageLoader is None or self.__currentZoomFactor * self.__imgScale <= 1:
+            return
+
+        fullImageLoader = self.__fullImageLoader
+        self.__fullImageLoader = None
+
+        image = fullImageLoader()
+        if isinstance(image, QImage) and not image.isNull():
+            img = QPixmap.fromImage(image)
+            self.__imgScale = self.__imgRectF.width() / img.width()
+            self.__imgHandle.setPixmap(img)
+            self.__imgHandle.setScale(self.__imgScale)
+
     def allowZoom(self):
         """Return True if user is allowed to zoom with mouse"""
         return self.__allowZoom
@@ -214,6 +234,7 @@ class WImageGView(QGraphicsView):
             raise EInvalidType("Given `value` must be a <float> or <QRectF>")
 
         self.__calculateZoomStep(oldZoomFactor > self.__currentZoomFactor)
+        self.__refineImage()
 
         self.zoomChanged.emit(round(self.__currentZoomFactor * 100, 2))
 
@@ -280,10 +301,14 @@ class WImageGView(QGraphicsView):
             self.__gScene.removeItem(self.__imgHandle)
             self.__imgHandle = None
             self.__imgRectF = None
+            self.__imgScale = 1.0
+            self.__fullImageLoader = None
             self.__currentZoomFactor = 1.0
 
     def image(self, asPixmap=False):
         """Return current image as QImage or None if not image is defined
+
+        Note: if image is a reduced preview, return preview
         """
         if self.hasImage():
             if asPixmap:
@@ -292,10 +317,15 @@ class WImageGView(QGraphicsView):
                 return self.__imgHandle.pixmap().toImage()
         return None
 
-    def setImage(self, image, resetZoom=True):
+    def setImage(self, image, resetZoom=True, fullSize=None, fullImageLoader=None):
         """Set current image
 
         Given image is a QImage or a QPixmap
+
+        If `fullSize` (QSize) is provided and is bigger than image size, given image
+        is a reduced preview: it's displayed scaled to `fullSize` (zoom is relative
+        to full size) and if `fullImageLoader` is provided, it's called once to get
+        full resolution image (QImage) when zoom is over preview 1:1 size
         """
         if image is None:
             self.clearImage()
@@ -313,8 +343,17 @@ class WImageGView(QGraphicsView):
             self.__imgHandle.setPixmap(img)
         else:
             self.__imgHandle = self.__gScene.addPixmap(img)
+            self.__imgHandle.setTransformationMode(Qt.SmoothTransformation)
 
-        self.__imgRectF = QRectF(img.rect())
+        if isinstance(fullSize, (QSize, QSizeF)) and fullSize.width() > img.width() > 0:
+            self.__imgScale = fullSize.width() / img.width()
+            self.__fullImageLoader = fullImageLoader
+        else:
+            self.__imgScale = 1.0
+            self.__fullImageLoader = None
+        self.__imgHandle.setScale(self.__imgScale)
+
+        self.__imgRectF = QRectF(0, 0, img.width() * self.__imgScale, img.height() * self.__imgScale)
 
         if self.__imgRectF.isNull():
             self.clearImage()
@@ -608,12 +647,16 @@ class WImageView(QWidget):
         """
         return self.__wImgView.image(asPixmap)
 
-    def setImage(self, image, resetZoom=True):
+    def setImage(self, image, resetZoom=True, fullSize=None, fullImageLoader=None):
         """Set current image
 
         Given image is a QImage or a QPixmap
+
+        If `fullSize` (QSize) is provided and is bigger than image size, given image
+        is a reduced preview and `fullImageLoader` (callable returning a QImage) is
+        used to get full resolution image when zoom is over preview 1:1 size
         """
-        return self.__wImgView.setImage(image, resetZoom)
+        return self.__wImgView.setImage(image, resetZoom, fullSize, fullImageLoader)
 
     def minimumZoom(self):
         """Return Minimum zoom that can be applied"""
@@ -0,0 +1,66 @@
+# -----------------------------------------------------------------------------
+# Buli Commander
+# Copyright (C) 2019-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin designed to manage documents
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# Tests configuration
+#
+# Plugin modules are imported from source tree without registering extension:
+# package __init__ is not executed, as it registers extension in Krita
+#
+# Outside Krita, a placeholder 'krita' module is provided: any name imported
+# from it is an empty class; modules imported by tests only use Krita API at
+# runtime (theme, windows, documents), not when they're imported, then tests
+# must not call code that needs Krita
+# Translation functions i18n() and i18nc(), provided as builtins by Krita,
+# return untranslated text
+#
+# Some modules create pixmaps when they're imported: as in Krita, a
+# QApplication (without display) is created before tests are collected
+# -----------------------------------------------------------------------------
+
+import builtins
+import os
+import sys
+import types
+
+
+if 'bulicommander' not in sys.modules:
+    package = types.ModuleType('bulicommander')
+    package.__path__ = [os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'bulicommander')]
+    sys.modules['bulicommander'] = package
+
+try:
+    import krita
+except ImportError:
+    class KritaModule(types.ModuleType):
+        """Placeholder for Krita python module"""
+
+        def __getattr__(self, name):
+            if name.startswith('__'):
+                raise AttributeError(name)
+            value = type(name, (object, ), {})
+            setattr(self, name, value)
+            return value
+
+    sys.modules['krita'] = KritaModule('krita')
+
+if not hasattr(builtins, 'i18n'):
+    builtins.i18n = lambda text, *args: text
+    builtins.i18nc = lambda context, text, *args: text
+
+try:
+    from PyQt5.QtWidgets import QApplication
+except ImportError:
+    # tests that need PyQt5 are skipped
+    pass
+else:
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    application = QApplication.instance() or QApplication([])
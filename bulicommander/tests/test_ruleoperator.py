@@ -0,0 +1,237 @@
+# -----------------------------------------------------------------------------
+# Buli Commander
+# Copyright (C) 2019-2022 - Grum999
+# -----------------------------------------------------------------------------
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# https://spdx.org/licenses/GPL-3.0-or-later.html
+# -----------------------------------------------------------------------------
+# A Krita plugin designed to manage documents
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# Tests for search rules operators (bcfile.BCFileListRuleOperator),
+# predicates (bcfile.BCFileListRulePredicates) and image rules
+# (bcfile.BCFileListRuleImage)
+#
+# Compiled comparison functions are checked against a reference implementation
+# of operators (comparison made operator by operator on each call) and against
+# compare(), for all operators and value types
+#
+# Plugin modules are imported from source tree (see conftest.py); they need
+# PyQt5, tests are skipped if it's not available
+#
+# Usage:
+#   python3 -m pytest bulicommander/tests
+# -----------------------------------------------------------------------------
+
+import itertools
+import random
+import re
+import sqlite3
+
+from enum import Enum
+
+import pytest
+
+pytest.importorskip('PyQt5')
+
+from PyQt5.QtCore import QSize
+
+from bulicommander.bc.bcfile import (
+        BCFile,
+        BCFileListRuleImage,
+        BCFileListRuleOperator,
+        BCFileListRuleOperatorType,
+        BCFileListRulePredicates,
+        BCFileManagedFormat
+    )
+from bulicommander.pktk.pktk import EInvalidType
+
+
+class Colour(Enum):
+    RED = 'red'
+    GREEN = 'green'
+    BLUE = 'blue'
+
+
+def reference(operator, ruleValue, value):
+    """Return expected result of comparison of `value` with rule `operator` and `ruleValue`"""
+    if operator == '=':
+        return value == ruleValue
+    elif operator == '<>':
+        return value != ruleValue
+    elif operator == '<':
+        return value < ruleValue
+    elif operator == '>':
+        return value > ruleValue
+    elif operator == '<=':
+        return value <= ruleValue
+    elif operator == '>=':
+        return value >= ruleValue
+    elif operator == 'in':
+        return value in ruleValue
+    elif operator == 'not in':
+        return value not in ruleValue
+    elif operator == 'between':
+        return ruleValue[0] <= value and value <= ruleValue[1]
+    elif operator == 'not between':
+        return not (ruleValue[0] <= value and value <= ruleValue[1])
+    elif operator == 'match':
+        return ruleValue.search(value) is not None
+    elif operator == 'not match':
+        return ruleValue.search(value) is None
+    raise ValueError(operator)
+
+
+COMPARISON_OPERATORS = ('=', '<>', '<', '>', '<=', '>=')
+SET_OPERATORS = ('in', 'not in')
+RANGE_OPERATORS = ('between', 'not between')
+
+# type: (single rule value, list of rule values, compared values, ordered)
+TYPES = {
+        BCFileListRuleOperatorType.INT: (5, [1, 5, 9], [-3, 0, 1, 4, 5, 6, 9, 10], True),
+        BCFileListRuleOperatorType.FLOAT: (2.5, [0.5, 2.5, 7.25], [-1.0, 0.0, 0.5, 2.4999, 2.5, 2.5001, 7.25, 9.0], True),
+        BCFileListRuleOperatorType.DATE: (1650000000, [1640995200, 1650000000], [1640995199, 1640995200, 1649999999.5, 1650000000, 1650000000.5, 1700000000], True),
+        BCFileListRuleOperatorType.DATETIME: (1650000000.5, [1640995200.25, 1650000000.5], [1640995200, 1640995200.25, 1650000000, 1650000000.5, 1650000001, 1700000000.75], True),
+        BCFileListRuleOperatorType.STRING: ('image.png', ['a.kra', 'image.png', 'z.jpg'], ['', 'a.kra', 'image.jpg', 'image.png', 'image.png ', 'Image.png', 'z.jpg', 'zz'], True),
+        BCFileListRuleOperatorType.ENUM: (Colour.GREEN, [Colour.RED, Colour.BLUE], list(Colour), False)
+    }
+
+
+def checkOperator(operator, type, ruleValue, comparedValues):
+    """Check compiled() and compare() against reference for all `comparedValues`"""
+    rule = BCFileListRuleOperator(ruleValue, operator, type)
+    compiled = rule.compiled()
+    for value in comparedValues:
+        expected = reference(operator, rule.value(), value)
+        assert compiled(value) == expected, f"{type} {operator} {ruleValue!r} / {value!r}"
+        assert rule.compare(value) == expected, f"{type} {operator} {ruleValue!r} / {value!r}"
+
+
+@pytest.mark.parametrize('type', TYPES.keys())
+@pytest.mark.parametrize('operator', COMPARISON_OPERATORS)
+def test_comparisonOperators(type, operator):
+    ruleValue, ruleValues, comparedValues, ordered = TYPES[type]
+    if not ordered and operator not in ('=', '<>'):
+        pytest.skip("values of type can't be ordered")
+    checkOperator(operator, type, ruleValue, comparedValues)
+
+
+@pytest.mark.parametrize('type', TYPES.keys())
+@pytest.mark.parametrize('operator', SET_OPERATORS)
+def test_setOperators(type, operator):
+    ruleValue, ruleValues, comparedValues, ordered = TYPES[type]
+    checkOperator(operator, type, ruleValues, comparedValues)
+    checkOperator(operator, type, tuple(ruleValues), comparedValues)
+    checkOperator(operator, type, [], comparedValues)
+
+
+def test_setOperatorsSingleValue():
+    # 'in' accept a single value, converted to a list
+    checkOperator('in', BCFileListRuleOperatorType.INT, 5, [4, 5, 6])
+
+
+@pytest.mark.parametrize('operator', SET_OPERATORS)
+def test_setOperatorsUnhashableValues(operator):
+    ruleValues = [[1, 2], [3], []]
+    comparedValues = [[1, 2], [2, 1], [3], [], [4]]
+    checkOperator(operator, BCFileListRuleOperatorType.LIST, ruleValues, comparedValues)
+
+
+@pytest.mark.parametrize('type', [type for type, definition in TYPES.items() if definition[3]])
+@pytest.mark.parametrize('operator', RANGE_OPERATORS)
+def test_rangeOperators(type, operator):
+    ruleValue, ruleValues, comparedValues, ordered = TYPES[type]
+    checkOperator(operator, type, (ruleValues[0], ruleValues[-1]), comparedValues)
+    checkOperator(operator, type, [ruleValues[0], ruleValues[-1]], comparedValues)
+    # empty range
+    checkOperator(operator, type, (ruleValues[-1], ruleValues[0]), comparedValues)
+
+
+def test_rangeOperatorsSingleValue():
+    # 'between' accept a single value, converted to a range
+    checkOperator('between', BCFileListRuleOperatorType.INT, 5, [4, 5, 6])
+
+
+@pytest.mark.parametrize('operator', ('match', 'not match'))
+@pytest.mark.parametrize('pattern', (r'\.png$', r'^image', re.compile(r'(?i)\.KRA$'), r'^$'))
+def test_regexOperators(operator, pattern):
+    comparedValues = ['', 'image.png', 'image.kra', 'photo.KRA', 'png', 'image.png.bak']
+    checkOperator(operator, BCFileListRuleOperatorType.REGEX, pattern, comparedValues)
+
+
+def test_regexOperatorsCompareType():
+    rule = BCFileListRuleOperator(r'\.png$', 'match', BCFileListRuleOperatorType.REGEX)
+    with pytest.raises(EInvalidType):
+        rule.compare(5)
+
+
+def test_predicatesOrder():
+    """Predicates order only change evaluation order, not result"""
+    random.seed(0)
+    calls = {'accept': 0}
+
+    def acceptAll(value):
+        calls['accept'] += 1
+        return True
+
+    definitions = [
+            (acceptAll, BCFileListRulePredicates.COST_ATTRIBUTE),
+            (lambda value: value % 100 == 0, BCFileListRulePredicates.COST_ATTRIBUTE),
+            (lambda value: value % 3 != 1, BCFileListRulePredicates.COST_REGEX),
+            (lambda value: value < 9000, BCFileListRulePredicates.COST_STAT)
+        ]
+    values = [random.randint(0, 10000) for index in range(3 * BCFileListRulePredicates.REORDER_INTERVAL)]
+    expected = [all(predicate(value) for predicate, cost in definitions) for value in values]
+
+    for permutation in itertools.permutations(definitions):
+        predicates = BCFileListRulePredicates()
+        for predicate, cost in permutation:
+            predicates.add(predicate, cost)
+        assert len(predicates) == len(definitions)
+
+        calls['accept'] = 0
+        assert [predicates.match(value) for value in values] == expected
+
+        # predicate that rejects most values is evaluated before the one that
+        # never rejects: it's called for a few values only
+        assert calls['accept'] < len(values) // 2
+
+
+class ImageFile(BCFile):
+    """A BCFile with given image properties, without any file to read"""
+
+    def __init__(self, width, height):
+        self.__imageSize = QSize(width, height)
+
+    def format(self):
+        return BCFileManagedFormat.PNG
+
+    def imageSize(self):
+        return self.__imageSize
+
+
+@pytest.mark.parametrize('width, height, expected', ((100, 500, True), (500, 100, False), (500, 500, True)))
+def test_imageHeightRule(width, height, expected):
+    """Image height rule compare image height, not image width"""
+    rule = BCFileListRuleImage()
+    rule.setImageHeight((400, '>='))
+    file = ImageFile(width, height)
+    assert rule.fileMatch(file) == (expected, file)
+
+
+@pytest.mark.parametrize('width, height, expected', ((100, 500, True), (500, 100, False), (500, 500, True)))
+def test_imageHeightRuleSqlFilter(width, height, expected):
+    """Image height rule applied on indexed columns of cache database compare
+    image height, as rule applied on file"""
+    rule = BCFileListRuleImage()
+    rule.setImageHeight((400, '>='))
+    condition, values, exact = rule.sqlFilter()
+    assert exact
+
+    connection = sqlite3.connect(':memory:')
+    connection.execute("CREATE TABLE metadata (fileFormat TEXT, width INTEGER, height INTEGER)")
+    connection.execute("INSERT INTO metadata VALUES (?, ?, ?)", (BCFileManagedFormat.PNG, width, height))
+    assert (connection.execute(f"SELECT COUNT(*) FROM metadata WHERE {condition}", values).fetchone()[0] == 1) == expected
+    connection.close()